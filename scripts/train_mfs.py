@@ -21,16 +21,21 @@ License: MIT License (See LICENSE.md)
 """
 
 import argparse
+import hashlib
+import json
 import logging
 import os
 import pickle
+import shutil
 import time
-from typing import Optional, Union, cast
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union, cast
 
 import numpy as np
 import pandas as pd
 from annoy import AnnoyIndex
-from joblib import Memory
 from lenskit.algorithms import als
 from lenskit.algorithms.mf_common import MFPredictor
 from pydantic import BaseModel
@@ -76,7 +81,11 @@ def setup_logging(output_dir: str):
 cachedir = '.cache'
 if not os.path.exists(cachedir):
     os.makedirs(cachedir)
-memory = Memory(cachedir, verbose=1)
+
+# Compact dtypes of the training data columns; 32M ratings take about 640MB instead of 1GB+ with pandas defaults.
+RATING_DTYPES = {'user': np.int32, 'item': np.int32, 'rating': np.float32, 'timestamp': np.int64}
+COLUMN_ALIASES = {'user_id': 'user', 'userId': 'user', 'movie_id': 'item', 'movieId': 'item'}
+CSV_CHUNK_ROWS = 5_000_000
 
 
 class Config(BaseModel):
@@ -89,9 +98,269 @@ class Config(BaseModel):
     ave_item_score: Optional[bool]
     cluster_index: Optional[bool]
     ratings_index: Optional[bool]
+    export_bundle: bool | None = False
     resample_count: int
     filter_list: Optional[str]
     emotion_index_path: Optional[str]
+    workers: int | None = None
+    threads_per_worker: int | None = None
+    seed: int = 42
+    force: bool = False
+
+
+PIPELINE_DIR = '.pipeline'
+BUNDLE_DIR = 'bundle'
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = 'pipeline_manifest.json'
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class PipelineError(RuntimeError):
+    """Raised when one or more pipeline stages failed."""
+
+
+@dataclass
+class Stage:
+    """A unit of work in the training pipeline.
+
+    Attributes:
+        name: Unique stage name, used as its key in the manifest.
+        run: Module-level function executed in a worker process as `run(*args)`.
+        args: Positional arguments for `run`; must be picklable.
+        deps: Names of the stages whose outputs this stage reads.
+        inputs: External files the stage reads; their contents are part of its fingerprint.
+        outputs: Files the stage writes; they are content-hashed once it completes.
+        params: Settings that change the stage's outputs; part of its fingerprint.
+    """
+
+    name: str
+    run: Callable[..., None]
+    args: tuple = ()
+    deps: tuple[str, ...] = ()
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+def _file_digest(path: str, known: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Hashes a file's content, reusing a previous digest if its size and mtime are unchanged.
+
+    Args:
+        path: The file to hash.
+        known: A digest recorded earlier for the same path.
+
+    Returns:
+        A dict with the file's 'sha256', 'size' and 'mtime_ns'.
+    """
+    stat = os.stat(path)
+    if known and known.get('size') == stat.st_size and known.get('mtime_ns') == stat.st_mtime_ns:
+        return known
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return {'sha256': digest.hexdigest(), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _init_worker(threads: int) -> None:
+    """Caps the threads a worker's numeric libraries use, so parallel stages do not oversubscribe the CPU.
+
+    Args:
+        threads: Number of threads each worker process may use.
+    """
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[var] = str(threads)
+    try:
+        import numba
+
+        numba.set_num_threads(threads)
+    except (ImportError, ValueError):
+        pass
+
+
+class Pipeline:
+    """Runs stages as a DAG on a process pool, skipping stages whose inputs are unchanged.
+
+    A stage's fingerprint hashes its name, its parameters, the contents of its external inputs and the content hashes
+    of its dependencies' outputs. When a stage completes, its fingerprint and output hashes are written to the
+    manifest, so later runs skip it as long as nothing upstream changed and its outputs are intact. The manifest is
+    saved after every stage, so a failed or interrupted run picks up from the stages that completed.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        manifest_path: str,
+        workers: int | None = None,
+        threads_per_worker: int | None = None,
+    ):
+        """Validates the stage graph and loads the manifest of earlier runs.
+
+        Args:
+            stages: The stages to run.
+            manifest_path: Path of the JSON manifest recording completed stages.
+            workers: Number of worker processes; defaults to the CPU count.
+            threads_per_worker: Threads each worker may use; defaults to an even share of the CPUs.
+
+        Raises:
+            ValueError: If stage names repeat, a dependency is unknown, or the dependencies form a cycle.
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError('Stage names must be unique.')
+        for stage in stages:
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                raise ValueError(f'Stage {stage.name} depends on unknown stages: {unknown}')
+        self._check_acyclic()
+
+        cpu_count = os.cpu_count() or 1
+        self.workers = workers or cpu_count
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.workers)
+        self.manifest_path = manifest_path
+        self.manifest = self._load_manifest()
+
+    def run(self, force: bool = False) -> dict[str, str]:
+        """Runs every stage whose fingerprint changed, in parallel wherever the dependencies allow.
+
+        A failed stage does not stop independent stages; only the stages downstream of it are held back.
+
+        Args:
+            force: Run every stage even if its recorded outputs are current.
+
+        Returns:
+            The outcome of each stage: 'ran', 'skipped', 'failed' or 'blocked'.
+
+        Raises:
+            PipelineError: If any stage failed or was blocked by a failed dependency.
+        """
+        status: dict[str, str] = {}
+        pending = dict(self.stages)
+        running: dict[Future, tuple[Stage, str, float]] = {}
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.threads_per_worker,)
+        ) as pool:
+            while pending or running:
+                ready = [stage for stage in pending.values() if all(dep in status for dep in stage.deps)]
+                for stage in ready:
+                    del pending[stage.name]
+                    if any(status[dep] not in ('ran', 'skipped') for dep in stage.deps):
+                        log.warning(f'Stage {stage.name}: blocked by a failed dependency.')
+                        status[stage.name] = 'blocked'
+                        continue
+
+                    fingerprint = self._fingerprint(stage)
+                    if not force and self._is_current(stage, fingerprint):
+                        log.info(f'Stage {stage.name}: up to date, skipping.')
+                        status[stage.name] = 'skipped'
+                        continue
+
+                    log.info(f'Stage {stage.name}: running.')
+                    running[pool.submit(stage.run, *stage.args)] = (stage, fingerprint, time.time())
+
+                if ready and not running:
+                    # Skipped stages may have unblocked others; look again before waiting.
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, fingerprint, started = running.pop(future)
+                    try:
+                        future.result()
+                        self._record(stage, fingerprint, time.time() - started)
+                        status[stage.name] = 'ran'
+                        log.info(f'Stage {stage.name}: done in {time.time() - started:.2f}s.')
+                    except Exception as e:
+                        log.error(f'Stage {stage.name}: failed: {e}')
+                        self.manifest['stages'].pop(stage.name, None)
+                        self._save_manifest()
+                        status[stage.name] = 'failed'
+
+        incomplete = sorted(name for name, outcome in status.items() if outcome in ('failed', 'blocked'))
+        if incomplete:
+            raise PipelineError(f'Stages did not complete: {incomplete}. Re-run to resume from the completed stages.')
+        return status
+
+    def _check_acyclic(self) -> None:
+        visited: set[str] = set()
+        active: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in active:
+                raise ValueError(f'Stage dependencies form a cycle through {name}.')
+            if name in visited:
+                return
+            active.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            active.remove(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _fingerprint(self, stage: Stage) -> str:
+        inputs = {}
+        for path in stage.inputs:
+            if not os.path.exists(path):
+                inputs[path] = None
+                continue
+            digest = _file_digest(path, self.manifest['inputs'].get(path))
+            self.manifest['inputs'][path] = digest
+            inputs[path] = digest['sha256']
+
+        dep_outputs = {
+            dep: {path: digest['sha256'] for path, digest in self.manifest['stages'][dep]['outputs'].items()}
+            for dep in sorted(stage.deps)
+        }
+        payload = {'name': stage.name, 'params': stage.params, 'inputs': inputs, 'deps': dep_outputs}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _is_current(self, stage: Stage, fingerprint: str) -> bool:
+        entry = self.manifest['stages'].get(stage.name)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return False
+        for path in stage.outputs:
+            recorded = entry['outputs'].get(path)
+            if recorded is None or not os.path.exists(path):
+                return False
+            current = _file_digest(path, recorded)
+            if current['sha256'] != recorded['sha256']:
+                return False
+            entry['outputs'][path] = current
+        return True
+
+    def _record(self, stage: Stage, fingerprint: str, seconds: float) -> None:
+        missing = [path for path in stage.outputs if not os.path.exists(path)]
+        if missing:
+            raise RuntimeError(f'Stage {stage.name} did not produce {missing}')
+        self.manifest['stages'][stage.name] = {
+            'fingerprint': fingerprint,
+            'outputs': {path: _file_digest(path) for path in stage.outputs},
+            'seconds': round(seconds, 2),
+        }
+        self._save_manifest()
+
+    def _load_manifest(self) -> dict[str, Any]:
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path) as f:
+                    manifest = json.load(f)
+                manifest.setdefault('inputs', {})
+                manifest.setdefault('stages', {})
+                return manifest
+            except (OSError, ValueError) as e:
+                log.warning(f'Could not read pipeline manifest ({e}). Every stage will run.')
+        return {'inputs': {}, 'stages': {}}
+
+    def _save_manifest(self) -> None:
+        os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+        temp_path = f'{self.manifest_path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
 
 
 def _get_model_path(model_path: str) -> str:
@@ -107,12 +376,76 @@ def _get_model_path(model_path: str) -> str:
     return f'{base_file}.bpk' if binpickle else f'{base_file}.pkl'
 
 
-@memory.cache
+def _save_columns(columns: dict[str, np.ndarray], directory: str) -> tuple[str, ...]:
+    """Writes each column as its own .npy file, so it can be memory-mapped back.
+
+    Args:
+        columns: Column name to values.
+        directory: The directory to write the files to.
+
+    Returns:
+        The paths of the written files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, values in columns.items():
+        path = os.path.join(directory, f'{name}.npy')
+        np.save(path, np.ascontiguousarray(values))
+        paths.append(path)
+    return tuple(paths)
+
+
+def _load_columns(directory: str) -> pd.DataFrame:
+    """Memory-maps the training data columns saved by `_save_columns` as a DataFrame.
+
+    The columns are not copied: the DataFrame reads straight from the page cache, so loading is near instant and
+    processes reading the same files share their memory.
+
+    Args:
+        directory: The directory holding the .npy column files.
+
+    Returns:
+        A DataFrame with the 'user', 'item', 'rating' and, if present, 'timestamp' columns.
+    """
+    columns = {}
+    for name in RATING_DTYPES:
+        path = os.path.join(directory, f'{name}.npy')
+        if os.path.exists(path):
+            columns[name] = np.load(path, mmap_mode='r')
+    return pd.DataFrame(columns, copy=False)
+
+
+def _convert_ratings_csv(data_path: str, directory: str) -> None:
+    """Converts a ratings CSV into compact, memory-mappable .npy columns.
+
+    The CSV is parsed in chunks straight into the compact dtypes, so the conversion never holds a full-width copy of
+    the data.
+
+    Args:
+        data_path: Path to the ratings CSV file.
+        directory: The directory to write the columns to.
+    """
+    log.info(f'Converting {data_path} to columnar training data in {directory}')
+    header = pd.read_csv(data_path, nrows=0).columns
+    rename = {column: COLUMN_ALIASES.get(column, column) for column in header}
+    usecols = [column for column in header if rename[column] in RATING_DTYPES]
+    dtypes = {column: RATING_DTYPES[rename[column]] for column in usecols}
+
+    chunks: dict[str, list[np.ndarray]] = {rename[column]: [] for column in usecols}
+    for chunk in pd.read_csv(data_path, usecols=usecols, dtype=dtypes, chunksize=CSV_CHUNK_ROWS):
+        for column in usecols:
+            chunks[rename[column]].append(chunk[column].to_numpy())
+
+    _save_columns({name: np.concatenate(parts) for name, parts in chunks.items()}, directory)
+
+
 def load_training_data(data_path):
     """Loads and standardizes training data from a CSV file.
 
     Renames common column variations (e.g., 'userId', 'movieId')
-    to the script's standard ('user', 'item').
+    to the script's standard ('user', 'item'). The CSV is converted once
+    into compact columnar files in the cache directory, keyed by its
+    content, and memory-mapped on every later load.
 
     Args:
         data_path: Path to the ratings CSV file.
@@ -120,20 +453,15 @@ def load_training_data(data_path):
     Returns:
         A DataFrame with standardized 'user', 'item', and 'rating' columns.
     """
-    ratings_train = pd.read_csv(data_path)
-    col_rename_dict = {}
-    if 'user_id' in ratings_train:
-        col_rename_dict['user_id'] = 'user'
-    elif 'userId' in ratings_train:
-        col_rename_dict['userId'] = 'user'
-    if 'movie_id' in ratings_train:
-        col_rename_dict['movie_id'] = 'item'
-    elif 'movieId' in ratings_train:
-        col_rename_dict['movieId'] = 'item'
-
-    ratings_train = ratings_train.rename(columns=col_rename_dict)
+    digest = _file_digest(data_path)['sha256']
+    directory = os.path.join(cachedir, f'ratings_{digest[:16]}')
+    complete_marker = os.path.join(directory, '.complete')
+    if not os.path.exists(complete_marker):
+        _convert_ratings_csv(data_path, directory)
+        with open(complete_marker, 'w') as f:
+            f.write(data_path)
 
-    return ratings_train
+    return _load_columns(directory)
 
 
 def load_training_data_npz(data_path):
@@ -148,12 +476,9 @@ def load_training_data_npz(data_path):
     Returns:
         A DataFrame with standardized columns and types.
     """
-    model_loaded = np.load(data_path)
-    data = model_loaded['dataset']
-    trainset = pd.DataFrame(data, columns=['user', 'item', 'rating', 'timestamp'])
-    trainset = trainset.astype({'user': int, 'item': int, 'rating': float, 'timestamp': int})
-
-    return trainset
+    data = np.load(data_path)['dataset']
+    columns = {name: data[:, i].astype(dtype) for i, (name, dtype) in enumerate(RATING_DTYPES.items())}
+    return pd.DataFrame(columns, copy=False)
 
 
 def _train_mf_model(training_data: pd.DataFrame, algo: str) -> MFPredictor:
@@ -182,44 +507,49 @@ def _train_mf_model(training_data: pd.DataFrame, algo: str) -> MFPredictor:
     return model
 
 
-def _train_resampled_models(
-    training_data: pd.DataFrame, algo: str, resample_count: int, output_dir: str, alpha: float = 0.5
-):
-    """Trains and serializes multiple models on subsets of the data.
+def _dump_model(model: MFPredictor, output_file: str) -> None:
+    """Serializes a model with binpickle, or pickle when binpickle is unavailable."""
+    if binpickle:
+        binpickle.dump(model, output_file)
+    else:
+        with open(output_file, 'wb') as f:
+            pickle.dump(model, f)
+
 
-    This is used for bootstrapping or robust evaluation.
+def _load_model(model_file: str) -> MFPredictor:
+    """Loads a model written by `_dump_model`."""
+    if binpickle:
+        return binpickle.load(model_file)
+    with open(model_file, 'rb') as f:
+        return pickle.load(f)
+
+
+def _get_resampled_model_path(model_path: str, index: int) -> str:
+    """Gets the file path of the resampled model with the given (1-based) index."""
+    base_file = os.path.join(model_path, f'resampled_model_{index}')
+    return f'{base_file}.bpk' if binpickle else f'{base_file}.pkl'
+
+
+def _train_resampled_model(config: Config, index: int, seed: int, alpha: float = 0.5) -> None:
+    """Trains and serializes one model on a random subset of the discounted training data.
+
+    This is used for bootstrapping or robust evaluation. Each resampled model is its own pipeline stage, so they
+    train in parallel. The sample is seeded so a re-run reproduces it.
 
     Args:
-        training_data: The full training dataset.
-        algo: The algorithm to use ('implicit' or 'biased').
-        resample_count: The number of resampled models to train.
-        output_dir: The directory to save the serialized models.
-        alpha: The fraction of the original data to sample for each model.
+        config: The run configuration object.
+        index: The 1-based index of the resampled model.
+        seed: Seed of the random sample.
+        alpha: The fraction of the original data to sample for the model.
     """
+    training_data = _load_columns(_work_file(config, 'discounted_ratings'))
     sample_size = int(training_data.shape[0] * alpha)
-    log.info(f'Training {resample_count} resampled models')
-    start = time.time()
-
-    for i in range(resample_count):
-        log.info(f'Training resampled model {i + 1}')
-
-        sample = training_data.sample(n=sample_size, replace=False)
-        model = _train_mf_model(sample, algo)
-        log.info(
-            f'Serializing the trained model {i + 1} of {resample_count} \
-            to disk.'
-        )
-        output_filename = f'{output_dir}/resampled_model_{i + 1}'
-        output_file = f'{output_filename}.bpk' if binpickle else f'{output_filename}.pkl'
-        if binpickle:
-            binpickle.dump(model, output_file)
-        else:
-            with open(output_file, 'wb') as f:
-                pickle.dump(model, f)
+    log.info(f'Training resampled model {index} of {config.resample_count}')
 
-    end = time.time() - start
-    log.info('Resampled models trained.')
-    log.info(f'Time spent: {end:.2f}')
+    sample = training_data.sample(n=sample_size, replace=False, random_state=seed)
+    model = _train_mf_model(sample, config.algo)
+    log.info(f'Serializing the trained model {index} of {config.resample_count} to disk.')
+    _dump_model(model, _get_resampled_model_path(config.model_path, index))
 
 
 def _pre_aggregate_user_history(training_data: pd.DataFrame, output_path: str) -> None:
@@ -340,7 +670,7 @@ def _get_exact_mf_model(model: MFPredictor) -> Optional[Union[als.BiasedMF, als.
 
 
 def _compute_ave_item_scores(
-    model: MFPredictor, training_data: pd.DataFrame, item_popularity: pd.DataFrame, alpha: float = 0.2
+    model: MFPredictor, training_data: pd.DataFrame | None, item_popularity: pd.DataFrame, alpha: float = 0.2
 ):
     """Computes model-predicted average scores and discounted scores for all items.
 
@@ -350,6 +680,7 @@ def _compute_ave_item_scores(
 
     Args:
         model: The trained LensKit model (must be BiasedMF or ImplicitMF).
+        training_data: Unused; kept for call compatibility.
         item_popularity: DataFrame containing item statistics, specifically
             the 'count' column, for calculating the discount.
         alpha: The weighting factor for the popularity penalty. Defaults to 0.2.
@@ -425,12 +756,25 @@ def _compute_ave_item_scores(
     return ave_scores_df[['item', 'ave_score', 'ave_discounted_score']]
 
 
-@memory.cache
+def _item_codes(items: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Maps item ids to dense codes.
+
+    Args:
+        items: The item id of every rating.
+
+    Returns:
+        A tuple of (item_ids, codes): the sorted distinct item ids, and each rating's position in them.
+    """
+    item_ids, codes = np.unique(items, return_inverse=True)
+    return item_ids, codes.astype(np.int32)
+
+
 def _compute_observed_item_mean(training_data: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     """Computes observed item rating statistics from the training data.
 
     Calculates the mean rating, rating count, and popularity/quality
-    ranks for every item.
+    ranks for every item. The per-item sums are computed with `np.bincount`
+    over dense item codes instead of a groupby over the full frame.
 
     Args:
         training_data: The training data.
@@ -441,9 +785,11 @@ def _compute_observed_item_mean(training_data: pd.DataFrame) -> tuple[pd.DataFra
             - item_popularity_df: DataFrame with 'item', 'count',
             'rank_popular', and 'rank_quality'.
     """
-    item_stats = training_data.groupby('item')['rating'].agg(['mean', 'count'])
-    item_stats = item_stats.reset_index()
+    item_ids, codes = _item_codes(training_data['item'].to_numpy())
+    counts = np.bincount(codes, minlength=len(item_ids))
+    sums = np.bincount(codes, weights=training_data['rating'].to_numpy(), minlength=len(item_ids))
 
+    item_stats = pd.DataFrame({'item': item_ids, 'mean': sums / counts, 'count': counts})
     item_stats['rank_popular'] = item_stats['count'].rank(method='min', ascending=False).astype(int)
     item_stats['rank_quality'] = item_stats['mean'].rank(method='min', ascending=False).astype(int)
 
@@ -482,14 +828,15 @@ def _create_annoy_index(user_factors: np.ndarray, user_index: pd.Index, output_p
     log.info(f'Annoy index built and saved to {output_path}')
 
 
-@memory.cache
 def _discount_popular_item_ratings(
     input_data: pd.DataFrame, items_popularity: pd.DataFrame, bias_factor: float = 0.4
 ) -> pd.DataFrame:
     """Discounts ratings for popular items to reduce popularity bias.
 
     Applies a penalty to ratings based on the item's popularity rank,
-    making very popular items' ratings slightly lower.
+    making very popular items' ratings slightly lower. Each rating's item is
+    looked up in the (sorted) popularity table with `np.searchsorted`, so no
+    full-size merge is materialized; only the discounted rating column is new.
 
     Args:
         input_data: The training data with original 'rating' column.
@@ -500,71 +847,20 @@ def _discount_popular_item_ratings(
         A DataFrame with the 'rating' column replaced by the
         'discounted_rating'.
     """
-    rpopularity = pd.merge(input_data, items_popularity, how='left', on='item')
-    rpopularity['discounted_rating'] = rpopularity['rating'] * (1 - bias_factor / (2 * rpopularity['rank_popular']))
-    rtrain = rpopularity[['user', 'item', 'discounted_rating', 'timestamp']]
-    rtrain = rtrain.rename({'discounted_rating': 'rating'}, axis=1)
-
-    return rtrain
-
-
-def _get_model(config: Config, train_data: pd.DataFrame) -> MFPredictor:
-    """Retrieves a pre-trained model or trains a new one.
-
-    Loads a model from disk if it exists and resampling is not requested.
-    Otherwise, it trains a new model, serializes it, and returns it.
-
-    Args:
-        config: The run configuration object.
-        train_data: The (potentially filtered) training data.
-
-    Returns:
-        The loaded or trained MFPredictor model, or None on failure.
-    """
-    model_file = _get_model_path(config.model_path)
-    model = None
-
-    if os.path.exists(model_file) and not config.resample_count > 0:
-        log.info(f'Existing model found: {model_file}. Loading trained model...')
-        try:
-            if binpickle:
-                model = binpickle.load(model_file)
-            else:
-                with open(model_file, 'rb') as f:
-                    model = pickle.load(f)
-            log.info('Model loaded successfully.')
-        except Exception as e:
-            log.warning(f'Error loading model ({e}). Retraining will proceed.')
-            model = None
-
-    if model is None:
-        log.info('Model not found or load failed. Initiating full training...')
-
-        # train_data = load_training_data(config.data_path)
-        obs_ave_scores_df, items_popularity_df = _compute_observed_item_mean(train_data)
-        discounted_train_data = _discount_popular_item_ratings(train_data, items_popularity_df)
-
-        log.info(f'Training {config.algo} MF models')
-        start = time.time()
-
-        model = _train_mf_model(discounted_train_data, config.algo)
-
-        end = time.time() - start
-        log.info('MF model trained.')
-        log.info(f'Time spent: {end:.2f}s')
-
-        # Serialize the newly trained model (only if trained)
-        log.info('Serializing the trained model to disk.')
-        if not os.path.exists(config.model_path):
-            os.makedirs(config.model_path)
-
-        if binpickle:
-            binpickle.dump(model, model_file)
-        else:
-            with open(model_file, 'wb') as f:
-                pickle.dump(model, f)
-
-    return model
+    popularity = items_popularity.sort_values('item')
+    item_ids = popularity['item'].to_numpy()
+    discount = (1 - bias_factor / (2 * popularity['rank_popular'].to_numpy())).astype(np.float32)
+
+    items = input_data['item'].to_numpy()
+    positions = np.searchsorted(item_ids, items).clip(max=len(item_ids) - 1)
+    factors = np.where(item_ids[positions] == items, discount[positions], np.float32(np.nan))
+    discounted = input_data['rating'].to_numpy(dtype=np.float32) * factors
+
+    columns = {name: input_data[name].to_numpy() for name in ('user', 'item', 'timestamp') if name in input_data}
+    columns['rating'] = discounted
+    return pd.DataFrame(columns, copy=False)[
+        [name for name in ('user', 'item', 'rating', 'timestamp') if name in columns]
+    ]
 
 
 def _apply_item_filter(train_data: pd.DataFrame, filter_list_path: Optional[str]) -> pd.DataFrame:
@@ -619,94 +915,394 @@ def _apply_item_filter(train_data: pd.DataFrame, filter_list_path: Optional[str]
     return train_data
 
 
-def _run_post_processing_tasks(
-    config: Config,
-    model: MFPredictor,
-    discounted_train_data: pd.DataFrame,
-    obs_ave_scores_df: pd.DataFrame,
-    items_popularity_df: pd.DataFrame,
-):
-    """Orchestrates all optional post-training analysis and artifact generation.
+def _work_file(config: Config, name: str) -> str:
+    """Gets the path of an intermediate file shared between pipeline stages."""
+    return os.path.join(config.model_path, PIPELINE_DIR, name)
+
 
-    This function checks the config flags and runs the corresponding
-    helper functions to save popularity stats, train resampled models,
-    compute average scores, build Annoy indexes, and create lookup tables.
+def _prepare_training_data(config: Config) -> None:
+    """Loads, filters and discounts the training data, and writes it for the downstream stages.
 
     Args:
         config: The run configuration object.
-        model: The main trained model.
-        discounted_train_data: The bias-discounted training data, used for
-            resampling and user history lookups.
-        obs_ave_scores_df: DataFrame of observed average scores, to be saved.
-        items_popularity_df: DataFrame of item popularity stats, to be saved.
+
+    Raises:
+        ValueError: If no interactions are left after filtering.
     """
-    if config.item_popularity:
-        log.info('Saving the item popularity as a csv file')
-        items_popularity_df.to_csv(f'{config.model_path}/item_popularity.csv', index=False)
+    train_data = load_training_data(config.data_path)
+    train_data = _apply_item_filter(train_data, config.filter_list)
+    if train_data.empty:
+        raise ValueError('Filtering resulted in 0 interactions or data is empty.')
 
-    if config.resample_count > 0:
-        _train_resampled_models(discounted_train_data, config.algo, config.resample_count, config.model_path)
+    obs_ave_scores_df, items_popularity_df = _compute_observed_item_mean(train_data)
+    discounted_train_data = _discount_popular_item_ratings(train_data, items_popularity_df)
 
-    if config.ave_item_score:
-        log.info('Computing the average model item scores')
-        scores_df = _compute_ave_item_scores(model, discounted_train_data, items_popularity_df)
-        if scores_df is not None:
-            log.info('Saving the average model item scores as a csv file')
-            scores_df.to_csv(f'{config.model_path}/averaged_item_score.csv', index=False)
+    os.makedirs(os.path.join(config.model_path, PIPELINE_DIR), exist_ok=True)
+    _save_columns(
+        {name: discounted_train_data[name].to_numpy() for name in discounted_train_data.columns},
+        _work_file(config, 'discounted_ratings'),
+    )
+    items_popularity_df.to_parquet(_work_file(config, 'item_popularity.parquet'), index=False)
+    obs_ave_scores_df.to_parquet(_work_file(config, 'obs_ave_item_score.parquet'), index=False)
 
-        log.info('Saving the average observed item scores as a csv file')
-        obs_ave_scores_df.to_csv(f'{config.model_path}/obs_ave_item_score.csv', index=False)
 
-    if config.cluster_index:
-        log.info('Building and saving the Annoy index')
-        model_instance = _get_exact_mf_model(model)
-        if model_instance is not None:
-            user_mat = model_instance.user_features_
-            user_index = model_instance.user_index_
-            if user_mat is not None and user_index is not None:
-                _create_annoy_index(user_mat, user_index, f'{config.model_path}/annoy_index')
-            else:
-                log.warning('Could not build Annoy index: user features or index not found.')
-        else:
-            log.warning('Could not build Annoy index: model instance not valid.')
+def _train_main_model(config: Config) -> None:
+    """Trains the main model on the discounted training data and serializes it."""
+    discounted_train_data = _load_columns(_work_file(config, 'discounted_ratings'))
 
-    if config.ratings_index:
-        _pre_aggregate_user_history(discounted_train_data, f'{config.model_path}/user_history_lookup.parquet')
+    log.info(f'Training {config.algo} MF models')
+    start = time.time()
+    model = _train_mf_model(discounted_train_data, config.algo)
+    log.info(f'MF model trained. Time spent: {time.time() - start:.2f}s')
+
+    log.info('Serializing the trained model to disk.')
+    _dump_model(model, _get_model_path(config.model_path))
+
+
+def _save_item_popularity(config: Config) -> None:
+    """Saves the observed item popularity statistics as a csv file."""
+    log.info('Saving the item popularity as a csv file')
+    items_popularity_df = pd.read_parquet(_work_file(config, 'item_popularity.parquet'))
+    items_popularity_df.to_csv(f'{config.model_path}/item_popularity.csv', index=False)
+
+
+def _save_ave_item_scores(config: Config) -> None:
+    """Saves the model-predicted and the observed average item scores as csv files.
+
+    Raises:
+        ValueError: If the model has no user features to average.
+    """
+    log.info('Computing the average model item scores')
+    model = _load_model(_get_model_path(config.model_path))
+    items_popularity_df = pd.read_parquet(_work_file(config, 'item_popularity.parquet'))
+    scores_df = _compute_ave_item_scores(model, None, items_popularity_df)
+    if scores_df is None or scores_df.empty:
+        raise ValueError('Could not compute the average model item scores.')
+    log.info('Saving the average model item scores as a csv file')
+    scores_df.to_csv(f'{config.model_path}/averaged_item_score.csv', index=False)
+
+    log.info('Saving the average observed item scores as a csv file')
+    obs_ave_scores_df = pd.read_parquet(_work_file(config, 'obs_ave_item_score.parquet'))
+    obs_ave_scores_df.to_csv(f'{config.model_path}/obs_ave_item_score.csv', index=False)
+
+
+def _build_annoy_index(config: Config) -> None:
+    """Builds and saves the Annoy index over the main model's user factors.
+
+    Raises:
+        ValueError: If the model has no user features or user index.
+    """
+    log.info('Building and saving the Annoy index')
+    model_instance = _get_exact_mf_model(_load_model(_get_model_path(config.model_path)))
+    if model_instance is None:
+        raise ValueError('Could not build Annoy index: model instance not valid.')
+    user_mat = model_instance.user_features_
+    user_index = model_instance.user_index_
+    if user_mat is None or user_index is None:
+        raise ValueError('Could not build Annoy index: user features or index not found.')
+    _create_annoy_index(user_mat, user_index, f'{config.model_path}/annoy_index')
 
+
+def _build_user_history(config: Config) -> None:
+    """Aggregates the discounted training data into the user history lookup table."""
+    discounted_train_data = _load_columns(_work_file(config, 'discounted_ratings'))
+    _pre_aggregate_user_history(discounted_train_data, f'{config.model_path}/user_history_lookup.parquet')
+
+
+def _build_emotion_lookup(config: Config) -> None:
+    """Builds the item emotion lookup table from the emotion data file."""
     if config.emotion_index_path:
         _create_item_emotion_lookup(config.emotion_index_path, f'{config.model_path}/item_emotion_lookup.parquet')
 
 
-def _main(config: Config):
-    """Main execution function for the training script.
+def _aligned(values: pd.Series, ids: np.ndarray, dtype: Any, fill_value: Any) -> np.ndarray:
+    """Reorders a per-id series to follow `ids`, filling ids it does not cover."""
+    return values.reindex(ids, fill_value=fill_value).to_numpy(dtype=dtype)
+
 
-    Orchestrates the entire workflow:
-    1. Load and filter data.
-    2. Get or train the main model.
-    3. Compute core statistics from the data.
-    4. Run all optional post-processing tasks.
+def _bundle_arrays(config: Config) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+    """Collects the serving arrays of the main model and the training data.
+
+    Items and users are sorted by id, so a server can find an id's row with a binary search. Every per-item array
+    follows `item_ids`; the factors and the CSR history rows follow `user_ids`.
 
     Args:
-        config: The Pydantic model containing all runtime configuration.
+        config: The run configuration object.
+
+    Returns:
+        A tuple of (arrays, metadata) for the bundle manifest.
+
+    Raises:
+        ValueError: If the model type is unknown.
     """
-    train_data = load_training_data(config.data_path)
-    train_data = _apply_item_filter(train_data, config.filter_list)
+    model = _load_model(_get_model_path(config.model_path))
+    model_instance = _get_exact_mf_model(model)
+    if model_instance is None:
+        raise ValueError('Cannot export a serving bundle: model type unknown.')
+
+    item_index = model_instance.item_index_
+    item_order = np.argsort(item_index.to_numpy())
+    item_ids = item_index.to_numpy()[item_order].astype(np.int32)
+    arrays: dict[str, np.ndarray] = {
+        'item_ids': item_ids,
+        'item_factors': np.asarray(model_instance.item_features_, dtype=np.float32)[item_order],
+    }
+
+    user_index = model_instance.user_index_
+    user_order = np.argsort(user_index.to_numpy())
+    user_ids = user_index.to_numpy()[user_order].astype(np.int32)
+    arrays['user_ids'] = user_ids
+    if model_instance.user_features_ is not None:
+        arrays['user_factors'] = np.asarray(model_instance.user_features_, dtype=np.float32)[user_order]
+
+    metadata: dict[str, Any] = {
+        'algo': config.algo,
+        'model_class': type(model_instance).__name__,
+        'n_items': len(item_ids),
+        'n_users': len(user_ids),
+        'n_features': int(arrays['item_factors'].shape[1]),
+        'params': {
+            name: getattr(model_instance, name)
+            for name in ('reg', 'weight', 'damping', 'use_ratings')
+            if isinstance(getattr(model_instance, name, None), (bool, int, float))
+        },
+        'global_bias': None,
+    }
 
-    if train_data.empty:
-        log.error('Filtering resulted in 0 interactions or data is empty. Aborting.')
-        return
+    bias = getattr(model_instance, 'bias', None)
+    if bias is not None:
+        metadata['global_bias'] = float(bias.mean_)
+        if bias.item_offsets_ is not None:
+            arrays['item_bias'] = _aligned(bias.item_offsets_, item_ids, np.float32, 0)
+        if bias.user_offsets_ is not None:
+            arrays['user_bias'] = _aligned(bias.user_offsets_, user_ids, np.float32, 0)
+
+    # User histories as CSR rows: the ratings of user_ids[u] are history_*[indptr[u]:indptr[u + 1]].
+    ratings = _load_columns(_work_file(config, 'discounted_ratings'))
+    rating_users = ratings['user'].to_numpy()
+    rows = np.searchsorted(user_ids, rating_users).clip(max=max(len(user_ids) - 1, 0))
+    known = user_ids[rows] == rating_users if len(user_ids) else np.zeros(len(rows), dtype=bool)
+    rows = rows[known]
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(user_ids)), out=indptr[1:])
+    arrays['history_indptr'] = indptr
+    arrays['history_items'] = ratings['item'].to_numpy()[known][order].astype(np.int32)
+    arrays['history_ratings'] = ratings['rating'].to_numpy()[known][order].astype(np.float32)
+
+    popularity = pd.read_parquet(_work_file(config, 'item_popularity.parquet')).set_index('item')
+    arrays['item_count'] = _aligned(popularity['count'], item_ids, np.int32, 0)
+    arrays['item_rank_popular'] = _aligned(popularity['rank_popular'], item_ids, np.int32, 0)
+    obs_ave_scores = pd.read_parquet(_work_file(config, 'obs_ave_item_score.parquet')).set_index('item')
+    arrays['item_obs_ave_score'] = _aligned(obs_ave_scores['ave_score'], item_ids, np.float32, np.nan)
+
+    ave_scores = _compute_ave_item_scores(model, None, popularity.reset_index())
+    if ave_scores is not None and not ave_scores.empty:
+        ave_scores = ave_scores.set_index('item')
+        arrays['item_ave_score'] = _aligned(ave_scores['ave_score'], item_ids, np.float32, np.nan)
+        arrays['item_ave_discounted_score'] = _aligned(ave_scores['ave_discounted_score'], item_ids, np.float32, np.nan)
+
+    return arrays, metadata
+
+
+def _export_serving_bundle(config: Config) -> None:
+    """Writes the main model and its lookup tables as a versioned bundle of memory-mappable arrays.
+
+    Every array is a raw .npy file, so serving processes can `np.load(..., mmap_mode='r')` them and share a single
+    page-cached copy. The bundle directory is named after the content hash of its arrays and is moved into place
+    atomically; `bundle/LATEST` names the newest version.
 
-    model = _get_model(config, train_data)
-    if model is None:
-        log.error('ERROR: Could not load or train model. Skipping post-processing.')
-        return
+    Args:
+        config: The run configuration object.
+    """
+    arrays, metadata = _bundle_arrays(config)
+    bundle_root = os.path.join(config.model_path, BUNDLE_DIR)
+    staging_dir = os.path.join(bundle_root, f'.staging-{os.getpid()}')
+    os.makedirs(staging_dir, exist_ok=True)
+
+    specs = {}
+    for name, path in zip(arrays, _save_columns(arrays, staging_dir), strict=True):
+        specs[name] = {
+            'file': os.path.basename(path),
+            'dtype': str(arrays[name].dtype),
+            'shape': list(arrays[name].shape),
+            'sha256': _file_digest(path)['sha256'],
+        }
+    version = hashlib.sha256(json.dumps(specs, sort_keys=True).encode()).hexdigest()[:16]
+
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'version': version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        **metadata,
+        'arrays': specs,
+    }
+    with open(os.path.join(staging_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    version_dir = os.path.join(bundle_root, version)
+    if os.path.exists(version_dir):
+        shutil.rmtree(staging_dir)
+    else:
+        os.replace(staging_dir, version_dir)
 
-    obs_ave_scores_df, items_popularity_df = _compute_observed_item_mean(train_data)
-    discounted_train_data = _discount_popular_item_ratings(train_data, items_popularity_df)
+    latest_tmp = os.path.join(bundle_root, 'LATEST.tmp')
+    with open(latest_tmp, 'w') as f:
+        f.write(version)
+    os.replace(latest_tmp, os.path.join(bundle_root, 'LATEST'))
+    log.info(f'Serving bundle {version} written to {version_dir}')
 
-    _run_post_processing_tasks(config, model, discounted_train_data, obs_ave_scores_df, items_popularity_df)
 
-    log.info('Done')
+def _build_stages(config: Config) -> list[Stage]:
+    """Lays out the training pipeline requested by the configuration.
+
+    The data preparation stage feeds every other stage. The main model, the resampled models, the popularity
+    statistics and the user history only depend on it, and the average scores and Annoy index only on the main
+    model, so all of them can run side by side.
+
+    Args:
+        config: The run configuration object.
+
+    Returns:
+        The stages to run.
+    """
+    model_path = config.model_path
+    model_file = _get_model_path(model_path)
+    prepared = (
+        *(os.path.join(_work_file(config, 'discounted_ratings'), f'{name}.npy') for name in RATING_DTYPES),
+        _work_file(config, 'item_popularity.parquet'),
+        _work_file(config, 'obs_ave_item_score.parquet'),
+    )
+
+    stages = [
+        Stage(
+            name='prepare',
+            run=_prepare_training_data,
+            args=(config,),
+            inputs=tuple(path for path in (config.data_path, config.filter_list) if path),
+            outputs=prepared,
+        ),
+        Stage(
+            name='model',
+            run=_train_main_model,
+            args=(config,),
+            deps=('prepare',),
+            outputs=(model_file,),
+            params={'algo': config.algo},
+        ),
+    ]
+
+    for index in range(1, config.resample_count + 1):
+        seed = config.seed + index
+        stages.append(
+            Stage(
+                name=f'resample_{index}',
+                run=_train_resampled_model,
+                args=(config, index, seed),
+                deps=('prepare',),
+                outputs=(_get_resampled_model_path(model_path, index),),
+                params={'algo': config.algo, 'seed': seed, 'alpha': 0.5},
+            )
+        )
+
+    if config.item_popularity:
+        stages.append(
+            Stage(
+                name='item_popularity',
+                run=_save_item_popularity,
+                args=(config,),
+                deps=('prepare',),
+                outputs=(f'{model_path}/item_popularity.csv',),
+            )
+        )
+
+    if config.ave_item_score:
+        stages.append(
+            Stage(
+                name='ave_item_score',
+                run=_save_ave_item_scores,
+                args=(config,),
+                deps=('prepare', 'model'),
+                outputs=(f'{model_path}/averaged_item_score.csv', f'{model_path}/obs_ave_item_score.csv'),
+            )
+        )
+
+    if config.cluster_index:
+        stages.append(
+            Stage(
+                name='cluster_index',
+                run=_build_annoy_index,
+                args=(config,),
+                deps=('model',),
+                outputs=(f'{model_path}/annoy_index', f'{model_path}/annoy_index_map.csv'),
+            )
+        )
+
+    if config.ratings_index:
+        stages.append(
+            Stage(
+                name='ratings_index',
+                run=_build_user_history,
+                args=(config,),
+                deps=('prepare',),
+                outputs=(f'{model_path}/user_history_lookup.parquet',),
+            )
+        )
+
+    if config.emotion_index_path:
+        stages.append(
+            Stage(
+                name='emotion_index',
+                run=_build_emotion_lookup,
+                args=(config,),
+                inputs=(config.emotion_index_path,),
+                outputs=(f'{model_path}/item_emotion_lookup.parquet',),
+            )
+        )
+
+    if config.export_bundle:
+        stages.append(
+            Stage(
+                name='export_bundle',
+                run=_export_serving_bundle,
+                args=(config,),
+                deps=('prepare', 'model'),
+                outputs=(os.path.join(model_path, BUNDLE_DIR, 'LATEST'),),
+                params={'format_version': BUNDLE_FORMAT_VERSION},
+            )
+        )
+
+    return stages
+
+
+def _main(config: Config):
+    """Main execution function for the training script.
+
+    Builds the training pipeline and runs it:
+    1. Load, filter and discount the data.
+    2. Train the main model and the resampled models in parallel.
+    3. Generate the requested artifacts as soon as their inputs are ready.
+
+    Stages whose inputs are unchanged since the last run are skipped, and a failed run resumes from the stages that
+    completed.
+
+    Args:
+        config: The Pydantic model containing all runtime configuration.
+
+    Raises:
+        PipelineError: If any stage did not complete.
+    """
+    pipeline = Pipeline(
+        _build_stages(config),
+        os.path.join(config.model_path, MANIFEST_FILE),
+        workers=config.workers,
+        threads_per_worker=config.threads_per_worker,
+    )
+    log.info(f'Running {len(pipeline.stages)} stages on {pipeline.workers} workers.')
+    status = pipeline.run(force=config.force)
+
+    ran = sorted(name for name, outcome in status.items() if outcome == 'ran')
+    log.info(f'Done. Ran {len(ran)} stages, skipped {len(status) - len(ran)} up-to-date stages.')
 
 
 if __name__ == '__main__':
@@ -794,6 +1390,18 @@ if __name__ == '__main__':
         ),
     )
 
+    parser.add_argument(
+        '--export_bundle',
+        required=False,
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help=(
+            'If set, exports the main model for serving as a versioned bundle of memory-mappable .npy arrays '
+            '(float32 factors, id indexes, CSR user histories and item score/popularity columns) with a manifest, '
+            'under <model_path>/bundle/.'
+        ),
+    )
+
     parser.add_argument(
         '-f',
         '--filter_list',
@@ -832,6 +1440,41 @@ if __name__ == '__main__':
             'and serialized individually.'
         ),
     )
+
+    # --- Pipeline Execution ---
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        required=False,
+        default=None,
+        help=(
+            'Number of worker processes running pipeline stages in parallel. Defaults to the CPU count. '
+            'Each concurrently training model holds its own copy of the training data, '
+            'so lower this if memory is tight.'
+        ),
+    )
+    parser.add_argument(
+        '--threads_per_worker',
+        type=int,
+        required=False,
+        default=None,
+        help='Number of threads each worker may use for model training. Defaults to an even share of the CPUs.',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        required=False,
+        default=42,
+        help='Base seed of the resampled training subsets, so re-runs reproduce them.',
+    )
+    parser.add_argument(
+        '--force',
+        required=False,
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='If set, re-runs every stage, even those whose inputs are unchanged since the last run.',
+    )
     args = parser.parse_args()
 
     setup_logging(args.model_path)
@@ -844,12 +1487,21 @@ if __name__ == '__main__':
         ave_item_score=args.ave_item_score,
         cluster_index=args.cluster_index,
         ratings_index=args.ratings_index,
+        export_bundle=args.export_bundle,
         resample_count=args.resample_count,
         filter_list=args.filter_list,
         emotion_index_path=args.emotion_index,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        seed=args.seed,
+        force=args.force,
     )
     log.info('Starting model training script.')
-    _main(run_config)
+    try:
+        _main(run_config)
+    except PipelineError as e:
+        log.error(str(e))
+        raise SystemExit(1) from e
     log.info('Script execution finished.')
 
     # Defaults for the current RSSA
@@ -11,6 +11,7 @@ ADMIN_CONSTRUCT_ITEMS_TAG = 'Construct Items [Admin]'
 ADMIN_CONSTRUCT_SCALES_TAG = 'Construct Scales [Admin]'
 ADMIN_SCALE_LEVELS_TAG = 'Scale Levels [Admin]'
 ADMIN_SURVEY_PAGES_TAG = 'Survey Page Content [Admin]'
+ADMIN_MODELS_TAG = 'Recommendation Models [Admin]'
 
 admin_tags_metadata = [
     {
@@ -10,6 +10,7 @@ from rssa_api.apps.admin.routers.study_components import study_participants
 
 from .docs import admin_tags_metadata
 from .routers import local_users as local_admin_users
+from .routers import models as model_admin
 from .routers import movies as movie_admin
 from .routers import shuffled_movie_lists as shuffled_lists
 from .routers import users as admin_users
@@ -60,6 +61,7 @@ api.include_router(admin_users.router)
 api.include_router(local_admin_users.router)
 api.include_router(movie_admin.router)
 api.include_router(shuffled_lists.router)
+api.include_router(model_admin.router)
 
 # Study participants
 api.include_router(study_participants.router)
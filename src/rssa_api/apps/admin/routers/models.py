@@ -0,0 +1,112 @@
+"""Router for managing the recommendation models loaded by the API."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from rssa_api.apps.admin.docs import ADMIN_MODELS_TAG
+from rssa_api.auth.security import get_auth0_authenticated_user, require_permissions
+from rssa_api.data.schemas.recommendations import RegistryModelSchema
+from rssa_api.services.recommendation.registry import REGISTRY, LoadedModel, ModelRegistry
+from rssa_api.services.recommendation.resilience import ResilientStrategy
+
+router = APIRouter(
+    prefix='/models',
+    dependencies=[
+        Depends(get_auth0_authenticated_user),
+        Depends(require_permissions('admin:all')),
+    ],
+    tags=[ADMIN_MODELS_TAG],
+)
+
+
+def _model_schema(registry: ModelRegistry, current: LoadedModel, previous: LoadedModel | None) -> RegistryModelSchema:
+    resilience = {}
+    if isinstance(current.strategy, ResilientStrategy):
+        strategy = current.strategy
+        resilience = {
+            'deadline_seconds': strategy.deadline_seconds,
+            'circuit_state': strategy.breaker.state,
+            'fallback': strategy.fallback.name if strategy.fallback else None,
+            'hedged_requests': strategy.hedged_requests,
+            'fallback_responses': strategy.fallback_responses,
+        }
+    return RegistryModelSchema(
+        key=current.key,
+        type=current.spec['type'],
+        version=current.version,
+        loaded_at=current.loaded_at,
+        load_seconds=current.load_seconds,
+        nbytes=current.nbytes,
+        previous_version=previous.version if previous else None,
+        previous_nbytes=previous.nbytes if previous else 0,
+        pinned=registry.is_pinned(current.key),
+        **resilience,
+    )
+
+
+def _registry_models(registry: ModelRegistry) -> list[RegistryModelSchema]:
+    return [_model_schema(registry, current, previous) for current, previous in registry.models()]
+
+
+@router.get(
+    '/',
+    response_model=list[RegistryModelSchema],
+    summary='Get the loaded recommendation models.',
+    description="""
+    List every registry entry with the artifact version it serves, its memory footprint, its load time, the
+    previous version kept loaded for rollback, and the state of its deadline, circuit breaker and fallback.
+    """,
+)
+async def get_models() -> list[RegistryModelSchema]:
+    """Get the loaded recommendation models.
+
+    Returns:
+        The registry entries.
+    """
+    return _registry_models(REGISTRY)
+
+
+@router.post(
+    '/reload',
+    response_model=list[RegistryModelSchema],
+    summary='Reload the recommendation models.',
+    description="""
+    Re-read the registry config and artifact versions, load whatever changed in the background and swap it in.
+    Requests in flight finish on the model they started with. Rolled back entries are reloaded as well.
+    """,
+)
+async def reload_models() -> list[RegistryModelSchema]:
+    """Reload the recommendation models.
+
+    Returns:
+        The registry entries after the reload.
+    """
+    await REGISTRY.reload(unpin=True)
+    return _registry_models(REGISTRY)
+
+
+@router.post(
+    '/{key}/rollback',
+    response_model=RegistryModelSchema,
+    summary='Roll back a recommendation model.',
+    description="""
+    Swap a registry entry back to the previous version it served. The entry stays on that version until the next
+    explicit reload.
+    """,
+)
+async def rollback_model(key: str) -> RegistryModelSchema:
+    """Roll back a recommendation model.
+
+    Args:
+        key: The registry key.
+
+    Returns:
+        The registry entry after the rollback.
+    """
+    try:
+        REGISTRY.rollback(key)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Model {key} is not registered.') from e
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+    current, previous = next((current, previous) for current, previous in REGISTRY.models() if current.key == key)
+    return _model_schema(REGISTRY, current, previous)
@@ -2,7 +2,6 @@
 
 import math
 import uuid
-from functools import reduce
 from typing import Annotated
 
 import structlog
@@ -28,6 +27,7 @@ from rssa_api.data.schemas.study_components import (
     ApiKeyBase,
     ApiKeyCreate,
     ApiKeyRead,
+    ConditionCountSchema,
     StudyAudit,
     StudyAuthorizationCreate,
     StudyAuthorizationRead,
@@ -36,6 +36,7 @@ from rssa_api.data.schemas.study_components import (
     StudyConditionRead,
     StudyCreate,
     StudyRead,
+    StudyStats,
     StudyStepBase,
     StudyStepCreate,
 )
@@ -156,6 +157,7 @@ async def get_study_detail(
     study_id: uuid.UUID,
     study_service: StudyServiceDep,
     study_condition_service: StudyConditionServiceDep,
+    participant_service: StudyParticipantServiceDep,
     user: Annotated[
         Auth0UserSchema,
         Depends(require_permissions('read:studies', 'admin:all', 'read:authorized_studies')),
@@ -177,6 +179,7 @@ async def get_study_detail(
         study_id: The UUID of the study.
         study_service: The study service.
         study_condition_service: The condition service.
+        participant_service: The participant service, holding the study statistics.
         user: The authenticated user.
         current_user: The current user details.
 
@@ -194,15 +197,66 @@ async def get_study_detail(
         if not has_access:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Study not found.')
 
-    grouped_count = await study_condition_service.get_participant_count_by_condition(study_id)
-    total = reduce(lambda acc, row: acc + row.participant_count, grouped_count, 0)
+    stats = await participant_service.get_study_stats(study_id)
+    conditions = await study_condition_service.get_all(StudyConditionRead, owner_id=study_id)
+    grouped_count = [
+        ConditionCountSchema(
+            study_condition_id=condition.id,
+            study_condition_name=condition.name,
+            participant_count=stats.verified_participants_by_condition.get(condition.id, 0),
+        )
+        for condition in conditions
+        if condition.enabled
+    ]
     study_detail = StudyAudit(**study.model_dump())
-    study_detail.total_participants = total
+    study_detail.total_participants = sum(row.participant_count for row in grouped_count)
     study_detail.participants_by_condition = grouped_count
 
     return study_detail
 
 
+@router.get(
+    '/{study_id}/stats',
+    response_model=StudyStats,
+    summary='Get participant statistics of a study.',
+    description="""
+    Get participant totals of a study broken down by condition, status and day of enrollment.
+
+    The statistics are maintained incrementally as participants enroll and progress, so this is cheap to poll
+    regardless of how many participants the study has.
+    """,
+)
+async def get_study_stats(
+    study_id: uuid.UUID,
+    study_service: StudyServiceDep,
+    participant_service: StudyParticipantServiceDep,
+    user: Annotated[
+        Auth0UserSchema,
+        Depends(require_permissions('read:studies', 'admin:all', 'read:authorized_studies')),
+    ],
+    current_user: Annotated[UserSchema, Depends(get_current_user)],
+) -> StudyStats:
+    """Get participant statistics of a study.
+
+    Args:
+        study_id: The UUID of the study.
+        study_service: The study service.
+        participant_service: The participant service, holding the study statistics.
+        user: The authenticated user.
+        current_user: The current user details.
+
+    Returns:
+        The study statistics.
+    """
+    is_super_admin = 'admin:all' in user.permissions
+    if not is_super_admin:
+        has_access = await study_service.check_study_access(study_id, current_user.id, min_role='viewer')
+        if not has_access:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Study not found.')
+
+    return await participant_service.get_study_stats(study_id)
+
+
 @router.post(
     '/',
     status_code=status.HTTP_201_CREATED,
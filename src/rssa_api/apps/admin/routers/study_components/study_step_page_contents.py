@@ -5,16 +5,12 @@ import uuid
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from rssa_storage.rssadb.models.study_components import StudyStepPage
 
 from rssa_api.auth.security import get_auth0_authenticated_user, get_current_user, require_permissions
 from rssa_api.data.schemas import Auth0UserSchema, UserSchema
 from rssa_api.data.schemas.study_components import StudyStepPageContentUpdate
-from rssa_api.data.services.dependencies import (
-    StudyServiceDep,
-    StudyStepPageContentServiceDep,
-    StudyStepPageServiceDep,
-    StudyStepServiceDep,
-)
+from rssa_api.data.services.dependencies import StudyServiceDep, StudyStepPageContentServiceDep
 
 from ...docs import ADMIN_SURVEY_PAGES_TAG
 
@@ -33,8 +29,6 @@ router = APIRouter(
 async def remove_survey_construct_from_page(
     content_id: uuid.UUID,
     service: StudyStepPageContentServiceDep,
-    page_service: StudyStepPageServiceDep,
-    step_service: StudyStepServiceDep,
     study_service: StudyServiceDep,
     user: Annotated[Auth0UserSchema, Depends(require_permissions('delete:content', 'admin:all'))],
     current_user: Annotated[UserSchema, Depends(get_current_user)],
@@ -44,8 +38,6 @@ async def remove_survey_construct_from_page(
     Args:
         content_id: The UUID of the content to remove.
         service: The page content service.
-        page_service: The page service.
-        step_service: The step service.
         study_service: The study service.
         user: Auth check.
         current_user: The current user.
@@ -59,16 +51,8 @@ async def remove_survey_construct_from_page(
 
     is_super_admin = 'admin:all' in user.permissions
     if not is_super_admin:
-        page = await page_service.get(content.study_step_page_id)
-        if not page:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Content not found.')
-
-        step = await step_service.get(page.study_step_id)
-        if not step:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Content not found.')
-
-        has_access = await study_service.check_study_access(step.study_id, current_user.id, min_role='editor')
-        if not has_access:
+        study_id = await study_service.get_component_study_id(StudyStepPage, content.study_step_page_id)
+        if study_id is None or not await study_service.check_study_access(study_id, current_user.id, min_role='editor'):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Content not found.')
 
     await service.delete(content_id)
@@ -79,8 +63,6 @@ async def update_page_content(
     content_id: uuid.UUID,
     payload: StudyStepPageContentUpdate,
     service: StudyStepPageContentServiceDep,
-    page_service: StudyStepPageServiceDep,
-    step_service: StudyStepServiceDep,
     study_service: StudyServiceDep,
     user: Annotated[Auth0UserSchema, Depends(require_permissions('update:content', 'admin:all'))],
     current_user: Annotated[UserSchema, Depends(get_current_user)],
@@ -91,8 +73,6 @@ async def update_page_content(
         content_id: The UUID of the content.
         payload: Fields to update.
         service: The page content service.
-        page_service: The page service.
-        step_service: The step service.
         study_service: The study service.
         user: Auth check.
         current_user: The current user.
@@ -106,16 +86,8 @@ async def update_page_content(
 
     is_super_admin = 'admin:all' in user.permissions
     if not is_super_admin:
-        page = await page_service.get(content.study_step_page_id)
-        if not page:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Content not found.')
-
-        step = await step_service.get(page.study_step_id)
-        if not step:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Content not found.')
-
-        has_access = await study_service.check_study_access(step.study_id, current_user.id, min_role='editor')
-        if not has_access:
+        study_id = await study_service.get_component_study_id(StudyStepPage, content.study_step_page_id)
+        if study_id is None or not await study_service.check_study_access(study_id, current_user.id, min_role='editor'):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Content not found.')
 
     await service.update(content_id, payload.model_dump(exclude_unset=True))
@@ -4,6 +4,7 @@ import uuid
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from rssa_storage.rssadb.models.study_components import StudyStepPage
 
 from rssa_api.auth.security import get_auth0_authenticated_user, get_current_user, require_permissions
 from rssa_api.data.schemas import Auth0UserSchema
@@ -35,7 +36,6 @@ router = APIRouter(
 async def get_step_page_details(
     page_id: uuid.UUID,
     page_service: StudyStepPageServiceDep,
-    step_service: StudyStepServiceDep,
     study_service: StudyServiceDep,
     user: Annotated[Auth0UserSchema, Depends(require_permissions('read:pages', 'admin:all'))],
     current_user: Annotated[UserSchema, Depends(get_current_user)],
@@ -45,7 +45,6 @@ async def get_step_page_details(
     Args:
         page_id: The UUID of the page.
         page_service: The page service.
-        step_service: The step service.
         study_service: The study service.
         user: Auth check.
         current_user: The current user.
@@ -59,11 +58,9 @@ async def get_step_page_details(
 
     is_super_admin = 'admin:all' in user.permissions
     if not is_super_admin:
-        step = await step_service.get(page_from_db.study_step_id)
-        if step:
-            has_access = await study_service.check_study_access(step.study_id, current_user.id, min_role='viewer')
-            if not has_access:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found.')
+        study_id = await study_service.get_component_study_id(StudyStepPage, page_id)
+        if study_id is None or not await study_service.check_study_access(study_id, current_user.id, min_role='viewer'):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found.')
 
     return StudyStepPageReadAdmin.model_validate(page_from_db)
 
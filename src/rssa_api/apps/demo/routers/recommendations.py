@@ -1,11 +1,14 @@
 from typing import Any
 
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, HTTPException, Query, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
 from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
 from rssa_api.data.schemas.recommendations import EnrichedResponseWrapper
 from rssa_api.docs.metadata import RSTagsEnum as Tags
 from rssa_api.services.dependencies import RecommenderServiceDep
+from rssa_api.services.recommendation.resilience import RecommendationUnavailableError
 
 router = APIRouter(
     prefix='/recommendations',
@@ -17,7 +20,7 @@ router = APIRouter(
 async def get_recommendations(
     recommender_service: RecommenderServiceDep,
     ratings: list[MovieLensRating],
-    limit: int,
+    limit: int = Query(gt=0, le=100),
     context_data: dict[str, Any] | None = Body(default=None),
 ):
     """Get recommendations for the current participant.
@@ -26,10 +29,19 @@ async def get_recommendations(
         recommender_service: Service to fetch recommendations.
         ratings: List of movielens ids for which recommendations are to be fetched.
         limit: Number of recommendations to fetch.
-        context_data: Optional dictionary for dynamic algorithm parameters (e.g. emotion inputs).
+        context_data: Optional dictionary with the `recommender_key` of the model to use and its tuning parameters
+            (e.g. emotion inputs); other fields are ignored.
     """
-    response: EnrichedResponseWrapper = await recommender_service.get_recommendations(
-        ratings=ratings, limit=limit, context_data=context_data
-    )
+    try:
+        response: EnrichedResponseWrapper = await recommender_service.get_recommendations(
+            ratings=ratings, limit=limit, context_data=context_data
+        )
+    except ValidationError as e:
+        # Malformed tuning parameters only surface once the recommender reads them.
+        raise RequestValidationError(e.errors()) from e
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    except RecommendationUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)) from e
 
     return response
@@ -9,6 +9,7 @@ from rssa_api.auth.authorization import validate_study_participant
 from rssa_api.data.schemas.recommendations import EnrichedResponseWrapper
 from rssa_api.docs.metadata import RSTagsEnum as Tags
 from rssa_api.services.dependencies import RecommenderServiceDep
+from rssa_api.services.recommendation.resilience import RecommendationUnavailableError
 
 log = logging.getLogger(__name__)
 
@@ -36,8 +37,11 @@ async def get_recommendations(
     if context_data is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Missing context data.')
 
-    response: EnrichedResponseWrapper = await recommender_service.get_recommendations_for_study_participant(
-        study_id=id_token['sty'], study_participant_id=study_participant_id, context_data=context_data
-    )
+    try:
+        response: EnrichedResponseWrapper = await recommender_service.get_recommendations_for_study_participant(
+            study_id=id_token['sty'], study_participant_id=study_participant_id, context_data=context_data
+        )
+    except RecommendationUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)) from e
 
     return response
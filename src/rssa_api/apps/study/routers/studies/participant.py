@@ -61,7 +61,7 @@ async def create_participant_demographic_info(
     Returns:
         Created demographic info.
     """
-    dem_data = await service.create_demographic_info(id_token['sub'], demographic_data)
+    dem_data = await service.create_demographic_info(id_token['sub'], demographic_data, study_id=id_token['sty'])
 
     if not dem_data:
         raise HTTPException(
@@ -77,7 +77,7 @@ async def upsert_participant_demographic_info(
     id_token: Annotated[dict[str, uuid.UUID], Depends(validate_study_participant)],
     service: StudyParticipantServiceDep,
 ):
-    dem_data = await service.upsert_demographic_info(id_token['sub'], demographic_data)
+    dem_data = await service.upsert_demographic_info(id_token['sub'], demographic_data, study_id=id_token['sty'])
     if not dem_data:
         raise HTTPException(status_code=500, detail='Could not upsert demographic data.')
     return dem_data
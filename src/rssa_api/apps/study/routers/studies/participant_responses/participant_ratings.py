@@ -11,11 +11,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from rssa_api.auth.authorization import validate_study_participant
 from rssa_api.data.schemas.participant_response_schemas import (
     ParticipantRatingBase,
+    ParticipantRatingBatch,
+    ParticipantRatingBatchResult,
     ParticipantRatingRead,
     ParticipantRatingUpdate,
 )
 from rssa_api.data.services import ResponseType
 from rssa_api.data.services.dependencies import ParticipantResponseServiceDep
+from rssa_api.services.prefetch import recommendation_prefetcher
+from rssa_api.services.recommender_service import RecommenderService
 
 ratings_router = APIRouter(
     prefix='/ratings',
@@ -47,10 +51,43 @@ async def create_content_Rating(
         The created content rating.
     """
     content_rating = await service.create_response(rating, id_token['sty'], id_token['sub'])
+    RecommenderService.invalidate_participant(id_token['sub'])
+    recommendation_prefetcher.schedule(id_token['sub'])
 
     return content_rating
 
 
+@ratings_router.put(
+    '/bulk',
+    status_code=status.HTTP_200_OK,
+    response_model=ParticipantRatingBatchResult,
+    summary='Create or update a batch of content ratings.',
+    description='Ratings with an id and version update the stored rating; stale versions are reported as conflicts.',
+    response_description='The saved ratings and the item ids that conflicted.',
+)
+async def upsert_content_ratings(
+    rating_batch: ParticipantRatingBatch,
+    service: ParticipantResponseServiceDep,
+    id_token: Annotated[dict[str, uuid.UUID], Depends(validate_study_participant)],
+):
+    """Create or update several content ratings for a study participant.
+
+    Args:
+        rating_batch: The ratings to save and their shared context.
+        service: The participant response service.
+        id_token: The validated study and participant IDs.
+
+    Returns:
+        The saved ratings and the item ids whose version did not match.
+    """
+    result = await service.upsert_ratings(rating_batch, id_token['sty'], id_token['sub'])
+    if result.ratings:
+        RecommenderService.invalidate_participant(id_token['sub'])
+        recommendation_prefetcher.schedule(id_token['sub'])
+
+    return result
+
+
 @ratings_router.patch(
     '/{rating_id}',
     status_code=status.HTTP_204_NO_CONTENT,
@@ -60,7 +97,7 @@ async def update_content_rating(
     rating_id: uuid.UUID,
     item_rating: ParticipantRatingUpdate,
     service: ParticipantResponseServiceDep,
-    _: Annotated[dict[str, uuid.UUID], Depends(validate_study_participant)],
+    id_token: Annotated[dict[str, uuid.UUID], Depends(validate_study_participant)],
 ):
     """Update an existing content rating for a study participant.
 
@@ -68,7 +105,7 @@ async def update_content_rating(
         rating_id: The ID of the content rating to be updated.
         item_rating: The updated content rating data.
         service: The participant response service.
-        _: The validated study and participant IDs.
+        id_token: The validated study and participant IDs.
 
     Raises:
         HTTPException: If there is a version conflict during the update.
@@ -94,6 +131,8 @@ async def update_content_rating(
             status_code=status.HTTP_409_CONFLICT,
             detail='Resource version mismatch. Data was updated by another process',
         )
+    RecommenderService.invalidate_participant(id_token['sub'])
+    recommendation_prefetcher.schedule(id_token['sub'])
 
 
 @ratings_router.get(
@@ -11,6 +11,8 @@ from rssa_api.data.schemas.participant_response_schemas import (
     ParticipantAttentionCheckResponseCreate,
     ParticipantSurveyResponseCreate,
     ParticipantSurveyResponseRead,
+    SurveyPageResponsesCreate,
+    SurveyPageResponsesRead,
     UnifiedItemResponsePayload,
 )
 from rssa_api.data.services import ResponseType
@@ -88,6 +90,32 @@ async def create_survey_item_response(
     return spoofed_return
 
 
+@survey_router.post(
+    '/bulk',
+    status_code=status.HTTP_201_CREATED,
+    response_model=SurveyPageResponsesRead,
+    summary='Submit all responses for a survey page.',
+    description='Creates the survey item, attention check, text and rating responses of a page in one transaction.',
+    response_description='The created responses grouped by type.',
+)
+async def create_survey_page_responses(
+    page_payload: SurveyPageResponsesCreate,
+    service: ParticipantResponseServiceDep,
+    id_token: Annotated[dict[str, uuid.UUID], Depends(validate_study_participant)],
+):
+    """Create every response for a survey page.
+
+    Args:
+        page_payload: Survey item, attention check, text and rating responses for the page.
+        service: Service for response operations.
+        id_token: Validated participant token.
+
+    Returns:
+        Created responses with their versions.
+    """
+    return await service.create_page_responses(page_payload, id_token['sty'], id_token['sub'])
+
+
 @survey_router.patch(
     '/{response_item_id}',
     status_code=status.HTTP_204_NO_CONTENT,
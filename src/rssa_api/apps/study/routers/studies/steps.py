@@ -12,6 +12,7 @@ from rssa_api.data.schemas.study_components import (
     StudyStepPresent,
 )
 from rssa_api.data.services.dependencies import StudyStepPageServiceDep, StudyStepServiceDep
+from rssa_api.services.prefetch import recommendation_prefetcher
 
 router = APIRouter(
     prefix='/steps',
@@ -53,6 +54,7 @@ async def get_study_step(
         raise HTTPException(status_code=403, detail='Study step does not belong to the authorized study.')
 
     step_service.enqueue_progress_update(participant_id, step_id)
+    recommendation_prefetcher.step_entered(participant_id, validated_step.step_type, step_id, step_result['next_id'])
     page_result = await page_service.get_first_with_navigation(step_id, StudyStepPagePresent)
 
     root_page_info = None
@@ -19,15 +19,12 @@ from rssa_api.data.schemas.study_components import (
     ResumeResponseSchema,
     StudyCompletionPayload,
     StudyConfigSchema,
-    StudyDataSubset,
     StudyStepConfigRead,
-    StudyStepPreview,
     StudyStepRead,
 )
 from rssa_api.data.services.dependencies import (
     EnrollmentServiceDep,
     ParticipantStudySessionServiceDep,
-    StudyParticipantMovieSessionServiceDep,
     StudyParticipantServiceDep,
     StudyServiceDep,
     StudyStepServiceDep,
@@ -129,45 +126,31 @@ async def create_new_participant_with_session(
     study_id: uuid.UUID,
     new_participant: StudyParticipantCreate,
     enrollment_service: EnrollmentServiceDep,
-    study_service: StudyServiceDep,
-    step_service: StudyStepServiceDep,
-    session_service: ParticipantStudySessionServiceDep,
-    movie_session_service: StudyParticipantMovieSessionServiceDep,
 ):
     """Enroll a new participant and start a session.
 
+    Step navigation, the study's dataset subset and its pre-shuffled lists come from a cached per-study enrollment
+    context, and the participant, session and list assignment are written in the request's transaction.
+
     Args:
         study_id: The UUID of the study.
         new_participant: Participant creation data.
         enrollment_service: Service for enrollment.
-        study_service: Service for studies.
-        step_service: Service for study steps.
-        session_service: Service for session management.
-        movie_session_service: Service for movie session assignments.
 
     Raises:
-        HTTPException: If next step cannot be found or session creation fails.
+        HTTPException: If the study or the next step cannot be found, or no session could be stored.
 
     Returns:
         Dictionary containing resume code and JWT token.
     """
-    current_step = await step_service.get_with_navigation(new_participant.current_step_id, StudyStepPreview)
-    if not current_step:
-        raise HTTPException(status_code=500, detail='Could not find next step, study is configuration fault.')
-    new_participant.current_step_id = current_step['next_id']
-
-    study_participant = await enrollment_service.enroll_participant(study_id, new_participant)
-    session = await session_service.create_session(study_participant.id)
-
-    ds_subset = 'movielens-32M-default'
-    study_wds = await study_service.get(study_id, StudyDataSubset)
-    if not study_wds:
+    context = await enrollment_service.get_enrollment_context(study_id)
+    if context is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Could not find study')
+    if new_participant.current_step_id not in context.next_step_ids:
+        raise HTTPException(status_code=500, detail='Could not find next step, study is configuration fault.')
+    new_participant.current_step_id = context.next_step_ids[new_participant.current_step_id]
 
-    if study_wds.dataset_subset:
-        ds_subset = study_wds.dataset_subset
-
-    await movie_session_service.assign_pre_shuffled_list_participant(study_participant.id, ds_subset)
+    study_participant, session = await enrollment_service.enroll_with_session(study_id, new_participant, context)
     if session is None:
         raise HTTPException(status_code=500, detail='Could not create unique session.')
 
@@ -209,7 +192,7 @@ async def resume_study_session(
     Returns:
         Resume response with current step and new token.
     """
-    participant_session = await session_service.get_session_by_resume_code(payload.resume_code)
+    participant_session = await session_service.get_session_by_resume_code(payload.resume_code, study_id)
     if participant_session is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail='Could not find a valid session for the code.'
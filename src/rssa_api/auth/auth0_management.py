@@ -1,24 +1,220 @@
 """Auth0 management API utilities."""
 
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 import httpx
-from async_lru import alru_cache
 from fastapi import HTTPException, status
 
 import rssa_api.core.config as cfg
+from rssa_api.core.ttl_cache import TTLCache
 
+log = logging.getLogger(__name__)
 
-async def _handle_auth0_request(
-    client: httpx.AsyncClient, method: str, url: str, operation_name: str, **kwargs: Any
-) -> Any:
+RETRYABLE_STATUS_CODES = frozenset(
+    {
+        status.HTTP_429_TOO_MANY_REQUESTS,
+        status.HTTP_502_BAD_GATEWAY,
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        status.HTTP_504_GATEWAY_TIMEOUT,
+    }
+)
+
+UserProfile = dict[str, str | None]
+
+
+class Auth0ManagementClient:
+    """Connection-pooled client for the Auth0 Management API.
+
+    One `httpx.AsyncClient` is shared by every call so connections to the tenant are reused. The management token is
+    fetched once and refreshed shortly before it expires; concurrent callers wait on the same refresh. Rate-limited
+    (429) and gateway errors are retried with backoff, honouring Auth0's `Retry-After`/`X-RateLimit-Reset` headers.
+    User profiles and the resource server's scopes are cached, and the scope cache is replaced by the response of
+    every scope mutation.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        max_backoff: float = 8.0,
+        profile_ttl: float = 300.0,
+        scopes_ttl: float = 300.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """Initialize the client; the HTTP connection pool is created on first use.
+
+        Args:
+            max_retries: Retries for rate-limited, gateway and connection errors.
+            backoff_base: Initial backoff in seconds, doubled on each retry.
+            max_backoff: Upper bound on a single wait, including server-requested waits.
+            profile_ttl: Seconds a fetched user profile is served from the cache.
+            scopes_ttl: Seconds the resource server scopes are served from the cache.
+            transport: Optional transport, used by tests to stub Auth0.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._token: str | None = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self.profiles: TTLCache[str, UserProfile] = TTLCache(ttl_seconds=profile_ttl)
+        self.scopes: TTLCache[str, list[dict[str, Any]]] = TTLCache(ttl_seconds=scopes_ttl, maxsize=1)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared HTTP client."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(10.0, connect=5.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Closes the connection pool and drops the cached token."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._token = None
+        self._token_expires_at = 0.0
+
+    async def get_token(self) -> str:
+        """Returns a valid management API token, fetching a new one when it is about to expire.
+
+        Raises:
+            HTTPException: If the token cannot be obtained.
+        """
+        if self._token is not None and time.monotonic() < self._token_expires_at:
+            return self._token
+        async with self._token_lock:
+            # Concurrent callers queue on the lock and pick up the token the first one fetched.
+            if self._token is not None and time.monotonic() < self._token_expires_at:
+                return self._token
+            self._token, expires_in = await self._fetch_token()
+            # Refresh a minute early so a token never expires mid-request.
+            self._token_expires_at = time.monotonic() + max(expires_in - 60, 0)
+            return self._token
+
+    def invalidate_token(self) -> None:
+        """Forces the next call to fetch a fresh token."""
+        self._token = None
+        self._token_expires_at = 0.0
+
+    async def _fetch_token(self) -> tuple[str, float]:
+        url = f'https://{cfg.AUTH0_DOMAIN}/oauth/token'
+        payload = {
+            'client_id': cfg.AUTH0_CLIENT_ID,
+            'client_secret': cfg.AUTH0_CLIENT_SECRET,
+            'audience': cfg.AUTH0_MANAGEMENT_API_AUDIENCE,
+            'grant_type': 'client_credentials',
+        }
+        try:
+            response = await self._send('POST', url, authorize=False, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise HTTPException(
+                e.response.status_code, f'Auth0: HTTP error obtaining management API token: {e.response.text}'
+            ) from e
+        body = response.json()
+        token = body.get('access_token')
+        if not token:
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, 'Auth0: Failed to obtain management API token.')
+        return token, float(body.get('expires_in', 3600))
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Sends an authorized management API request with retries.
+
+        Status errors are returned as responses, not raised, so callers can map them.
+
+        Args:
+            method: HTTP method.
+            url: Absolute management API URL.
+            **kwargs: Passed through to `httpx.AsyncClient.request`.
+
+        Returns:
+            httpx.Response: The final response.
+        """
+        return await self._send(method, url, authorize=True, **kwargs)
+
+    async def _send(self, method: str, url: str, authorize: bool, **kwargs: Any) -> httpx.Response:
+        extra_headers = kwargs.pop('headers', None) or {}
+        token_refreshed = False
+        attempt = 0
+        while True:
+            headers = dict(extra_headers)
+            if authorize:
+                headers['Authorization'] = f'Bearer {await self.get_token()}'
+            try:
+                response = await self.client.request(method, url, headers=headers, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt, None))
+                attempt += 1
+                continue
+
+            if authorize and response.status_code == status.HTTP_401_UNAUTHORIZED and not token_refreshed:
+                # The token was revoked or rotated early; fetch a new one and try once more.
+                self.invalidate_token()
+                token_refreshed = True
+                continue
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                delay = self._backoff(attempt, response)
+                log.warning(f'Auth0: {method} {url} returned {response.status_code}, retrying in {delay:.1f}s')
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            return response
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        delay = self.backoff_base * 2**attempt
+        if response is not None:
+            requested = _requested_wait(response)
+            if requested is not None:
+                delay = requested
+        return min(max(delay, 0.0), self.max_backoff)
+
+
+def _requested_wait(response: httpx.Response) -> float | None:
+    """Seconds the server asked us to wait, from `Retry-After` or Auth0's `X-RateLimit-Reset` epoch."""
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                pass
+    reset = response.headers.get('X-RateLimit-Reset')
+    if reset:
+        try:
+            return float(reset) - time.time()
+        except ValueError:
+            pass
+    return None
+
+
+auth0_management = Auth0ManagementClient()
+
+
+async def _handle_auth0_request(method: str, url: str, operation_name: str, **kwargs: Any) -> Any:
     """Helper to execute Auth0 requests with standardized error handling."""
     try:
-        response = await client.request(method, url, **kwargs)
+        response = await auth0_management.request(method, url, **kwargs)
         response.raise_for_status()
         if response.status_code == status.HTTP_204_NO_CONTENT:
             return None
         return response.json()
+    except HTTPException:
+        raise
     except httpx.HTTPStatusError as e:
         detail = f'Auth0: HTTP error {operation_name}: {e.response.text}'
         raise HTTPException(status_code=e.response.status_code, detail=detail) from e
@@ -29,7 +225,6 @@ async def _handle_auth0_request(
         ) from e
 
 
-@alru_cache(ttl=3600)
 async def get_management_api_token() -> str:
     """Fetches and caches the Auth0 Management API token.
 
@@ -39,56 +234,42 @@ async def get_management_api_token() -> str:
     Raises:
         HTTPException: If the token cannot be obtained.
     """
-    url = f'https://{cfg.AUTH0_DOMAIN}/oauth/token'
-    payload = {
-        'client_id': cfg.AUTH0_CLIENT_ID,
-        'client_secret': cfg.AUTH0_CLIENT_SECRET,
-        'audience': cfg.AUTH0_MANAGEMENT_API_AUDIENCE,
-        'grant_type': 'client_credentials',
-    }
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            token = response.json().get('access_token')
-            if not token:
-                raise HTTPException(
-                    status.HTTP_500_INTERNAL_SERVER_ERROR, 'Auth0: Failed to obtain management API token.'
-                )
-            return token
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                e.response.status_code, f'Auth0: HTTP error obtaining management API token: {e.response.text}'
-            ) from e
+    return await auth0_management.get_token()
 
 
-async def get_resource_server_scopes() -> list[dict[str, Any]]:
+async def get_resource_server_scopes(use_cache: bool = True) -> list[dict[str, Any]]:
     """Retrieves all defined scopes for the Auth0 API (Resource Server).
 
+    Args:
+        use_cache: Serve the scopes from the cache when they were fetched recently.
+
     Returns:
         list[dict[str, Any]]: A list of scope dictionaries containing 'value' and 'description'.
     """
-    token = await get_management_api_token()
-    headers = {'Authorization': f'Bearer {token}'}
-    async with httpx.AsyncClient(headers=headers) as client:
-        response_json = await _handle_auth0_request(
-            client, 'GET', cfg.RESOURCE_SERVER_URL, 'getting resource server scopes'
-        )
-        return response_json.get('scopes', [])
-
+    if use_cache:
+        hit, scopes = auth0_management.scopes.lookup(cfg.RESOURCE_SERVER_URL)
+        if hit and scopes is not None:
+            return list(scopes)
 
-def get_management_api_authorized_client(token: str) -> httpx.AsyncClient:
-    """Returns an httpx.AsyncClient configured with the management API token.
+    response_json = await _handle_auth0_request('GET', cfg.RESOURCE_SERVER_URL, 'getting resource server scopes')
+    scopes = response_json.get('scopes', [])
+    auth0_management.scopes.set(cfg.RESOURCE_SERVER_URL, scopes)
+    return list(scopes)
 
-    Args:
-        token: The Auth0 Management API access token.
 
-    Returns:
-        httpx.AsyncClient: An authenticated client instance.
-    """
-    headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json', 'Cache-Control': 'no-cache'}
-    client = httpx.AsyncClient(headers=headers)
-    return client
+async def _patch_scopes(scopes: list[dict[str, Any]], operation_name: str) -> list[dict[str, Any]]:
+    """Replaces the resource server's scopes and caches the result."""
+    try:
+        response_json = await _handle_auth0_request(
+            'PATCH', cfg.RESOURCE_SERVER_URL, operation_name, json={'scopes': scopes}
+        )
+    except HTTPException:
+        # The cached list may be what made the patch fail; read it fresh next time.
+        auth0_management.scopes.invalidate(cfg.RESOURCE_SERVER_URL)
+        raise
+    updated_scopes = response_json.get('scopes', [])
+    auth0_management.scopes.set(cfg.RESOURCE_SERVER_URL, updated_scopes)
+    return list(updated_scopes)
 
 
 async def create_permission_scope(permission_name: str, permission_description: str) -> list[dict[str, Any]]:
@@ -101,28 +282,17 @@ async def create_permission_scope(permission_name: str, permission_description:
     Returns:
         list[dict[str, Any]]: The updated list of all scopes for the Resource Server.
     """
-    token = await get_management_api_token()
-    # Note: Optimization - we could cache scopes perhaps, but for creation we want fresh state.
     current_scopes = await get_resource_server_scopes()
-    client = get_management_api_authorized_client(token)
-
-    new_scope_obj = {
-        'value': permission_name,
-        'description': permission_description,
-    }
 
     if any(scope['value'] == permission_name for scope in current_scopes):
         print(f'Permission scope "{permission_name}" already exists. Skipping creation.')
         return current_scopes
 
-    updated_scopes = current_scopes + [new_scope_obj]
-    payload = {'scopes': updated_scopes}
-
-    async with client:
-        response_json = await _handle_auth0_request(
-            client, 'PATCH', cfg.RESOURCE_SERVER_URL, 'creating permission scope', json=payload
-        )
-        return response_json.get('scopes', [])
+    new_scope_obj = {
+        'value': permission_name,
+        'description': permission_description,
+    }
+    return await _patch_scopes(current_scopes + [new_scope_obj], 'creating permission scope')
 
 
 async def delete_permission_scope(permission_name: str) -> list[dict[str, Any]]:
@@ -134,18 +304,9 @@ async def delete_permission_scope(permission_name: str) -> list[dict[str, Any]]:
     Returns:
         list[dict[str, Any]]: The updated list of all scopes for the Resource Server.
     """
-    token = await get_management_api_token()
     current_scopes = await get_resource_server_scopes()
-    client = get_management_api_authorized_client(token)
-
     updated_scopes = [scope for scope in current_scopes if scope['value'] != permission_name]
-    payload = {'scopes': updated_scopes}
-
-    async with client:
-        response_json = await _handle_auth0_request(
-            client, 'PATCH', cfg.RESOURCE_SERVER_URL, 'deleting permission scope', json=payload
-        )
-        return response_json.get('scopes', [])
+    return await _patch_scopes(updated_scopes, 'deleting permission scope')
 
 
 async def assign_permission_to_user(user_id: str, permission_name: str) -> dict[str, str]:
@@ -161,9 +322,7 @@ async def assign_permission_to_user(user_id: str, permission_name: str) -> dict[
     Raises:
         HTTPException: For Unauthorized, Not Found, or other API errors.
     """
-    token = await get_management_api_token()
     url = f'https://{cfg.AUTH0_DOMAIN}/api/v2/users/{user_id}/permissions'
-    headers = {'Authorization': f'Bearer {token}', 'content-type': 'application/json'}
     payload = {
         'permissions': [
             {
@@ -172,82 +331,97 @@ async def assign_permission_to_user(user_id: str, permission_name: str) -> dict[
             }
         ]
     }
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            return {'message': f'Permission "{permission_name}" assigned to user "{user_id}"'}
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == status.HTTP_401_UNAUTHORIZED:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail='Auth0: Invalid client credentials for management API.',
-                ) from e
-            elif e.response.status_code == status.HTTP_404_NOT_FOUND:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f'Auth0: User {user_id} not found or permission not found.',
-                ) from e
-            elif e.response.status_code == status.HTTP_409_CONFLICT:
-                return {'message': f"Permission '{permission_name}' already assigned to user '{user_id}'"}
-            else:
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f'Auth0: HTTP error assigning permission: {e.response.text}',
-                ) from e
-        except httpx.ConnectTimeout as e:
+    try:
+        response = await auth0_management.request('POST', url, json=payload)
+        response.raise_for_status()
+        auth0_management.profiles.invalidate(user_id)
+        return {'message': f'Permission "{permission_name}" assigned to user "{user_id}"'}
+    except HTTPException:
+        raise
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == status.HTTP_401_UNAUTHORIZED:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Auth0: Invalid client credentials for management API.',
+            ) from e
+        elif e.response.status_code == status.HTTP_404_NOT_FOUND:
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f'Auth0: Connection timeout assigning permission: {e}',
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'Auth0: User {user_id} not found or permission not found.',
             ) from e
-        except Exception as e:
+        elif e.response.status_code == status.HTTP_409_CONFLICT:
+            return {'message': f"Permission '{permission_name}' already assigned to user '{user_id}'"}
+        else:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f'Auth0: Unexpected error assigning permission: {e}',
+                status_code=e.response.status_code,
+                detail=f'Auth0: HTTP error assigning permission: {e.response.text}',
             ) from e
+    except httpx.ConnectTimeout as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f'Auth0: Connection timeout assigning permission: {e}',
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f'Auth0: Unexpected error assigning permission: {e}',
+        ) from e
+
 
+def _profile_fields(user_data: dict[str, Any]) -> UserProfile:
+    return {
+        'name': user_data.get('name'),
+        'picture': user_data.get('picture'),
+        'nickname': user_data.get('nickname'),
+        'email': user_data.get('email'),
+    }
 
-async def get_user_profile_by_id(user_id: str) -> dict[str, str | None] | None:
+
+async def get_user_profile_by_id(user_id: str, use_cache: bool = True) -> UserProfile | None:
     """Fetches a user's public profile (name, picture, nickname) from the Auth0 Management API.
 
     Args:
         user_id: The Auth0 user ID.
+        use_cache: Serve the profile from the cache when it was fetched recently.
 
     Returns:
         dict[str, str | None] | None: A dictionary with 'name', 'picture', 'nickname' or None if not found.
     """
-    token = await get_management_api_token()
-    headers = {'Authorization': f'Bearer {token}'}
+    if use_cache:
+        hit, profile = auth0_management.profiles.lookup(user_id)
+        if hit and profile is not None:
+            return dict(profile)
+
     url = f'https://{cfg.AUTH0_DOMAIN}/api/v2/users/{user_id}'
+    try:
+        response = await auth0_management.request('GET', url)
+        response.raise_for_status()
+        profile = _profile_fields(response.json())
+    except HTTPException:
+        raise
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == status.HTTP_404_NOT_FOUND:
+            auth0_management.profiles.invalidate(user_id)
+            return None
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f'Auth0: HTTP error getting user profile: {e.response.text}',
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f'Auth0: Unexpected error getting user profile: {e}',
+        ) from e
 
-    async with httpx.AsyncClient(headers=headers) as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            user_data = response.json()
-            return {
-                'name': user_data.get('name'),
-                'picture': user_data.get('picture'),
-                'nickname': user_data.get('nickname'),
-                'email': user_data.get('email'),
-            }
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == status.HTTP_404_NOT_FOUND:
-                return None
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f'Auth0: HTTP error getting user profile: {e.response.text}',
-            ) from e
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f'Auth0: Unexpected error getting user profile: {e}',
-            ) from e
+    auth0_management.profiles.set(user_id, profile)
+    return dict(profile)
 
 
 async def search_users(search_query: str | None = None, page: int = 0, per_page: int = 50) -> list[dict[str, Any]]:
     """Searches for users in Auth0, with pagination.
 
+    The returned users also warm the profile cache, so opening one of them does not need another request.
+
     Args:
         search_query: Lucene query string (e.g. 'email:"foo@bar.com"').
         page: Page index (0-based).
@@ -256,9 +430,6 @@ async def search_users(search_query: str | None = None, page: int = 0, per_page:
     Returns:
         list[dict[str, Any]]: A list of user profile dictionaries containing only essential fields.
     """
-    token = await get_management_api_token()
-    headers = {'Authorization': f'Bearer {token}'}
-
     fields_to_include = 'user_id,name,email,picture,nickname'
 
     params = {
@@ -274,6 +445,10 @@ async def search_users(search_query: str | None = None, page: int = 0, per_page:
 
     url = f'https://{cfg.AUTH0_DOMAIN}/api/v2/users'
 
-    async with httpx.AsyncClient(headers=headers) as client:
-        response_json = await _handle_auth0_request(client, 'GET', url, 'searching users', params=params)
-        return response_json if isinstance(response_json, list) else []
+    response_json = await _handle_auth0_request('GET', url, 'searching users', params=params)
+    if not isinstance(response_json, list):
+        return []
+    for user_data in response_json:
+        if user_data.get('user_id'):
+            auth0_management.profiles.set(user_data['user_id'], _profile_fields(user_data))
+    return response_json
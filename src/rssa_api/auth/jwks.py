@@ -0,0 +1,169 @@
+"""Auth0 signing key management."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+import rssa_api.core.config as cfg
+
+log = logging.getLogger(__name__)
+
+JWKSFetcher = Callable[[], Awaitable[dict[str, Any]]]
+
+
+async def fetch_auth0_jwks() -> dict[str, Any]:
+    """Downloads the Auth0 JSON Web Key Set.
+
+    Returns:
+        dict[str, Any]: The JWKS document.
+
+    Raises:
+        httpx.HTTPError: If the request fails.
+    """
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        response = await client.get(cfg.AUTH0_JWKS_URL)
+        response.raise_for_status()
+        return response.json()
+
+
+class JWKSManager:
+    """Holds Auth0's public signing keys, parsed once and indexed by `kid`.
+
+    The keys are prefetched when the app starts and refreshed in the background on a fixed interval. A token signed
+    with a `kid` we have not seen (Auth0 rotated its keys) triggers one immediate refetch, rate limited to one per
+    `min_refetch_interval` so a flood of forged tokens cannot hammer the JWKS endpoint.
+    """
+
+    def __init__(
+        self,
+        fetch: JWKSFetcher = fetch_auth0_jwks,
+        refresh_interval: float = 3600.0,
+        min_refetch_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the manager without fetching anything.
+
+        Args:
+            fetch: Coroutine function returning the JWKS document.
+            refresh_interval: Seconds between background refreshes.
+            min_refetch_interval: Minimum seconds between two fetches triggered by unknown key ids.
+            clock: Monotonic clock, replaceable in tests.
+        """
+        self._fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self._clock = clock
+        self._keys: dict[str, Key] = {}
+        self._lock = asyncio.Lock()
+        self._last_fetch: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def __contains__(self, kid: object) -> bool:
+        return kid in self._keys
+
+    @property
+    def kids(self) -> list[str]:
+        """The key ids currently held."""
+        return list(self._keys)
+
+    async def refresh(self) -> int:
+        """Fetches the key set and replaces the held keys.
+
+        Keys that fail to parse are skipped. If the fetch fails, the current keys are kept.
+
+        Returns:
+            The number of keys held.
+
+        Raises:
+            httpx.HTTPError: If the key set cannot be fetched.
+            ValueError: If the response is not JSON.
+        """
+        async with self._lock:
+            await self._refresh_locked()
+        return len(self._keys)
+
+    async def _refresh_locked(self) -> None:
+        self._last_fetch = self._clock()
+        jwks = await self._fetch()
+        keys: dict[str, Key] = {}
+        for key_data in jwks.get('keys', []):
+            kid = key_data.get('kid')
+            if not kid or key_data.get('use', 'sig') != 'sig':
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data, key_data.get('alg') or cfg.AUTH0_ALGORITHMS[0])
+            except JWKError as e:
+                log.warning(f'Auth0: Skipping unusable signing key {kid}: {e}')
+        self._keys = keys
+
+    async def get_signing_key(self, kid: str | None) -> Key | None:
+        """Returns the parsed public key for a key id.
+
+        An unknown key id causes a single refetch unless one happened within `min_refetch_interval`.
+
+        Args:
+            kid: The `kid` from the token header.
+
+        Returns:
+            The key, or None if Auth0 does not publish it.
+        """
+        if kid is None:
+            return None
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        async with self._lock:
+            # Another request may have refetched while we waited for the lock.
+            key = self._keys.get(kid)
+            if key is not None or not self._may_refetch():
+                return key
+            try:
+                await self._refresh_locked()
+            except (httpx.HTTPError, ValueError) as e:
+                log.warning(f'Auth0: Could not refetch JWKS for unknown key {kid}: {e}')
+            return self._keys.get(kid)
+
+    def _may_refetch(self) -> bool:
+        return self._last_fetch is None or self._clock() - self._last_fetch >= self.min_refetch_interval
+
+    async def start(self) -> None:
+        """Prefetches the keys and starts the background refresh task.
+
+        A failed prefetch is logged rather than raised; token validation fetches the keys once the refetch rate limit
+        allows.
+        """
+        try:
+            await self.refresh()
+        except (httpx.HTTPError, ValueError) as e:
+            log.warning(f'Auth0: Could not prefetch JWKS: {e}')
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        """Cancels the background refresh task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except (httpx.HTTPError, ValueError) as e:
+                log.warning(f'Auth0: Background JWKS refresh failed, keeping current keys: {e}')
+
+
+jwks_manager = JWKSManager()
@@ -1,44 +1,36 @@
 """Security utilities for authentication and authorization."""
 
+import hashlib
+import time
 from collections.abc import Callable
-from typing import Annotated, Any
+from typing import Annotated
 
-import httpx
-from async_lru import alru_cache
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import jwt
 from jose.exceptions import JWTClaimsError, JWTError
 
 import rssa_api.core.config as cfg
+from rssa_api.auth.jwks import jwks_manager
+from rssa_api.core.ttl_cache import TTLCache
 from rssa_api.data.schemas.auth_schemas import Auth0UserSchema, UserSchema
 from rssa_api.data.services.dependencies import UserServiceDep
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# auth0 sub -> (profile claims the local user was synced from, local user)
+current_user_cache: TTLCache[str, tuple[tuple[str | None, ...], UserSchema]] = TTLCache(ttl_seconds=60)
 
-@alru_cache
-async def get_jwks_cached() -> dict[str, Any]:
-    """Fetches and caches Auth0 JSON Web Key Set (JWKS).
-
-    Returns:
-        dict[str, Any]: The JWKS dictionary used for token verification.
-
-    Raises:
-        HTTPException: If fetching JWKS fails (500).
-    """
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(cfg.AUTH0_JWKS_URL)
-            response.raise_for_status()
-            return response.json()
-        except httpx.RequestError as e:
-            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f'Auth0: Could not fetch JWKS: {e}') from e
+# sha256(token) -> (exp claim, validated user); entries are only served while the token is unexpired
+verified_token_cache: TTLCache[bytes, tuple[float, Auth0UserSchema]] = TTLCache(ttl_seconds=300)
 
 
 async def validate_auth0_token(token: str) -> Auth0UserSchema:
     """Validates an Auth0 JWT and returns the user schema.
 
+    Successful verifications are cached by token hash until the token expires, so repeated requests with the same
+    bearer token skip the signature check.
+
     Args:
         token: The raw JWT token.
 
@@ -48,32 +40,28 @@ async def validate_auth0_token(token: str) -> Auth0UserSchema:
     Raises:
         HTTPException: If the token is invalid (401) or claims are forbidden (403).
     """
+    token_hash = hashlib.sha256(token.encode()).digest()
+    hit, cached = verified_token_cache.lookup(token_hash)
+    if hit and cached is not None and cached[0] > time.time():
+        return cached[1]
+
     try:
-        jwks = await get_jwks_cached()
         unverified_header = jwt.get_unverified_header(token)
-        rsa_key: dict[str, Any] = {}
-        if 'keys' in jwks:
-            for key in jwks['keys']:
-                if key['kid'] == unverified_header.get('kid'):
-                    rsa_key = {
-                        'kty': key['kty'],
-                        'kid': key['kid'],
-                        'use': key['use'],
-                        'n': key['n'],
-                        'e': key['e'],
-                    }
-                    break
-        if not rsa_key:
+        signing_key = await jwks_manager.get_signing_key(unverified_header.get('kid'))
+        if signing_key is None:
             raise JWTError('Auth0: Unable to find appropriate signing key')
 
         payload = jwt.decode(
             token,
-            rsa_key,
+            signing_key,
             algorithms=cfg.AUTH0_ALGORITHMS,
             audience=cfg.AUTH0_API_AUDIENCE,
             issuer=cfg.AUTH0_ISSUER_URL,
         )
-        return Auth0UserSchema(**payload)
+        user = Auth0UserSchema(**payload)
+        if isinstance(payload.get('exp'), int | float):
+            verified_token_cache.set(token_hash, (payload['exp'], user))
+        return user
     except (JWTError, JWTClaimsError) as e:
         if isinstance(e, JWTClaimsError):
             raise HTTPException(status.HTTP_403_FORBIDDEN, f'Auth0: Invalid token claims: {e}') from e
@@ -105,6 +93,9 @@ async def get_current_user(
 ) -> UserSchema:
     """Dependency that takes the validated Auth0 user and returns the local database user.
 
+    The local user is cached per Auth0 subject for a short TTL, so the lookup and profile sync only run again once the
+    entry expires or the token's profile claims change.
+
     Args:
         token_user: The user profile from Auth0.
         user_service: The service to retrieve or create local users.
@@ -112,12 +103,20 @@ async def get_current_user(
     Returns:
         UserSchema: The local user database record.
     """
+    claims = (token_user.email, token_user.name, token_user.picture)
+    hit, cached = current_user_cache.lookup(token_user.sub)
+    if hit and cached is not None and cached[0] == claims:
+        return cached[1]
+
     db_user = await user_service.get_user_by_auth0_sub(token_user.sub)
     if db_user is None:
         db_user = await user_service.create_user_from_auth0(token_user)
     else:
         db_user = await user_service.update_user_from_auth0(db_user, token_user)
-    return UserSchema.model_validate(db_user)
+
+    user = UserSchema.model_validate(db_user)
+    current_user_cache.set(token_user.sub, (claims, user))
+    return user
 
 
 def require_permissions(*scopes: str) -> Callable[[Auth0UserSchema], Auth0UserSchema]:
@@ -0,0 +1,121 @@
+"""Balanced assignment of participants to study conditions."""
+
+import asyncio
+import random
+import time
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+
+ConditionCountLoader = Callable[[], Awaitable[Mapping[uuid.UUID, int]]]
+
+
+@dataclass
+class _StudyAllocation:
+    counts: dict[uuid.UUID, int]
+    synced_at: float
+    block: deque[uuid.UUID] = field(default_factory=deque)
+
+
+class ConditionAllocator:
+    """Keeps per-study condition counters and hands out conditions in balanced blocks.
+
+    The counters are seeded from the participant count aggregate the first time a study enrolls someone and then
+    updated in memory, so an enrollment costs a deque pop instead of an aggregate query. Conditions are dealt in
+    shuffled blocks made of every condition at the current minimum count. With k conditions and n participants this
+    keeps n_i = (n - n % k) / k for every condition, plus one for n % k of them, which is the split the enrollment
+    service always aimed for.
+
+    Each worker process balances its own assignments, so with several workers the conditions can drift apart by at
+    most the number of workers. Counters are re-seeded from the database every `resync_seconds` to pull the workers
+    back together and to account for participants who never verified.
+    """
+
+    def __init__(
+        self,
+        resync_seconds: float | None = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        """Initialize an allocator with no studies loaded.
+
+        Args:
+            resync_seconds: Seconds before a study's counters are re-seeded from the database, or None to never resync.
+            clock: Monotonic clock, replaceable in tests.
+            rng: Random generator used to shuffle blocks.
+        """
+        self.resync_seconds = resync_seconds
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._studies: dict[uuid.UUID, _StudyAllocation] = {}
+        self._locks: dict[uuid.UUID, asyncio.Lock] = {}
+
+    def counts(self, study_id: uuid.UUID) -> dict[uuid.UUID, int]:
+        """The in-memory condition counters for a study, empty if it has not been seeded."""
+        allocation = self._studies.get(study_id)
+        return dict(allocation.counts) if allocation else {}
+
+    async def assign(self, study_id: uuid.UUID, load_counts: ConditionCountLoader) -> uuid.UUID:
+        """Picks the condition for the next participant of a study.
+
+        Args:
+            study_id: The study being enrolled into.
+            load_counts: Returns the current participant count per enabled condition. Only awaited when the study's
+                counters are missing or due for a resync; concurrent enrollments share a single load.
+
+        Returns:
+            The condition id.
+
+        Raises:
+            ValueError: If the study has no enabled conditions.
+        """
+        allocation = self._studies.get(study_id)
+        if allocation is None or self._is_stale(allocation):
+            allocation = await self._seed(study_id, load_counts)
+
+        # No awaits from here on, so the pop and increment are atomic with respect to other enrollments.
+        if not allocation.block:
+            allocation.block = self._next_block(allocation.counts)
+        condition_id = allocation.block.popleft()
+        allocation.counts[condition_id] += 1
+        return condition_id
+
+    def invalidate(self, study_id: uuid.UUID) -> None:
+        """Drops a study's counters so the next enrollment re-seeds them."""
+        self._studies.pop(study_id, None)
+
+    def invalidate_condition(self, condition_id: uuid.UUID) -> None:
+        """Drops the counters of whichever study holds the condition."""
+        for study_id in [sid for sid, allocation in self._studies.items() if condition_id in allocation.counts]:
+            self._studies.pop(study_id, None)
+
+    def clear(self) -> None:
+        """Drops every study's counters."""
+        self._studies.clear()
+
+    def _is_stale(self, allocation: _StudyAllocation) -> bool:
+        return self.resync_seconds is not None and self._clock() - allocation.synced_at >= self.resync_seconds
+
+    async def _seed(self, study_id: uuid.UUID, load_counts: ConditionCountLoader) -> _StudyAllocation:
+        lock = self._locks.setdefault(study_id, asyncio.Lock())
+        async with lock:
+            allocation = self._studies.get(study_id)
+            if allocation is not None and not self._is_stale(allocation):
+                return allocation
+
+            counts = dict(await load_counts())
+            if not counts:
+                raise ValueError(f'No active study conditions found for study ID: {study_id}')
+            allocation = _StudyAllocation(counts=counts, synced_at=self._clock())
+            self._studies[study_id] = allocation
+            return allocation
+
+    def _next_block(self, counts: Mapping[uuid.UUID, int]) -> deque[uuid.UUID]:
+        min_count = min(counts.values())
+        block = [condition_id for condition_id, count in counts.items() if count == min_count]
+        self._rng.shuffle(block)
+        return deque(block)
+
+
+condition_allocator = ConditionAllocator()
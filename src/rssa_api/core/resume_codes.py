@@ -0,0 +1,157 @@
+"""Collision-free resume code allocation."""
+
+import hashlib
+import secrets
+import string
+from collections.abc import Hashable, Iterable
+
+CODE_ALPHABET = string.ascii_uppercase + string.digits
+CODE_LENGTH = 5
+
+
+class CodePermutation:
+    """A keyed bijection on `[0, len(alphabet) ** length)`, rendered as fixed-length codes.
+
+    A four round Feistel network permutes the smallest even-bit-width domain covering the code space, and cycle walking
+    folds it back into the code space. Encoding a counter therefore yields distinct, unpredictable-looking codes until
+    the space is exhausted, without remembering what was handed out.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, key: bytes, alphabet: str = CODE_ALPHABET, length: int = CODE_LENGTH):
+        """Initialize the permutation.
+
+        Args:
+            key: Secret key selecting the permutation.
+            alphabet: Characters a code is made of.
+            length: Number of characters in a code.
+        """
+        self.alphabet = alphabet
+        self.length = length
+        self.size = len(alphabet) ** length
+        self._half_bits = ((self.size - 1).bit_length() + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        self._round_keys = [
+            hashlib.blake2b(key=key[:64], digest_size=16, person=b'rssa-code' + bytes([r])) for r in range(self.ROUNDS)
+        ]
+
+    def _round(self, r: int, value: int) -> int:
+        digest = self._round_keys[r].copy()
+        digest.update(value.to_bytes(8, 'big'))
+        return int.from_bytes(digest.digest()[:8], 'big') & self._half_mask
+
+    def _forward(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for r in range(self.ROUNDS):
+            left, right = right, left ^ self._round(r, right)
+        return (left << self._half_bits) | right
+
+    def _backward(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for r in reversed(range(self.ROUNDS)):
+            left, right = right ^ self._round(r, left), left
+        return (left << self._half_bits) | right
+
+    def permute(self, index: int) -> int:
+        """Maps an index in the code space to another index in the code space."""
+        if not 0 <= index < self.size:
+            raise ValueError(f'Index {index} is outside the code space.')
+        value = self._forward(index)
+        while value >= self.size:
+            value = self._forward(value)
+        return value
+
+    def invert(self, value: int) -> int:
+        """Inverse of `permute`."""
+        if not 0 <= value < self.size:
+            raise ValueError(f'Value {value} is outside the code space.')
+        index = self._backward(value)
+        while index >= self.size:
+            index = self._backward(index)
+        return index
+
+    def encode(self, index: int) -> str:
+        """Renders the permuted index as a code."""
+        value = self.permute(index)
+        base = len(self.alphabet)
+        chars = []
+        for _ in range(self.length):
+            value, digit = divmod(value, base)
+            chars.append(self.alphabet[digit])
+        return ''.join(reversed(chars))
+
+    def decode(self, code: str) -> int:
+        """Recovers the index a code was encoded from."""
+        base = len(self.alphabet)
+        value = 0
+        for char in code:
+            value = value * base + self.alphabet.index(char)
+        return self.invert(value)
+
+
+class ResumeCodeAllocator:
+    """Hands out resume codes per study without collisions or database retries.
+
+    Every study (namespace) walks its own keyed permutation of the code space with an in-memory counter, so codes within
+    a study never repeat. Codes already stored in the database are loaded at startup and codes are skipped if another
+    namespace already produced them, so the allocator never hands out a code it knows is taken. The key is drawn per
+    process; codes a different worker issued since startup are caught by the insert's conflict clause.
+    """
+
+    def __init__(self, key: bytes | None = None, alphabet: str = CODE_ALPHABET, length: int = CODE_LENGTH):
+        """Initialize an allocator.
+
+        Args:
+            key: Secret the per-study permutations are derived from; random when omitted.
+            alphabet: Characters a code is made of.
+            length: Number of characters in a code.
+        """
+        self._key = key or secrets.token_bytes(32)
+        self.alphabet = alphabet
+        self.length = length
+        self._namespaces: dict[Hashable, tuple[CodePermutation, int]] = {}
+        self._used: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._used
+
+    def load(self, codes: Iterable[str]) -> None:
+        """Marks codes that are already stored as taken."""
+        self._used.update(codes)
+
+    def mark_used(self, code: str) -> None:
+        """Marks a single code as taken."""
+        self._used.add(code)
+
+    def allocate(self, namespace: Hashable = None) -> str:
+        """Returns the next free code for a namespace.
+
+        Args:
+            namespace: Usually the study id; each namespace has its own permutation and counter.
+
+        Returns:
+            A code that has not been handed out or loaded before.
+
+        Raises:
+            RuntimeError: If the namespace has exhausted the code space.
+        """
+        permutation, counter = self._namespaces.get(namespace) or (self._permutation_for(namespace), 0)
+        while counter < permutation.size:
+            code = permutation.encode(counter)
+            counter += 1
+            if code not in self._used:
+                self._used.add(code)
+                self._namespaces[namespace] = (permutation, counter)
+                return code
+        raise RuntimeError(f'Resume code space exhausted for {namespace!r}.')
+
+    def _permutation_for(self, namespace: Hashable) -> CodePermutation:
+        namespace_key = hashlib.blake2b(repr(namespace).encode(), key=self._key, digest_size=32).digest()
+        return CodePermutation(namespace_key, self.alphabet, self.length)
+
+
+resume_code_allocator = ResumeCodeAllocator()
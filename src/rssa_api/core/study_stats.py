@@ -0,0 +1,141 @@
+"""Incrementally maintained participant statistics per study."""
+
+import asyncio
+import time
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from typing import Any
+
+DEFAULT_PARTICIPANT_STATUS = 'active'
+COMPLETED_STATUS = 'completed'
+
+
+@dataclass(frozen=True)
+class ParticipantBucket:
+    """The attributes the statistics group a participant by."""
+
+    condition_id: uuid.UUID | None
+    status: str
+    enrolled_on: date
+    is_verified: bool
+
+
+def participant_bucket(participant: Any, **changes: Any) -> ParticipantBucket | None:
+    """The bucket a participant is counted in, or None if they are discarded.
+
+    Args:
+        participant: A participant row, possibly not flushed yet.
+        **changes: Column values that override the participant's, e.g. a pending update.
+    """
+
+    def value(name: str) -> Any:
+        return changes[name] if name in changes else getattr(participant, name, None)
+
+    if value('discarded'):
+        return None
+    created_at = value('created_at')
+    return ParticipantBucket(
+        condition_id=value('study_condition_id'),
+        status=value('current_status') or DEFAULT_PARTICIPANT_STATUS,
+        enrolled_on=(created_at or datetime.now(UTC)).astimezone(UTC).date(),
+        is_verified=bool(value('is_verified')),
+    )
+
+
+BucketLoader = Callable[[], Awaitable[Iterable[tuple[ParticipantBucket, int]]]]
+
+
+@dataclass
+class _StudyCounters:
+    buckets: Counter[ParticipantBucket]
+    synced_at: float
+
+
+class StudyStatsStore:
+    """Keeps a count of a study's participants per bucket, updated as participants enroll and change.
+
+    Every statistic the dashboard shows (enrolled, verified, completed, per condition, per status, per day) is a sum
+    over buckets. A study has one bucket per combination of condition, status, enrollment day and verification, so
+    reading its statistics costs the same no matter how many participants it has.
+
+    Counters are loaded with one grouped query the first time a study is read, then moved by `record` as enrollments
+    and updates happen in this process. They are reloaded every `reconcile_seconds` to pick up writes made by other
+    workers and to undo increments from transactions that were rolled back.
+    """
+
+    def __init__(self, reconcile_seconds: float | None = 300.0, clock: Callable[[], float] = time.monotonic):
+        """Initialize a store with no studies loaded.
+
+        Args:
+            reconcile_seconds: Seconds before a study's counters are reloaded from the database, or None for never.
+            clock: Monotonic clock, replaceable in tests.
+        """
+        self.reconcile_seconds = reconcile_seconds
+        self._clock = clock
+        self._studies: dict[uuid.UUID, _StudyCounters] = {}
+        self._locks: dict[uuid.UUID, asyncio.Lock] = {}
+
+    async def get(self, study_id: uuid.UUID, load_buckets: BucketLoader) -> Counter[ParticipantBucket]:
+        """Returns a copy of a study's bucket counts.
+
+        Args:
+            study_id: The study.
+            load_buckets: Returns the participant count per bucket. Only awaited when the counters are missing or due
+                for reconciliation; concurrent readers share a single load.
+
+        Returns:
+            Participant count per bucket; buckets without participants are left out.
+        """
+        counters = self._studies.get(study_id)
+        if counters is None or self._is_stale(counters):
+            counters = await self._load(study_id, load_buckets)
+        return Counter(counters.buckets)
+
+    def record(self, study_id: uuid.UUID, old: ParticipantBucket | None, new: ParticipantBucket | None) -> None:
+        """Moves one participant between buckets of a loaded study.
+
+        Args:
+            study_id: The participant's study.
+            old: The bucket the participant was counted in, or None for a new participant.
+            new: The bucket the participant belongs in now, or None if they no longer count (e.g. discarded).
+        """
+        counters = self._studies.get(study_id)
+        if counters is None or old == new:
+            return
+        if old is not None:
+            counters.buckets[old] -= 1
+            if counters.buckets[old] <= 0:
+                del counters.buckets[old]
+        if new is not None:
+            counters.buckets[new] += 1
+
+    def invalidate(self, study_id: uuid.UUID) -> None:
+        """Drops a study's counters so the next read reloads them."""
+        self._studies.pop(study_id, None)
+
+    def clear(self) -> None:
+        """Drops every study's counters."""
+        self._studies.clear()
+
+    def _is_stale(self, counters: _StudyCounters) -> bool:
+        return self.reconcile_seconds is not None and self._clock() - counters.synced_at >= self.reconcile_seconds
+
+    async def _load(self, study_id: uuid.UUID, load_buckets: BucketLoader) -> _StudyCounters:
+        lock = self._locks.setdefault(study_id, asyncio.Lock())
+        async with lock:
+            counters = self._studies.get(study_id)
+            if counters is not None and not self._is_stale(counters):
+                return counters
+
+            buckets: Counter[ParticipantBucket] = Counter()
+            for bucket, count in await load_buckets():
+                buckets[bucket] += count
+            counters = _StudyCounters(buckets=+buckets, synced_at=self._clock())
+            self._studies[study_id] = counters
+            return counters
+
+
+study_stats = StudyStatsStore()
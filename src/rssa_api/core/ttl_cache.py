@@ -0,0 +1,71 @@
+"""Small in-process cache with per-entry expiry."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class TTLCache(Generic[K, V]):
+    """A bounded mapping whose entries expire `ttl_seconds` after they were set.
+
+    Entries are evicted oldest-first once `maxsize` is reached; with `lru` set, a hit makes an entry the newest, so
+    the least recently used one goes first. A `ttl_seconds` of None keeps entries until they are evicted or
+    invalidated, which suits values that never change (e.g. the study a component belongs to).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float | None,
+        maxsize: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+        lru: bool = False,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.lru = lru
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float | None, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: K) -> tuple[bool, V | None]:
+        """Returns `(True, value)` for a live entry and `(False, None)` otherwise.
+
+        The hit flag lets callers cache None as a meaningful value.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._clock():
+            self._entries.pop(key, None)
+            return False, None
+        if self.lru:
+            self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: K, value: V) -> None:
+        """Stores a value, evicting the oldest entry when the cache is full."""
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Removes a single entry."""
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> None:
+        """Removes every entry whose key matches the predicate."""
+        for key in [key for key in self._entries if predicate(key)]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._entries.clear()
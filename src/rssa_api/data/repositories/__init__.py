@@ -0,0 +1 @@
+"""Repositories extending the rssa_storage ones with the queries only this API needs."""
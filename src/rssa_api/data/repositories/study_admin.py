@@ -0,0 +1,26 @@
+"""Repositories for study administration."""
+
+import uuid
+
+from rssa_storage.rssadb.models.participant_movie_sequence import PreShuffledMovieList
+from rssa_storage.rssadb.repositories.study_admin import PreShuffledMovieRepository as BasePreShuffledMovieRepository
+from sqlalchemy import select
+
+
+class PreShuffledMovieRepository(BasePreShuffledMovieRepository):
+    """Pre-shuffled movie list repository with the lookups used by enrollment."""
+
+    async def get_list_ids(self, subset_desc: str) -> list[uuid.UUID]:
+        """Fetch the ids of the pre-shuffled lists of a movie subset, without loading the lists themselves.
+
+        Args:
+            subset_desc: The movie subset the lists were shuffled from.
+
+        Returns:
+            The ids of the subset's lists.
+        """
+        return list(
+            await self.db.scalars(
+                select(PreShuffledMovieList.id).where(PreShuffledMovieList.subset_desc == subset_desc)
+            )
+        )
@@ -0,0 +1,68 @@
+"""Repositories for study components."""
+
+import uuid
+
+from rssa_storage.rssadb.models.study_components import Study, StudyAuthorization, StudyStep
+from rssa_storage.rssadb.repositories.study_components import StudyRepository as BaseStudyRepository
+from sqlalchemy import select
+
+
+class StudyRepository(BaseStudyRepository):
+    """Study repository with the lookups used by the access checks and by enrollment."""
+
+    async def get_owner_and_role(
+        self, study_id: uuid.UUID, user_id: uuid.UUID
+    ) -> tuple[uuid.UUID | None, str | None] | None:
+        """Fetch a study's owner together with the role a user was authorized for, in one joined query.
+
+        Args:
+            study_id: The UUID of the study.
+            user_id: The UUID of the user.
+
+        Returns:
+            The owner id and the user's role (None without an authorization), or None if the study does not exist.
+        """
+        stmt = (
+            select(Study.owner_id, StudyAuthorization.role)
+            .outerjoin(
+                StudyAuthorization,
+                (StudyAuthorization.study_id == Study.id) & (StudyAuthorization.user_id == user_id),
+            )
+            .where(Study.id == study_id)
+        )
+        row = (await self.db.execute(stmt)).first()
+        if row is None:
+            return None
+        owner_id, role = row
+        return owner_id, role
+
+    async def get_component_study_id(self, model: type, component_id: uuid.UUID) -> uuid.UUID | None:
+        """Fetch the id of the study a component belongs to.
+
+        Args:
+            model: The component model; it must have a `study_id` column.
+            component_id: The UUID of the component.
+
+        Returns:
+            The UUID of the owning study, or None if the component does not exist.
+        """
+        return (await self.db.execute(select(model.study_id).where(model.id == component_id))).scalar()
+
+    async def get_dataset_subset_and_step_ids(self, study_id: uuid.UUID) -> tuple[str | None, list[uuid.UUID]] | None:
+        """Fetch the movie subset a study draws from and the ids of its steps, in step order.
+
+        Args:
+            study_id: The UUID of the study.
+
+        Returns:
+            The dataset subset (None when the study does not set one) and the step ids, or None if the study does not
+            exist.
+        """
+        row = (await self.db.execute(select(Study.dataset_subset).where(Study.id == study_id))).first()
+        if row is None:
+            return None
+
+        step_ids = await self.db.scalars(
+            select(StudyStep.id).where(StudyStep.study_id == study_id).order_by(StudyStep.order_position)
+        )
+        return row.dataset_subset, list(step_ids)
@@ -0,0 +1,124 @@
+"""Repositories for study participants."""
+
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from rssa_storage.rssadb.models.study_participants import Demographic, ParticipantStudySession, StudyParticipant
+from rssa_storage.rssadb.repositories.study_participants import (
+    ParticipantDemographicRepository as BaseParticipantDemographicRepository,
+)
+from rssa_storage.rssadb.repositories.study_participants import (
+    ParticipantStudySessionRepository as BaseParticipantStudySessionRepository,
+)
+from rssa_storage.rssadb.repositories.study_participants import (
+    StudyParticipantRepository as BaseStudyParticipantRepository,
+)
+from sqlalchemy import Date, Row, case, cast, func, select, update
+
+
+class StudyParticipantRepository(BaseStudyParticipantRepository):
+    """Study participant repository with the counts behind the study statistics."""
+
+    async def count_by_stats_bucket(self, study_id: uuid.UUID) -> Sequence[Row[Any]]:
+        """Count a study's participants that were not discarded, grouped by what the study statistics break down by.
+
+        Args:
+            study_id: The UUID of the study.
+
+        Returns:
+            Rows of `study_condition_id`, `current_status`, `enrolled_on` (the UTC day of enrollment), `is_verified`
+            and `count`.
+        """
+        enrolled_on = cast(func.timezone('UTC', StudyParticipant.created_at), Date).label('enrolled_on')
+        stmt = (
+            select(
+                StudyParticipant.study_condition_id,
+                StudyParticipant.current_status,
+                enrolled_on,
+                StudyParticipant.is_verified,
+                func.count().label('count'),
+            )
+            .where(StudyParticipant.study_id == study_id, StudyParticipant.discarded.is_(False))
+            .group_by(
+                StudyParticipant.study_condition_id,
+                StudyParticipant.current_status,
+                enrolled_on,
+                StudyParticipant.is_verified,
+            )
+        )
+        result = await self.db.execute(stmt)
+        return result.all()
+
+
+class ParticipantDemographicRepository(BaseParticipantDemographicRepository):
+    """Demographic repository with the per-study answer counts."""
+
+    async def count_answers_by_field(self, study_id: uuid.UUID, fields: Sequence[str]) -> list[tuple[str, Any, int]]:
+        """Count how many of a study's participants gave each answer, for every field, in one GROUPING SETS query.
+
+        Args:
+            study_id: The UUID of the study.
+            fields: The demographic columns to count the answers of.
+
+        Returns:
+            (field, answer, count) for every distinct answer of every field; missing answers come back as None.
+        """
+        columns = [getattr(Demographic, field) for field in fields]
+        stmt = (
+            select(*columns, func.grouping(*columns).label('grouping_id'), func.count().label('count'))
+            .join(StudyParticipant, StudyParticipant.id == Demographic.study_participant_id)
+            .where(StudyParticipant.study_id == study_id)
+            .group_by(func.grouping_sets(*columns))
+        )
+        result = await self.db.execute(stmt)
+
+        # GROUPING() sets a bit for every column left out of the row's grouping set, first column highest.
+        all_bits = (1 << len(fields)) - 1
+        index_by_grouping_id = {all_bits ^ (1 << (len(fields) - 1 - i)): i for i in range(len(fields))}
+        counts = []
+        for row in result.all():
+            index = index_by_grouping_id[row.grouping_id]
+            counts.append((fields[index], row[index], row.count))
+        return counts
+
+
+class ParticipantStudySessionRepository(BaseParticipantStudySessionRepository):
+    """Participant study session repository with the resume code lookup."""
+
+    async def extend_by_resume_code(
+        self,
+        resume_code: str,
+        now: datetime,
+        max_age: timedelta,
+        extension: timedelta,
+        study_id: uuid.UUID | None = None,
+    ) -> ParticipantStudySession | None:
+        """Fetch the session a resume code belongs to and extend its expiry, in a single UPDATE ... RETURNING.
+
+        Args:
+            resume_code: The code the participant entered.
+            now: The time the code was entered.
+            max_age: Sessions created longer ago than this do not match.
+            extension: How long from `now` an active session is extended to; inactive sessions are left unchanged.
+            study_id: When given, only sessions of this study's participants match.
+
+        Returns:
+            The session, or None if no session matches.
+        """
+        model = ParticipantStudySession
+        stmt = (
+            update(model)
+            .where(model.resume_code == resume_code, model.created_at > now - max_age)
+            .values(expires_at=case((model.is_active, now + extension), else_=model.expires_at))
+            .returning(model)
+        )
+        if study_id is not None:
+            stmt = stmt.where(
+                model.study_participant_id.in_(select(StudyParticipant.id).where(StudyParticipant.study_id == study_id))
+            )
+        result = await self.db.scalars(
+            stmt, execution_options={'populate_existing': True, 'synchronize_session': False}
+        )
+        return result.first()
@@ -0,0 +1,26 @@
+"""Repositories for survey components."""
+
+import uuid
+from collections.abc import Iterable
+
+from rssa_storage.rssadb.models.survey_constructs import SurveyItem
+from rssa_storage.rssadb.repositories.survey_components import SurveyItemRepository as BaseSurveyItemRepository
+from sqlalchemy import select
+
+
+class SurveyItemRepository(BaseSurveyItemRepository):
+    """Survey item repository with the construct lookup used by page submissions."""
+
+    async def get_construct_ids(self, item_ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, uuid.UUID]:
+        """Fetch the construct of every given survey item with a single `IN` query.
+
+        Args:
+            item_ids: The ids to look up; ids that are not survey items are left out of the result.
+
+        Returns:
+            The construct id of each survey item, by item id.
+        """
+        result = await self.db.execute(
+            select(SurveyItem.id, SurveyItem.survey_construct_id).where(SurveyItem.id.in_(item_ids))
+        )
+        return dict(result.all())
@@ -3,7 +3,7 @@
 import uuid
 from typing import Any
 
-from pydantic import BaseModel, computed_field
+from pydantic import BaseModel, computed_field, model_validator
 
 from rssa_api.data.schemas.base_schemas import DBMixin, VersionMixin
 
@@ -91,6 +91,31 @@ class ParticipantRatingBase(BaseModel, ParticipantResponseContextMixin):
     rated_item: RatedItem
 
 
+class RatedItemUpsert(RatedItem):
+    """Schema for one rating in a batch upsert.
+
+    `id` and `version` identify an existing rating to update; ratings without them are created.
+    """
+
+    id: uuid.UUID | None = None
+    version: int | None = None
+
+
+class ParticipantRatingBatch(BaseModel, ParticipantResponseContextMixin):
+    """Schema for creating or updating several ratings that share the same context."""
+
+    rated_items: list[RatedItemUpsert]
+
+    @model_validator(mode='after')
+    def _unique_items(self) -> 'ParticipantRatingBatch':
+        """Rejects batches that rate an item, or update a rating, more than once."""
+        item_ids = [rated_item.item_id for rated_item in self.rated_items]
+        ids = [rated_item.id for rated_item in self.rated_items if rated_item.id is not None]
+        if len(set(item_ids)) != len(item_ids) or len(set(ids)) != len(ids):
+            raise ValueError('Each item and rating id may only appear once in a batch.')
+        return self
+
+
 class MovieLensRating(BaseModel):
     """Schema for MovieLens rating."""
 
@@ -178,3 +203,30 @@ class ParticipantRatingUpdate(VersionMixin, DBMixin):
     """Schema for updating a participant rating."""
 
     rated_item: RatedItem
+
+
+class SurveyPageResponsesCreate(BaseModel):
+    """Schema for submitting every response on a survey page in one request.
+
+    Survey items and attention checks both arrive as `UnifiedItemResponsePayload`; the service tells them apart.
+    """
+
+    survey_items: list[UnifiedItemResponsePayload] = []
+    text_responses: list[ParticipantFreeformResponseCreate] = []
+    ratings: list[ParticipantRatingBase] = []
+
+
+class SurveyPageResponsesRead(BaseModel):
+    """Schema for the responses created by a survey page submission."""
+
+    survey_items: list[ParticipantSurveyResponseRead] = []
+    attention_checks: list[ParticipantAttentionCheckResponseRead] = []
+    text_responses: list[ParticipantFreeformResponseRead] = []
+    ratings: list[ParticipantRatingRead] = []
+
+
+class ParticipantRatingBatchResult(BaseModel):
+    """Schema for the outcome of a batch rating upsert."""
+
+    ratings: list[ParticipantRatingRead] = []
+    conflicts: list[uuid.UUID] = []
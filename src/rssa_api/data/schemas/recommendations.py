@@ -1,5 +1,6 @@
 """Schemas for recommendations."""
 
+from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, Field
@@ -62,6 +63,9 @@ class ResponseWrapper(BaseModel):
 
     response_type: Literal['standard', 'community_advisors', 'community_comparison']
     items: list[RecUnionType]
+    fallback_reason: Literal['deadline', 'error', 'circuit_open'] | None = Field(
+        None, description='Set when the recommender could not answer in time and a precomputed ranking was served.'
+    )
 
 
 EnrichedRecUnionType = (
@@ -82,3 +86,22 @@ class TuningPayload(BaseModel):
 
     sliders: dict[str, float] = Field(default_factory=dict)
     filters: dict[str, list[str]] = Field(default_factory=dict)
+
+
+class RegistryModelSchema(BaseModel):
+    """Schema for a model loaded in the recommendation registry."""
+
+    key: str
+    type: str
+    version: str
+    loaded_at: datetime
+    load_seconds: float
+    nbytes: int = Field(description='Size of the artifact held in memory (memory-mapped bundles count in full).')
+    previous_version: str | None = None
+    previous_nbytes: int = 0
+    pinned: bool = False
+    deadline_seconds: float | None = None
+    circuit_state: Literal['closed', 'open', 'half_open'] | None = None
+    fallback: str | None = None
+    hedged_requests: int = 0
+    fallback_responses: int = 0
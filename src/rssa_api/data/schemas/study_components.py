@@ -1,7 +1,7 @@
 """Schemas for study components."""
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import ClassVar, Generic, Literal, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field, computed_field
@@ -31,6 +31,19 @@ class ConditionCountSchema(BaseModel):
     participant_count: int
 
 
+class StudyStats(BaseModel):
+    """Participant statistics of a study; discarded participants are not counted."""
+
+    study_id: uuid.UUID
+    total_participants: int
+    verified_participants: int
+    completed_participants: int
+    participants_by_condition: dict[uuid.UUID, int]
+    verified_participants_by_condition: dict[uuid.UUID, int]
+    participants_by_status: dict[str, int]
+    participants_by_day: dict[date, int]
+
+
 T = TypeVar('T', bound=BaseModel)
 
 
@@ -4,7 +4,7 @@ from typing import Annotated
 
 from fastapi import Depends
 from rssa_storage.moviedb.repositories import MovieRepository
-from rssa_storage.rssadb.repositories.study_admin import ApiKeyRepository, PreShuffledMovieRepository, UserRepository
+from rssa_storage.rssadb.repositories.study_admin import ApiKeyRepository, UserRepository
 from rssa_storage.rssadb.repositories.study_components import (
     FeedbackRepository,
 )
@@ -18,6 +18,7 @@ from rssa_storage.rssadb.repositories.survey_components import (
     SurveyScaleRepository,
 )
 
+from rssa_api.data.repositories.study_admin import PreShuffledMovieRepository
 from rssa_api.data.services.movie_service import MovieService
 from rssa_api.data.services.response_service import ParticipantResponseServiceDep
 from rssa_api.data.services.study_admin import ApiKeyService, PreShuffledMovieService, UserService
@@ -24,22 +24,29 @@ from rssa_storage.rssadb.repositories.participant_responses import (
 )
 from rssa_storage.rssadb.repositories.study_participants import StudyParticipantRepository
 from rssa_storage.shared import RepoQueryOptions
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from rssa_api.data.repositories.survey_components import SurveyItemRepository
 from rssa_api.data.schemas.participant_response_schemas import (
     ParticipantAttentionCheckResponseCreate,
     ParticipantAttentionCheckResponseRead,
     ParticipantFreeformResponseCreate,
     ParticipantFreeformResponseRead,
     ParticipantRatingBase,
+    ParticipantRatingBatch,
+    ParticipantRatingBatchResult,
     ParticipantRatingRead,
     ParticipantStudyInteractionResponseCreate,
     ParticipantStudyInteractionResponseRead,
     ParticipantSurveyResponseCreate,
     ParticipantSurveyResponseRead,
+    SurveyPageResponsesCreate,
+    SurveyPageResponsesRead,
 )
 from rssa_api.data.services.base_service import BaseService
 from rssa_api.data.sources.rssadb import get_service
-from rssa_api.data.utility import convert_datetime_to_str, convert_uuids_to_str
+from rssa_api.data.utility import to_json_safe
 
 ResponseCreateUnionType = (
     ParticipantSurveyResponseCreate
@@ -79,6 +86,7 @@ class ParticipantResponseService(BaseService[StudyParticipant, StudyParticipantR
         text_repo: Repository for freeform text responses.
         rating_repo: Repository for participant ratings.
         interact_response_repo: Repository for study interaction responses.
+        survey_item_repo: Repository for the survey items, used to tell them apart from attention checks.
     """
 
     def __init__(
@@ -89,6 +97,7 @@ class ParticipantResponseService(BaseService[StudyParticipant, StudyParticipantR
         content_rating_repo: ParticipantRatingRepository,
         interact_response_repo: ParticipantStudyInteractionResponseRepository,
         ac_response_repo: ParticipantAttentionCheckResponseRepository,
+        survey_item_repo: SurveyItemRepository,
     ):
         """Initialize the ParticipantResponseService with the necessary repositories.
 
@@ -99,6 +108,7 @@ class ParticipantResponseService(BaseService[StudyParticipant, StudyParticipantR
             content_rating_repo: Repository for participant ratings.
             interact_response_repo: Repository for study interaction responses.
             ac_response_repo: Repository for participant attention check.
+            survey_item_repo: Repository for the survey items responses are given to.
         """
         super().__init__(participant_repo)
         self.item_repo = item_response_repo
@@ -106,6 +116,7 @@ class ParticipantResponseService(BaseService[StudyParticipant, StudyParticipantR
         self.rating_repo = content_rating_repo
         self.interact_repo = interact_response_repo
         self.ac_repo = ac_response_repo
+        self.survey_item_repo = survey_item_repo
 
         self.strategy_map = {
             ResponseType.SURVEY_ITEM: (item_response_repo, ParticipantSurveyResponseRead),
@@ -204,6 +215,232 @@ class ParticipantResponseService(BaseService[StudyParticipant, StudyParticipantR
         repo, _ = self._get_strategy(response_type)
         return await repo.update_response(response_id, update_dict, client_version)
 
+    async def create_page_responses(
+        self, page_payload: SurveyPageResponsesCreate, study_id: uuid.UUID, participant_id: uuid.UUID
+    ) -> SurveyPageResponsesRead:
+        """Creates every response submitted for a survey page.
+
+        Survey items are told apart from attention checks with a single `IN` query against the survey items, and each
+        response type is then written with one multi-row INSERT ... RETURNING, so the number of statements does not
+        grow with the number of items on the page. All statements share the request's session and transaction.
+
+        Args:
+            page_payload: The survey item, attention check, text and rating responses for the page.
+            study_id: The ID of the study.
+            participant_id: The ID of the participant.
+
+        Returns:
+            The created responses, with their ids and versions, grouped by type.
+        """
+        construct_ids: dict[uuid.UUID, uuid.UUID] = {}
+        item_ids = {item.item_id for item in page_payload.survey_items}
+        if item_ids:
+            construct_ids = await self.survey_item_repo.get_construct_ids(item_ids)
+
+        survey_rows = []
+        ac_rows = []
+        for item in page_payload.survey_items:
+            context = {
+                'study_id': study_id,
+                'study_participant_id': participant_id,
+                'study_step_id': item.study_step_id,
+                'study_step_page_id': item.study_step_page_id,
+                'context_tag': item.context_tag,
+                'survey_scale_id': item.survey_scale_id,
+            }
+            if item.item_id in construct_ids:
+                survey_rows.append(
+                    {
+                        **context,
+                        'survey_construct_id': construct_ids[item.item_id],
+                        'survey_item_id': item.item_id,
+                        'survey_scale_level_id': item.survey_scale_level_id,
+                    }
+                )
+            else:
+                ac_rows.append(
+                    {
+                        **context,
+                        'study_attention_check_id': item.item_id,
+                        'responded_survey_scale_level_id': item.survey_scale_level_id,
+                    }
+                )
+
+        rating_rows = [
+            {
+                'study_id': study_id,
+                'study_participant_id': participant_id,
+                'study_step_id': rating.study_step_id,
+                'study_step_page_id': rating.study_step_page_id,
+                'context_tag': rating.context_tag,
+                'item_id': rating.rated_item.item_id,
+                'item_table_name': 'movies',
+                'rating': rating.rated_item.rating,
+                'scale_min': 1,
+                'scale_max': 5,
+            }
+            for rating in page_payload.ratings
+        ]
+
+        # Text responses are unique per (study_id, study_participant_id, context_tag), the last one in the batch wins.
+        now = datetime.now(UTC)
+        text_rows = {
+            text.context_tag: {
+                'study_id': study_id,
+                'study_participant_id': participant_id,
+                'study_step_id': text.study_step_id,
+                'context_tag': text.context_tag,
+                'response_text': text.response_text,
+                'updated_at': now,
+                'version': 1,
+            }
+            for text in page_payload.text_responses
+        }
+
+        created_texts = []
+        if text_rows:
+            stmt = pg_insert(ParticipantFreeformResponse).values(list(text_rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['study_id', 'study_participant_id', 'context_tag'],
+                set_={
+                    'response_text': stmt.excluded.response_text,
+                    # A response sent without its step keeps the one it was stored with.
+                    'study_step_id': func.coalesce(
+                        stmt.excluded.study_step_id, ParticipantFreeformResponse.study_step_id
+                    ),
+                    'updated_at': stmt.excluded.updated_at,
+                    'version': ParticipantFreeformResponse.version + 1,
+                },
+            )
+            created_texts = await self._insert_returning(stmt, ParticipantFreeformResponse)
+
+        return SurveyPageResponsesRead(
+            survey_items=[
+                ParticipantSurveyResponseRead.model_validate(row)
+                for row in await self._insert_many(ParticipantSurveyResponse, survey_rows)
+            ],
+            attention_checks=[
+                ParticipantAttentionCheckResponseRead.model_validate(row)
+                for row in await self._insert_many(ParticipantAttentionCheckResponse, ac_rows)
+            ],
+            text_responses=[ParticipantFreeformResponseRead.model_validate(row) for row in created_texts],
+            ratings=[
+                ParticipantRatingRead.model_validate(row)
+                for row in await self._insert_many(ParticipantRating, rating_rows)
+            ],
+        )
+
+    async def upsert_ratings(
+        self, rating_batch: ParticipantRatingBatch, study_id: uuid.UUID, participant_id: uuid.UUID
+    ) -> ParticipantRatingBatchResult:
+        """Creates or updates a batch of content ratings with a single INSERT ... ON CONFLICT DO UPDATE.
+
+        One SELECT first resolves each rating to the participant's stored row: the row with the given `id`, or else
+        the row rating the same item in the same context. A rating with a known `id` updates its row only when the
+        stored version still matches the client version; a rating without one (or with an unknown `id`) updates the
+        item's row unconditionally, so re-sent ratings never create duplicates. Ratings for unrated items are created
+        at version 1. Updated rows get their version incremented.
+
+        Args:
+            rating_batch: The ratings and their shared step, page and context tag.
+            study_id: The ID of the study.
+            participant_id: The ID of the participant.
+
+        Returns:
+            The created and updated ratings, and the item ids whose update was rejected by the version check.
+        """
+        if not rating_batch.rated_items:
+            return ParticipantRatingBatchResult()
+
+        stored = await self._stored_ratings(rating_batch, participant_id)
+        by_id = {row.id: row for row in stored}
+        by_item = {row.item_id: row for row in stored if row.context_tag == rating_batch.context_tag}
+
+        rows = []
+        conflicts = []
+        claimed: set[uuid.UUID] = set()
+        for rated_item in rating_batch.rated_items:
+            known = by_id.get(rated_item.id) if rated_item.id else None
+            if known is not None:
+                row_id = known.id
+                version = rated_item.version if rated_item.version is not None else known.version
+            elif (existing := by_item.get(rated_item.item_id)) is not None:
+                row_id, version = existing.id, existing.version
+            else:
+                row_id, version = uuid.uuid4(), 1
+
+            if row_id in claimed:  # another rating of this batch already targets the row
+                conflicts.append(rated_item.item_id)
+                continue
+            claimed.add(row_id)
+            rows.append(
+                {
+                    'id': row_id,
+                    'study_id': study_id,
+                    'study_participant_id': participant_id,
+                    'study_step_id': rating_batch.study_step_id,
+                    'study_step_page_id': rating_batch.study_step_page_id,
+                    'context_tag': rating_batch.context_tag,
+                    'item_id': rated_item.item_id,
+                    'item_table_name': 'movies',
+                    'rating': rated_item.rating,
+                    'scale_min': 1,
+                    'scale_max': 5,
+                    'version': version,
+                }
+            )
+
+        stmt = pg_insert(ParticipantRating).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ParticipantRating.id],
+            set_={
+                'item_id': stmt.excluded.item_id,
+                'rating': stmt.excluded.rating,
+                'version': ParticipantRating.version + 1,
+            },
+            where=(ParticipantRating.version == stmt.excluded.version)
+            & (ParticipantRating.study_participant_id == stmt.excluded.study_participant_id),
+        )
+        saved = await self._insert_returning(stmt, ParticipantRating)
+
+        saved_ids = {rating.id for rating in saved}
+        return ParticipantRatingBatchResult(
+            ratings=[ParticipantRatingRead.model_validate(rating) for rating in saved],
+            conflicts=conflicts + [row['item_id'] for row in rows if row['id'] not in saved_ids],
+        )
+
+    async def _stored_ratings(self, rating_batch: ParticipantRatingBatch, participant_id: uuid.UUID) -> list[Any]:
+        """The participant's stored ratings that the batch refers to, by id or by item and context."""
+        ids = [rated_item.id for rated_item in rating_batch.rated_items if rated_item.id]
+        item_ids = [rated_item.item_id for rated_item in rating_batch.rated_items]
+        result = await self.repo.db.execute(
+            select(
+                ParticipantRating.id,
+                ParticipantRating.item_id,
+                ParticipantRating.context_tag,
+                ParticipantRating.version,
+            ).where(
+                ParticipantRating.study_participant_id == participant_id,
+                or_(
+                    ParticipantRating.id.in_(ids),
+                    (ParticipantRating.context_tag == rating_batch.context_tag)
+                    & ParticipantRating.item_id.in_(item_ids),
+                ),
+            )
+        )
+        return list(result.all())
+
+    async def _insert_many(self, model: type, rows: list[dict[str, Any]]) -> list[Any]:
+        """Inserts rows with a single multi-row statement and returns the created instances."""
+        if not rows:
+            return []
+        return await self._insert_returning(insert(model).values(rows), model)
+
+    async def _insert_returning(self, stmt: Any, model: type) -> list[Any]:
+        """Executes an INSERT statement and returns the inserted (or upserted) rows as model instances."""
+        result = await self.repo.db.scalars(stmt.returning(model), execution_options={'populate_existing': True})
+        return list(result.all())
+
     @singledispatchmethod
     async def create_response(  # noqa: D102
         self, response_data: ResponseCreateUnionType, study_id: uuid.UUID, participant_id: uuid.UUID
@@ -235,16 +472,13 @@ class ParticipantResponseService(BaseService[StudyParticipant, StudyParticipantR
     async def _(
         self, response_data: ParticipantStudyInteractionResponseCreate, study_id: uuid.UUID, participant_id: uuid.UUID
     ) -> ParticipantStudyInteractionResponseRead:
-        raw_dict = response_data.payload_json.model_dump()
-        json_safe_dict = convert_uuids_to_str(raw_dict)
-        json_safe_dict = convert_datetime_to_str(json_safe_dict)
         int_response = ParticipantStudyInteractionResponse(
             study_id=study_id,
             study_participant_id=participant_id,
             study_step_id=response_data.study_step_id,
             study_step_page_id=response_data.study_step_page_id,
             context_tag=response_data.context_tag,
-            payload_json=json_safe_dict,
+            payload_json=to_json_safe(response_data.payload_json),
         )
         await self.interact_repo.create(int_response)
         return ParticipantStudyInteractionResponseRead.model_validate(int_response)
@@ -338,6 +572,7 @@ ParticipantResponseServiceDep = Annotated[
             ParticipantRatingRepository,
             ParticipantStudyInteractionResponseRepository,
             ParticipantAttentionCheckResponseRepository,
+            SurveyItemRepository,
         )
     ),
 ]
@@ -6,6 +6,7 @@ from typing import Annotated, Any
 
 import structlog
 from fastapi import Depends
+from pydantic import BaseModel
 from rssa_storage.rssadb.models.study_components import (
     Study,
     StudyAuthorization,
@@ -23,31 +24,72 @@ from rssa_storage.rssadb.repositories.study_components import (
     StudyAttentionCheckRepository,
     StudyAuthorizationRepository,
     StudyConditionRepository,
-    StudyRepository,
     StudyStepPageContentRepository,
     StudyStepPageRepository,
     StudyStepRepository,
 )
-from rssa_storage.rssadb.repositories.study_participants import (
-    ParticipantDemographicRepository,
-    ParticipantRecommendationContextRepository,
-    StudyParticipantRepository,
-)
+from rssa_storage.rssadb.repositories.study_participants import ParticipantRecommendationContextRepository
 from rssa_storage.shared import RepoQueryOptions, merge_repo_query_options
 
+from rssa_api.core.condition_allocator import condition_allocator
 from rssa_api.core.queue import BackgroundWriteCommand, background_write_queue
+from rssa_api.core.study_stats import (
+    COMPLETED_STATUS,
+    DEFAULT_PARTICIPANT_STATUS,
+    ParticipantBucket,
+    participant_bucket,
+    study_stats,
+)
+from rssa_api.core.ttl_cache import TTLCache
+from rssa_api.data.repositories.study_components import StudyRepository
+from rssa_api.data.repositories.study_participants import (
+    ParticipantDemographicRepository,
+    StudyParticipantRepository,
+)
 from rssa_api.data.schemas.participant_schemas import DemographicsCreate, DemographicsUpdate
 from rssa_api.data.schemas.preferences_schemas import RecommendationContextBaseSchema, RecommendationContextSchema
-from rssa_api.data.schemas.study_components import ConditionCountSchema, NavigationWrapper
+from rssa_api.data.schemas.study_components import ConditionCountSchema, NavigationWrapper, StudyStats
 from rssa_api.data.services.base_ordered_service import BaseOrderedService
 from rssa_api.data.services.base_scoped_service import BaseScopedService, SchemaType
 from rssa_api.data.services.base_service import BaseService
 from rssa_api.data.services.navigation_mixin import NavigationMixin
 from rssa_api.data.sources.rssadb import get_service
-from rssa_api.data.utility import extract_load_strategies
+from rssa_api.data.utility import extract_load_strategies, to_json_safe
 
 logger = structlog.getLogger()
 
+STUDY_ROLE_LEVELS = {'viewer': 0, 'editor': 1, 'admin': 2, 'owner': 3}
+
+# (study_id, user_id) -> role, None when the user has no access. Kept short so that changes made by another process
+# are picked up quickly; changes made through StudyService invalidate their entries directly.
+study_role_cache: TTLCache[tuple[uuid.UUID, uuid.UUID], str | None] = TTLCache(ttl_seconds=30)
+
+# component id -> id of the study it belongs to. Components never move between studies, so entries do not expire.
+component_study_cache: TTLCache[uuid.UUID, uuid.UUID] = TTLCache(ttl_seconds=None, maxsize=16384)
+
+# Participant columns the study statistics are bucketed by.
+PARTICIPANT_STATS_FIELDS = frozenset({'study_condition_id', 'current_status', 'is_verified', 'discarded'})
+
+DEMOGRAPHIC_SUMMARY_FIELDS = ('age_range', 'gender', 'race', 'education')
+
+# study id -> {field: {category: count}}. Demographic writes made through StudyParticipantService drop the entry; the
+# TTL reconciles it with writes made by other processes.
+demographic_summary_cache: TTLCache[uuid.UUID, dict[str, dict[str, int]]] = TTLCache(ttl_seconds=300)
+
+
+def _summary_category(value: Any) -> str:
+    return value if value else 'Unknown'
+
+
+def _invalidate_demographic_summary(study_id: uuid.UUID | None) -> None:
+    """Drops a study's cached demographic summary after one of its participants' answers changed.
+
+    The entry is dropped rather than patched: the write is not committed yet, and a patched entry would keep counting
+    it after a rollback.
+    """
+    if study_id is not None:
+        demographic_summary_cache.invalidate(study_id)
+
 
 class StudyService(BaseService[Study, StudyRepository]):
     """Service for managing studies."""
@@ -56,6 +98,61 @@ class StudyService(BaseService[Study, StudyRepository]):
         """Initialize the study service."""
         super().__init__(repo)
         self.auth_repo = auth_repo
+        self._request_roles: dict[tuple[uuid.UUID, uuid.UUID], str | None] = {}
+
+    async def get_study_role(self, study_id: uuid.UUID, user_id: uuid.UUID) -> str | None:
+        """Resolve the role of a user on a study.
+
+        Roles are resolved with a single query joining the study owner and the user's authorization, then cached for
+        the rest of the request (the service lives for one request) and process-wide for a short TTL.
+
+        Args:
+            study_id: The UUID of the study.
+            user_id: The UUID of the user.
+
+        Returns:
+            'owner' for the study owner, the authorized role otherwise, or None if the user has no access.
+        """
+        key = (study_id, user_id)
+        if key in self._request_roles:
+            return self._request_roles[key]
+
+        hit, role = study_role_cache.lookup(key)
+        if not hit:
+            role = await self._fetch_study_role(study_id, user_id)
+            study_role_cache.set(key, role)
+
+        self._request_roles[key] = role
+        return role
+
+    async def _fetch_study_role(self, study_id: uuid.UUID, user_id: uuid.UUID) -> str | None:
+        row = await self.repo.get_owner_and_role(study_id, user_id)
+        if row is None:
+            return None
+
+        owner_id, role = row
+        if owner_id == user_id:
+            return 'owner'
+        return role
+
+    async def get_component_study_id(self, model: type, component_id: uuid.UUID) -> uuid.UUID | None:
+        """Resolve the study a component (step, page, condition, ...) belongs to.
+
+        Args:
+            model: The component model; it must have a `study_id` column.
+            component_id: The UUID of the component.
+
+        Returns:
+            The UUID of the owning study, or None if the component does not exist.
+        """
+        hit, study_id = component_study_cache.lookup(component_id)
+        if hit:
+            return study_id
+
+        study_id = await self.repo.get_component_study_id(model, component_id)
+        if study_id is not None:
+            component_study_cache.set(component_id, study_id)
+        return study_id
 
     async def check_study_access(self, study_id: uuid.UUID, user_id: uuid.UUID, min_role: str | None = None) -> bool:
         """Check if a user has access to a specific study with a minimum role.
@@ -70,25 +167,12 @@ class StudyService(BaseService[Study, StudyRepository]):
         Returns:
             True if the user has access and meets the role requirement, False otherwise.
         """
-        roles_hierarchy = {'viewer': 0, 'editor': 1, 'admin': 2, 'owner': 3}
-        min_level = roles_hierarchy.get(min_role, 0) if min_role else 0
-
-        study = await self.repo.find_one(RepoQueryOptions(filters={'id': study_id}, load_columns=['id', 'owner_id']))
-        if not study:
-            return False
-
-        if study.owner_id == user_id:
-            return True
-
-        auth_record = await self.auth_repo.find_one(
-            RepoQueryOptions(filters={'study_id': study_id, 'user_id': user_id})
-        )
-
-        if not auth_record:
+        role = await self.get_study_role(study_id, user_id)
+        if role is None:
             return False
 
-        user_level = roles_hierarchy.get(auth_record.role, 0)
-        return user_level >= min_level
+        min_level = STUDY_ROLE_LEVELS.get(min_role, 0) if min_role else 0
+        return STUDY_ROLE_LEVELS.get(role, 0) >= min_level
 
     async def get_paged_for_authorized_user(
         self,
@@ -132,7 +216,9 @@ class StudyService(BaseService[Study, StudyRepository]):
     async def add_study_authorization(self, study_id: uuid.UUID, user_id: uuid.UUID, role: str) -> StudyAuthorization:
         """Add authorization for a user to a study."""
         auth = StudyAuthorization(study_id=study_id, user_id=user_id, role=role)
-        return await self.auth_repo.create(auth)
+        created = await self.auth_repo.create(auth)
+        self._invalidate_role(study_id, user_id)
+        return created
 
     async def remove_study_authorization(self, study_id: uuid.UUID, user_id: uuid.UUID) -> None:
         """Remove authorization for a user from a study."""
@@ -141,6 +227,18 @@ class StudyService(BaseService[Study, StudyRepository]):
         )
         if existing:
             await self.auth_repo.delete(existing.id)
+        self._invalidate_role(study_id, user_id)
+
+    async def delete(self, id: uuid.UUID) -> None:
+        """Delete a study and forget every cached role and statistic on it."""
+        await super().delete(id)
+        study_role_cache.invalidate_where(lambda key: key[0] == id)
+        study_stats.invalidate(id)
+        self._request_roles = {key: role for key, role in self._request_roles.items() if key[0] != id}
+
+    def _invalidate_role(self, study_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        study_role_cache.invalidate((study_id, user_id))
+        self._request_roles.pop((study_id, user_id), None)
 
 
 class StudyConditionService(BaseScopedService[StudyCondition, StudyConditionRepository]):
@@ -158,6 +256,22 @@ class StudyConditionService(BaseScopedService[StudyCondition, StudyConditionRepo
         )
         return [ConditionCountSchema(**row._mapping) for row in condition_count_rows]
 
+    async def create(self, schema: BaseModel, *, owner_id: uuid.UUID | None = None, **kwargs) -> StudyCondition:
+        """Create a condition and rebalance enrollment across the study's conditions."""
+        condition = await super().create(schema, owner_id=owner_id, **kwargs)
+        condition_allocator.invalidate(condition.study_id)
+        return condition
+
+    async def update(self, id: uuid.UUID, update_dict: dict[str, Any]) -> None:
+        """Update a condition; enabling or disabling it changes which conditions enrollment balances over."""
+        await super().update(id, update_dict)
+        condition_allocator.invalidate_condition(id)
+
+    async def delete(self, id: uuid.UUID) -> None:
+        """Delete a condition and stop assigning participants to it."""
+        await super().delete(id)
+        condition_allocator.invalidate_condition(id)
+
 
 class StudyStepService(
     BaseOrderedService[StudyStep, StudyStepRepository],
@@ -269,13 +383,14 @@ class StudyParticipantService(BaseScopedService[StudyParticipant, StudyParticipa
         )
 
     async def create_demographic_info(
-        self, participant_id: uuid.UUID, demographic_data: DemographicsCreate
+        self, participant_id: uuid.UUID, demographic_data: DemographicsCreate, study_id: uuid.UUID | None = None
     ) -> DemographicsCreate:
         """Create demographic information for a participant.
 
         Args:
             participant_id: The UUID of the participant.
             demographic_data: The demographic data to create.
+            study_id: The participant's study, whose cached demographic summary is dropped when given.
 
         Returns:
             The created demographic information.
@@ -288,11 +403,12 @@ class StudyParticipantService(BaseScopedService[StudyParticipant, StudyParticipa
 
         demographic_obj = Demographic(**serialized_data)
         await self.demographics_repo.create(demographic_obj)
+        _invalidate_demographic_summary(study_id)
 
         return DemographicsCreate.model_validate(demographic_obj)
 
     async def upsert_demographic_info(
-        self, participant_id: uuid.UUID, demographic_data: DemographicsUpdate
+        self, participant_id: uuid.UUID, demographic_data: DemographicsUpdate, study_id: uuid.UUID | None = None
     ) -> DemographicsCreate:
 
         existing = await self.demographics_repo.find_one(
@@ -314,6 +430,7 @@ class StudyParticipantService(BaseScopedService[StudyParticipant, StudyParticipa
                 update_data['race'] = ';'.join(update_data['race'])
 
             updated_obj = await self.demographics_repo.update(existing.id, update_data)
+            _invalidate_demographic_summary(study_id)
             return DemographicsCreate.model_validate(updated_obj)
 
         else:
@@ -326,6 +443,7 @@ class StudyParticipantService(BaseScopedService[StudyParticipant, StudyParticipa
 
             new_obj = Demographic(**update_data)
             await self.demographics_repo.create(new_obj)
+            _invalidate_demographic_summary(study_id)
             return DemographicsCreate.model_validate(new_obj)
 
     async def update_demographic_info(
@@ -341,7 +459,11 @@ class StudyParticipantService(BaseScopedService[StudyParticipant, StudyParticipa
         Returns:
             True if the update was successful, False otherwise.
         """
-        return await self.demographics_repo.update_response(demographics_id, update_data, client_version)
+        updated = await self.demographics_repo.update_response(demographics_id, update_data, client_version)
+        if updated and any(field in update_data for field in DEMOGRAPHIC_SUMMARY_FIELDS):
+            # The study is not known here; let every cached summary be recomputed.
+            demographic_summary_cache.clear()
+        return updated
 
     async def get_demographic_info(
         self, participant_id: uuid.UUID, payload_schema: type[SchemaType]
@@ -372,32 +494,43 @@ class StudyParticipantService(BaseScopedService[StudyParticipant, StudyParticipa
         Returns:
             The created recommendation context.
         """
-        from rssa_api.data.utility import convert_datetime_to_str, convert_uuids_to_str
-
-        raw_dict = context_data.recommendations_json.model_dump()
-        json_safe_dict = convert_uuids_to_str(raw_dict)
-        json_safe_dict = convert_datetime_to_str(json_safe_dict)
         rec_ctx = ParticipantRecommendationContext(
             study_id=study_id,
             study_step_id=context_data.step_id,
             study_step_page_id=context_data.step_page_id,
             study_participant_id=participant_id,
             context_tag=context_data.context_tag,
-            recommendations_json=json_safe_dict,
+            recommendations_json=to_json_safe(context_data.recommendations_json),
         )
         await self.recommendation_context_repo.create(rec_ctx)
 
         return RecommendationContextSchema.model_validate(rec_ctx)
 
     async def get_study_demographic_summary(self, study_id: uuid.UUID) -> dict[str, dict[str, int]]:
-        fields_to_aggregate = ['age_range', 'gender', 'race', 'education']
-        summary = {}
+        """Get the distribution of each demographic field's answers in a study.
 
-        for field in fields_to_aggregate:
-            rows = await self.demographics_repo.get_aggregate_distribution(study_id, field)
+        The summary is served from a cache that demographic writes invalidate. On a miss, every distribution is
+        computed by a single GROUPING SETS query instead of one scan per field.
 
-            summary[field] = {(row.category if row.category else 'Unknown'): row.count for row in rows}
+        Args:
+            study_id: The UUID of the study.
 
+        Returns:
+            A mapping of field name to {category: participant count}; missing answers count as 'Unknown'.
+        """
+        hit, summary = demographic_summary_cache.lookup(study_id)
+        if not hit or summary is None:
+            summary = await self._compute_demographic_summary(study_id)
+            demographic_summary_cache.set(study_id, summary)
+        return {field: dict(counts) for field, counts in summary.items()}
+
+    async def _compute_demographic_summary(self, study_id: uuid.UUID) -> dict[str, dict[str, int]]:
+        counts = await self.demographics_repo.count_answers_by_field(study_id, DEMOGRAPHIC_SUMMARY_FIELDS)
+
+        summary: dict[str, dict[str, int]] = {field: {} for field in DEMOGRAPHIC_SUMMARY_FIELDS}
+        for field, answer, count in counts:
+            category = _summary_category(answer)
+            summary[field][category] = summary[field].get(category, 0) + count
         return summary
 
     async def get_recommndation_context_by_participant_context(
@@ -428,7 +561,78 @@ class StudyParticipantService(BaseScopedService[StudyParticipant, StudyParticipa
 
         return RecommendationContextSchema.model_validate(rec_ctx)
 
+    async def update(self, id: uuid.UUID, update_dict: dict[str, Any]) -> None:
+        """Update a participant and move them between the buckets of their study's statistics."""
+        if not PARTICIPANT_STATS_FIELDS.intersection(update_dict):
+            await super().update(id, update_dict)
+            return
+
+        participant = await self.repo.find_one(RepoQueryOptions(ids=[id]))
+        if participant is None:
+            await super().update(id, update_dict)
+            return
+
+        study_id = participant.study_id
+        previous, current = participant_bucket(participant), participant_bucket(participant, **update_dict)
+        await super().update(id, update_dict)
+        study_stats.record(study_id, previous, current)
+
+    async def get_study_stats(self, study_id: uuid.UUID) -> StudyStats:
+        """Get a study's participant statistics from its incrementally maintained counters.
+
+        Args:
+            study_id: The UUID of the study.
+
+        Returns:
+            Participant totals broken down by condition, status and day of enrollment.
+        """
+        buckets = await study_stats.get(study_id, lambda: self._load_participant_buckets(study_id))
+
+        stats = StudyStats(
+            study_id=study_id,
+            total_participants=0,
+            verified_participants=0,
+            completed_participants=0,
+            participants_by_condition={},
+            verified_participants_by_condition={},
+            participants_by_status={},
+            participants_by_day={},
+        )
+        for bucket, count in buckets.items():
+            stats.total_participants += count
+            stats.participants_by_status[bucket.status] = stats.participants_by_status.get(bucket.status, 0) + count
+            stats.participants_by_day[bucket.enrolled_on] = stats.participants_by_day.get(bucket.enrolled_on, 0) + count
+            if bucket.status == COMPLETED_STATUS:
+                stats.completed_participants += count
+            if bucket.condition_id is not None:
+                by_condition = stats.participants_by_condition
+                by_condition[bucket.condition_id] = by_condition.get(bucket.condition_id, 0) + count
+            if bucket.is_verified:
+                stats.verified_participants += count
+                if bucket.condition_id is not None:
+                    by_condition = stats.verified_participants_by_condition
+                    by_condition[bucket.condition_id] = by_condition.get(bucket.condition_id, 0) + count
+        return stats
+
+    async def _load_participant_buckets(self, study_id: uuid.UUID) -> list[tuple[ParticipantBucket, int]]:
+        rows = await self.repo.count_by_stats_bucket(study_id)
+        return [
+            (
+                ParticipantBucket(
+                    condition_id=row.study_condition_id,
+                    status=row.current_status or DEFAULT_PARTICIPANT_STATUS,
+                    enrolled_on=row.enrolled_on,
+                    is_verified=bool(row.is_verified),
+                ),
+                row.count,
+            )
+            for row in rows
+        ]
+
     async def count_participants_in_study(self, study_id: uuid.UUID, options: RepoQueryOptions | None) -> int:
+        if options is None:
+            return (await self.get_study_stats(study_id)).total_participants
+
         _options = RepoQueryOptions(filters={'study_id': study_id, 'discarded': False})
         if options:
             _options = merge_repo_query_options(options, _options)
@@ -1,8 +1,8 @@
 """Services related to the study participants."""
 
 import random
-import string
 import uuid
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
@@ -15,28 +15,107 @@ from rssa_storage.rssadb.models.study_participants import (
     ParticipantStudySession,
     StudyParticipant,
 )
-from rssa_storage.rssadb.repositories.study_admin import PreShuffledMovieRepository
 from rssa_storage.rssadb.repositories.study_components import FeedbackRepository, StudyConditionRepository
 from rssa_storage.rssadb.repositories.study_participants import (
-    ParticipantStudySessionRepository,
     StudyParticipantMovieSessionRepository,
     StudyParticipantRepository,
 )
 from rssa_storage.shared import RepoQueryOptions
-from sqlalchemy import func, select
-from sqlalchemy.exc import IntegrityError
-
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from rssa_api.core.condition_allocator import condition_allocator
+from rssa_api.core.resume_codes import resume_code_allocator
+from rssa_api.core.study_stats import participant_bucket, study_stats
+from rssa_api.core.ttl_cache import TTLCache
+from rssa_api.data.repositories.study_admin import PreShuffledMovieRepository
+from rssa_api.data.repositories.study_components import StudyRepository
+from rssa_api.data.repositories.study_participants import ParticipantStudySessionRepository
 from rssa_api.data.schemas.participant_response_schemas import FeedbackBaseSchema
 from rssa_api.data.schemas.participant_schemas import StudyParticipantCreate
 from rssa_api.data.services.base_service import BaseService
-from rssa_api.data.sources.rssadb import get_service
+from rssa_api.data.sources.rssadb import AsyncSessionLocal, get_service
+
+DEFAULT_DATASET_SUBSET = 'movielens-32M-default'
+
+
+@dataclass(frozen=True)
+class EnrollmentContext:
+    """Per-study data every enrollment needs, loaded once and shared between enrollments.
+
+    Attributes:
+        next_step_ids: Maps each step of the study to the step after it (None for the last step).
+        dataset_subset: The movie subset the study draws its pre-shuffled lists from.
+        shuffled_list_ids: The pre-shuffled movie lists available for that subset.
+    """
+
+    next_step_ids: dict[uuid.UUID, uuid.UUID | None]
+    dataset_subset: str
+    shuffled_list_ids: tuple[uuid.UUID, ...]
+
+
+# study id -> enrollment context; short-lived so step reordering and new lists show up quickly
+enrollment_context_cache: TTLCache[uuid.UUID, EnrollmentContext] = TTLCache(ttl_seconds=60)
+
+
+MAX_RETRIES = 5
+
+
+async def insert_study_session(
+    db: AsyncSession, participant_id: uuid.UUID, study_id: uuid.UUID | None = None
+) -> ParticipantStudySession | None:
+    """Inserts a study session with a freshly allocated resume code.
+
+    Codes come from the collision-free allocator, so the insert normally succeeds first time. The conflict clause only
+    fires when another worker issued the same code after this one loaded its code index; the statement then inserts
+    nothing, the transaction stays usable and the next code is drawn.
+
+    Args:
+        db: The request's database session.
+        participant_id: The participant the session belongs to.
+        study_id: The study, used as the code namespace.
+
+    Returns:
+        The new session, or None if every attempt conflicted.
+    """
+    expires_at = datetime.now(UTC) + timedelta(hours=24)
+    for _ in range(MAX_RETRIES):
+        stmt = (
+            pg_insert(ParticipantStudySession)
+            .values(
+                id=uuid.uuid4(),
+                study_participant_id=participant_id,
+                resume_code=resume_code_allocator.allocate(study_id),
+                expires_at=expires_at,
+            )
+            .on_conflict_do_nothing()
+            .returning(ParticipantStudySession)
+        )
+        result = await db.scalars(stmt, execution_options={'populate_existing': True})
+        session = result.first()
+        if session is not None:
+            return session
+    return None
+
+
+async def load_resume_codes(session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal) -> int:
+    """Loads every stored resume code into the allocator so it never hands them out again.
+
+    Returns:
+        The number of codes loaded.
+    """
+    async with session_factory() as session:
+        codes = await session.scalars(select(ParticipantStudySession.resume_code))
+        resume_code_allocator.load(codes)
+    return len(resume_code_allocator)
 
 
 class EnrollmentService(BaseService[StudyParticipant, StudyParticipantRepository]):
     """Service to create and assign participant to a study condition.
 
     Primary Repo: StudyParticipantRepository.
-    Auxiliary: StudyConditionRepository.
+    Auxiliary: StudyConditionRepository, StudyRepository, PreShuffledMovieRepository.
 
     """
 
@@ -44,10 +123,14 @@ class EnrollmentService(BaseService[StudyParticipant, StudyParticipantRepository
         self,
         participant_repo: StudyParticipantRepository,
         study_condition_repo: StudyConditionRepository,
+        study_repo: StudyRepository,
+        shuffled_movie_repo: PreShuffledMovieRepository,
     ):
-        """Initialize as a participant service with access to participant type, and study conditions."""
+        """Initialize as a participant service with access to study conditions, studies and pre-shuffled lists."""
         super().__init__(participant_repo)
         self.study_condition_repo = study_condition_repo
+        self.study_repo = study_repo
+        self.shuffled_movie_repo = shuffled_movie_repo
 
     async def enroll_participant(
         self, study_id: uuid.UUID, new_participant: StudyParticipantCreate
@@ -61,13 +144,8 @@ class EnrollmentService(BaseService[StudyParticipant, StudyParticipantRepository
         Returns:
             The newly created participant.
         """
-        condition_key = None
         source_meta = new_participant.source_meta
-        if source_meta and new_participant.participant_type_key == 'test':
-            if 'condition_key' in source_meta:
-                condition_key = source_meta['condition_key']
-
-        condition_id = await self._pick_condition(study_id, condition_key)
+        condition_id = await self._pick_condition(study_id, self._requested_condition_key(new_participant))
 
         study_participant = StudyParticipant(
             study_id=study_id,
@@ -78,10 +156,95 @@ class EnrollmentService(BaseService[StudyParticipant, StudyParticipantRepository
             updated_at=func.now(),
         )
 
+        # Taken before the insert; reading server defaults back afterwards would need another round trip.
+        bucket = participant_bucket(study_participant)
         await self.repo.create(study_participant)
+        study_stats.record(study_id, None, bucket)
 
         return study_participant
 
+    async def get_enrollment_context(self, study_id: uuid.UUID) -> EnrollmentContext | None:
+        """Returns the study's enrollment context, loading it on a cache miss.
+
+        Args:
+            study_id: The ID of the study.
+
+        Returns:
+            The enrollment context, or None if the study does not exist.
+        """
+        hit, context = enrollment_context_cache.lookup(study_id)
+        if hit:
+            return context
+
+        study = await self.study_repo.get_dataset_subset_and_step_ids(study_id)
+        if study is None:
+            return None
+        dataset_subset, step_ids = study
+        dataset_subset = dataset_subset or DEFAULT_DATASET_SUBSET
+        list_ids = await self.shuffled_movie_repo.get_list_ids(dataset_subset)
+
+        context = EnrollmentContext(
+            next_step_ids=dict(zip(step_ids, [*step_ids[1:], None], strict=True)),
+            dataset_subset=dataset_subset,
+            shuffled_list_ids=tuple(list_ids),
+        )
+        enrollment_context_cache.set(study_id, context)
+        return context
+
+    async def enroll_with_session(
+        self, study_id: uuid.UUID, new_participant: StudyParticipantCreate, context: EnrollmentContext
+    ) -> tuple[StudyParticipant, ParticipantStudySession | None]:
+        """Enrolls a participant, opens their study session and assigns a pre-shuffled movie list.
+
+        The participant is flushed first, then its movie list assignment and session are inserted, all in the request's
+        transaction, so either everything is stored or nothing is.
+
+        Args:
+            study_id: The ID of the study.
+            new_participant: The new participant schema, with `current_step_id` already advanced past the entry step.
+            context: The study's enrollment context.
+
+        Returns:
+            The new participant and their session, or None for the session if no free resume code could be stored.
+        """
+        source_meta = new_participant.source_meta
+        condition_id = await self._pick_condition(study_id, self._requested_condition_key(new_participant))
+
+        study_participant = StudyParticipant(
+            id=uuid.uuid4(),
+            study_id=study_id,
+            study_condition_id=condition_id,
+            current_step_id=new_participant.current_step_id,
+            current_page_id=new_participant.current_page_id,
+            source_meta=source_meta,
+            updated_at=func.now(),
+        )
+        # Taken before the flush; reading server defaults back afterwards would need another round trip.
+        bucket = participant_bucket(study_participant)
+        # The list assignment and the session reference the participant, so it is flushed on its own first and the
+        # rows depending on it are inserted explicitly afterwards.
+        self.repo.db.add(study_participant)
+        await self.repo.db.flush()
+        if context.shuffled_list_ids:
+            await self.repo.db.execute(
+                insert(StudyParticipantMovieSession).values(
+                    study_participant_id=study_participant.id,
+                    assigned_list_id=random.choice(context.shuffled_list_ids),
+                )
+            )
+        session = await insert_study_session(self.repo.db, study_participant.id, study_id)
+        study_stats.record(study_id, None, bucket)
+
+        return study_participant, session
+
+    @staticmethod
+    def _requested_condition_key(new_participant: StudyParticipantCreate) -> str | None:
+        """Test participants may ask for a specific condition through `source_meta`."""
+        source_meta = new_participant.source_meta
+        if source_meta and new_participant.participant_type_key == 'test':
+            return source_meta.get('condition_key')
+        return None
+
     async def _pick_condition(self, study_id: uuid.UUID, condition_key: str | None) -> uuid.UUID:
         if condition_key:
             study_condition = await self.study_condition_repo.find_one(
@@ -91,23 +254,14 @@ class EnrollmentService(BaseService[StudyParticipant, StudyParticipantRepository
                 raise ValueError('There was a problem with the condition key.')
             return study_condition.id
 
-        # Ideally: Dynamic weighted choice so that we always have n participants for each of the k conditions
-        # n%k = 0 => n_i = n_k = n/k for all i \in [1, ..., k], where n_i is the i'th condition's participant count
-        # n%k != 0 => n_i = n_k = (n-(n%k))/k & m_j = m_(k-(n%k)) = 1,
-        # where n_i, and m_j are the number of participants in the i'th and j'th conditions respectively and i != j
-        # Shortcut: We remove the last assigned condition from the pool.
+        # Conditions are dealt in balanced blocks so every condition ends up with n/k participants, give or take one.
+        return await condition_allocator.assign(study_id, lambda: self._count_participants_by_condition(study_id))
+
+    async def _count_participants_by_condition(self, study_id: uuid.UUID) -> dict[uuid.UUID, int]:
         condition_counts_rows = await self.study_condition_repo.get_participant_count_by_condition(
             study_id, enabled_only=True, verified_participants_only=True
         )
-
-        if not condition_counts_rows:
-            raise ValueError(f'No active study conditions found for study ID: {study_id}')
-
-        condition_counts = {row.study_condition_id: row.participant_count for row in condition_counts_rows}
-        min_count = min(condition_counts.values())
-        eligible_conditions = [cond_id for cond_id, count in condition_counts.items() if count == min_count]
-
-        return random.choice(eligible_conditions)
+        return {row.study_condition_id: row.participant_count for row in condition_counts_rows}
 
 
 class PagedMoviesSchema(BaseModel):
@@ -227,9 +381,6 @@ class FeedbackService(BaseService[Feedback, FeedbackRepository]):
         return feedback_item
 
 
-MAX_RETRIES = 5
-
-
 class ParticipantStudySessionService(BaseService[ParticipantStudySession, ParticipantStudySessionRepository]):
     """Service for managing ParticipantStudySession operations.
 
@@ -237,41 +388,50 @@ class ParticipantStudySessionService(BaseService[ParticipantStudySession, Partic
         repo: The ParticipantStudySession repository.
     """
 
-    async def create_session(self, participant_id: uuid.UUID) -> ParticipantStudySession | None:
+    async def create_session(
+        self, participant_id: uuid.UUID, study_id: uuid.UUID | None = None
+    ) -> ParticipantStudySession | None:
         """Create a new ParticipantStudySession for the given participant."""
-        for _ in range(MAX_RETRIES):
-            resume_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
-            expires_at = datetime.now(UTC) + timedelta(hours=24)
+        return await insert_study_session(self.repo.db, participant_id, study_id)
 
-            new_session = ParticipantStudySession(
-                study_participant_id=participant_id, resume_code=resume_code, expires_at=expires_at
-            )
-            try:
-                await self.repo.create(new_session)
-                return new_session
-            except IntegrityError:
-                await self.repo.db.rollback()
-        else:
-            return None
+    async def get_session_by_resume_code(
+        self, resume_code: str, study_id: uuid.UUID | None = None
+    ) -> ParticipantStudySession | None:
+        """Resolve a resume code and extend the session's expiry, in a single statement.
 
-    async def get_session_by_resume_code(self, resume_code: str) -> ParticipantStudySession | None:
-        """Retrieve a ParticipantStudySession by its resume code."""
-        session = await self.repo.find_one(RepoQueryOptions(filters={'resume_code': resume_code}))
-        if not session:
-            return None
-        if session.created_at + timedelta(hours=72) < datetime.now(UTC):
-            await self.repo.update(session.id, {'is_active': False})
-            return None
+        Sessions older than 72 hours are treated as expired by the query itself rather than being marked inactive
+        first. Inactive sessions are returned unchanged so the caller can reject them.
 
-        session_expires_at = datetime.now(UTC) + timedelta(hours=24)
-        await self.repo.update(session.id, {'expires_at': session_expires_at})
+        Args:
+            resume_code: The code the participant entered.
+            study_id: When given, only sessions of this study's participants match.
 
+        Returns:
+            The session, or None if the code is unknown, expired or belongs to another study.
+        """
+        session = await self.repo.extend_by_resume_code(
+            resume_code,
+            datetime.now(UTC),
+            max_age=timedelta(hours=72),
+            extension=timedelta(hours=24),
+            study_id=study_id,
+        )
+        if session is not None:
+            resume_code_allocator.mark_used(session.resume_code)
         return session
 
 
 EnrollmentServiceDep = Annotated[
     EnrollmentService,
-    Depends(get_service(EnrollmentService, StudyParticipantRepository, StudyConditionRepository)),
+    Depends(
+        get_service(
+            EnrollmentService,
+            StudyParticipantRepository,
+            StudyConditionRepository,
+            StudyRepository,
+            PreShuffledMovieRepository,
+        )
+    ),
 ]
 
 ParticipantStudySessionServiceDep = Annotated[
@@ -1,12 +1,16 @@
 """Utility file to help with data modeling."""
 
 import inspect
+import math
 import types
 import uuid
 from collections.abc import Iterable
-from datetime import datetime
+from datetime import date, time
+from decimal import Decimal
+from enum import Enum
 from typing import Annotated, Any, Union, get_args, get_origin
 
+import numpy as np
 import sqlalchemy as sa
 from pydantic import BaseModel
 
@@ -16,28 +20,38 @@ def sa_obj_to_dict(obj):
     return {c.key: getattr(obj, c.key) for c in sa.inspect(obj).mapper.column_attrs}
 
 
-def convert_uuids_to_str(data: dict[str, Any]) -> dict[str, Any]:
-    """Converts UUIDs in a dictionary to strings recursively."""
-    if isinstance(data, dict):
-        return {k: convert_uuids_to_str(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [convert_uuids_to_str(element) for element in data]
-    elif isinstance(data, uuid.UUID):
-        return str(data)
-    else:
-        return data
-
+def to_json_safe(data: Any) -> Any:
+    """Converts a value for a JSON column in a single pass.
 
-def convert_datetime_to_str(data: dict[str, Any]) -> dict[str, Any]:
-    """Converts datetime in a dictionary to strings recursively."""
+    Pydantic models are dumped in JSON mode. Elsewhere the conversion follows the same rules: UUIDs, Decimals and
+    non-string keys become strings, dates and times ISO strings, enums their value, NumPy scalars and arrays Python
+    numbers and lists, tuples and sets lists, and non-finite floats None.
+    """
+    if data is None or isinstance(data, str | bool | int):
+        return data
     if isinstance(data, dict):
-        return {k: convert_datetime_to_str(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [convert_datetime_to_str(element) for element in data]
-    elif isinstance(data, datetime):
+        return {
+            key if isinstance(key, str) else str(to_json_safe(key)): to_json_safe(value) for key, value in data.items()
+        }
+    if isinstance(data, list | tuple | set | frozenset):
+        return [to_json_safe(element) for element in data]
+    if isinstance(data, BaseModel):
+        return data.model_dump(mode='json')
+    return _json_safe_scalar(data)
+
+
+def _json_safe_scalar(data: Any) -> Any:
+    if isinstance(data, float | np.floating):
+        return float(data) if math.isfinite(data) else None
+    if isinstance(data, uuid.UUID | Decimal):
         return str(data)
-    else:
-        return data
+    if isinstance(data, date | time):
+        return data.isoformat()
+    if isinstance(data, Enum):
+        return to_json_safe(data.value)
+    if isinstance(data, np.ndarray | np.generic):
+        return to_json_safe(data.tolist())
+    return data
 
 
 def get_columns_from_schema(schema_cls: type[BaseModel]) -> list[str]:
@@ -12,14 +12,18 @@ from rssa_storage.rssadb.repositories.study_participants import (
     ParticipantRecommendationContextRepository,
     StudyParticipantRepository,
 )
-from rssa_storage.shared import RepoQueryOptions
+from sqlalchemy import Text, func, literal, type_coerce, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 
 from rssa_api.core.queue import background_write_queue
 from rssa_api.data.schemas.participant_response_schemas import DynamicPayload
 from rssa_api.data.sources.rssadb import AsyncSessionLocal
+from rssa_api.data.utility import to_json_safe
 
 log = logging.getLogger(__name__)
 
+INTERACTION_HISTORY_PATH = ('extra', 'history')
+
 
 async def process_save_rec_context(session, payload: dict):
     repo = ParticipantRecommendationContextRepository(session)
@@ -35,7 +39,12 @@ async def process_save_rec_context(session, payload: dict):
 
 
 async def process_upsert_interaction(session, payload: dict):
-    repo = ParticipantStudyInteractionResponseRepository(session)
+    """Appends an emotion input to the participant's interaction history.
+
+    The history is a JSONB array at `payload_json.extra.history`. The event is appended in a single UPDATE, so
+    nothing is read back and concurrent appends cannot overwrite each other. A row is only created for the first
+    event of a step.
+    """
     ctx_data = payload['context_data']
     step_id = ctx_data.get('step_id')
 
@@ -43,38 +52,46 @@ async def process_upsert_interaction(session, payload: dict):
         return
 
     context_tag = ctx_data.get('tuning_tag', 'emotion_tuning')
-
-    existing = await repo.find_one(
-        RepoQueryOptions(
-            filters={
-                'study_participant_id': payload['study_participant_id'],
-                'context_tag': context_tag,
-                'study_step_id': step_id,
-            }
-        )
-    )
-
     new_entry = {
         'timestamp': datetime.now().isoformat(),
         'emotion_input': ctx_data['emotion_input'],
     }
 
-    if existing:
-        current_payload = existing.payload_json
-        history = current_payload.get('history', [])
-        if not isinstance(history, list):
-            history = []
-        history.append(new_entry)
-        await repo.update(existing.id, {'payload_json': {**current_payload, 'history': history}})
-    else:
-        new_payload = ParticipantStudyInteractionResponse(
-            study_id=payload['study_id'],
-            study_participant_id=payload['study_participant_id'],
-            study_step_id=step_id,
-            context_tag=context_tag,
-            payload_json=DynamicPayload(extra={'history': [new_entry]}).model_dump(),
+    appended = await session.execute(
+        update(ParticipantStudyInteractionResponse)
+        .where(
+            ParticipantStudyInteractionResponse.study_participant_id == payload['study_participant_id'],
+            ParticipantStudyInteractionResponse.context_tag == context_tag,
+            ParticipantStudyInteractionResponse.study_step_id == step_id,
         )
-        await repo.create(new_payload)
+        .values(payload_json=_append_to_history(new_entry))
+        .returning(ParticipantStudyInteractionResponse.id)
+    )
+    if appended.first() is not None:
+        return
+
+    repo = ParticipantStudyInteractionResponseRepository(session)
+    new_payload = ParticipantStudyInteractionResponse(
+        study_id=payload['study_id'],
+        study_participant_id=payload['study_participant_id'],
+        study_step_id=step_id,
+        context_tag=context_tag,
+        payload_json=to_json_safe(DynamicPayload(extra={'history': [new_entry]})),
+    )
+    await repo.create(new_payload)
+
+
+def _append_to_history(entry: dict):
+    """SQL expression of the row's payload with `entry` appended to its history."""
+    payload_json = type_coerce(ParticipantStudyInteractionResponse.payload_json, JSONB)
+    history = func.coalesce(payload_json[INTERACTION_HISTORY_PATH], literal([], JSONB))
+    return func.jsonb_set(
+        payload_json,
+        literal(list(INTERACTION_HISTORY_PATH), ARRAY(Text)),
+        history.op('||')(literal([entry], JSONB)),
+        True,
+        type_=JSONB,
+    )
 
 
 async def process_update_participant_progress(session, payload: dict):
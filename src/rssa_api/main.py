@@ -13,10 +13,16 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import ValidationError
 
 from rssa_api.apps import admin_api, demo_api, study_api
+from rssa_api.auth.auth0_management import auth0_management
+from rssa_api.auth.jwks import jwks_manager
 from rssa_api.core.config import CORS_ORIGINS, PROJECT_ROOT, ROOT_PATH
 from rssa_api.core.logging import configure_structlog
 from rssa_api.core.middleware import StructlogAccessMiddleware
+from rssa_api.data.services.study_participants import load_resume_codes
 from rssa_api.data.workers import db_writer_worker
+from rssa_api.services.movielens_ids import movielens_id_map
+from rssa_api.services.prefetch import recommendation_prefetcher
+from rssa_api.services.recommendation.registry import REGISTRY
 
 logger = structlog.getLogger(__name__)
 
@@ -27,9 +33,29 @@ async def lifespan(app: FastAPI):
     configure_structlog()
     logger.info('Starting up RSSA API...')
     worker_task = asyncio.create_task(db_writer_worker())
+    await jwks_manager.start()
+    try:
+        await movielens_id_map.load()
+    except Exception as e:
+        # Rating translation falls back to fetching unknown ids on demand.
+        logger.warning(f'Could not preload MovieLens ids: {e}')
+    try:
+        await load_resume_codes()
+    except Exception as e:
+        # Session inserts still skip taken codes through their conflict clause.
+        logger.warning(f'Could not preload resume codes: {e}')
+    try:
+        await REGISTRY.start()
+    except Exception as e:
+        # The default (Lambda) entries keep serving until the next reload.
+        logger.warning(f'Could not load the model registry config: {e}')
     yield
 
     logger.info('Shutting down RSSA API...')
+    await jwks_manager.stop()
+    await REGISTRY.stop()
+    await recommendation_prefetcher.stop()
+    await auth0_management.aclose()
     worker_task.cancel()
     try:
         await worker_task
@@ -0,0 +1,97 @@
+"""Process-wide mapping of movie database UUIDs to MovieLens ids."""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from rssa_storage.moviedb.models.movies import Movie
+from rssa_storage.moviedb.repositories import MovieRepository
+from rssa_storage.shared import RepoQueryOptions
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from rssa_api.data.sources.moviedb import AsyncSessionLocal
+
+log = logging.getLogger(__name__)
+
+
+class MovieLensIdMap:
+    """In-memory map from movie UUIDs to MovieLens ids.
+
+    The whole table is loaded in bulk (at startup) so translating participant ratings for the recommender does not
+    need a movie database round trip. Movies added after the last load are fetched on their first miss and remembered,
+    and `refresh` reloads the full map.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal):
+        """Initialize an empty map.
+
+        Args:
+            session_factory: Session factory for the movie database used by `load`.
+        """
+        self._session_factory = session_factory
+        self._ids: dict[uuid.UUID, str] = {}
+        self._lock = asyncio.Lock()
+        self.loaded_at: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, movie_id: object) -> bool:
+        return movie_id in self._ids
+
+    async def load(self) -> int:
+        """Loads every movie's MovieLens id with a single query, replacing the current map.
+
+        Returns:
+            The number of movies in the map.
+        """
+        async with self._lock, self._session_factory() as session:
+            result = await session.execute(select(Movie.id, Movie.movielens_id))
+            self._ids = {movie_id: str(movielens_id) for movie_id, movielens_id in result.all()}
+            self.loaded_at = datetime.now(UTC)
+
+        log.info(f'Loaded {len(self._ids)} MovieLens ids.')
+        return len(self._ids)
+
+    async def refresh(self) -> int:
+        """Reloads the map after movies were added or changed."""
+        return await self.load()
+
+    def set(self, movie_id: uuid.UUID, movielens_id: str | int) -> None:
+        """Adds or replaces a single movie's MovieLens id."""
+        self._ids[movie_id] = str(movielens_id)
+
+    def discard(self, movie_id: uuid.UUID) -> None:
+        """Removes a movie from the map."""
+        self._ids.pop(movie_id, None)
+
+    def lookup(self, movie_ids: Sequence[uuid.UUID]) -> list[str | None]:
+        """Returns the MovieLens id for each movie UUID, or None when it is not in the map."""
+        return list(map(self._ids.get, movie_ids))
+
+    async def translate(self, movie_ids: Sequence[uuid.UUID], movie_repository: MovieRepository) -> list[str | None]:
+        """Maps movie UUIDs to MovieLens ids, fetching only the ids the map does not know yet.
+
+        Args:
+            movie_ids: Movie UUIDs in the order the ids should be returned.
+            movie_repository: Repository used to resolve misses.
+
+        Returns:
+            The MovieLens ids in the same order, with None for UUIDs that are not in the movie database.
+        """
+        movielens_ids = self.lookup(movie_ids)
+        missing = list({movie_id for movie_id, mlid in zip(movie_ids, movielens_ids, strict=True) if mlid is None})
+        if not missing:
+            return movielens_ids
+
+        movies = await movie_repository.find_many(RepoQueryOptions(ids=missing))
+        for movie in movies:
+            self.set(movie.id, movie.movielens_id)
+
+        return self.lookup(movie_ids)
+
+
+movielens_id_map = MovieLensIdMap()
@@ -0,0 +1,124 @@
+"""Speculative recommendation prefetch, run outside the request that triggered it."""
+
+import asyncio
+import logging
+import os
+import uuid
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+from rssa_storage.moviedb.repositories import MovieRepository
+from rssa_storage.rssadb.repositories.participant_responses import (
+    ParticipantRatingRepository,
+    ParticipantStudyInteractionResponseRepository,
+)
+from rssa_storage.rssadb.repositories.study_participants import (
+    ParticipantRecommendationContextRepository,
+    StudyParticipantRepository,
+)
+
+from rssa_api.core.ttl_cache import TTLCache
+from rssa_api.data.sources import moviedb, rssadb
+
+from .recommender_service import RecommenderService
+
+log = logging.getLogger(__name__)
+
+PREFETCH_DELAY_SECONDS = float(os.getenv('RECOMMENDATION_PREFETCH_DELAY_SECONDS', '3'))
+
+# Step types on which participants rate the items their recommendations are computed from; the step after one shows
+# the recommendations.
+RATING_STEP_TYPES = frozenset({'preference-elicitation'})
+
+ServiceFactory = Callable[[], AbstractAsyncContextManager[RecommenderService]]
+
+
+@asynccontextmanager
+async def _session_service() -> AsyncIterator[RecommenderService]:
+    """A RecommenderService on sessions of its own, since the triggering request closes its sessions when it ends."""
+    async with rssadb.AsyncSessionLocal() as rssa_session, moviedb.AsyncSessionLocal() as movie_session:
+        yield RecommenderService(
+            StudyParticipantRepository(rssa_session),
+            ParticipantRatingRepository(rssa_session),
+            MovieRepository(movie_session),
+            ParticipantStudyInteractionResponseRepository(rssa_session),
+            ParticipantRecommendationContextRepository(rssa_session),
+        )
+
+
+class RecommendationPrefetcher:
+    """Starts computing a participant's recommendations once their ratings look final.
+
+    Every saved rating or batch of ratings (re)schedules a prefetch `delay_seconds` later, so a participant still
+    rating does not trigger one per save. Entering the step after the rating step, the one showing the
+    recommendations, runs a scheduled prefetch right away, since the ratings cannot change anymore.
+    """
+
+    def __init__(self, delay_seconds: float = PREFETCH_DELAY_SECONDS, service_factory: ServiceFactory | None = None):
+        """Initialize a prefetcher.
+
+        Args:
+            delay_seconds: Quiet time after the last rating before the prefetch starts.
+            service_factory: Opens a RecommenderService for a prefetch; one on fresh DB sessions by default.
+        """
+        self.delay_seconds = delay_seconds
+        self._service_factory = service_factory or _session_service
+        self._timers: dict[uuid.UUID, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        # The step showing each participant's recommendations, once they have entered the rating step before it
+        self._recommendation_steps: TTLCache[uuid.UUID, uuid.UUID] = TTLCache(ttl_seconds=3600, maxsize=16384)
+
+    def schedule(self, study_participant_id: uuid.UUID) -> None:
+        """Schedules a prefetch, replacing the participant's pending one."""
+        timer = self._timers.pop(study_participant_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[study_participant_id] = asyncio.get_running_loop().call_later(
+            self.delay_seconds, self.flush, study_participant_id
+        )
+
+    def step_entered(
+        self, study_participant_id: uuid.UUID, step_type: str | None, step_id: uuid.UUID, next_step_id: uuid.UUID | None
+    ) -> None:
+        """Follows a participant's progress through the study.
+
+        Entering a rating step remembers the step after it; entering that step runs the prefetch the participant's
+        ratings scheduled right away. Other steps leave pending prefetches alone.
+        """
+        if step_type in RATING_STEP_TYPES and next_step_id is not None:
+            self._recommendation_steps.set(study_participant_id, next_step_id)
+            return
+        hit, recommendation_step_id = self._recommendation_steps.lookup(study_participant_id)
+        if hit and recommendation_step_id == step_id:
+            self._recommendation_steps.invalidate(study_participant_id)
+            self.flush(study_participant_id)
+
+    def flush(self, study_participant_id: uuid.UUID) -> None:
+        """Runs the participant's pending prefetch now, if there is one."""
+        timer = self._timers.pop(study_participant_id, None)
+        if timer is None:
+            return
+        timer.cancel()
+        task = asyncio.create_task(self._run(study_participant_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        """Cancels pending and running prefetches."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._recommendation_steps.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, study_participant_id: uuid.UUID) -> None:
+        try:
+            async with self._service_factory() as service:
+                await service.prefetch_recommendations(study_participant_id)
+        except Exception as e:
+            log.warning(f'Could not prefetch recommendations for {study_participant_id}: {e}')
+
+
+recommendation_prefetcher = RecommendationPrefetcher()
@@ -0,0 +1,90 @@
+"""Micro-batching of concurrent recommendation requests."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+log = logging.getLogger(__name__)
+
+RequestT = TypeVar('RequestT')
+ResultT = TypeVar('ResultT')
+
+# Handles a whole batch. Returns one result per request, in order; an exception in the list fails only its request.
+BatchHandler = Callable[[list[RequestT]], Awaitable[Sequence[ResultT | BaseException]]]
+
+
+@dataclass
+class _Batch(Generic[RequestT]):
+    requests: list[RequestT] = field(default_factory=list)
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+class MicroBatcher(Generic[RequestT, ResultT]):
+    """Collects concurrent requests for a short window and hands them to a handler as one batch.
+
+    A batch is flushed when it reaches `max_batch_size` or `max_wait_seconds` after its first request, whichever
+    comes first. Each caller awaits its own result; if the handler raises, every request in the batch fails with
+    that error.
+    """
+
+    def __init__(self, handler: BatchHandler, max_batch_size: int, max_wait_seconds: float, name: str = 'batch'):
+        """Initialize a batcher.
+
+        Args:
+            handler: Processes a batch of requests.
+            max_batch_size: Number of requests that triggers an immediate flush.
+            max_wait_seconds: Longest time a request waits for others to join its batch.
+            name: Name used in log messages.
+        """
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.name = name
+        self._batch: _Batch[RequestT] = _Batch()
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, request: RequestT) -> ResultT:
+        """Adds a request to the current batch and waits for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.requests.append(request)
+        self._batch.futures.append(future)
+
+        if len(self._batch.requests) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, _Batch()
+        if batch.requests:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _Batch[RequestT]) -> None:
+        try:
+            results = await self.handler(batch.requests)
+            if len(results) != len(batch.requests):
+                raise RuntimeError(f'Expected {len(batch.requests)} results, got {len(results)}.')
+        except Exception as e:
+            log.error(f'{self.name} of {len(batch.requests)} failed: {e}')
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(batch.futures, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,140 @@
+"""Memory-mapped model bundles exported by scripts/train_mfs.py."""
+
+import json
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+LATEST_FILE = 'LATEST'
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """A trained model and its lookup tables, memory-mapped from a bundle directory.
+
+    Every array is opened with `mmap_mode='r'`, so opening a bundle costs a few file opens and every worker process
+    serving the same bundle shares one page-cached copy. Items and users are sorted by id: per-item arrays follow
+    `item_ids`, and user factors and history rows follow `user_ids`.
+
+    Attributes:
+        path: The version directory the bundle was opened from.
+        manifest: The bundle manifest (version, model parameters and array specs).
+        arrays: Array name to read-only memory-mapped array.
+    """
+
+    path: Path
+    manifest: Mapping[str, Any]
+    arrays: Mapping[str, np.ndarray]
+
+    @classmethod
+    def open(cls, path: str | Path) -> 'ModelBundle':
+        """Opens a bundle.
+
+        Args:
+            path: A bundle version directory, or the bundle root, in which case the version named in its LATEST file
+                is opened.
+
+        Returns:
+            The opened bundle.
+
+        Raises:
+            FileNotFoundError: If the directory has no manifest.
+            ValueError: If the bundle format is unsupported or an array does not match its manifest entry.
+        """
+        path = resolve_bundle_path(path)
+        manifest = json.loads((path / MANIFEST_FILE).read_text())
+        if manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f'Unsupported bundle format {manifest.get("format_version")!r} in {path}.')
+
+        arrays = {}
+        for name, spec in manifest['arrays'].items():
+            array = np.load(path / spec['file'], mmap_mode='r', allow_pickle=False)
+            if str(array.dtype) != spec['dtype'] or list(array.shape) != spec['shape']:
+                raise ValueError(f'Array {name} in {path} does not match the bundle manifest.')
+            arrays[name] = array
+
+        log.info(f'Opened model bundle {manifest["version"]} from {path}')
+        return cls(path=path, manifest=manifest, arrays=arrays)
+
+    @property
+    def version(self) -> str:
+        """The content-derived version of the bundle."""
+        return self.manifest['version']
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the bundle's arrays, whether or not they are paged in."""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    @property
+    def item_ids(self) -> np.ndarray:
+        """The sorted item ids the per-item arrays are indexed by."""
+        return self.arrays['item_ids']
+
+    @property
+    def item_factors(self) -> np.ndarray:
+        """The float32 item factor matrix, one row per item id."""
+        return self.arrays['item_factors']
+
+    @property
+    def user_ids(self) -> np.ndarray:
+        """The sorted ids of the training users."""
+        return self.arrays['user_ids']
+
+    def item_positions(self, item_ids: Any) -> np.ndarray:
+        """Finds the rows of item ids in the per-item arrays.
+
+        Args:
+            item_ids: Item ids to look up.
+
+        Returns:
+            The row of each item, or -1 for items the model does not know.
+        """
+        return _positions(self.item_ids, item_ids)
+
+    def user_history(self, user_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """The items a training user rated and their ratings.
+
+        Args:
+            user_id: The training user's id.
+
+        Returns:
+            A tuple of (items, ratings) views; both are empty for unknown users.
+        """
+        row = _positions(self.user_ids, [user_id])[0]
+        if row < 0:
+            return self.arrays['history_items'][:0], self.arrays['history_ratings'][:0]
+        indptr = self.arrays['history_indptr']
+        start, end = indptr[row], indptr[row + 1]
+        return self.arrays['history_items'][start:end], self.arrays['history_ratings'][start:end]
+
+
+def resolve_bundle_path(path: str | Path) -> Path:
+    """The version directory a bundle path refers to, following the LATEST file of a bundle root."""
+    path = Path(path)
+    latest = path / LATEST_FILE
+    if latest.is_file():
+        return path / latest.read_text().strip()
+    return path
+
+
+def bundle_version(path: str | Path) -> str:
+    """Reads the version a bundle path currently refers to, without opening its arrays."""
+    manifest = json.loads((resolve_bundle_path(path) / MANIFEST_FILE).read_text())
+    return manifest['version']
+
+
+def _positions(sorted_ids: np.ndarray, ids: Any) -> np.ndarray:
+    ids = np.asarray(ids)
+    if len(sorted_ids) == 0:
+        return np.full(ids.shape, -1, dtype=np.int64)
+    positions = np.searchsorted(sorted_ids, ids).clip(max=len(sorted_ids) - 1)
+    return np.where(sorted_ids[positions] == ids, positions, -1)
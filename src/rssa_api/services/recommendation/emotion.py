@@ -0,0 +1,265 @@
+"""Local emotion re-ranking of a cached candidate pool, for emotion-tuning conditions."""
+
+import asyncio
+import logging
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from rssa_api.core.ttl_cache import TTLCache
+from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
+from rssa_api.data.schemas.preferences_schemas import EmotionContinuousInputSchema, EmotionDiscreteInputSchema
+from rssa_api.data.schemas.recommendations import ResponseWrapper
+
+from .strategies import RecommendationStrategy
+
+log = logging.getLogger(__name__)
+
+EMOTION_TAGS = ('anger', 'anticipation', 'disgust', 'fear', 'joy', 'sadness', 'surprise', 'trust')
+
+
+@dataclass(frozen=True)
+class ItemEmotions:
+    """Item emotion vectors, as written by train_mfs to item_emotion_lookup.parquet.
+
+    Attributes:
+        item_ids: External item ids, sorted.
+        vectors: One row of emotion scores per item, in `tags` order.
+        tags: The emotions, one per column.
+    """
+
+    item_ids: np.ndarray
+    vectors: np.ndarray
+    tags: tuple[str, ...]
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> 'ItemEmotions':
+        """Reads an item-indexed frame with one column per emotion, skipping items with missing scores."""
+        tags = tuple(tag for tag in EMOTION_TAGS if tag in frame.columns)
+        frame = frame[list(tags)].dropna().sort_index()
+        return cls(
+            item_ids=frame.index.to_numpy(dtype=np.int64),
+            vectors=frame.to_numpy(dtype=np.float32),
+            tags=tags,
+        )
+
+    @classmethod
+    def from_parquet(cls, path: str | Path) -> 'ItemEmotions':
+        """Loads an item emotion lookup table."""
+        return cls.from_frame(pd.read_parquet(path))
+
+    def lookup(self, item_ids: Sequence[int]) -> tuple[np.ndarray, np.ndarray]:
+        """The emotion vectors of the given items.
+
+        Returns:
+            A mask of the items that have a vector, and the vectors of those items, in order.
+        """
+        ids = np.asarray(item_ids, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.item_ids, ids), max(len(self.item_ids) - 1, 0))
+        known = self.item_ids[positions] == ids if len(self.item_ids) else np.zeros(len(ids), dtype=bool)
+        return known, self.vectors[positions[known]]
+
+
+@dataclass(frozen=True)
+class EmotionPreferences:
+    """What a participant asked for with the emotion sliders.
+
+    Attributes:
+        targets: Target score per emotion; NaN for emotions without a target.
+        diverse: Which emotions the participant wants varied.
+    """
+
+    targets: np.ndarray
+    diverse: np.ndarray
+
+    @classmethod
+    def parse(
+        cls, emotion_input: Sequence[Mapping[str, Any]], tags: Sequence[str], low_val: float, high_val: float
+    ) -> 'EmotionPreferences':
+        """Reads discrete (`low`, `high`, `diverse`, `ignore`) or continuous (`switch` plus `weight`) slider input.
+
+        Raises:
+            pydantic.ValidationError: If an entry is neither.
+        """
+        targets = np.full(len(tags), np.nan, dtype=np.float32)
+        diverse = np.zeros(len(tags), dtype=bool)
+        for entry in emotion_input:
+            if entry['emotion'] not in tags:
+                continue
+            position = tags.index(entry['emotion'])
+            if 'switch' in entry:
+                continuous = EmotionContinuousInputSchema.model_validate(entry)
+                if continuous.switch == 'specified':
+                    targets[position] = continuous.weight
+                diverse[position] = continuous.switch == 'diverse'
+            else:
+                discrete = EmotionDiscreteInputSchema.model_validate(entry)
+                if discrete.weight in ('low', 'high'):
+                    targets[position] = low_val if discrete.weight == 'low' else high_val
+                diverse[position] = discrete.weight == 'diverse'
+        return cls(targets=targets, diverse=diverse)
+
+
+def rerank(
+    relevance: np.ndarray,
+    vectors: np.ndarray,
+    preferences: EmotionPreferences,
+    limit: int,
+    emotion_weight: float = 1.0,
+    diversity: float = 0.5,
+    diversify_all: bool = False,
+) -> np.ndarray:
+    """Orders a candidate pool by relevance, closeness to the emotion targets and emotional diversity.
+
+    Each candidate scores `relevance - emotion_weight * distance`, the distance being the RMS difference to the
+    targeted emotions. Candidates are then picked greedily, MMR style: each pick maximizes
+    `(1 - diversity) * score - diversity * similarity`, where the similarity to the items picked so far is measured on
+    the emotions marked diverse (all of them when `diversify_all` is set and none are).
+
+    Args:
+        relevance: Relevance per candidate, in [0, 1].
+        vectors: Emotion vector per candidate.
+        preferences: The participant's slider settings.
+        limit: Number of items to pick.
+        emotion_weight: Weight of the emotion distance against relevance.
+        diversity: Weight of dissimilarity against score when diversifying.
+        diversify_all: Whether to diversify on every emotion when none is marked diverse.
+
+    Returns:
+        Positions of the picked candidates, best first.
+    """
+    limit = min(limit, len(relevance))
+    scores = relevance.astype(np.float32, copy=True)
+    targeted = ~np.isnan(preferences.targets)
+    if targeted.any():
+        gaps = vectors[:, targeted] - preferences.targets[targeted]
+        scores -= emotion_weight * np.sqrt(np.mean(gaps * gaps, axis=1))
+
+    diverse = preferences.diverse if preferences.diverse.any() or not diversify_all else np.ones_like(targeted)
+    if not diverse.any() or limit == 0:
+        return np.argsort(-scores, kind='stable')[:limit]
+
+    points = vectors[:, diverse]
+    scale = np.sqrt(diverse.sum())
+    picked = np.empty(limit, dtype=np.int64)
+    similarity = np.full(len(scores), -np.inf, dtype=np.float32)  # highest similarity to any picked item
+    available = np.ones(len(scores), dtype=bool)
+    for rank in range(limit):
+        if rank == 0:
+            gain = scores
+        else:
+            gain = (1 - diversity) * scores - diversity * similarity
+        gain = np.where(available, gain, -np.inf)
+        choice = int(np.argmax(gain))
+        picked[rank] = choice
+        available[choice] = False
+        distance = np.linalg.norm(points - points[choice], axis=1) / scale
+        similarity = np.maximum(similarity, 1 - distance)
+    return picked
+
+
+@dataclass(frozen=True)
+class _CandidatePool:
+    item_ids: np.ndarray
+    relevance: np.ndarray
+    vectors: np.ndarray
+
+
+class EmotionRerankStrategy:
+    """Serves emotion-tuning requests by re-ranking a cached candidate pool in process.
+
+    The first request of a participant asks the wrapped strategy for `pool_size` items without the emotion input and
+    caches them with their emotion vectors. Every request, including later slider changes, is then answered by
+    `rerank` on that pool. The wrapped strategy only returns a ranking, so relevance falls linearly with rank.
+    The pool is fetched again when the participant's ratings change or it expires.
+    """
+
+    def __init__(
+        self,
+        strategy: RecommendationStrategy,
+        emotions: ItemEmotions,
+        pool_size: int = 200,
+        emotion_weight: float = 1.0,
+        diversity: float = 0.5,
+        diversify_all: bool = False,
+        low_val: float = 0.3,
+        high_val: float = 0.8,
+        pool_ttl_seconds: float = 1800,
+    ):
+        """Wrap a strategy.
+
+        Args:
+            strategy: The strategy providing candidates.
+            emotions: The item emotion vectors.
+            pool_size: Number of candidates fetched per participant.
+            emotion_weight: See `rerank`.
+            diversity: See `rerank`.
+            diversify_all: See `rerank`; set for the diverse-n conditions.
+            low_val: Target score of a `low` discrete slider.
+            high_val: Target score of a `high` discrete slider.
+            pool_ttl_seconds: How long a participant's pool is kept.
+        """
+        self.inner = strategy
+        self.emotions = emotions
+        self.pool_size = pool_size
+        self.emotion_weight = emotion_weight
+        self.diversity = diversity
+        self.diversify_all = diversify_all
+        self.low_val = low_val
+        self.high_val = high_val
+        self._pools: TTLCache[tuple[str, tuple], asyncio.Task] = TTLCache(ttl_seconds=pool_ttl_seconds)
+
+    @classmethod
+    def from_options(cls, strategy: RecommendationStrategy, options: Mapping[str, Any]) -> 'EmotionRerankStrategy':
+        """Wraps a strategy as configured by a registry entry's `emotion_rerank` options (`lookup` plus keywords)."""
+        options = dict(options)
+        emotions = ItemEmotions.from_parquet(options.pop('lookup'))
+        return cls(strategy, emotions, **options)
+
+    async def recommend(
+        self, user_id: str, ratings: list[MovieLensRating], limit: int, run_config: dict | None = None
+    ) -> ResponseWrapper:
+        """Re-ranks the participant's candidate pool for their current emotion input."""
+        run_config = run_config or {}
+        pool = await self._pool(user_id, ratings, run_config)
+        emotion_input = run_config.get('emotion_input')
+        if emotion_input:
+            preferences = EmotionPreferences.parse(emotion_input, self.emotions.tags, self.low_val, self.high_val)
+        else:
+            preferences = EmotionPreferences(
+                targets=np.full(len(self.emotions.tags), np.nan, dtype=np.float32),
+                diverse=np.zeros(len(self.emotions.tags), dtype=bool),
+            )
+        order = rerank(
+            pool.relevance,
+            pool.vectors,
+            preferences,
+            limit,
+            emotion_weight=self.emotion_weight,
+            diversity=self.diversity,
+            diversify_all=self.diversify_all and bool(emotion_input),
+        )
+        return ResponseWrapper(response_type='standard', items=pool.item_ids[order].tolist())
+
+    async def _pool(self, user_id: str, ratings: list[MovieLensRating], run_config: dict) -> _CandidatePool:
+        """The participant's candidate pool; concurrent requests share a single fetch."""
+        key = (user_id, tuple(sorted((str(r.item_id), float(r.rating)) for r in ratings)))
+        hit, task = self._pools.lookup(key)
+        if not hit or task is None or (task.done() and (task.cancelled() or task.exception())):
+            candidate_config = {name: value for name, value in run_config.items() if name != 'emotion_input'}
+            task = asyncio.create_task(self._fetch_pool(user_id, ratings, candidate_config))
+            self._pools.set(key, task)
+        return await asyncio.shield(task)
+
+    async def _fetch_pool(self, user_id: str, ratings: list[MovieLensRating], run_config: dict) -> _CandidatePool:
+        response = await self.inner.recommend(user_id, ratings, self.pool_size, run_config)
+        item_ids = np.asarray([int(item) for item in response.items], dtype=np.int64)
+        relevance = 1 - np.arange(len(item_ids), dtype=np.float32) / max(len(item_ids), 1)
+        known, vectors = self.emotions.lookup(item_ids)
+        if not known.all():
+            log.info(f'{int((~known).sum())} of {len(item_ids)} candidates have no emotion scores and were skipped')
+        return _CandidatePool(item_ids=item_ids[known], relevance=relevance[known], vectors=vectors)
@@ -0,0 +1,201 @@
+"""In-process recommendations for users outside the training set, by folding their ratings into a trained model."""
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batching import MicroBatcher
+from .bundle import ModelBundle
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FoldInRequest:
+    """The ratings of one user to fold in, keyed by external item id."""
+
+    item_ids: Sequence[int]
+    ratings: Sequence[float]
+    limit: int
+
+
+class FoldInScorer:
+    """Projects new users into the latent space of a matrix factorization model and ranks the catalogue for them.
+
+    Follows the row solves of LensKit's ALS trainers, so a folded-in user gets the factors training would have given
+    them with the item factors held fixed:
+
+    - explicit (`BiasedMF`): `(V_u^T V_u + reg * n_u * I) x = V_u^T (r_u - b)`, with `b` the global, item and damped
+      user biases;
+    - implicit (`ImplicitMF`): `(V^T V + V_u^T (C_u - I) V_u + reg * I) x = V_u^T C_u 1`, with confidence
+      `C = 1 + weight * r` (or `1 + weight` when ratings are not used).
+
+    A batch of users is padded to its longest history and solved with one batched `np.linalg.solve`, and the whole
+    catalogue is scored with a single matrix multiply.
+    """
+
+    def __init__(
+        self,
+        bundle: ModelBundle,
+        implicit: bool | None = None,
+        reg: float | None = None,
+        weight: float | None = None,
+        damping: float | None = None,
+        use_ratings: bool | None = None,
+    ):
+        """Initialize a scorer over a bundle's item factors.
+
+        Args:
+            bundle: The model bundle.
+            implicit: Whether to solve the implicit-feedback system. Taken from the bundle's model class when omitted.
+            reg: Regularization term. The remaining arguments default to the bundle's training parameters.
+            weight: Implicit confidence weight.
+            damping: Damping of the user bias.
+            use_ratings: Whether the implicit confidence scales with the rating.
+        """
+        params = bundle.manifest.get('params', {})
+        self.bundle = bundle
+        self.implicit = 'Implicit' in bundle.manifest.get('model_class', '') if implicit is None else implicit
+        self.reg = float(params.get('reg', 0.1) if reg is None else reg)
+        self.weight = float(params.get('weight', 40.0) if weight is None else weight)
+        self.damping = float(params.get('damping', 0.0) if damping is None else damping)
+        self.use_ratings = bool(params.get('use_ratings', True) if use_ratings is None else use_ratings)
+
+        self.item_factors = np.asarray(bundle.item_factors, dtype=np.float32)
+        self.n_features = self.item_factors.shape[1]
+        self.global_bias = float(bundle.manifest.get('global_bias') or 0.0)
+        item_bias = bundle.arrays.get('item_bias')
+        self.item_bias = None if item_bias is None or self.implicit else np.asarray(item_bias, dtype=np.float32)
+        # V^T V + reg * I is shared by every implicit solve.
+        self._gram = self.item_factors.T.astype(np.float64) @ self.item_factors + self.reg * np.eye(self.n_features)
+
+    def recommend(self, requests: Sequence[FoldInRequest]) -> list[np.ndarray]:
+        """Ranks the catalogue for a batch of users.
+
+        Args:
+            requests: The users' ratings. Items the model does not know are ignored.
+
+        Returns:
+            For each request, up to `limit` external item ids by descending score, without the items it rated.
+        """
+        if not requests:
+            return []
+        positions, ratings, mask = self._pad(requests)
+        scores = self.score(positions, ratings, mask)
+
+        rows = np.broadcast_to(np.arange(len(requests))[:, None], positions.shape)
+        scores[rows[mask], positions[mask]] = -np.inf
+
+        limit = min(max(request.limit for request in requests), scores.shape[1])
+        if limit <= 0:
+            return [self.bundle.item_ids[:0] for _ in requests]
+        top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            self.bundle.item_ids[top[i][np.isfinite(top_scores[i])][: request.limit]]
+            for i, request in enumerate(requests)
+        ]
+
+    def warm(self) -> None:
+        """Pages in the item factors and runs one solve, so the first real request does not pay for either."""
+        self.recommend([FoldInRequest(item_ids=(), ratings=(), limit=1)])
+
+    def score(self, positions: np.ndarray, ratings: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Scores every item for a padded batch of users.
+
+        Args:
+            positions: (users, max ratings) item rows of the rated items, 0 where padded.
+            ratings: (users, max ratings) ratings, 0 where padded.
+            mask: (users, max ratings) True where a rating is present.
+
+        Returns:
+            A (users, items) float32 score matrix.
+        """
+        factors = self.item_factors[positions] * mask[..., None]
+        counts = mask.sum(axis=1)
+
+        if self.implicit:
+            confidence = self.weight * (ratings if self.use_ratings else 1.0) * mask
+            lhs = self._gram + np.einsum('bnk,bn,bnm->bkm', factors, confidence, factors, dtype=np.float64)
+            rhs = np.einsum('bnk,bn->bk', factors, (confidence + 1.0) * mask, dtype=np.float64)
+        else:
+            residuals = ratings - self.global_bias
+            if self.item_bias is not None:
+                residuals = residuals - self.item_bias[positions]
+            residuals = residuals * mask
+            user_bias = residuals.sum(axis=1) / np.maximum(counts + self.damping, 1e-9)
+            residuals = (residuals - user_bias[:, None]) * mask
+            lhs = np.einsum('bnk,bnm->bkm', factors, factors, dtype=np.float64)
+            # Users without known ratings solve I x = 0 and are ranked by the item biases alone.
+            lhs += np.eye(self.n_features) * np.where(counts > 0, self.reg * counts, 1.0)[:, None, None]
+            rhs = np.einsum('bnk,bn->bk', factors, residuals, dtype=np.float64)
+
+        user_factors = np.linalg.solve(lhs, rhs[..., None])[..., 0].astype(np.float32)
+        scores = user_factors @ self.item_factors.T
+        if not self.implicit:
+            scores += self.global_bias + user_bias[:, None].astype(np.float32)
+            if self.item_bias is not None:
+                scores += self.item_bias
+        return scores
+
+    def _pad(self, requests: Sequence[FoldInRequest]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rated = []
+        for request in requests:
+            positions = self.bundle.item_positions(np.asarray(request.item_ids, dtype=np.int64))
+            known = positions >= 0
+            rated.append((positions[known], np.asarray(request.ratings, dtype=np.float32)[known]))
+
+        width = max(1, max(len(item_positions) for item_positions, _ in rated))
+        positions = np.zeros((len(rated), width), dtype=np.int64)
+        ratings = np.zeros((len(rated), width), dtype=np.float32)
+        mask = np.zeros((len(rated), width), dtype=bool)
+        for i, (item_positions, item_ratings) in enumerate(rated):
+            positions[i, : len(item_positions)] = item_positions
+            ratings[i, : len(item_ratings)] = item_ratings
+            mask[i, : len(item_positions)] = True
+        return positions, ratings, mask
+
+
+class FoldInBatcher:
+    """Collects concurrent fold-in requests for a few milliseconds and scores them as one batch.
+
+    A batch is flushed when it reaches `max_batch_size` or `max_wait_seconds` after its first request, whichever
+    comes first, and scored in a worker thread so the event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, scorer: FoldInScorer, max_batch_size: int = 64, max_wait_seconds: float = 0.005):
+        """Initialize a batcher.
+
+        Args:
+            scorer: The scorer batches are handed to.
+            max_batch_size: Number of requests that triggers an immediate flush.
+            max_wait_seconds: Longest time a request waits for others to join its batch.
+        """
+        self.scorer = scorer
+        self._batcher: MicroBatcher[FoldInRequest, list[int]] = MicroBatcher(
+            self._score, max_batch_size, max_wait_seconds, name='Fold-in batch'
+        )
+
+    async def recommend(self, item_ids: Sequence[int], ratings: Sequence[float], limit: int) -> list[int]:
+        """Ranks the catalogue for one user, batched with whichever requests arrive alongside it.
+
+        Args:
+            item_ids: External ids of the rated items.
+            ratings: The ratings, in the same order.
+            limit: Number of items to return.
+
+        Returns:
+            Up to `limit` external item ids by descending score, without the rated items.
+        """
+        return await self._batcher.submit(FoldInRequest(item_ids, ratings, limit))
+
+    async def _score(self, requests: list[FoldInRequest]) -> list[list[int]]:
+        results = await asyncio.to_thread(self.scorer.recommend, requests)
+        return [items.tolist() for items in results]
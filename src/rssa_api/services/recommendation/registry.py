@@ -1,49 +1,373 @@
+"""Registry of the recommendation models a study condition can select, reloadable while the API is running."""
+
+import asyncio
+import json
+import logging
 import os
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from .bundle import ModelBundle, bundle_version, resolve_bundle_path
+from .emotion import EmotionRerankStrategy
+from .resilience import RankedFallback, ResilientStrategy, circuit_breaker
+from .strategies import LambdaStrategy, LocalStrategy, RecommendationStrategy
 
-from .strategies import LambdaStrategy
+log = logging.getLogger(__name__)
 
 # Assuming these are the names of your deployed Lambda functions
 LAMBDA_IMPLICIT = os.environ.get('LAMBDA_NAME_IMPLICIT', 'ImplicitMFRecsFunction')
 LAMBDA_BIASED = os.environ.get('LAMBDA_NAME_BIASED', 'BiasedMFRecsFunction')
 LAMBDA_EMOTION = os.environ.get('LAMBDA_NAME_EMOTION', 'ImplicitMFErsRecsFunction')
 
-REGISTRY = {
+# JSON file with registry entries that extend or replace the defaults below, and how often it is re-read.
+MODEL_REGISTRY_CONFIG = os.environ.get('MODEL_REGISTRY_CONFIG', '')
+MODEL_REGISTRY_POLL_SECONDS = float(os.environ.get('MODEL_REGISTRY_POLL_SECONDS', '60'))
+
+# Longest a participant waits on a recommender, and the ranking (e.g. train_mfs' averaged_item_score.csv) served
+# instead when it cannot answer. Entries can override both with `deadline_seconds` and `fallback`.
+RECOMMENDATION_DEADLINE_SECONDS = float(os.environ.get('RECOMMENDATION_DEADLINE_SECONDS', '8'))
+RECOMMENDATION_FALLBACK_CSV = os.environ.get('RECOMMENDATION_FALLBACK_CSV', '')
+
+
+def _lambda(function_name: str, response_type: str = 'standard', **payload_template: Any) -> dict[str, Any]:
+    return {
+        'type': 'lambda',
+        'function_name': function_name,
+        'response_type': response_type,
+        'payload_template': payload_template,
+    }
+
+
+DEFAULT_ENTRIES: dict[str, dict[str, Any]] = {
     # --- Implicit Models ---
-    'implicit_recs_top_n': LambdaStrategy(function_name=LAMBDA_IMPLICIT, payload_template={'path': 'top_n'}),
-    'implicit_recs_discounted_top_n': LambdaStrategy(
-        function_name=LAMBDA_IMPLICIT, payload_template={'path': 'discounted_top_n'}
-    ),
+    'implicit_recs_top_n': _lambda(LAMBDA_IMPLICIT, path='top_n'),
+    'implicit_recs_discounted_top_n': _lambda(LAMBDA_IMPLICIT, path='discounted_top_n'),
     # Additional implicit strategies from rssa-recommender
-    'controversial': LambdaStrategy(function_name=LAMBDA_IMPLICIT, payload_template={'path': 'controversial'}),
-    'hate': LambdaStrategy(function_name=LAMBDA_IMPLICIT, payload_template={'path': 'hate'}),
-    'hip': LambdaStrategy(function_name=LAMBDA_IMPLICIT, payload_template={'path': 'hip'}),
-    'no_clue': LambdaStrategy(function_name=LAMBDA_IMPLICIT, payload_template={'path': 'no_clue'}),
-    'community_advisors': LambdaStrategy(
-        function_name=LAMBDA_IMPLICIT, payload_template={'path': 'community_advisors'}
-    ),
+    'controversial': _lambda(LAMBDA_IMPLICIT, path='controversial'),
+    'hate': _lambda(LAMBDA_IMPLICIT, path='hate'),
+    'hip': _lambda(LAMBDA_IMPLICIT, path='hip'),
+    'no_clue': _lambda(LAMBDA_IMPLICIT, path='no_clue'),
+    'community_advisors': _lambda(LAMBDA_IMPLICIT, 'community_advisors', path='community_advisors'),
     # --- Biased Models ---
-    'biased_recs_top_n': LambdaStrategy(function_name=LAMBDA_BIASED, payload_template={'path': 'top_n'}),
-    'biased_community_scored': LambdaStrategy(
-        function_name=LAMBDA_BIASED, payload_template={'path': 'community_scored_predictions'}
-    ),
-    'biased_ann_predicted_community_scored': LambdaStrategy(
-        function_name=LAMBDA_BIASED,
-        payload_template={'path': 'community_scored_predictions', 'ave_score_type': 'nn_predicted'},
+    'biased_recs_top_n': _lambda(LAMBDA_BIASED, path='top_n'),
+    'biased_community_scored': _lambda(LAMBDA_BIASED, 'community_comparison', path='community_scored_predictions'),
+    'biased_ann_predicted_community_scored': _lambda(
+        LAMBDA_BIASED, 'community_comparison', path='community_scored_predictions', ave_score_type='nn_predicted'
     ),
-    'biased_ann_observed_community_scored': LambdaStrategy(
-        function_name=LAMBDA_BIASED,
-        payload_template={'path': 'community_scored_predictions', 'ave_score_type': 'nn_observed'},
+    'biased_ann_observed_community_scored': _lambda(
+        LAMBDA_BIASED, 'community_comparison', path='community_scored_predictions', ave_score_type='nn_observed'
     ),
-    'biased_global_observed_community_scored': LambdaStrategy(
-        function_name=LAMBDA_BIASED,
-        payload_template={'path': 'community_scored_predictions', 'ave_score_type': 'global'},
+    'biased_global_observed_community_scored': _lambda(
+        LAMBDA_BIASED, 'community_comparison', path='community_scored_predictions', ave_score_type='global'
     ),
     # --- Emotion Models ---
-    'implicit_ers_top_n': LambdaStrategy(function_name=LAMBDA_EMOTION, payload_template={'path': 'top_n'}),
-    'implicit_ers_diverse_n': LambdaStrategy(function_name=LAMBDA_EMOTION, payload_template={'path': 'diverse_n'}),
+    'implicit_ers_top_n': _lambda(LAMBDA_EMOTION, path='top_n'),
+    'implicit_ers_diverse_n': _lambda(LAMBDA_EMOTION, path='diverse_n'),
 }
 
 
+@dataclass(frozen=True)
+class LoadedModel:
+    """A registry entry with its artifact loaded and ready to serve.
+
+    Attributes:
+        key: The registry key study conditions select the model by.
+        version: The artifact version; the bundle version for local models and the function name for Lambdas.
+        spec: The registry entry the model was loaded from.
+        strategy: The strategy serving the model.
+        loaded_at: When loading finished.
+        load_seconds: How long loading and warming took.
+        nbytes: Size of the artifact held by this process.
+    """
+
+    key: str
+    version: str
+    spec: Mapping[str, Any]
+    strategy: RecommendationStrategy
+    loaded_at: datetime
+    load_seconds: float
+    nbytes: int
+
+
+@dataclass(frozen=True)
+class _Slot:
+    current: LoadedModel
+    previous: LoadedModel | None = None
+
+
+def artifact_version(spec: Mapping[str, Any]) -> str:
+    """The version of the artifact a registry entry currently points at.
+
+    Raises:
+        ValueError: If the entry type is unknown.
+    """
+    if spec['type'] == 'lambda':
+        return spec['function_name']
+    if spec['type'] == 'local':
+        return bundle_version(spec['bundle'])
+    raise ValueError(f'Unknown registry entry type: {spec["type"]}')
+
+
+@lru_cache(maxsize=32)
+def _cached_fallback(kind: str, path: str, column: str, mtime: float) -> RankedFallback:
+    if kind == 'csv':
+        return RankedFallback.from_csv(path, column=column)
+    return RankedFallback.from_bundle(ModelBundle.open(path), array=column)
+
+
+def load_fallback(spec: Mapping[str, Any]) -> RankedFallback | None:
+    """Loads the fallback ranking of a registry entry.
+
+    Entries name it with `fallback`: `{'csv': path, 'column': ...}` or `{'bundle': path, 'array': ...}`, or null for
+    none. Without it, local entries fall back to their own bundle's average scores and Lambda entries to
+    `RECOMMENDATION_FALLBACK_CSV`, but only when their `response_type` is 'standard': a ranked item list cannot stand
+    in for advisor or comparison responses. A fallback that cannot be loaded is logged and left out.
+    """
+    fallback = spec.get('fallback', ...)
+    if fallback is ...:
+        if spec.get('response_type', 'standard') != 'standard':
+            fallback = None
+        elif spec['type'] == 'local':
+            fallback = {'bundle': spec['bundle']}
+        elif RECOMMENDATION_FALLBACK_CSV:
+            fallback = {'csv': RECOMMENDATION_FALLBACK_CSV}
+        else:
+            fallback = None
+    if fallback is None:
+        return None
+
+    try:
+        if 'csv' in fallback:
+            path = fallback['csv']
+            return _cached_fallback('csv', path, fallback.get('column', 'ave_discounted_score'), os.path.getmtime(path))
+        path = str(resolve_bundle_path(fallback['bundle']))
+        array = fallback.get('array', 'item_ave_discounted_score')
+        return _cached_fallback('bundle', path, array, os.path.getmtime(path))
+    except Exception as e:
+        log.error(f'Could not load fallback {fallback}: {e}')
+        return None
+
+
+def load_model(key: str, spec: Mapping[str, Any]) -> LoadedModel:
+    """Loads and warms the strategy of a registry entry. Blocking; run it in a worker thread.
+
+    Args:
+        key: The registry key.
+        spec: The registry entry. `lambda` entries take `function_name`, `payload_template`, `region_name` and the
+            micro-batching `batch_size` and `batch_window_seconds`; `local` entries take a `bundle` path and the
+            micro-batching `max_batch_size` and `max_wait_seconds`. Either can set `deadline_seconds` (null to call
+            the strategy unguarded), `hedge_after_seconds` and `fallback` for the `ResilientStrategy` around it, and
+            `emotion_rerank` (the `lookup` parquet path plus `EmotionRerankStrategy` options) to serve emotion input
+            from a locally re-ranked candidate pool. `response_type` names the kind of response the strategy answers
+            with ('standard' by default) and decides whether a default fallback applies.
+
+    Returns:
+        The loaded model.
+
+    Raises:
+        ValueError: If the entry type is unknown.
+    """
+    started = time.perf_counter()
+    version = artifact_version(spec)
+    strategy: RecommendationStrategy
+    if spec['type'] == 'lambda':
+        backend = f'lambda:{spec["function_name"]}'
+        strategy = LambdaStrategy(
+            function_name=spec['function_name'],
+            payload_template=dict(spec.get('payload_template', {})),
+            region_name=spec.get('region_name', 'us-east-1'),
+            batch_size=spec.get('batch_size', 1),
+            batch_window_seconds=spec.get('batch_window_seconds', 0.02),
+        )
+        nbytes = 0
+    else:
+        backend = f'bundle:{spec["bundle"]}'
+        options = {name: spec[name] for name in ('max_batch_size', 'max_wait_seconds') if name in spec}
+        strategy = LocalStrategy.from_bundle(spec['bundle'], **options)
+        strategy.batcher.scorer.warm()
+        nbytes = strategy.nbytes
+
+    if spec.get('emotion_rerank'):
+        strategy = EmotionRerankStrategy.from_options(strategy, spec['emotion_rerank'])
+        nbytes += strategy.emotions.vectors.nbytes
+
+    deadline_seconds = spec.get('deadline_seconds', RECOMMENDATION_DEADLINE_SECONDS)
+    if deadline_seconds is not None:
+        strategy = ResilientStrategy(
+            strategy,
+            name=key,
+            deadline_seconds=deadline_seconds,
+            hedge_after_seconds=spec.get('hedge_after_seconds'),
+            fallback=load_fallback(spec),
+            breaker=circuit_breaker(backend),
+        )
+
+    return LoadedModel(
+        key=key,
+        version=version,
+        spec=spec,
+        strategy=strategy,
+        loaded_at=datetime.now(UTC),
+        load_seconds=time.perf_counter() - started,
+        nbytes=nbytes,
+    )
+
+
+class ModelRegistry(Mapping[str, RecommendationStrategy]):
+    """The recommendation strategy behind every registry key, swappable without a restart.
+
+    Entries come from `DEFAULT_ENTRIES` overlaid with an optional JSON config file mapping keys to entries (`null`
+    removes a default). `reload` re-reads the file and the artifact versions it points at, loads and warms whatever
+    changed in a worker thread, and only then swaps it in. A swap replaces one dict item, so requests that already
+    picked up the old strategy finish on it while new requests get the new one. The replaced model stays loaded as
+    the entry's previous version, so `rollback` is instant.
+
+    Reading the registry (`REGISTRY.get(key)`) works like reading a dict of strategies.
+    """
+
+    def __init__(
+        self,
+        defaults: Mapping[str, Mapping[str, Any]],
+        config_path: str | Path | None = None,
+        poll_seconds: float | None = 60.0,
+    ):
+        """Initialize the registry with its default entries.
+
+        Args:
+            defaults: Entries served until the config file is loaded; they must be cheap to load.
+            config_path: JSON file with entries that extend or replace the defaults.
+            poll_seconds: How often `start` re-reads the config and artifact versions, or None to only reload on
+                demand.
+        """
+        self.defaults = dict(defaults)
+        self.config_path = Path(config_path) if config_path else None
+        self.poll_seconds = poll_seconds
+        self._slots = {key: _Slot(load_model(key, spec)) for key, spec in self.defaults.items()}
+        self._pinned: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._poller: asyncio.Task | None = None
+
+    def __getitem__(self, key: str) -> RecommendationStrategy:
+        return self._slots[key].current.strategy
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def models(self) -> list[tuple[LoadedModel, LoadedModel | None]]:
+        """The loaded (current, previous) models of every entry."""
+        return [(slot.current, slot.previous) for slot in self._slots.values()]
+
+    def read_entries(self) -> dict[str, Mapping[str, Any]]:
+        """The registry entries: the defaults overlaid with the config file, if there is one."""
+        entries: dict[str, Any] = dict(self.defaults)
+        if self.config_path is not None:
+            entries.update(json.loads(self.config_path.read_text()))
+        return {key: spec for key, spec in entries.items() if spec is not None}
+
+    async def reload(self, unpin: bool = False) -> list[str]:
+        """Loads entries whose config or artifact version changed and swaps them in.
+
+        An entry that fails to load keeps serving its current model. Entries that were rolled back stay pinned to
+        the rolled back version until reloaded with `unpin`.
+
+        Args:
+            unpin: Whether to also reload entries pinned by `rollback`.
+
+        Returns:
+            The keys that were added, replaced or removed.
+        """
+        async with self._lock:
+            if unpin:
+                self._pinned.clear()
+            entries = await asyncio.to_thread(self.read_entries)
+
+            changed = []
+            for key, spec in entries.items():
+                slot = self._slots.get(key)
+                if key in self._pinned and slot is not None:
+                    continue
+                try:
+                    if slot is not None and slot.current.spec == spec:
+                        version = await asyncio.to_thread(artifact_version, spec)
+                        if version == slot.current.version:
+                            continue
+                    model = await asyncio.to_thread(load_model, key, spec)
+                except Exception as e:
+                    log.error(f'Could not load model {key}: {e}')
+                    continue
+
+                self._slots[key] = _Slot(current=model, previous=slot.current if slot else None)
+                changed.append(key)
+                log.info(f'Model {key} now serving version {model.version} (loaded in {model.load_seconds:.2f}s)')
+
+            for key in [key for key in self._slots if key not in entries]:
+                del self._slots[key]
+                self._pinned.discard(key)
+                changed.append(key)
+                log.info(f'Model {key} removed from the registry')
+            return changed
+
+    def rollback(self, key: str) -> LoadedModel:
+        """Swaps an entry back to its previous version and pins it there.
+
+        Args:
+            key: The registry key.
+
+        Returns:
+            The model now serving the entry.
+
+        Raises:
+            KeyError: If the key is not registered.
+            ValueError: If the entry has no previous version.
+        """
+        slot = self._slots[key]
+        if slot.previous is None:
+            raise ValueError(f'Model {key} has no previous version to roll back to.')
+        self._slots[key] = _Slot(current=slot.previous, previous=slot.current)
+        self._pinned.add(key)
+        log.info(f'Model {key} rolled back to version {slot.previous.version}')
+        return slot.previous
+
+    def is_pinned(self, key: str) -> bool:
+        """Whether an entry was rolled back and is skipped by reloads."""
+        return key in self._pinned
+
+    async def start(self) -> None:
+        """Loads the configured entries and keeps polling for changes in the background."""
+        await self.reload()
+        if self.poll_seconds is not None and self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stops polling for changes."""
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.reload()
+            except Exception as e:
+                log.error(f'Model registry reload failed: {e}')
+
+
+REGISTRY = ModelRegistry(DEFAULT_ENTRIES, MODEL_REGISTRY_CONFIG or None, MODEL_REGISTRY_POLL_SECONDS)
+
+
 def get_registry_keys() -> list[dict[str, str]]:
     """Returns a list of registry keys formatted for frontend selection."""
     return [{'id': key, 'name': key.replace('_', ' ').title()} for key in REGISTRY.keys()]
@@ -0,0 +1,287 @@
+"""Deadlines, hedged requests, circuit breaking and fallbacks around recommendation strategies."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
+from rssa_api.data.schemas.recommendations import ResponseWrapper
+
+from .bundle import ModelBundle
+from .strategies import RecommendationStrategy
+
+log = logging.getLogger(__name__)
+
+FallbackReason = Literal['deadline', 'error', 'circuit_open']
+
+
+class RecommendationUnavailableError(RuntimeError):
+    """Raised when a strategy failed or missed its deadline and no fallback is configured."""
+
+
+class CircuitBreaker:
+    """Stops calling a backend that keeps failing, and lets a single trial request through once it may have recovered.
+
+    The breaker opens after `failure_threshold` consecutive failures. While open, requests are refused for
+    `reset_seconds`; the first request after that is let through as a trial, and its outcome closes or re-opens the
+    breaker.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 5, reset_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker.
+            reset_seconds: How long the breaker stays open before a trial request.
+            clock: Monotonic clock, replaceable in tests.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> Literal['closed', 'open', 'half_open']:
+        """The breaker state."""
+        if self._opened_at is None:
+            return 'closed'
+        if self._trial_in_flight or self._clock() - self._opened_at >= self.reset_seconds:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now. Letting a trial request through counts as sending it."""
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Closes the breaker."""
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Gives up a trial request without an outcome, e.g. when it was cancelled, so the next request can try."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Counts a failure, opening the breaker at the threshold or when a trial request failed."""
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def circuit_breaker(name: str) -> CircuitBreaker:
+    """The process-wide breaker of a backend (a Lambda function or a model bundle), shared by every key using it."""
+    return _circuit_breakers.setdefault(name, CircuitBreaker())
+
+
+class LatencyWindow:
+    """The latencies of the most recent successful requests."""
+
+    def __init__(self, size: int = 256, min_samples: int = 20):
+        """Initialize an empty window.
+
+        Args:
+            size: Number of latencies kept.
+            min_samples: Samples needed before quantiles are reported.
+        """
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        """Records a latency."""
+        self._latencies.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """The q-quantile of the recorded latencies, or None while there are too few of them."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        return float(np.quantile(np.fromiter(self._latencies, dtype=float), q))
+
+
+class RankedFallback:
+    """A precomputed ranking served when a strategy cannot answer in time, minus the items the participant rated."""
+
+    def __init__(self, item_ids: Sequence[int | str], name: str = 'fallback'):
+        """Initialize a fallback.
+
+        Args:
+            item_ids: External item ids, best first.
+            name: Where the ranking came from, for logging.
+        """
+        self.item_ids = [int(item_id) for item_id in item_ids]
+        self.name = name
+
+    @classmethod
+    def from_csv(
+        cls, path: str | Path, column: str = 'ave_discounted_score', item_column: str = 'item'
+    ) -> 'RankedFallback':
+        """Ranks the items of a train_mfs score table, such as averaged_item_score.csv, by one of its columns."""
+        scores = pd.read_csv(path, usecols=[item_column, column]).dropna()
+        ranked = scores.sort_values(column, ascending=False, kind='stable')[item_column]
+        return cls(ranked.tolist(), name=f'{Path(path).name}:{column}')
+
+    @classmethod
+    def from_bundle(cls, bundle: ModelBundle, array: str = 'item_ave_discounted_score') -> 'RankedFallback':
+        """Ranks the items of a model bundle by one of its per-item score arrays."""
+        scores = np.nan_to_num(np.asarray(bundle.arrays[array], dtype=np.float64), nan=-np.inf)
+        order = np.argsort(-scores, kind='stable')
+        return cls(bundle.item_ids[order].tolist(), name=f'{bundle.version}:{array}')
+
+    def recommend(self, ratings: list[MovieLensRating], limit: int) -> ResponseWrapper:
+        """The top `limit` items the participant has not rated."""
+        rated = {int(rating.item_id) for rating in ratings}
+        items = [item_id for item_id in self.item_ids if item_id not in rated][:limit]
+        return ResponseWrapper(response_type='standard', items=items)
+
+
+class ResilientStrategy:
+    """Bounds how long a participant waits on a strategy.
+
+    Each request runs against a deadline. When it is still running after the hedge delay (a fixed delay, or the
+    observed p95 latency once enough requests were seen), or when it fails early, a duplicate request is sent and the
+    first answer wins. Consecutive failures open the backend's circuit breaker so requests stop queueing up behind a
+    broken function. A missed deadline, a failure, or an open breaker is answered from the fallback ranking, marked
+    with `fallback_reason`.
+    """
+
+    def __init__(
+        self,
+        strategy: RecommendationStrategy,
+        name: str,
+        deadline_seconds: float = 8.0,
+        hedge_after_seconds: float | None = None,
+        fallback: RankedFallback | None = None,
+        breaker: CircuitBreaker | None = None,
+        hedge_quantile: float = 0.95,
+    ):
+        """Wrap a strategy.
+
+        Args:
+            strategy: The strategy to call.
+            name: Name used in log messages, usually the registry key.
+            deadline_seconds: Longest time a request may take, hedges included.
+            hedge_after_seconds: Delay before the duplicate request; the observed `hedge_quantile` latency when None.
+            fallback: The ranking served when the strategy cannot answer. Without one, such requests raise
+                `RecommendationUnavailableError`.
+            breaker: The circuit breaker of the strategy's backend.
+            hedge_quantile: Latency quantile used as the hedge delay when `hedge_after_seconds` is None.
+        """
+        self.inner = strategy
+        self.name = name
+        self.deadline_seconds = deadline_seconds
+        self.hedge_after_seconds = hedge_after_seconds
+        self.fallback = fallback
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge_quantile = hedge_quantile
+        self.latencies = LatencyWindow()
+        self.hedged_requests = 0
+        self.fallback_responses = 0
+
+    def hedge_delay(self) -> float | None:
+        """Seconds before a duplicate request is sent, or None when there is no basis for hedging yet."""
+        if self.hedge_after_seconds is not None:
+            return self.hedge_after_seconds
+        return self.latencies.quantile(self.hedge_quantile)
+
+    async def recommend(
+        self, user_id: str, ratings: list[MovieLensRating], limit: int, run_config: dict | None = None
+    ) -> ResponseWrapper:
+        """Recommends through the wrapped strategy, or from the fallback if it cannot answer before the deadline."""
+        if not self.breaker.allow():
+            return self._fall_back(ratings, limit, 'circuit_open')
+
+        try:
+            result = await self._race(user_id, ratings, limit, run_config)
+        except TimeoutError:
+            self.breaker.record_failure()
+            log.warning(f'Strategy {self.name} missed its {self.deadline_seconds}s deadline')
+            return self._fall_back(ratings, limit, 'deadline')
+        except Exception as e:
+            self.breaker.record_failure()
+            log.error(f'Strategy {self.name} failed: {e}')
+            return self._fall_back(ratings, limit, 'error', e)
+        except BaseException:
+            # Cancelled: the request says nothing about the backend, but must not hold on to the trial slot.
+            self.breaker.release_trial()
+            raise
+
+        self.breaker.record_success()
+        return result
+
+    async def _race(
+        self, user_id: str, ratings: list[MovieLensRating], limit: int, run_config: dict | None
+    ) -> ResponseWrapper:
+        """Returns the first successful answer of the request and its hedge.
+
+        Raises:
+            TimeoutError: If no attempt answered before the deadline.
+            Exception: The error of the last attempt, if every attempt failed.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.deadline_seconds
+        hedge_delay = self.hedge_delay()
+        hedge_at = started + hedge_delay if hedge_delay is not None else None
+
+        def attempt() -> asyncio.Task:
+            return asyncio.create_task(self.inner.recommend(user_id, ratings, limit, run_config))
+
+        pending = {attempt()}
+        hedged = False
+        error: BaseException | None = None
+        try:
+            while pending and loop.time() < deadline:
+                wake_at = deadline if hedged or hedge_at is None else min(hedge_at, deadline)
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(wake_at - loop.time(), 0), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies.add(loop.time() - started)
+                        return task.result()
+                    error = task.exception()
+
+                # Hedge once: when the hedge delay passed, or right away when the first attempt already failed.
+                if not hedged and (not pending or (hedge_at is not None and loop.time() >= hedge_at)):
+                    hedged = True
+                    if self.breaker.allow():
+                        self.hedged_requests += 1
+                        pending.add(attempt())
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending or error is None:
+            raise TimeoutError
+        raise error
+
+    def _fall_back(
+        self, ratings: list[MovieLensRating], limit: int, reason: FallbackReason, error: BaseException | None = None
+    ) -> ResponseWrapper:
+        if self.fallback is None:
+            raise RecommendationUnavailableError(f'Strategy {self.name} is unavailable ({reason}).') from error
+        self.fallback_responses += 1
+        log.warning(f'Serving {self.name} from fallback {self.fallback.name} ({reason})')
+        return self.fallback.recommend(ratings, limit).model_copy(update={'fallback_reason': reason})
@@ -2,6 +2,7 @@
 
 import json
 import logging
+from pathlib import Path
 from typing import Any, Protocol, cast
 
 from aiobotocore.session import get_session
@@ -12,6 +13,10 @@ from rssa_api.data.schemas.recommendations import (
     ResponseWrapper,
 )
 
+from .batching import MicroBatcher
+from .bundle import ModelBundle
+from .fold_in import FoldInBatcher, FoldInScorer
+
 log = logging.getLogger(__name__)
 
 
@@ -33,12 +38,34 @@ class RecommendationStrategy(Protocol):
 class LambdaStrategy:
     """Invokes an AWS Lambda function for recommendations."""
 
-    def __init__(self, function_name: str, payload_template: dict, region_name: str = 'us-east-1'):
+    def __init__(
+        self,
+        function_name: str,
+        payload_template: dict,
+        region_name: str = 'us-east-1',
+        batch_size: int = 1,
+        batch_window_seconds: float = 0.02,
+    ):
+        """Initialize the strategy.
+
+        Args:
+            function_name: The Lambda function to invoke.
+            payload_template: Fields sent with every request, e.g. the recommender path.
+            region_name: The AWS region of the function.
+            batch_size: Largest number of requests merged into one invocation; 1 invokes once per request. The
+                function must accept the batch payload (see `_invoke_batch`) when this is above 1.
+            batch_window_seconds: Longest time a request waits for others to join its invocation.
+        """
         self.logical_function_name = function_name
         self.resolved_function_name: str | None = None
         self.payload_template = payload_template
         self.region_name = region_name
         self._session = get_session()
+        self._batcher: MicroBatcher[dict, ResponseWrapper] | None = None
+        if batch_size > 1:
+            self._batcher = MicroBatcher(
+                self._invoke_batch, batch_size, batch_window_seconds, name=f'Lambda batch for {function_name}'
+            )
 
     # async def _resolve_function_name(self, client) -> str:
     #     """Finds the full Lambda function name given a partial (logical) name.
@@ -74,7 +101,7 @@ class LambdaStrategy:
     async def recommend(
         self, user_id: str, ratings: list[MovieLensRating], limit: int, run_config: dict | None = None
     ) -> ResponseWrapper:
-        """Invokes the Lambda function."""
+        """Invokes the Lambda function, merged with concurrent requests when batching is enabled."""
         payload = self.payload_template.copy()
         if run_config:
             payload.update(run_config)
@@ -83,7 +110,33 @@ class LambdaStrategy:
         payload['ratings'] = [r.model_dump() for r in ratings]
         payload['limit'] = limit  # Ensure limit is passed
 
-        # Invoke Lambda
+        if self._batcher is not None:
+            return await self._batcher.submit(payload)
+        response_data = await self._invoke(payload)
+        return ResponseWrapper.model_validate_json(response_data['body'])
+
+    async def _invoke_batch(self, payloads: list[dict]) -> list[ResponseWrapper | BaseException]:
+        """Sends several requests in one invocation.
+
+        The function receives `{'batch': [payload, ...]}` and answers with a body holding a JSON list with, per
+        payload and in the same order, either the response wrapper or an object with an `errorMessage`. A lone
+        request is sent as a plain payload, so it is served exactly like an unbatched one.
+        """
+        if len(payloads) == 1:
+            response_data = await self._invoke(payloads[0])
+            return [ResponseWrapper.model_validate_json(response_data['body'])]
+
+        response_data = await self._invoke({'batch': payloads})
+        results: list[ResponseWrapper | BaseException] = []
+        for entry in json.loads(response_data['body']):
+            if 'errorMessage' in entry:
+                results.append(RuntimeError(f'Recommendation Engine Error: {entry["errorMessage"]}'))
+            else:
+                results.append(ResponseWrapper.model_validate(entry))
+        return results
+
+    async def _invoke(self, payload: dict) -> dict:
+        """Invokes the Lambda function with a payload and returns its decoded response."""
         try:
             async with self._session.create_client('lambda', region_name=self.region_name) as client:
                 lambda_client = cast(LambdaClient, client)
@@ -105,8 +158,37 @@ class LambdaStrategy:
 
                 log.info(f'Lambda Raw Response: {response_data}')
 
-                return ResponseWrapper.model_validate_json(response_data['body'])
+                return response_data
 
         except Exception as e:
             log.error(f'Error invoking Lambda strategy {self.logical_function_name}: {e}')
             raise e
+
+
+class LocalStrategy:
+    """Scores recommendations in process by folding the participant's ratings into a memory-mapped model bundle."""
+
+    def __init__(self, batcher: FoldInBatcher):
+        self.batcher = batcher
+
+    @classmethod
+    def from_bundle(
+        cls, path: str | Path, max_batch_size: int = 64, max_wait_seconds: float = 0.005
+    ) -> 'LocalStrategy':
+        """Opens a bundle written by train_mfs and serves it through a micro-batching fold-in scorer."""
+        scorer = FoldInScorer(ModelBundle.open(path))
+        return cls(FoldInBatcher(scorer, max_batch_size=max_batch_size, max_wait_seconds=max_wait_seconds))
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the model bundle served by this strategy."""
+        return self.batcher.scorer.bundle.nbytes
+
+    async def recommend(
+        self, user_id: str, ratings: list[MovieLensRating], limit: int, run_config: dict | None = None
+    ) -> ResponseWrapper:
+        """Ranks the model's catalogue for the participant."""
+        items = await self.batcher.recommend(
+            item_ids=[int(r.item_id) for r in ratings], ratings=[r.rating for r in ratings], limit=limit
+        )
+        return ResponseWrapper(response_type='standard', items=items)
@@ -1,16 +1,17 @@
 """Service for handling recommendation logic."""
 
 import asyncio
+import hashlib
+import json
 import logging
+import os
 import uuid
-from datetime import datetime
 from typing import Any, cast
 
 from rssa_storage.moviedb.repositories import MovieRepository
 from rssa_storage.rssadb.models.study_participants import ParticipantRecommendationContext
 from rssa_storage.rssadb.repositories.participant_responses import (
     ParticipantRatingRepository,
-    ParticipantStudyInteractionResponse,
     ParticipantStudyInteractionResponseRepository,
 )
 from rssa_storage.rssadb.repositories.study_participants import (
@@ -20,11 +21,9 @@ from rssa_storage.rssadb.repositories.study_participants import (
 from rssa_storage.shared import RepoQueryOptions
 
 from rssa_api.core.queue import BackgroundWriteCommand, background_write_queue
+from rssa_api.core.ttl_cache import TTLCache
 from rssa_api.data.schemas.movie_schemas import MovieDetailSchema
-from rssa_api.data.schemas.participant_response_schemas import (
-    DynamicPayload,
-    MovieLensRating,
-)
+from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
 from rssa_api.data.schemas.recommendations import (
     AdvisorRecItem,
     Avatar,
@@ -35,11 +34,33 @@ from rssa_api.data.schemas.recommendations import (
     EnrichedResponseWrapper,
     ResponseWrapper,
 )
+from rssa_api.data.utility import to_json_safe
 
+from .movielens_ids import MovieLensIdMap, movielens_id_map
 from .recommendation.registry import REGISTRY
 
 log = logging.getLogger(__name__)
 
+# Request fields that only say where recommendations are shown. Requests carrying anything else (emotion input, run
+# configs) depend on more than the participant's ratings and cannot be answered from a prefetch.
+ROUTING_CONTEXT_KEYS = frozenset({'step_id', 'step_page_id', 'context_tag'})
+
+# Recommender serving anonymous demo requests that do not name one with `recommender_key`.
+DEMO_RECOMMENDER_KEY = os.getenv('DEMO_RECOMMENDER_KEY', 'implicit_recs_top_n')
+# Recommenders anonymous demo requests may name, comma separated.
+DEMO_RECOMMENDER_KEYS = frozenset(
+    key.strip()
+    for key in os.getenv(
+        'DEMO_RECOMMENDER_KEYS', f'{DEMO_RECOMMENDER_KEY},implicit_ers_top_n,implicit_ers_diverse_n'
+    ).split(',')
+    if key.strip()
+)
+# Demo request fields passed on to the recommender; anything else in `context_data` is ignored.
+DEMO_TUNING_KEYS = frozenset({'emotion_input'})
+
+# What a prefetched result was computed from: the recommender key, the limit and the ratings.
+PrefetchInputs = tuple[str, int, tuple[tuple[str, float], ...]]
+
 AVATARS = {
     'cow': {
         'src': 'cow',
@@ -82,9 +103,13 @@ AVATARS = {
 class RecommenderService:
     """Service for handling recommendation logic."""
 
-    _cache: dict[str, dict[str, Any]] = {}  # caching results for ttl seconds
     _in_flight: dict[str, asyncio.Future] = {}  # caching currently running tasks
     _bg_tasks: set[asyncio.Task] = set()  # For fire-and-forget database calls
+    # Speculatively computed recommendations per participant, with the inputs they were computed from
+    _prefetched: TTLCache[uuid.UUID, tuple[PrefetchInputs, asyncio.Task]] = TTLCache(ttl_seconds=900)
+    # Demo responses by request hash, and the movie details they are enriched with
+    _demo_results: TTLCache[str, EnrichedResponseWrapper] = TTLCache(ttl_seconds=3600, maxsize=1024, lru=True)
+    _movie_details: TTLCache[str, MovieDetailSchema] = TTLCache(ttl_seconds=3600, maxsize=8192, lru=True)
 
     def __init__(
         self,
@@ -94,6 +119,7 @@ class RecommenderService:
         participant_interaction_repository: ParticipantStudyInteractionResponseRepository,
         recommendation_context_repository: ParticipantRecommendationContextRepository,
         ttl_seconds: int = 300,
+        movielens_ids: MovieLensIdMap | None = None,
     ):
         self.study_participant_repository = study_participant_repository
         self.participant_rating_repository = participant_rating_repository
@@ -102,17 +128,142 @@ class RecommenderService:
         self.recommendation_context_repository = recommendation_context_repository
 
         self.ttl = ttl_seconds
+        self.movielens_ids = movielens_ids if movielens_ids is not None else movielens_id_map
+
+    @classmethod
+    def invalidate_participant(cls, study_participant_id: uuid.UUID) -> None:
+        """Drops the prefetched recommendations of a participant whose ratings changed."""
+        cls._prefetched.invalidate(study_participant_id)
+
+    async def prefetch_recommendations(self, study_participant_id: uuid.UUID) -> None:
+        """Computes a participant's recommendations ahead of their request.
+
+        The result is kept in process together with the inputs it was computed from. A later request with the same
+        recommender, limit and ratings joins or reuses it instead of calling the strategy, and persists it under its
+        own context tag. Nothing is stored when the participant has no ratings or the strategy fell back.
+        """
+        algorithm_key, limit = await self._get_participant_algorithm_config(study_participant_id)
+        ratings = await self._get_translated_participant_ratings(study_participant_id)
+        strategy = REGISTRY.get(algorithm_key)
+        if not ratings or not strategy:
+            return
+
+        inputs = self._prefetch_inputs(algorithm_key, limit, ratings)
+        hit, entry = self._prefetched.lookup(study_participant_id)
+        if hit and entry and entry[0] == inputs:
+            return
+
+        task = asyncio.create_task(strategy.recommend(user_id=str(study_participant_id), ratings=ratings, limit=limit))
+        self._prefetched.set(study_participant_id, (inputs, task))
+        try:
+            result = await task
+        except Exception as e:
+            log.warning(f'Prefetch for {study_participant_id} [{algorithm_key}] failed: {e}')
+            self._drop_prefetch(study_participant_id, task)
+            return
+        if result.fallback_reason:
+            self._drop_prefetch(study_participant_id, task)
+            return
+        log.info(f'Prefetched recommendations for {study_participant_id} [{algorithm_key}]')
+
+    @staticmethod
+    def _prefetch_inputs(algorithm_key: str, limit: int, ratings: list[MovieLensRating]) -> PrefetchInputs:
+        return algorithm_key, limit, tuple(sorted((str(r.item_id), float(r.rating)) for r in ratings))
+
+    @classmethod
+    def _drop_prefetch(cls, study_participant_id: uuid.UUID, task: asyncio.Task) -> None:
+        """Removes a participant's prefetch, unless a newer one replaced it meanwhile."""
+        hit, entry = cls._prefetched.lookup(study_participant_id)
+        if hit and entry and entry[1] is task:
+            cls._prefetched.invalidate(study_participant_id)
+
+    async def _take_prefetched(
+        self,
+        study_participant_id: uuid.UUID,
+        algorithm_key: str,
+        limit: int,
+        ratings: list[MovieLensRating],
+        context_data: dict[str, Any],
+    ) -> ResponseWrapper | None:
+        """The prefetched result for these inputs, waiting for it if it is still being computed."""
+        if not context_data.keys() <= ROUTING_CONTEXT_KEYS:
+            return None
+        hit, entry = self._prefetched.lookup(study_participant_id)
+        if not hit or not entry or entry[0] != self._prefetch_inputs(algorithm_key, limit, ratings):
+            return None
+        try:
+            # Shielded so that an abandoned request does not cancel the prefetch other requests may join.
+            result = await asyncio.shield(entry[1])
+        except Exception:
+            return None
+        return None if result.fallback_reason else result
 
     async def get_recommendations(
         self, ratings: list[MovieLensRating], limit: int, context_data: dict[str, Any] | None = None
     ) -> EnrichedResponseWrapper:
-        """Get recommendations based on ratings."""
-        if not context_data:
-            # TODO: This will return the implicit top N.
-            return EnrichedResponseWrapper(response_type='standard', items=[])
-        # TODO: This should be a generic call to the recommender without needing participant context. The idea is for
-        # this method to service the demo endpoints.
-        return EnrichedResponseWrapper(response_type='standard', items=[])
+        """Get recommendations for anonymous demo traffic.
+
+        Requests go to the strategy named by `context_data['recommender_key']`, which must be one of
+        `DEMO_RECOMMENDER_KEYS`, or to `DEMO_RECOMMENDER_KEY`. Only the `DEMO_TUNING_KEYS` fields of the context reach
+        the strategy. Results are cached by a hash of the recommender, ratings, limit and those fields, so the many
+        visitors submitting the same starter ratings share one computation, and identical requests running at the same
+        time are joined.
+
+        Raises:
+            ValueError: If the recommender is not open to demo requests or not registered.
+        """
+        context_data = context_data or {}
+        algorithm_key = str(context_data.get('recommender_key', DEMO_RECOMMENDER_KEY))
+        if algorithm_key not in DEMO_RECOMMENDER_KEYS:
+            raise ValueError(f'Recommender {algorithm_key} is not available for demo requests')
+        run_config = {key: value for key, value in context_data.items() if key in DEMO_TUNING_KEYS}
+        request_hash = self._demo_request_hash(algorithm_key, ratings, limit, run_config)
+
+        hit, cached = self._demo_results.lookup(request_hash)
+        if hit and cached is not None:
+            return cached
+
+        dedup_key = f'demo_{request_hash}'
+        if dedup_key in self._in_flight:
+            return await self._in_flight[dedup_key]
+        gen_task = asyncio.create_task(self._generate_demo(algorithm_key, request_hash, ratings, limit, run_config))
+        self._in_flight[dedup_key] = gen_task
+
+        try:
+            return await gen_task
+        finally:
+            self._in_flight.pop(dedup_key, None)
+
+    @staticmethod
+    def _demo_request_hash(
+        algorithm_key: str, ratings: list[MovieLensRating], limit: int, run_config: dict[str, Any]
+    ) -> str:
+        """A hash of the request that does not depend on the order of the ratings or run config keys."""
+        canonical = json.dumps(
+            [algorithm_key, limit, sorted((str(r.item_id), r.rating) for r in ratings), run_config],
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    async def _generate_demo(
+        self,
+        algorithm_key: str,
+        request_hash: str,
+        ratings: list[MovieLensRating],
+        limit: int,
+        run_config: dict[str, Any],
+    ) -> EnrichedResponseWrapper:
+        strategy = REGISTRY.get(algorithm_key)
+        if not strategy:
+            raise ValueError(f'No strategy found for key: {algorithm_key}')
+
+        result = await strategy.recommend(user_id='demo', ratings=ratings, limit=limit, run_config=run_config or None)
+        enriched = await self._process_recommendation_result(result, movie_cache=self._movie_details)
+        if not result.fallback_reason:
+            self._demo_results.set(request_hash, enriched)
+        return enriched
 
     async def get_recommendations_for_study_participant(
         self, study_id: uuid.UUID, study_participant_id: uuid.UUID, context_data: dict[str, Any]
@@ -162,17 +313,11 @@ class RecommenderService:
                 {'study_id': study_id, 'study_participant_id': study_participant_id, 'context_data': context_data},
             )
 
-        strategy = REGISTRY.get(algorithm_key)
-        if not strategy:
-            raise ValueError(f'No strategy found for key: {algorithm_key}')
-
-        try:
-            result = await strategy.recommend(
-                user_id=str(study_participant_id), ratings=ratings, limit=limit, run_config=context_data
-            )
-        except Exception as e:
-            log.error(f'Error for {study_participant_id} [{algorithm_key}]: {e}')
-            raise
+        result = await self._take_prefetched(study_participant_id, algorithm_key, limit, ratings, context_data)
+        if result is not None:
+            log.info(f'Serving prefetched recommendations for {study_participant_id} [{algorithm_key}]')
+        else:
+            result = await self._recommend(study_participant_id, algorithm_key, limit, ratings, context_data)
 
         self._enqueue_command(
             'save_rec_context',
@@ -182,12 +327,38 @@ class RecommenderService:
                 'step_page_id': step_page_id,
                 'study_participant_id': study_participant_id,
                 'context_tag': context_tag,
-                'result_json': result.model_dump(),
+                'result_json': to_json_safe(result),
             },
         )
 
         return await self._process_recommendation_result(result)
 
+    async def _recommend(
+        self,
+        study_participant_id: uuid.UUID,
+        algorithm_key: str,
+        limit: int,
+        ratings: list[MovieLensRating],
+        context_data: dict[str, Any],
+    ) -> ResponseWrapper:
+        """Calls the participant's strategy."""
+        strategy = REGISTRY.get(algorithm_key)
+        if not strategy:
+            raise ValueError(f'No strategy found for key: {algorithm_key}')
+
+        try:
+            result = await strategy.recommend(
+                user_id=str(study_participant_id), ratings=ratings, limit=limit, run_config=context_data
+            )
+        except Exception as e:
+            log.error(f'Error for {study_participant_id} [{algorithm_key}]: {e}')
+            raise
+        if result.fallback_reason:
+            log.warning(
+                f'Fallback recommendations for {study_participant_id} [{algorithm_key}]: {result.fallback_reason}'
+            )
+        return result
+
     def _parse_recommendation_context(self, context_data: dict[str, Any]) -> tuple[uuid.UUID, str, uuid.UUID | None]:
         """Extracts and validates required context fields."""
         step_id = context_data.get('step_id')
@@ -244,13 +415,12 @@ class RecommenderService:
         if not ratings_models:
             return []
 
-        movies = await self.movie_repository.find_many(RepoQueryOptions(ids=[r.item_id for r in ratings_models]))
-        movie_map = {m.id: m.movielens_id for m in movies}
+        movielens_ids = await self.movielens_ids.translate([r.item_id for r in ratings_models], self.movie_repository)
 
         ratings = []
-        for r in ratings_models:
-            if r.item_id in movie_map:
-                ratings.append(MovieLensRating(item_id=movie_map[r.item_id], rating=r.rating))
+        for r, movielens_id in zip(ratings_models, movielens_ids, strict=True):
+            if movielens_id is not None:
+                ratings.append(MovieLensRating(item_id=movielens_id, rating=r.rating))
             else:
                 log.warning(f'Rating for item {r.item_id} skipped: Movie not found in DB')
 
@@ -272,28 +442,32 @@ class RecommenderService:
             study_step_page_id=step_page_id,
             study_participant_id=study_participant_id,
             context_tag=context_tag,
-            recommendations_json=result.model_dump(),
+            recommendations_json=to_json_safe(result),
         )
         await self.recommendation_context_repository.create(rec_ctx)
 
-    async def _process_recommendation_result(self, result: ResponseWrapper) -> EnrichedResponseWrapper:
+    async def _process_recommendation_result(
+        self, result: ResponseWrapper, movie_cache: TTLCache[str, MovieDetailSchema] | None = None
+    ) -> EnrichedResponseWrapper:
         response_items: EnrichedRecUnionType
         if result.response_type == 'standard':
             # TODO: Check if we should use OrderedDict here or does dict in Python3 maintain order?
-            movies = await self._enrich_with_moviedata([str(rec_item) for rec_item in result.items])
+            movies = await self._enrich_with_moviedata([str(rec_item) for rec_item in result.items], movie_cache)
             response_items = {int(movie.movielens_id): movie for movie in movies}
 
         elif result.response_type == 'community_advisors':
-            response_items = await self._enrich_advisor_response(result)
+            response_items = await self._enrich_advisor_response(result, movie_cache)
 
         elif result.response_type == 'community_comparison':
-            response_items = await self._enrich_pref_viz_response(result)
+            response_items = await self._enrich_pref_viz_response(result, movie_cache)
         else:
             raise KeyError('Result response_type key did not match any known types.')
 
         return EnrichedResponseWrapper(response_type=result.response_type, items=response_items)
 
-    async def _enrich_advisor_response(self, response: ResponseWrapper) -> EnrichedRecUnionType:
+    async def _enrich_advisor_response(
+        self, response: ResponseWrapper, movie_cache: TTLCache[str, MovieDetailSchema] | None = None
+    ) -> EnrichedRecUnionType:
         """Helper to hydrate Advisor responses with movie data."""
         advisor_dict = {}
         all_movie_ids = set()
@@ -304,7 +478,7 @@ class RecommenderService:
             all_movie_ids.update([str(mid) for mid in advisor.profile_top_n])
             all_movie_ids.add(str(advisor.recommendation))
 
-        all_movies = await self._enrich_with_moviedata(list(all_movie_ids))
+        all_movies = await self._enrich_with_moviedata(list(all_movie_ids), movie_cache)
         movie_dict = {str(m.movielens_id): m for m in all_movies}
         avatar_keys = list(AVATARS.keys())
         for i, advisor in enumerate(advisors):
@@ -316,7 +490,9 @@ class RecommenderService:
             )
         return advisor_dict
 
-    async def _enrich_pref_viz_response(self, response: ResponseWrapper) -> EnrichedRecUnionType:
+    async def _enrich_pref_viz_response(
+        self, response: ResponseWrapper, movie_cache: TTLCache[str, MovieDetailSchema] | None = None
+    ) -> EnrichedRecUnionType:
         """Helper to hydrate Preference Visualization responses with movie data."""
         all_rec_ids = set()
         comm_scores = []
@@ -325,7 +501,7 @@ class RecommenderService:
             comm_scores.append(score_item)
             all_rec_ids.add(score_item.item)
 
-        movies = await self._enrich_with_moviedata([str(mid) for mid in all_rec_ids])
+        movies = await self._enrich_with_moviedata([str(mid) for mid in all_rec_ids], movie_cache)
         movies_dict = {int(m.movielens_id): m for m in movies}
         return {
             score_item.item: EnrichedCommunityScoreItem(
@@ -334,59 +510,25 @@ class RecommenderService:
             for score_item in comm_scores
         }
 
-    async def _enrich_with_moviedata(self, movielens_ids: list[str]) -> list[MovieDetailSchema]:
-        """Helper to enrich recommendations with movie data."""
+    async def _enrich_with_moviedata(
+        self, movielens_ids: list[str], movie_cache: TTLCache[str, MovieDetailSchema] | None = None
+    ) -> list[MovieDetailSchema]:
+        """Helper to enrich recommendations with movie data, reading and filling `movie_cache` when given."""
         movielens_ids = [str(mid) for mid in movielens_ids]
-        options = RepoQueryOptions(filters={'movielens_id': movielens_ids}, load_options=MovieRepository.LOAD_ALL)
-        movies = await self.movie_repository.find_many(options)
-        movie_map = {movie.movielens_id: MovieDetailSchema.model_validate(movie) for movie in movies}
+        movie_map: dict[str, MovieDetailSchema] = {}
+        if movie_cache is not None:
+            for mid in movielens_ids:
+                hit, movie = movie_cache.lookup(mid)
+                if hit and movie is not None:
+                    movie_map[mid] = movie
+
+        missing = [mid for mid in movielens_ids if mid not in movie_map]
+        if missing:
+            options = RepoQueryOptions(filters={'movielens_id': missing}, load_options=MovieRepository.LOAD_ALL)
+            movies = await self.movie_repository.find_many(options)
+            for movie in movies:
+                movie_map[movie.movielens_id] = MovieDetailSchema.model_validate(movie)
+                if movie_cache is not None:
+                    movie_cache.set(movie.movielens_id, movie_map[movie.movielens_id])
 
         return [movie_map[mid] for mid in movielens_ids]  # we must preserve original order, since they are ranked
-
-    async def _upsert_interaction(self, study_id: uuid.UUID, study_participant_id: uuid.UUID, context_data: dict):
-        """Helper to upsert participant interactions."""
-        try:
-            step_id_str = context_data.get('step_id')
-            if step_id_str:
-                step_id = uuid.UUID(str(step_id_str))
-                context_tag = context_data.get('tuning_tag', 'emotion_tuning')
-
-                # Check for existing interaction
-                existing_interaction = await self.participant_interaction_repository.find_one(
-                    RepoQueryOptions(
-                        filters={
-                            'study_participant_id': study_participant_id,
-                            'context_tag': context_tag,
-                            'study_step_id': step_id,
-                        }
-                    )
-                )
-
-                new_entry = {
-                    'timestamp': datetime.now().isoformat(),
-                    'emotion_input': context_data['emotion_input'],
-                }
-
-                if existing_interaction:
-                    current_payload = existing_interaction.payload_json
-                    history = current_payload.get('history', [])
-                    if not isinstance(history, list):
-                        history = []
-                    history.append(new_entry)
-
-                    updated_payload = {**current_payload, 'history': history}
-                    await self.participant_interaction_repository.update(
-                        existing_interaction.id, {'payload_json': updated_payload}
-                    )
-                else:
-                    payload = ParticipantStudyInteractionResponse(
-                        study_id=study_id,
-                        study_participant_id=study_participant_id,
-                        study_step_id=step_id,
-                        context_tag=context_tag,
-                        payload_json=DynamicPayload(extra={'history': [new_entry]}).model_dump(),
-                    )
-                    await self.participant_interaction_repository.create(payload)
-
-        except Exception as e:
-            log.error(f'Failed to record interaction: {e}')
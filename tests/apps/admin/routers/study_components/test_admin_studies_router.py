@@ -2,6 +2,7 @@
 
 import uuid
 from collections.abc import Generator
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -11,6 +12,7 @@ from fastapi.testclient import TestClient
 from rssa_api.apps.admin.routers.study_components.studies import router
 from rssa_api.auth.security import get_auth0_authenticated_user, get_current_user
 from rssa_api.data.schemas import Auth0UserSchema
+from rssa_api.data.schemas.study_components import StudyStats
 from rssa_api.data.services.dependencies import (
     ApiKeyServiceDep,
     StudyConditionServiceDep,
@@ -39,6 +41,21 @@ def override_dep(app, dep, mock) -> None:
         app.dependency_overrides[dep] = lambda: mock
 
 
+def _study_stats(study_id: uuid.UUID, **overrides: Any) -> StudyStats:
+    """Builds study statistics with empty defaults."""
+    fields: dict[str, Any] = {
+        'study_id': study_id,
+        'total_participants': 0,
+        'verified_participants': 0,
+        'completed_participants': 0,
+        'participants_by_condition': {},
+        'verified_participants_by_condition': {},
+        'participants_by_status': {},
+        'participants_by_day': {},
+    }
+    return StudyStats(**{**fields, **overrides})
+
+
 @pytest.fixture
 def mock_study_service() -> AsyncMock:
     """Fixture for a mocked StudyService."""
@@ -133,7 +150,10 @@ async def test_get_studies(client: TestClient, mock_study_service: AsyncMock) ->
 
 @pytest.mark.asyncio
 async def test_get_study_detail(
-    client: TestClient, mock_study_service: AsyncMock, mock_condition_service: AsyncMock
+    client: TestClient,
+    mock_study_service: AsyncMock,
+    mock_condition_service: AsyncMock,
+    mock_study_participant_service: AsyncMock,
 ) -> None:
     """Test retrieving study details."""
     study_id = uuid.uuid4()
@@ -163,12 +183,13 @@ async def test_get_study_detail(
 
     mock_study_service.get_detailed.return_value = mock_study_obj
 
-    mock_row = MagicMock()
-    mock_row.participant_count = 10
-    mock_row.study_condition_name = 'Control'
-    mock_row.study_condition_id = uuid.uuid4()
-
-    mock_condition_service.get_participant_count_by_condition.return_value = [mock_row]
+    condition_id = uuid.uuid4()
+    mock_condition = MagicMock(id=condition_id, enabled=True)
+    mock_condition.name = 'Control'
+    mock_condition_service.get_all.return_value = [mock_condition]
+    mock_study_participant_service.get_study_stats.return_value = _study_stats(
+        study_id, verified_participants_by_condition={condition_id: 10}
+    )
 
     response = client.get(f'/studies/{study_id}')
 
@@ -178,6 +199,23 @@ async def test_get_study_detail(
     assert data['total_participants'] == 10
 
 
+@pytest.mark.asyncio
+async def test_get_study_stats(client: TestClient, mock_study_participant_service: AsyncMock) -> None:
+    """Test retrieving the incrementally maintained study statistics."""
+    study_id = uuid.uuid4()
+    mock_study_participant_service.get_study_stats.return_value = _study_stats(
+        study_id, total_participants=12, completed_participants=5, participants_by_status={'active': 7, 'completed': 5}
+    )
+
+    response = client.get(f'/studies/{study_id}/stats')
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['total_participants'] == 12
+    assert data['participants_by_status'] == {'active': 7, 'completed': 5}
+    mock_study_participant_service.get_study_stats.assert_awaited_once_with(study_id)
+
+
 @pytest.mark.asyncio
 async def test_create_study(client: TestClient, mock_study_service: AsyncMock) -> None:
     """Test creating a new study."""
@@ -0,0 +1,64 @@
+"""Tests for the recommendation models router."""
+
+from collections.abc import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rssa_api.apps.admin.routers import models as models_router
+from rssa_api.auth.security import get_auth0_authenticated_user
+from rssa_api.data.schemas import Auth0UserSchema
+from rssa_api.services.recommendation.registry import ModelRegistry
+
+DEFAULTS = {'implicit_recs_top_n': {'type': 'lambda', 'function_name': 'ImplicitFn', 'payload_template': {}}}
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch) -> ModelRegistry:
+    """A registry with a single Lambda entry, patched into the router."""
+    registry = ModelRegistry(DEFAULTS, poll_seconds=None)
+    monkeypatch.setattr(models_router, 'REGISTRY', registry)
+    return registry
+
+
+@pytest.fixture
+def client(registry: ModelRegistry) -> Generator[TestClient, None, None]:
+    """Fixture for a TestClient authenticated as an admin."""
+    app = FastAPI()
+    app.include_router(models_router.router)
+
+    async def mock_auth() -> Auth0UserSchema:
+        return Auth0UserSchema(sub='auth0|admin', email='admin@test.com', permissions=['admin:all'])
+
+    app.dependency_overrides[get_auth0_authenticated_user] = mock_auth
+    with TestClient(app) as client:
+        yield client
+
+
+def test_get_models(client: TestClient) -> None:
+    """Loaded models are listed with their version and footprint."""
+    response = client.get('/models/')
+
+    assert response.status_code == 200
+    [model] = response.json()
+    assert model['key'] == 'implicit_recs_top_n'
+    assert model['type'] == 'lambda'
+    assert model['version'] == 'ImplicitFn'
+    assert model['nbytes'] == 0
+    assert model['previous_version'] is None
+
+
+def test_reload_and_rollback(client: TestClient, registry: ModelRegistry) -> None:
+    """Reloading picks up changed entries, and rolling back needs a previous version."""
+    assert client.post('/models/implicit_recs_top_n/rollback').status_code == 409
+    assert client.post('/models/unknown/rollback').status_code == 404
+
+    registry.defaults['implicit_recs_top_n'] = {'type': 'lambda', 'function_name': 'ImplicitFnV2'}
+    [model] = client.post('/models/reload').json()
+    assert (model['version'], model['previous_version']) == ('ImplicitFnV2', 'ImplicitFn')
+
+    response = client.post('/models/implicit_recs_top_n/rollback')
+    assert response.status_code == 200
+    assert response.json()['version'] == 'ImplicitFn'
+    assert response.json()['pinned'] is True
@@ -131,7 +131,7 @@ async def test_get_study_detail_success_owner(
         participants_by_condition=[],
     )
     mock_study_service.check_study_access.return_value = True
-    mock_study_condition_service.get_participant_count_by_condition.return_value = []
+    mock_study_condition_service.get_all.return_value = []
 
     with TestClient(app) as client:
         response = client.get(f'/studies/{study_id}')
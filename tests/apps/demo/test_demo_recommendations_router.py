@@ -0,0 +1,69 @@
+"""Tests for the demo recommendations router."""
+
+from collections.abc import Generator
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from rssa_api.apps.demo.routers.recommendations import router
+from rssa_api.data.schemas.recommendations import EnrichedResponseWrapper
+from rssa_api.services.dependencies import get_recommender_service
+from rssa_api.services.recommender_service import RecommenderService
+
+RATINGS = [{'item_id': '1', 'rating': 5}]
+
+
+@pytest.fixture
+def mock_recommender_service() -> AsyncMock:
+    """Fixture for a mocked RecommenderService."""
+    return AsyncMock(spec=RecommenderService)
+
+
+@pytest.fixture
+def client(mock_recommender_service: AsyncMock) -> Generator[TestClient, None, None]:
+    """Fixture for a TestClient with the recommender service overridden."""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_recommender_service] = lambda: mock_recommender_service
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.mark.parametrize('limit', [0, 101])
+def test_limit_is_bounded(client: TestClient, mock_recommender_service: AsyncMock, limit: int) -> None:
+    """Out-of-range limits are rejected before reaching the service."""
+    response = client.post(f'/recommendations/?limit={limit}', json={'ratings': RATINGS})
+
+    assert response.status_code == 422
+    mock_recommender_service.get_recommendations.assert_not_called()
+
+
+def test_get_recommendations(client: TestClient, mock_recommender_service: AsyncMock) -> None:
+    """A valid request is answered by the service."""
+    expected = EnrichedResponseWrapper(items=[], response_type='standard', total_count=0, rec_type='standard')
+    mock_recommender_service.get_recommendations.return_value = expected
+
+    response = client.post('/recommendations/?limit=10', json={'ratings': RATINGS})
+
+    assert response.status_code == 200
+    assert mock_recommender_service.get_recommendations.call_args.kwargs['limit'] == 10
+
+
+def test_invalid_tuning_input_is_a_client_error(client: TestClient, mock_recommender_service: AsyncMock) -> None:
+    """Validation errors raised while reading tuning parameters map to 422 rather than 500."""
+
+    class Weight(BaseModel):
+        weight: float
+
+    def _reject(**_: object) -> None:
+        Weight.model_validate({'weight': 'high'})
+
+    mock_recommender_service.get_recommendations.side_effect = _reject
+
+    response = client.post('/recommendations/?limit=10', json={'ratings': RATINGS, 'context_data': {}})
+
+    assert response.status_code == 422
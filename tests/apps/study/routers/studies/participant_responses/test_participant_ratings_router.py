@@ -12,9 +12,12 @@ from fastapi.testclient import TestClient
 
 from rssa_api.apps.study.routers.studies.participant_responses.participant_ratings import ratings_router
 from rssa_api.auth.authorization import validate_study_participant
+from rssa_api.data.schemas.participant_response_schemas import ParticipantRatingBatchResult, ParticipantRatingRead
 from rssa_api.data.services import ResponseType
 from rssa_api.data.services.dependencies import ParticipantResponseServiceDep
 from rssa_api.data.services.response_service import ParticipantResponseService
+from rssa_api.services.prefetch import recommendation_prefetcher
+from rssa_api.services.recommender_service import RecommenderService
 
 
 def get_dependency_key(annotated_dep: Any) -> Any:  # noqa: ANN401
@@ -54,8 +57,14 @@ def client(
 
 
 @pytest.mark.asyncio
-async def test_create_rating_success(client: TestClient, mock_response_service: AsyncMock) -> None:
-    """Test creating a rating successfully."""
+async def test_create_rating_success(
+    client: TestClient, mock_response_service: AsyncMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test creating a rating successfully, which schedules a prefetch for the participant."""
+    participant_id = uuid.uuid4()
+    client.app.dependency_overrides[validate_study_participant] = lambda: {'sty': uuid.uuid4(), 'sub': participant_id}
+    schedule = MagicMock()
+    monkeypatch.setattr(recommendation_prefetcher, 'schedule', schedule)
     step_id = uuid.uuid4()
     item_id = uuid.uuid4()
 
@@ -88,6 +97,7 @@ async def test_create_rating_success(client: TestClient, mock_response_service:
     assert response.status_code == 201, response.text
     data = response.json()
     assert data['rated_item']['rating'] == 5
+    schedule.assert_called_once_with(participant_id)
 
 
 @pytest.mark.asyncio
@@ -123,8 +133,14 @@ async def test_get_ratings_success(client: TestClient, mock_response_service: As
 
 
 @pytest.mark.asyncio
-async def test_update_rating_success(client: TestClient, mock_response_service: AsyncMock) -> None:
-    """Test updating a rating."""
+async def test_update_rating_success(
+    client: TestClient, mock_response_service: AsyncMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test updating a rating, which schedules a prefetch like any other rating save."""
+    participant_id = uuid.uuid4()
+    client.app.dependency_overrides[validate_study_participant] = lambda: {'sty': uuid.uuid4(), 'sub': participant_id}
+    schedule = MagicMock()
+    monkeypatch.setattr(recommendation_prefetcher, 'schedule', schedule)
     rating_id = uuid.uuid4()
     version = 1
     item_id = uuid.uuid4()
@@ -148,3 +164,49 @@ async def test_update_rating_success(client: TestClient, mock_response_service:
     assert args[2]['rating'] == 3
     # Check flattening logic: item_id and rating should be in update_data
     assert args[2]['item_id'] == item_id
+    schedule.assert_called_once_with(participant_id)
+
+
+@pytest.mark.asyncio
+async def test_upsert_ratings(
+    client: TestClient, mock_response_service: AsyncMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the batch upsert reports conflicts, invalidates cached recommendation input and schedules a prefetch."""
+    participant_id = uuid.uuid4()
+    client.app.dependency_overrides[validate_study_participant] = lambda: {'sty': uuid.uuid4(), 'sub': participant_id}
+    invalidate = MagicMock()
+    monkeypatch.setattr(RecommenderService, 'invalidate_participant', invalidate)
+    schedule = MagicMock()
+    monkeypatch.setattr(recommendation_prefetcher, 'schedule', schedule)
+
+    step_id = uuid.uuid4()
+    saved_item, stale_item = uuid.uuid4(), uuid.uuid4()
+    saved = ParticipantRatingRead(
+        id=uuid.uuid4(),
+        version=1,
+        study_step_id=step_id,
+        context_tag='gallery',
+        rated_item={'item_id': saved_item, 'rating': 4},
+    )
+    mock_response_service.upsert_ratings = AsyncMock(
+        return_value=ParticipantRatingBatchResult(ratings=[saved], conflicts=[stale_item])
+    )
+
+    payload = {
+        'study_step_id': str(step_id),
+        'context_tag': 'gallery',
+        'rated_items': [
+            {'item_id': str(saved_item), 'rating': 4},
+            {'item_id': str(stale_item), 'rating': 2, 'id': str(uuid.uuid4()), 'version': 1},
+        ],
+    }
+    response = client.put('/ratings/bulk', json=payload)
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['conflicts'] == [str(stale_item)]
+    assert data['ratings'][0]['rated_item']['item_id'] == str(saved_item)
+    batch = mock_response_service.upsert_ratings.call_args.args[0]
+    assert batch.rated_items[1].version == 1
+    invalidate.assert_called_once_with(participant_id)
+    schedule.assert_called_once_with(participant_id)
@@ -12,6 +12,7 @@ from fastapi.testclient import TestClient
 
 from rssa_api.apps.study.routers.studies.participant_responses.survey_responses import survey_router
 from rssa_api.auth.authorization import get_current_participant, validate_api_key, validate_study_participant
+from rssa_api.data.schemas.participant_response_schemas import SurveyPageResponsesRead
 from rssa_api.data.schemas.participant_schemas import StudyParticipantRead
 from rssa_api.data.services import ResponseType
 from rssa_api.data.services.dependencies import ParticipantResponseServiceDep
@@ -156,3 +157,34 @@ async def test_update_survey_response_success(client: TestClient, mock_response_
     args, kwargs = mock_response_service.update_response.call_args
     assert args[0] == ResponseType.SURVEY_ITEM
     assert args[2]['survey_scale_level_id'] == new_level_id
+
+
+@pytest.mark.asyncio
+async def test_create_survey_page_responses(client: TestClient, mock_response_service: AsyncMock) -> None:
+    """Test submitting a whole survey page in one request."""
+    study_id = uuid.uuid4()
+    participant_id = uuid.uuid4()
+    client.app.dependency_overrides[validate_study_participant] = lambda: {'sty': study_id, 'sub': participant_id}
+
+    context = {'study_step_id': str(uuid.uuid4()), 'study_step_page_id': str(uuid.uuid4()), 'context_tag': 'page'}
+    payload = {
+        'survey_items': [
+            {
+                **context,
+                'item_id': str(uuid.uuid4()),
+                'survey_scale_id': str(uuid.uuid4()),
+                'survey_scale_level_id': str(uuid.uuid4()),
+            }
+            for _ in range(3)
+        ],
+        'text_responses': [{**context, 'response_text': 'free text'}],
+    }
+    mock_response_service.create_page_responses = AsyncMock(return_value=SurveyPageResponsesRead())
+
+    response = client.post('/survey/bulk', json=payload)
+
+    assert response.status_code == 201, response.text
+    assert response.json() == {'survey_items': [], 'attention_checks': [], 'text_responses': [], 'ratings': []}
+    page_payload, sty, sub = mock_response_service.create_page_responses.call_args.args
+    assert len(page_payload.survey_items) == 3
+    assert (sty, sub) == (study_id, participant_id)
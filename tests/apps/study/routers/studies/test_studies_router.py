@@ -27,6 +27,7 @@ from rssa_api.data.services.study_components import (
     StudyStepService,
 )
 from rssa_api.data.services.study_participants import (
+    EnrollmentContext,
     EnrollmentService,
     ParticipantStudySessionService,
     StudyParticipantMovieSessionService,
@@ -97,8 +98,8 @@ def client(
     app.dependency_overrides[get_dependency_key(StudyConditionServiceDep)] = lambda: mock_condition_service
     app.dependency_overrides[get_dependency_key(EnrollmentServiceDep)] = lambda: mock_enrollment_service
     app.dependency_overrides[get_dependency_key(ParticipantStudySessionServiceDep)] = lambda: mock_session_service
-    app.dependency_overrides[get_dependency_key(StudyParticipantMovieSessionServiceDep)] = (
-        lambda: mock_movie_session_service
+    app.dependency_overrides[get_dependency_key(StudyParticipantMovieSessionServiceDep)] = lambda: (
+        mock_movie_session_service
     )
     app.dependency_overrides[get_dependency_key(StudyParticipantServiceDep)] = lambda: mock_participant_service
 
@@ -186,7 +187,7 @@ async def test_export_study_config(
 
 
 @pytest.mark.asyncio
-async def test_create_new_participant_fail_missing_step(client: TestClient, mock_step_service: AsyncMock) -> None:
+async def test_create_new_participant_fail_missing_step(client: TestClient, mock_enrollment_service: AsyncMock) -> None:
     """Test enrollment failing when next step is missing."""
     study_id = uuid.uuid4()
     payload = {
@@ -194,14 +195,51 @@ async def test_create_new_participant_fail_missing_step(client: TestClient, mock
         'current_step_id': str(uuid.uuid4()),
         'participant_type_key': 'participant',
         'external_id': 'ext_id',
+        'source_meta': None,
     }
 
-    mock_step_service.get_with_navigation.return_value = None
+    mock_enrollment_service.get_enrollment_context.return_value = EnrollmentContext(
+        next_step_ids={}, dataset_subset='subset', shuffled_list_ids=()
+    )
 
     response = client.post(f'/studies/{study_id}/new-participant', json=payload)
 
     assert response.status_code == 500
     assert response.json()['detail'] == 'Could not find next step, study is configuration fault.'
+    mock_enrollment_service.enroll_with_session.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_new_participant_with_session_success(
+    client: TestClient, mock_enrollment_service: AsyncMock
+) -> None:
+    """Test enrollment advancing past the entry step and returning the resume code and token."""
+    study_id = uuid.uuid4()
+    entry_step_id, next_step_id = uuid.uuid4(), uuid.uuid4()
+    payload = {
+        'current_step_id': str(entry_step_id),
+        'participant_type_key': 'participant',
+        'source_meta': None,
+    }
+
+    context = EnrollmentContext(
+        next_step_ids={entry_step_id: next_step_id, next_step_id: None},
+        dataset_subset='subset',
+        shuffled_list_ids=(uuid.uuid4(),),
+    )
+    mock_enrollment_service.get_enrollment_context.return_value = context
+    participant = MagicMock(id=uuid.uuid4())
+    session = MagicMock(id=uuid.uuid4(), resume_code='ABC12')
+    session.expires_at = datetime.datetime.now(datetime.UTC) + datetime.timedelta(hours=24)
+    mock_enrollment_service.enroll_with_session.return_value = (participant, session)
+
+    response = client.post(f'/studies/{study_id}/new-participant', json=payload)
+
+    assert response.status_code == 201
+    assert response.json()['resume_code'] == 'ABC12'
+    assert response.json()['token']
+    enrolled = mock_enrollment_service.enroll_with_session.call_args[0][1]
+    assert enrolled.current_step_id == next_step_id
 
 
 @pytest.mark.asyncio
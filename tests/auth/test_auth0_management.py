@@ -0,0 +1,97 @@
+"""Tests for the pooled Auth0 management client."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+import rssa_api.core.config as cfg
+from rssa_api.auth import auth0_management as mgmt
+
+
+class _Auth0Stub:
+    """Records requests and answers them like a tiny Auth0 tenant."""
+
+    def __init__(self, rate_limited: int = 0) -> None:
+        self.requests: list[httpx.Request] = []
+        self.rate_limited = rate_limited
+        self.scopes = [{'value': 'read:studies', 'description': 'Read studies'}]
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == '/oauth/token':
+            await asyncio.sleep(0)
+            return httpx.Response(200, json={'access_token': 'mgmt-token', 'expires_in': 86400})
+        assert request.headers['Authorization'] == 'Bearer mgmt-token'
+        if self.rate_limited:
+            self.rate_limited -= 1
+            return httpx.Response(429, headers={'Retry-After': '0'})
+        if request.url.path.startswith('/api/v2/resource-servers/'):
+            if request.method == 'PATCH':
+                self.scopes = json.loads(request.content)['scopes']
+            return httpx.Response(200, json={'scopes': self.scopes})
+        if request.url.path == '/api/v2/users':
+            return httpx.Response(200, json=[{'user_id': 'auth0|1', 'name': 'Ada', 'email': 'ada@example.com'}])
+        if request.url.path == '/api/v2/users/auth0|missing':
+            return httpx.Response(404, json={'message': 'not found'})
+        return httpx.Response(200, json={'name': 'Grace', 'nickname': 'grace'})
+
+    def paths(self) -> list[str]:
+        return [request.url.path for request in self.requests]
+
+
+@pytest.fixture
+def auth0_stub():
+    stub = _Auth0Stub()
+    client = mgmt.Auth0ManagementClient(backoff_base=0, transport=httpx.MockTransport(stub))
+    with (
+        patch.object(mgmt, 'auth0_management', client),
+        patch.object(cfg, 'AUTH0_DOMAIN', 'tenant.auth0.com'),
+        patch.object(cfg, 'RESOURCE_SERVER_URL', 'https://tenant.auth0.com/api/v2/resource-servers/api'),
+    ):
+        yield stub
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_token_and_retry_rate_limits(auth0_stub: _Auth0Stub) -> None:
+    """Concurrent callers coalesce on a single token fetch, and a 429 is retried."""
+    auth0_stub.rate_limited = 1
+
+    profiles = await asyncio.gather(*(mgmt.get_user_profile_by_id(f'auth0|{i}') for i in range(5)))
+
+    assert all(profile is not None and profile['name'] == 'Grace' for profile in profiles)
+    assert auth0_stub.paths().count('/oauth/token') == 1
+    assert len(auth0_stub.requests) == 1 + 5 + 1
+
+
+@pytest.mark.asyncio
+async def test_profiles_are_cached_and_warmed_by_search(auth0_stub: _Auth0Stub) -> None:
+    """Search results and fetched profiles are served from the cache; missing users are not cached."""
+    users = await mgmt.search_users('name:Ada')
+    assert users[0]['user_id'] == 'auth0|1'
+
+    profile = await mgmt.get_user_profile_by_id('auth0|1')
+    assert profile is not None and profile['email'] == 'ada@example.com'
+    assert await mgmt.get_user_profile_by_id('auth0|missing') is None
+    assert await mgmt.get_user_profile_by_id('auth0|missing') is None
+
+    missing_path = '/api/v2/users/auth0|missing'
+    assert auth0_stub.paths() == ['/oauth/token', '/api/v2/users', missing_path, missing_path]
+
+
+@pytest.mark.asyncio
+async def test_scope_cache_follows_mutations(auth0_stub: _Auth0Stub) -> None:
+    """Scopes are fetched once, and creating or deleting a scope updates the cache from the response."""
+    assert [s['value'] for s in await mgmt.get_resource_server_scopes()] == ['read:studies']
+
+    created = await mgmt.create_permission_scope('write:studies', 'Write studies')
+    assert [s['value'] for s in created] == ['read:studies', 'write:studies']
+    assert [s['value'] for s in await mgmt.get_resource_server_scopes()] == ['read:studies', 'write:studies']
+
+    await mgmt.delete_permission_scope('read:studies')
+    assert [s['value'] for s in await mgmt.get_resource_server_scopes()] == ['write:studies']
+
+    methods = [request.method for request in auth0_stub.requests if request.url.path != '/oauth/token']
+    assert methods == ['GET', 'PATCH', 'PATCH']
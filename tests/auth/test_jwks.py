@@ -0,0 +1,102 @@
+"""Tests for Auth0 signing key management and token validation."""
+
+import time
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+import rssa_api.core.config as cfg
+from rssa_api.auth import security
+from rssa_api.auth.jwks import JWKSManager
+
+
+def _rsa_pair(kid: str) -> tuple[str, dict[str, Any]]:
+    """Generates a private PEM and the matching public JWK."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public_jwk = jwk.construct(public_pem, 'RS256').to_dict()
+    public_jwk.update({'kid': kid, 'use': 'sig'})
+    return private_pem, public_jwk
+
+
+def _token(private_pem: str, kid: str, exp_in: int = 600) -> str:
+    claims = {
+        'sub': 'auth0|abc',
+        'permissions': ['read:studies'],
+        'aud': cfg.AUTH0_API_AUDIENCE,
+        'iss': cfg.AUTH0_ISSUER_URL,
+        'exp': int(time.time()) + exp_in,
+    }
+    return jwt.encode(claims, private_pem, algorithm='RS256', headers={'kid': kid})
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetches_once_within_rate_limit() -> None:
+    """A rotated key is picked up by one refetch, and repeated unknown kids do not refetch again."""
+    _, old_jwk = _rsa_pair('old')
+    _, new_jwk = _rsa_pair('new')
+    fetch = AsyncMock(side_effect=[{'keys': [old_jwk]}, {'keys': [old_jwk, new_jwk]}])
+    clock = _Clock()
+    manager = JWKSManager(fetch=fetch, min_refetch_interval=30, clock=clock)
+
+    assert await manager.refresh() == 1
+    assert await manager.get_signing_key('old') is not None
+
+    clock.now = 60
+    assert await manager.get_signing_key('new') is not None
+    assert fetch.await_count == 2
+
+    assert await manager.get_signing_key('forged') is None
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_start_survives_failed_prefetch() -> None:
+    """The app still starts when Auth0 is unreachable, and stop cancels the refresh task."""
+    manager = JWKSManager(fetch=AsyncMock(side_effect=httpx.ConnectError('down')), refresh_interval=3600)
+
+    await manager.start()
+    assert manager.kids == []
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_validate_auth0_token_caches_verified_tokens() -> None:
+    """A verified token is served from the cache, and a token signed by an unknown key is rejected."""
+    private_pem, public_jwk = _rsa_pair('k1')
+    other_pem, _ = _rsa_pair('k2')
+    manager = JWKSManager(fetch=AsyncMock(return_value={'keys': [public_jwk]}))
+    await manager.refresh()
+    token = _token(private_pem, 'k1')
+    security.verified_token_cache.clear()
+
+    with patch.object(security, 'jwks_manager', manager), patch.object(jwt, 'decode', wraps=jwt.decode) as decode:
+        user = await security.validate_auth0_token(token)
+        assert user.sub == 'auth0|abc'
+        assert await security.validate_auth0_token(token) == user
+        assert decode.call_count == 1
+
+        with pytest.raises(HTTPException) as exc_info:
+            await security.validate_auth0_token(_token(other_pem, 'k2'))
+        assert exc_info.value.status_code == 401
+
+    security.verified_token_cache.clear()
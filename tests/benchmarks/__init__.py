@@ -0,0 +1,7 @@
+"""Load and performance harnesses for the RSSA API.
+
+These modules are not collected as part of the regular test run; they are
+driven from the command line, e.g.::
+
+    PYTHONPATH=src python -m tests.benchmarks.bench_recommendations --participants 200 --concurrency 50
+"""
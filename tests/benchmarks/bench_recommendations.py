@@ -0,0 +1,276 @@
+"""Benchmark for the participant recommendation path.
+
+Drives `POST /study/recommendations/` (and so `RecommenderService.get_recommendations_for_study_participant`) through
+the real ASGI application with concurrent simulated participants. The Lambda transport behind every
+`LambdaStrategy` is replaced by `LocalLambdaEmulator`, the database is SQLite (default) or a local Postgres, and the
+background writer is run against the same database so its queue behaves as in production.
+
+Example:
+    PYTHONPATH=src python -m tests.benchmarks.bench_recommendations --participants 500 --concurrency 100
+        --duplicates 3 --output runtime/bench/recs.json
+
+The JSON report contains throughput, latency percentiles, `_in_flight` dedup counters, background queue depth,
+emulator counters and SQL statement counts, and is meant to be diffed between releases.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import tempfile
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from fastapi import Request
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from rssa_api.apps import study_api
+from rssa_api.auth.authorization import validate_study_participant
+from rssa_api.core.queue import background_write_queue
+from rssa_api.main import app
+from rssa_api.services.recommender_service import RecommenderService
+
+from .harness import (
+    QueryCounter,
+    Stopwatch,
+    background_writer,
+    create_benchmark_engine,
+    latency_histogram,
+    override_databases,
+    seed_recommendation_fixture,
+    summarize_latencies,
+)
+from .lambda_emulator import ErrorProfile, LatencyProfile, LocalLambdaEmulator, install_emulator
+
+PARTICIPANT_HEADER = 'X-Bench-Participant'
+
+
+class _CountingInFlight(dict):
+    """Drop-in for `RecommenderService._in_flight` that records how often a request joined a running generation."""
+
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+        self.joins = 0
+        self.generations = 0
+        self.peak_size = 0
+
+    def __contains__(self, key: object) -> bool:
+        self.lookups += 1
+        hit = super().__contains__(key)
+        if hit:
+            self.joins += 1
+        return hit
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.generations += 1
+        super().__setitem__(key, value)
+        self.peak_size = max(self.peak_size, len(self))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'lookups': self.lookups,
+            'joined_in_flight': self.joins,
+            'generations_started': self.generations,
+            'dedup_ratio': round(self.joins / self.lookups, 4) if self.lookups else 0.0,
+            'peak_in_flight': self.peak_size,
+        }
+
+
+def _build_emulator(args: argparse.Namespace) -> LocalLambdaEmulator:
+    latency = LatencyProfile(
+        median_ms=args.latency_median_ms,
+        sigma=args.latency_sigma,
+        cold_start_rate=args.cold_start_rate,
+        cold_start_ms=args.cold_start_ms,
+    )
+    errors = ErrorProfile(
+        function_error_rate=args.function_error_rate,
+        transport_error_rate=args.transport_error_rate,
+    )
+    if args.item_scores:
+        emulator = LocalLambdaEmulator.from_item_scores(
+            args.item_scores, latency=latency, errors=errors, seed=args.seed
+        )
+        emulator.catalogue = emulator.catalogue[: args.catalogue_size]
+        allowed = set(emulator.catalogue)
+        emulator.discounted_catalogue = [item for item in emulator.discounted_catalogue if item in allowed]
+        return emulator
+    return LocalLambdaEmulator.from_synthetic_catalogue(
+        args.catalogue_size, latency=latency, errors=errors, seed=args.seed
+    )
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Seeds the database, runs the load and returns the report."""
+    database_url = args.database_url
+    tmp_dir = None
+    if database_url is None:
+        tmp_dir = tempfile.TemporaryDirectory(prefix='rssa-bench-')
+        database_url = f'sqlite+aiosqlite:///{tmp_dir.name}/bench.db'
+
+    engine = await create_benchmark_engine(database_url, create_schema=not args.skip_schema)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    emulator = _build_emulator(args)
+    fixture = await seed_recommendation_fixture(
+        session_factory,
+        emulator.catalogue,
+        participants=args.participants,
+        ratings_per_participant=args.ratings_per_participant,
+        recommender_keys=args.recommender_keys,
+        recommendation_count=args.recommendation_count,
+    )
+
+    counter = QueryCounter()
+    counter.attach(engine)
+
+    async def _bench_participant(request: Request) -> dict[str, Any]:
+        return {'sty': fixture.study_id, 'sub': uuid.UUID(request.headers[PARTICIPANT_HEADER])}
+
+    in_flight = _CountingInFlight()
+    original_in_flight = RecommenderService._in_flight
+    RecommenderService._in_flight = in_flight
+    study_api.dependency_overrides[validate_study_participant] = _bench_participant
+
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    queue_samples: list[int] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _request(client: AsyncClient, participant_id: uuid.UUID, context_tag: str) -> None:
+        body = {'step_id': str(fixture.step_id), 'context_tag': context_tag}
+        async with semaphore:
+            with Stopwatch() as watch:
+                response = await client.post(
+                    '/study/recommendations/', json=body, headers={PARTICIPANT_HEADER: str(participant_id)}
+                )
+        latencies.append(watch.elapsed)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    passes = []
+    try:
+        async with background_writer(session_factory, queue_samples, args.queue_sample_interval):
+            with install_emulator(emulator), override_databases([study_api], session_factory):
+                transport = ASGITransport(app=app, raise_app_exceptions=False)
+                async with AsyncClient(transport=transport, base_url='http://bench') as client:
+                    for pass_no in range(args.passes):
+                        latencies.clear()
+                        statuses.clear()
+                        statements_before = counter.statements
+                        invocations_before = emulator.stats.invocations
+                        context_tag = f'bench_pass_{pass_no}' if args.fresh_context_per_pass else 'bench'
+                        with Stopwatch() as watch:
+                            await asyncio.gather(
+                                *(
+                                    _request(client, participant_id, context_tag)
+                                    for participant_id in fixture.participant_ids
+                                    for _ in range(args.duplicates)
+                                )
+                            )
+                        passes.append(
+                            {
+                                'pass': pass_no,
+                                'context_tag': context_tag,
+                                'elapsed_s': round(watch.elapsed, 4),
+                                'latency': summarize_latencies(latencies, watch.elapsed),
+                                'histogram': latency_histogram(latencies),
+                                'status_codes': dict(statuses),
+                                'sql_statements': counter.statements - statements_before,
+                                'lambda_invocations': emulator.stats.invocations - invocations_before,
+                            }
+                        )
+                        await asyncio.wait_for(background_write_queue.join(), timeout=args.drain_timeout)
+    finally:
+        study_api.dependency_overrides.pop(validate_study_participant, None)
+        RecommenderService._in_flight = original_in_flight
+        await engine.dispose()
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    total_requests = args.participants * args.duplicates
+    return {
+        'benchmark': 'recommendations',
+        'timestamp': datetime.now(UTC).isoformat(),
+        'python': platform.python_version(),
+        'database': engine.url.get_backend_name(),
+        'config': {
+            'participants': args.participants,
+            'duplicates': args.duplicates,
+            'concurrency': args.concurrency,
+            'ratings_per_participant': args.ratings_per_participant,
+            'catalogue_size': len(emulator.catalogue),
+            'recommender_keys': list(args.recommender_keys),
+            'recommendation_count': args.recommendation_count,
+            'latency': vars(emulator.latency),
+            'errors': vars(emulator.errors),
+            'seed': args.seed,
+            'passes': args.passes,
+        },
+        'passes': passes,
+        'dedup': in_flight.as_dict(),
+        'background_queue': {
+            'max_depth': max(queue_samples, default=0),
+            'mean_depth': round(sum(queue_samples) / len(queue_samples), 3) if queue_samples else 0.0,
+            'capacity': background_write_queue.maxsize,
+            'samples': len(queue_samples),
+        },
+        'database_usage': counter.as_dict(),
+        'sql_statements_per_request': round(counter.statements / (total_requests * args.passes), 3)
+        if total_requests
+        else 0.0,
+        'emulator': emulator.stats.as_dict(),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the command line interface."""
+    parser = argparse.ArgumentParser(description='Benchmark the participant recommendation path with a local Lambda.')
+    parser.add_argument('--database-url', default=None, help='Async SQLAlchemy URL; defaults to a temporary SQLite.')
+    parser.add_argument('--skip-schema', action='store_true', help='Do not create tables (pre-migrated Postgres).')
+    parser.add_argument('--participants', type=int, default=100)
+    parser.add_argument('--duplicates', type=int, default=2, help='Concurrent identical requests per participant.')
+    parser.add_argument('--concurrency', type=int, default=50, help='Maximum requests in flight.')
+    parser.add_argument('--passes', type=int, default=2, help='The second pass exercises the stored-context path.')
+    parser.add_argument(
+        '--fresh-context-per-pass',
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='Use a new context tag per pass so every pass generates recommendations.',
+    )
+    parser.add_argument('--ratings-per-participant', type=int, default=10)
+    parser.add_argument('--catalogue-size', type=int, default=500)
+    parser.add_argument('--item-scores', default=None, help='averaged_item_score.csv to rank responses from.')
+    parser.add_argument('--recommender-keys', nargs='+', default=['implicit_recs_top_n'])
+    parser.add_argument('--recommendation-count', type=int, default=10)
+    parser.add_argument('--latency-median-ms', type=float, default=250.0)
+    parser.add_argument('--latency-sigma', type=float, default=0.4)
+    parser.add_argument('--cold-start-rate', type=float, default=0.0)
+    parser.add_argument('--cold-start-ms', type=float, default=1500.0)
+    parser.add_argument('--function-error-rate', type=float, default=0.0)
+    parser.add_argument('--transport-error-rate', type=float, default=0.0)
+    parser.add_argument('--queue-sample-interval', type=float, default=0.01)
+    parser.add_argument('--drain-timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-o', '--output', default=None, help='Write the JSON report to this path.')
+    return parser
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    """Runs the benchmark from the command line."""
+    args = build_parser().parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+    rendered = json.dumps(report, indent=2, default=str)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(rendered)
+    print(rendered)
+    return report
+
+
+if __name__ == '__main__':
+    main()
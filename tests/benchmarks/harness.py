@@ -0,0 +1,559 @@
+"""Shared plumbing for the benchmark drivers.
+
+Covers database setup (SQLite or a local Postgres), fixture seeding, wiring the ASGI app to the benchmark database,
+and the small amount of statistics the reports need.
+"""
+
+import asyncio
+import math
+import random
+import secrets
+import time
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from cryptography.fernet import Fernet
+from fastapi import FastAPI
+from rssa_storage.moviedb.models.movies import Movie
+from rssa_storage.rssadb.models.participant_movie_sequence import PreShuffledMovieList
+from rssa_storage.rssadb.models.participant_responses import ParticipantRating
+from rssa_storage.rssadb.models.rssa_base_models import RssaBase
+from rssa_storage.rssadb.models.study_components import (
+    ApiKey,
+    Study,
+    StudyCondition,
+    StudyStep,
+    StudyStepPage,
+    StudyStepPageContent,
+    User,
+)
+from rssa_storage.rssadb.models.study_participants import StudyParticipant
+from rssa_storage.rssadb.models.survey_constructs import SurveyConstruct, SurveyItem, SurveyScale, SurveyScaleLevel
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import UniqueConstraint
+from sqlalchemy.types import ARRAY
+
+import rssa_api.auth.authorization as authorization
+import rssa_api.data.services.study_admin as study_admin
+import rssa_api.data.workers as workers
+from rssa_api.core.queue import background_write_queue
+from rssa_api.data.sources.moviedb import movie_db
+from rssa_api.data.sources.rssadb import rssa_db
+
+
+@compiles(ARRAY, 'sqlite')
+def _compile_array(element, compiler, **kw: Any) -> str:
+    """Compiles PostgreSQL ARRAY type to JSON for SQLite compatibility."""
+    return 'JSON'
+
+
+@compiles(postgresql.JSONB, 'sqlite')
+def _compile_jsonb(element, compiler, **kw: Any) -> str:
+    """Compiles PostgreSQL JSONB type to JSON for SQLite compatibility."""
+    return 'JSON'
+
+
+METADATA = (RssaBase.metadata, Movie.metadata)
+
+
+async def create_benchmark_engine(database_url: str, create_schema: bool = True) -> AsyncEngine:
+    """Creates the engine the benchmark runs against.
+
+    Args:
+        database_url: SQLAlchemy async URL, e.g. `sqlite+aiosqlite:///bench.db` or `postgresql+asyncpg://...`.
+        create_schema: Create the RSSA and movie tables (SQLite, or an empty Postgres database).
+
+    Returns:
+        The async engine.
+    """
+    is_sqlite = database_url.startswith('sqlite')
+    connect_args = {'check_same_thread': False} if is_sqlite else {}
+    engine = create_async_engine(database_url, connect_args=connect_args)
+
+    if create_schema:
+        if is_sqlite:
+            for metadata in METADATA:
+                for table in metadata.tables.values():
+                    for constraint in table.constraints:
+                        if isinstance(constraint, UniqueConstraint):
+                            constraint.deferrable = None
+                            constraint.initially = None
+        async with engine.begin() as conn:
+            for metadata in METADATA:
+                await conn.run_sync(metadata.create_all)
+
+    return engine
+
+
+@dataclass
+class QueryCounter:
+    """Counts statements and connection checkouts on an engine."""
+
+    statements: int = 0
+    checkouts: int = 0
+    checked_out: int = 0
+    peak_checked_out: int = 0
+    by_verb: dict[str, int] = field(default_factory=dict)
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Registers the event listeners on `engine`."""
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, 'before_cursor_execute')
+        def _on_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+            self.statements += 1
+            verb = statement.lstrip().split(' ', 1)[0].upper()
+            self.by_verb[verb] = self.by_verb.get(verb, 0) + 1
+
+        @event.listens_for(sync_engine.pool, 'checkout')
+        def _on_checkout(dbapi_conn, conn_record, conn_proxy) -> None:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+        @event.listens_for(sync_engine.pool, 'checkin')
+        def _on_checkin(dbapi_conn, conn_record) -> None:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns a JSON serializable view of the counters."""
+        return {
+            'statements': self.statements,
+            'by_verb': dict(sorted(self.by_verb.items())),
+            'connection_checkouts': self.checkouts,
+            'peak_connections_in_use': self.peak_checked_out,
+        }
+
+
+@contextmanager
+def override_databases(apps: Sequence[FastAPI], session_factory: async_sessionmaker[AsyncSession]) -> Iterator[None]:
+    """Points the `rssa_db` and `movie_db` dependencies of `apps` at the benchmark database.
+
+    Overrides are resolved on the application a route was included in, so the mounted sub-apps (e.g. `study_api`)
+    must be passed rather than the root application.
+    """
+
+    async def _get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    for app in apps:
+        app.dependency_overrides[rssa_db] = _get_db
+        app.dependency_overrides[movie_db] = _get_db
+    try:
+        yield
+    finally:
+        for app in apps:
+            app.dependency_overrides.pop(rssa_db, None)
+            app.dependency_overrides.pop(movie_db, None)
+
+
+def _bench_owner_and_study(**study_fields: Any) -> tuple[User, Study]:
+    user = User(id=uuid.uuid4(), auth0_sub=f'auth0|bench-{uuid.uuid4().hex[:8]}')
+    study = Study(
+        id=uuid.uuid4(),
+        name='Benchmark Study',
+        description='Seeded by the benchmark harness.',
+        owner_id=user.id,
+        created_by_id=user.id,
+        **study_fields,
+    )
+    return user, study
+
+
+def _bench_step(study_id: uuid.UUID, name: str, path: str, step_type: str, position: int) -> StudyStep:
+    return StudyStep(
+        id=uuid.uuid4(),
+        study_id=study_id,
+        name=name,
+        description=f'{name} step',
+        path=path,
+        step_type=step_type,
+        order_position=position,
+    )
+
+
+def _bench_conditions(
+    study_id: uuid.UUID, recommender_keys: Sequence[str], recommendation_count: int
+) -> list[StudyCondition]:
+    return [
+        StudyCondition(
+            id=uuid.uuid4(),
+            study_id=study_id,
+            name=key,
+            description=f'Benchmark condition for {key}',
+            recommender_key=key,
+            recommendation_count=recommendation_count,
+            short_code=f'b{i:04d}',
+            enabled=True,
+        )
+        for i, key in enumerate(recommender_keys)
+    ]
+
+
+def _bench_movies(movielens_ids: Sequence[int | str]) -> list[Movie]:
+    return [
+        Movie(
+            id=uuid.uuid4(),
+            movielens_id=str(mlid),
+            imdb_id=f'{i:07d}',
+            tmdb_id=str(i),
+            title=f'Benchmark Movie {mlid}',
+            year=1990 + i % 30,
+            ave_rating=3.5,
+            genre='Drama',
+            director='Bench Director',
+            cast='Bench Cast',
+            description='Seeded by the benchmark harness.',
+            poster='',
+        )
+        for i, mlid in enumerate(movielens_ids)
+    ]
+
+
+@asynccontextmanager
+async def background_writer(
+    session_factory: async_sessionmaker[AsyncSession], queue_samples: list[int] | None = None, interval: float = 0.01
+) -> AsyncIterator[None]:
+    """Runs `db_writer_worker` against the benchmark database for the duration of the block.
+
+    Args:
+        session_factory: Session factory the worker should use instead of the application's.
+        queue_samples: When given, the background queue depth is appended every `interval` seconds.
+        interval: Sampling interval in seconds.
+    """
+
+    async def _sample() -> None:
+        while True:
+            queue_samples.append(background_write_queue.qsize())
+            await asyncio.sleep(interval)
+
+    original_session_local = workers.AsyncSessionLocal
+    workers.AsyncSessionLocal = session_factory
+    tasks = [asyncio.create_task(workers.db_writer_worker())]
+    if queue_samples is not None:
+        tasks.append(asyncio.create_task(_sample()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        workers.AsyncSessionLocal = original_session_local
+
+
+@dataclass
+class RecommendationFixture:
+    """Identifiers of the seeded recommendation fixture."""
+
+    study_id: uuid.UUID
+    step_id: uuid.UUID
+    condition_ids: list[uuid.UUID]
+    participant_ids: list[uuid.UUID]
+    movielens_ids: list[str]
+
+
+async def seed_recommendation_fixture(
+    session_factory: async_sessionmaker[AsyncSession],
+    movielens_ids: Sequence[int | str],
+    participants: int,
+    ratings_per_participant: int,
+    recommender_keys: Sequence[str],
+    recommendation_count: int = 10,
+) -> RecommendationFixture:
+    """Seeds a study with one recommendation step, its conditions, participants, ratings and the movie catalogue.
+
+    Args:
+        session_factory: Session factory bound to the benchmark engine.
+        movielens_ids: Catalogue to insert into the movie table, must cover everything the emulator can return.
+        participants: Number of participants to enroll.
+        ratings_per_participant: Number of ratings each participant has submitted before asking for recommendations.
+        recommender_keys: Registry keys, one condition is created per key; participants are spread round-robin.
+        recommendation_count: Recommendation count configured on every condition.
+
+    Returns:
+        The identifiers of the seeded rows.
+    """
+    user, study = _bench_owner_and_study()
+    step = _bench_step(study.id, 'Recommendations', '/recommendations', 'task', 1)
+    conditions = _bench_conditions(study.id, recommender_keys, recommendation_count)
+    movies = _bench_movies(movielens_ids)
+
+    async with session_factory() as session:
+        for stage in ([user], [study, *movies], [step, *conditions]):
+            session.add_all(stage)
+            await session.flush()
+
+        participant_ids = []
+        for p in range(participants):
+            participant = StudyParticipant(
+                id=uuid.uuid4(),
+                study_id=study.id,
+                study_condition_id=conditions[p % len(conditions)].id,
+                current_step_id=step.id,
+            )
+            participant_ids.append(participant.id)
+            session.add(participant)
+            offset = (p * ratings_per_participant) % max(len(movies), 1)
+            rated = (movies[offset:] + movies[:offset])[:ratings_per_participant]
+            session.add_all(
+                ParticipantRating(
+                    study_id=study.id,
+                    study_participant_id=participant.id,
+                    study_step_id=step.id,
+                    context_tag='bench_ratings',
+                    item_id=movie.id,
+                    item_table_name='movies',
+                    rating=1 + (p + j) % 5,
+                    scale_min=1,
+                    scale_max=5,
+                )
+                for j, movie in enumerate(rated)
+            )
+        await session.commit()
+
+    return RecommendationFixture(
+        study_id=study.id,
+        step_id=step.id,
+        condition_ids=[c.id for c in conditions],
+        participant_ids=participant_ids,
+        movielens_ids=[str(m) for m in movielens_ids],
+    )
+
+
+def ensure_bench_secrets() -> None:
+    """Fills in throwaway JWT and API key encryption secrets when the environment does not provide them."""
+    if not authorization.SECRET_KEY:
+        authorization.SECRET_KEY = secrets.token_urlsafe(32)
+    if not study_admin.ENCRYPTION_KEY:
+        study_admin.ENCRYPTION_KEY = Fernet.generate_key().decode()
+
+
+@dataclass
+class SurveyPageFixture:
+    """A seeded survey page and the items a participant answers on it."""
+
+    page_id: uuid.UUID
+    construct_id: uuid.UUID
+    scale_id: uuid.UUID
+    level_ids: list[uuid.UUID]
+    item_ids: list[uuid.UUID]
+
+
+@dataclass
+class JourneyFixture:
+    """Identifiers of a seeded study a simulated participant can walk end to end."""
+
+    study_id: uuid.UUID
+    api_key_id: uuid.UUID
+    api_key_secret: str
+    consent_step_id: uuid.UUID
+    rating_step_id: uuid.UUID
+    recommendation_step_id: uuid.UUID
+    survey_step_id: uuid.UUID
+    completion_step_id: uuid.UUID
+    survey_pages: list[SurveyPageFixture]
+    movie_ids: list[uuid.UUID]
+    movielens_ids: list[str]
+
+    @property
+    def step_ids(self) -> list[uuid.UUID]:
+        """Steps in study order."""
+        return [
+            self.consent_step_id,
+            self.rating_step_id,
+            self.recommendation_step_id,
+            self.survey_step_id,
+            self.completion_step_id,
+        ]
+
+
+async def seed_journey_fixture(
+    session_factory: async_sessionmaker[AsyncSession],
+    movielens_ids: Sequence[int | str],
+    recommender_keys: Sequence[str],
+    survey_pages: int = 2,
+    items_per_page: int = 5,
+    recommendation_count: int = 10,
+    dataset_subset: str = 'bench-subset',
+    shuffled_lists: int = 4,
+) -> JourneyFixture:
+    """Seeds a study shaped like a typical RSSA deployment.
+
+    The study has a consent step, a rating step backed by pre-shuffled movie lists, a recommendation step, a survey
+    step with `survey_pages` pages and a completion step, one condition per recommender key and an active API key.
+
+    Args:
+        session_factory: Session factory bound to the benchmark engine.
+        movielens_ids: Movie catalogue; must cover everything the Lambda emulator can return.
+        recommender_keys: Registry keys, one condition is created per key.
+        survey_pages: Number of pages in the survey step.
+        items_per_page: Number of survey items on each page.
+        recommendation_count: Recommendation count configured on every condition.
+        dataset_subset: Subset name used for the study and its pre-shuffled movie lists.
+        shuffled_lists: Number of pre-shuffled movie lists participants are spread over.
+
+    Returns:
+        The identifiers of the seeded rows and the plain text API key secret.
+    """
+    ensure_bench_secrets()
+    user, study = _bench_owner_and_study(completion_code='BENCHDONE', dataset_subset=dataset_subset)
+    consent = _bench_step(study.id, 'Consent', '/consent', 'consent', 1)
+    rating = _bench_step(study.id, 'Rate Movies', '/ratemovies', 'preference-elicitation', 2)
+    recommendation = _bench_step(study.id, 'Recommendations', '/recommendations', 'task', 3)
+    survey = _bench_step(study.id, 'Survey', '/survey', 'survey', 4)
+    completion = _bench_step(study.id, 'Completion', '/endstudy', 'end', 5)
+    conditions = _bench_conditions(study.id, recommender_keys, recommendation_count)
+    movies = _bench_movies(movielens_ids)
+
+    api_key_secret = secrets.token_urlsafe(32)
+    api_key = ApiKey(
+        id=uuid.uuid4(),
+        study_id=study.id,
+        user_id=user.id,
+        description='Benchmark key',
+        key_hash=Fernet(study_admin.ENCRYPTION_KEY.encode()).encrypt(api_key_secret.encode()).decode(),
+        is_active=True,
+    )
+
+    scale = SurveyScale(id=uuid.uuid4(), name='Agreement', description='Five point agreement scale')
+    levels = [
+        SurveyScaleLevel(id=uuid.uuid4(), survey_scale_id=scale.id, value=v, label=f'Level {v}', order_position=v)
+        for v in range(1, 6)
+    ]
+    # Inserted stage by stage so foreign keys resolve without relying on mapped relationships.
+    stages: list[list[Any]] = [
+        [user],
+        [study, scale, *movies],
+        [consent, survey, rating, recommendation, completion, *conditions, api_key, *levels],
+        [],
+        [],
+    ]
+
+    page_fixtures = []
+    for p in range(survey_pages):
+        construct = SurveyConstruct(id=uuid.uuid4(), name=f'Construct {p + 1}', description='Benchmark construct')
+        items = [
+            SurveyItem(id=uuid.uuid4(), survey_construct_id=construct.id, text=f'Item {i + 1}', order_position=i + 1)
+            for i in range(items_per_page)
+        ]
+        page = StudyStepPage(
+            id=uuid.uuid4(),
+            study_id=study.id,
+            study_step_id=survey.id,
+            name=f'Survey page {p + 1}',
+            description='Benchmark survey page',
+            page_type='survey',
+            order_position=p + 1,
+        )
+        content = StudyStepPageContent(
+            id=uuid.uuid4(),
+            study_step_page_id=page.id,
+            survey_construct_id=construct.id,
+            survey_scale_id=scale.id,
+            order_position=1,
+        )
+        stages[1].append(construct)
+        stages[3] += [*items, page]
+        stages[4].append(content)
+        page_fixtures.append(
+            SurveyPageFixture(
+                page_id=page.id,
+                construct_id=construct.id,
+                scale_id=scale.id,
+                level_ids=[level.id for level in levels],
+                item_ids=[item.id for item in items],
+            )
+        )
+
+    movie_ids = [movie.id for movie in movies]
+    for seed in range(shuffled_lists):
+        shuffled = list(movie_ids)
+        random.Random(seed).shuffle(shuffled)
+        stages[1].append(PreShuffledMovieList(subset_desc=dataset_subset, seed=seed, movie_ids=shuffled))
+
+    async with session_factory() as session:
+        for stage in stages:
+            session.add_all(stage)
+            await session.flush()
+        await session.commit()
+
+    return JourneyFixture(
+        study_id=study.id,
+        api_key_id=api_key.id,
+        api_key_secret=api_key_secret,
+        consent_step_id=consent.id,
+        survey_step_id=survey.id,
+        rating_step_id=rating.id,
+        recommendation_step_id=recommendation.id,
+        completion_step_id=completion.id,
+        survey_pages=page_fixtures,
+        movie_ids=movie_ids,
+        movielens_ids=[str(m) for m in movielens_ids],
+    )
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize_latencies(latencies: Sequence[float], elapsed: float | None = None) -> dict[str, Any]:
+    """Summarizes request latencies (seconds) into the millisecond figures used by the reports."""
+    ordered = sorted(latencies)
+    summary: dict[str, Any] = {
+        'count': len(ordered),
+        'mean_ms': round(1000 * sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        'p50_ms': round(1000 * percentile(ordered, 50), 3),
+        'p95_ms': round(1000 * percentile(ordered, 95), 3),
+        'p99_ms': round(1000 * percentile(ordered, 99), 3),
+        'max_ms': round(1000 * ordered[-1], 3) if ordered else 0.0,
+    }
+    if elapsed:
+        summary['throughput_rps'] = round(len(ordered) / elapsed, 3)
+    return summary
+
+
+def latency_histogram(latencies: Sequence[float], bounds_ms: Sequence[float] | None = None) -> dict[str, int]:
+    """Buckets latencies (seconds) into non-cumulative millisecond buckets keyed by their upper bound."""
+    bounds = list(bounds_ms or (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000))
+    histogram = {f'le_{int(b)}ms': 0 for b in bounds}
+    histogram['gt_max'] = 0
+    for latency in latencies:
+        latency_ms = latency * 1000
+        for b in bounds:
+            if latency_ms <= b:
+                histogram[f'le_{int(b)}ms'] += 1
+                break
+        else:
+            histogram['gt_max'] += 1
+    return histogram
+
+
+class Stopwatch:
+    """Monotonic timer usable as a context manager."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def __enter__(self) -> 'Stopwatch':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.elapsed = time.perf_counter() - self.started
@@ -0,0 +1,272 @@
+"""Local stand-in for the AWS Lambda transport used by `LambdaStrategy`.
+
+`LambdaStrategy` talks to AWS through an aiobotocore session (`strategy._session`). The emulator mimics the small
+part of that surface the strategy touches (`create_client('lambda')` -> `invoke(...)` -> `Payload.read()`), so the
+real strategy code (payload building, error handling, response validation) is exercised without leaving the process.
+
+Responses are either deterministic (a seeded ranking over a fixed catalogue) or artifact-backed (ranked from an
+`averaged_item_score.csv` produced by `scripts/train_mfs.py`). Latency and failures are drawn from configurable
+distributions so tail behaviour of the API can be studied.
+"""
+
+import asyncio
+import csv
+import hashlib
+import json
+import random
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from rssa_api.services.recommendation.registry import REGISTRY
+
+
+@dataclass
+class LatencyProfile:
+    """Log-normal latency model with optional cold starts.
+
+    Attributes:
+        median_ms: Median invocation latency in milliseconds.
+        sigma: Shape of the log-normal distribution; larger values give a heavier tail.
+        cold_start_rate: Probability that an invocation pays the cold start penalty.
+        cold_start_ms: Additional latency for a cold start in milliseconds.
+    """
+
+    median_ms: float = 250.0
+    sigma: float = 0.4
+    cold_start_rate: float = 0.0
+    cold_start_ms: float = 1500.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Draws a latency in seconds."""
+        latency_ms = rng.lognormvariate(0.0, self.sigma) * self.median_ms if self.median_ms > 0 else 0.0
+        if self.cold_start_rate and rng.random() < self.cold_start_rate:
+            latency_ms += self.cold_start_ms
+        return latency_ms / 1000.0
+
+
+@dataclass
+class ErrorProfile:
+    """Failure model for the emulated function.
+
+    Attributes:
+        function_error_rate: Probability of a handled Lambda error (response carries `FunctionError`).
+        transport_error_rate: Probability of the invoke call itself raising (throttling, network errors).
+    """
+
+    function_error_rate: float = 0.0
+    transport_error_rate: float = 0.0
+
+
+class EmulatedTransportError(RuntimeError):
+    """Raised by the emulator to simulate a failed invoke call."""
+
+
+class _Payload:
+    """Mimics the aiobotocore `StreamingBody` returned in `response['Payload']`."""
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+@dataclass
+class EmulatorStats:
+    """Counters collected by the emulator while it is installed."""
+
+    invocations: int = 0
+    function_errors: int = 0
+    transport_errors: int = 0
+    by_function: Counter = field(default_factory=Counter)
+    by_path: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns a JSON serializable view of the counters."""
+        return {
+            'invocations': self.invocations,
+            'function_errors': self.function_errors,
+            'transport_errors': self.transport_errors,
+            'by_function': dict(self.by_function),
+            'by_path': dict(self.by_path),
+        }
+
+
+class LocalLambdaEmulator:
+    """Serves recommendation responses in place of the deployed Lambda functions.
+
+    Args:
+        catalogue: MovieLens ids the emulator may recommend, ordered best first.
+        latency: Latency distribution of a single invocation.
+        errors: Failure distribution of a single invocation.
+        seed: Seed for the latency/error draws and the deterministic rankings.
+        discounted_catalogue: Optional alternative ordering used for `discounted_top_n` requests.
+    """
+
+    def __init__(
+        self,
+        catalogue: Sequence[int | str],
+        latency: LatencyProfile | None = None,
+        errors: ErrorProfile | None = None,
+        seed: int = 42,
+        discounted_catalogue: Sequence[int | str] | None = None,
+    ):
+        if not catalogue:
+            raise ValueError('The emulator needs a non-empty catalogue.')
+        self.catalogue = [str(item) for item in catalogue]
+        self.discounted_catalogue = [str(item) for item in discounted_catalogue or self.catalogue]
+        self.latency = latency or LatencyProfile()
+        self.errors = errors or ErrorProfile()
+        self.seed = seed
+        self.stats = EmulatorStats()
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_synthetic_catalogue(cls, size: int, start_id: int = 1, **kwargs: Any) -> 'LocalLambdaEmulator':
+        """Creates an emulator over the MovieLens ids `start_id .. start_id + size - 1`."""
+        return cls([start_id + i for i in range(size)], **kwargs)
+
+    @classmethod
+    def from_item_scores(cls, scores_path: str | Path, **kwargs: Any) -> 'LocalLambdaEmulator':
+        """Creates an emulator ranked by an `averaged_item_score.csv` artifact.
+
+        Args:
+            scores_path: CSV with the columns `item`, `ave_score` and (optionally) `ave_discounted_score`.
+            **kwargs: Forwarded to the constructor.
+        """
+        with open(scores_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        if not rows:
+            raise ValueError(f'No item scores found in {scores_path}')
+
+        def _score(row: dict[str, str], column: str) -> float:
+            value = row.get(column) or row.get('ave_score') or 'nan'
+            score = float(value)
+            return score if score == score else float('-inf')  # NaN sorts last
+
+        ranked = sorted(rows, key=lambda r: _score(r, 'ave_score'), reverse=True)
+        discounted = sorted(rows, key=lambda r: _score(r, 'ave_discounted_score'), reverse=True)
+        return cls(
+            [r['item'] for r in ranked],
+            discounted_catalogue=[r['item'] for r in discounted],
+            **kwargs,
+        )
+
+    def create_client(self, service_name: str, **_: Any) -> '_EmulatedLambdaClient':
+        """Mirrors `AioSession.create_client`."""
+        if service_name != 'lambda':
+            raise ValueError(f'The emulator only provides the lambda service, not {service_name}.')
+        return _EmulatedLambdaClient(self)
+
+    async def invoke(self, function_name: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """Simulates a RequestResponse invocation of `function_name`."""
+        self.stats.invocations += 1
+        self.stats.by_function[function_name] += 1
+        path = str(payload.get('path', 'top_n'))
+        self.stats.by_path[path] += 1
+
+        await asyncio.sleep(self.latency.sample(self._rng))
+
+        roll = self._rng.random()
+        if roll < self.errors.transport_error_rate:
+            self.stats.transport_errors += 1
+            raise EmulatedTransportError(f'Emulated invoke failure for {function_name}')
+        if roll < self.errors.transport_error_rate + self.errors.function_error_rate:
+            self.stats.function_errors += 1
+            return {
+                'StatusCode': 200,
+                'FunctionError': 'Unhandled',
+                'Payload': _Payload(json.dumps({'errorMessage': 'Emulated function error'}).encode()),
+            }
+
+        body = self.build_response(path, payload)
+        return {
+            'StatusCode': 200,
+            'Payload': _Payload(json.dumps({'statusCode': 200, 'body': json.dumps(body)}).encode()),
+        }
+
+    def build_response(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """Builds the `ResponseWrapper` body the real function would return for `path`."""
+        limit = int(payload.get('limit') or 10)
+        rated = {str(r.get('item_id')) for r in payload.get('ratings', [])}
+        ranked = self._ranked_candidates(path, str(payload.get('user_id', '')), rated)
+
+        if path == 'community_advisors':
+            advisors = []
+            for i in range(min(limit, max(len(ranked) // 4, 1))):
+                window = ranked[i * 4 : i * 4 + 4] or ranked[:4]
+                advisors.append({'id': i, 'recommendation': window[0], 'profile_top_n': window[1:] or window})
+            return {'response_type': 'community_advisors', 'items': advisors}
+
+        if path == 'community_scored_predictions':
+            items = []
+            for rank, item in enumerate(ranked[:limit]):
+                score = round(5.0 - rank * (4.0 / max(limit, 1)), 4)
+                community_score = round(5.0 - ((rank * 7) % max(limit, 1)) * (4.0 / max(limit, 1)), 4)
+                items.append(
+                    {
+                        'item': item,
+                        'score': score,
+                        'community_score': community_score,
+                        'label': int(score >= 3.0),
+                        'community_label': int(community_score >= 3.0),
+                        'cluster': rank % 3,
+                    }
+                )
+            return {'response_type': 'community_comparison', 'items': items}
+
+        return {'response_type': 'standard', 'items': ranked[:limit]}
+
+    def _ranked_candidates(self, path: str, user_id: str, rated: set[str]) -> list[str]:
+        """Returns unrated candidates in the order the emulated model would rank them."""
+        base = self.discounted_catalogue if path == 'discounted_top_n' else self.catalogue
+        candidates = [item for item in base if item not in rated]
+        if path in ('top_n', 'discounted_top_n', 'community_scored_predictions'):
+            return candidates
+        # Other paths get a stable per-user permutation so different users see different lists.
+        digest = hashlib.blake2b(f'{self.seed}:{path}:{user_id}'.encode(), digest_size=8).digest()
+        random.Random(int.from_bytes(digest, 'big')).shuffle(candidates)
+        return candidates
+
+
+class _EmulatedLambdaClient:
+    """Async context manager returned by `LocalLambdaEmulator.create_client`."""
+
+    def __init__(self, emulator: LocalLambdaEmulator):
+        self._emulator = emulator
+
+    async def __aenter__(self) -> '_EmulatedLambdaClient':
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def invoke(self, FunctionName: str, InvocationType: str, Payload: str) -> dict[str, Any]:
+        if InvocationType != 'RequestResponse':
+            raise ValueError(f'Unsupported invocation type: {InvocationType}')
+        return await self._emulator.invoke(FunctionName, json.loads(Payload))
+
+
+@contextmanager
+def install_emulator(emulator: LocalLambdaEmulator, registry: dict[str, Any] | None = None) -> Iterator[None]:
+    """Routes every `LambdaStrategy` in `registry` through `emulator` for the duration of the block.
+
+    Args:
+        emulator: The emulator to install.
+        registry: Strategy registry to patch, defaults to the application registry.
+    """
+    strategies = [
+        getattr(strategy, 'inner', strategy) for strategy in (REGISTRY if registry is None else registry).values()
+    ]
+    patched = [(strategy, strategy._session) for strategy in strategies if hasattr(strategy, '_session')]
+    for strategy, _ in patched:
+        strategy._session = emulator
+    try:
+        yield
+    finally:
+        for strategy, session in patched:
+            strategy._session = session
@@ -0,0 +1,97 @@
+"""Tests for the participant journey load generator."""
+
+import random
+import uuid
+
+import httpx
+import pytest
+
+from .harness import JourneyFixture, SurveyPageFixture
+from .journey_load import EndpointStats, JourneyConfig, JourneyFailed, ParticipantJourney
+
+
+def _fixture() -> JourneyFixture:
+    page = SurveyPageFixture(
+        page_id=uuid.uuid4(),
+        construct_id=uuid.uuid4(),
+        scale_id=uuid.uuid4(),
+        level_ids=[uuid.uuid4() for _ in range(5)],
+        item_ids=[uuid.uuid4() for _ in range(2)],
+    )
+    return JourneyFixture(
+        study_id=uuid.uuid4(),
+        api_key_id=uuid.uuid4(),
+        api_key_secret='secret',
+        consent_step_id=uuid.uuid4(),
+        rating_step_id=uuid.uuid4(),
+        recommendation_step_id=uuid.uuid4(),
+        survey_step_id=uuid.uuid4(),
+        completion_step_id=uuid.uuid4(),
+        survey_pages=[page, page],
+        movie_ids=[uuid.uuid4() for _ in range(10)],
+        movielens_ids=[str(i) for i in range(10)],
+    )
+
+
+def _handler(gallery_status: int = 200, recommendation_status: int = 200):
+    calls: list[str] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(f'{request.method} {request.url.path}')
+        path = request.url.path
+        if path.endswith('/new-participant'):
+            return httpx.Response(201, json={'resume_code': 'ABCDE', 'token': 'jwt'})
+        if path == '/study/movies/':
+            return httpx.Response(gallery_status, json={'data': [{'id': str(uuid.uuid4())} for _ in range(4)]})
+        if path == '/study/recommendations/':
+            return httpx.Response(recommendation_status, json={'response_type': 'standard', 'items': []})
+        if request.method == 'POST':
+            return httpx.Response(201, json={})
+        return httpx.Response(200, json={})
+
+    return handle, calls
+
+
+@pytest.mark.asyncio
+async def test_journey_walks_every_endpoint() -> None:
+    """A successful journey visits every stage in order and records each request."""
+    handle, calls = _handler()
+    stats = EndpointStats()
+    config = JourneyConfig(gallery_pages=2, gallery_page_size=4, ratings=3)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handle), base_url='http://test') as client:
+        await ParticipantJourney(client, _fixture(), config, stats, random.Random(1)).run()
+
+    assert calls[0].endswith('/new-participant')
+    assert calls[-1].endswith('/finalize')
+    assert calls.count('GET /study/movies/') == 2
+    assert calls.count('POST /study/responses/ratings/') == 3
+    assert calls.count('POST /study/responses/survey/') == 4
+    assert stats.statuses['POST /recommendations/'] == {'200': 1}
+    report = stats.as_dict(elapsed=1.0)
+    assert report['GET /steps/{step_id}']['count'] == 4
+
+
+@pytest.mark.asyncio
+async def test_gallery_failure_falls_back_to_catalogue() -> None:
+    """Participants still rate movies when the gallery endpoint is unavailable."""
+    handle, calls = _handler(gallery_status=500)
+    stats = EndpointStats()
+    config = JourneyConfig(gallery_pages=3, ratings=3)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handle), base_url='http://test') as client:
+        await ParticipantJourney(client, _fixture(), config, stats, random.Random(1)).run()
+
+    assert calls.count('GET /study/movies/') == 1
+    assert stats.statuses['GET /movies/'] == {'500': 1}
+    assert calls.count('POST /study/responses/ratings/') == 3
+
+
+@pytest.mark.asyncio
+async def test_journey_stops_at_failed_recommendations() -> None:
+    """A failed recommendation request ends the journey at that stage."""
+    handle, calls = _handler(recommendation_status=500)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handle), base_url='http://test') as client:
+        journey = ParticipantJourney(client, _fixture(), JourneyConfig(ratings=1), EndpointStats(), random.Random(1))
+        with pytest.raises(JourneyFailed, match='recommendations'):
+            await journey.run()
+
+    assert not any(call.endswith('/finalize') for call in calls)
@@ -0,0 +1,116 @@
+"""Tests for the local Lambda emulator used by the benchmarks."""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
+from rssa_api.services.recommendation.strategies import LambdaStrategy
+
+from .harness import latency_histogram, percentile, summarize_latencies
+from .lambda_emulator import EmulatedTransportError, ErrorProfile, LatencyProfile, LocalLambdaEmulator, install_emulator
+
+NO_LATENCY = LatencyProfile(median_ms=0)
+
+
+@pytest.mark.asyncio
+async def test_strategy_is_served_by_emulator() -> None:
+    """The real strategy builds its payload and parses the emulated response."""
+    emulator = LocalLambdaEmulator.from_synthetic_catalogue(20, latency=NO_LATENCY)
+    strategy = LambdaStrategy('ImplicitMF', {'path': 'top_n'})
+    registry = {'implicit_recs_top_n': strategy}
+
+    with install_emulator(emulator, registry):
+        result = await strategy.recommend('user-1', [MovieLensRating(item_id=1, rating=5)], limit=5)
+
+    assert result.response_type == 'standard'
+    assert result.items == ['2', '3', '4', '5', '6']
+    assert emulator.stats.invocations == 1
+    assert emulator.stats.by_function == {'ImplicitMF': 1}
+    assert strategy._session is not emulator
+
+
+@pytest.mark.asyncio
+async def test_community_comparison_shape() -> None:
+    """Community scored predictions are returned in the community comparison shape."""
+    emulator = LocalLambdaEmulator.from_synthetic_catalogue(20, latency=NO_LATENCY)
+    strategy = LambdaStrategy('BiasedMF', {'path': 'community_scored_predictions'})
+
+    with install_emulator(emulator, {'key': strategy}):
+        result = await strategy.recommend('user-1', [], limit=4)
+
+    assert result.response_type == 'community_comparison'
+    assert len(result.items) == 4
+
+
+@pytest.mark.asyncio
+async def test_function_error_is_raised_by_strategy() -> None:
+    """A handled Lambda error surfaces through the strategy's error path."""
+    emulator = LocalLambdaEmulator.from_synthetic_catalogue(5, latency=NO_LATENCY, errors=ErrorProfile(1.0, 0.0))
+    strategy = LambdaStrategy('ImplicitMF', {'path': 'top_n'})
+
+    with install_emulator(emulator, {'key': strategy}), pytest.raises(RuntimeError, match='Recommendation Engine'):
+        await strategy.recommend('user-1', [], limit=5)
+    assert emulator.stats.function_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_transport_error_is_raised() -> None:
+    """Transport failures raise from the invoke call."""
+    emulator = LocalLambdaEmulator.from_synthetic_catalogue(5, latency=NO_LATENCY, errors=ErrorProfile(0.0, 1.0))
+    strategy = LambdaStrategy('ImplicitMF', {'path': 'top_n'})
+
+    with install_emulator(emulator, {'key': strategy}), pytest.raises(EmulatedTransportError):
+        await strategy.recommend('user-1', [], limit=5)
+
+
+def test_item_scores_artifact(tmp_path: Path) -> None:
+    """Artifact-backed emulators rank by the averaged item scores."""
+    scores = tmp_path / 'averaged_item_score.csv'
+    with open(scores, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['item', 'ave_score', 'ave_discounted_score'])
+        writer.writerows([[10, 3.0, 2.9], [20, 4.5, 1.0], [30, 4.0, 3.5]])
+
+    emulator = LocalLambdaEmulator.from_item_scores(scores, latency=NO_LATENCY)
+
+    assert emulator.catalogue == ['20', '30', '10']
+    assert emulator.discounted_catalogue == ['30', '10', '20']
+    assert emulator.build_response('discounted_top_n', {'limit': 2, 'ratings': []})['items'] == ['30', '10']
+
+
+@pytest.mark.asyncio
+async def test_error_rates_are_injected_over_many_invocations() -> None:
+    """Over many invocations the injected failures follow the error profile, and a seed replays them exactly."""
+    invocations = 2000
+
+    async def run(seed: int) -> LocalLambdaEmulator:
+        emulator = LocalLambdaEmulator.from_synthetic_catalogue(
+            5, latency=NO_LATENCY, errors=ErrorProfile(function_error_rate=0.2, transport_error_rate=0.1), seed=seed
+        )
+        for _ in range(invocations):
+            try:
+                await emulator.invoke('ImplicitMF', {'path': 'top_n', 'limit': 1})
+            except EmulatedTransportError:
+                pass
+        return emulator
+
+    emulator = await run(seed=7)
+
+    assert emulator.stats.invocations == invocations
+    assert emulator.stats.function_errors / invocations == pytest.approx(0.2, abs=0.03)
+    assert emulator.stats.transport_errors / invocations == pytest.approx(0.1, abs=0.03)
+    assert (await run(seed=7)).stats.as_dict() == emulator.stats.as_dict()
+
+
+def test_latency_summary() -> None:
+    """Percentiles and histograms are computed from seconds and reported in milliseconds."""
+    latencies = [i / 1000 for i in range(1, 101)]
+
+    assert percentile(sorted(latencies), 50) == 0.05
+    summary = summarize_latencies(latencies, elapsed=2.0)
+    assert summary['p95_ms'] == 95.0
+    assert summary['p99_ms'] == 99.0
+    assert summary['throughput_rps'] == 50.0
+    assert sum(latency_histogram(latencies).values()) == 100
@@ -0,0 +1,59 @@
+"""Tests for the balanced condition allocator."""
+
+import asyncio
+import random
+import uuid
+from collections import Counter
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rssa_api.core.condition_allocator import ConditionAllocator
+
+
+@pytest.mark.asyncio
+async def test_concurrent_assignments_stay_balanced() -> None:
+    """Concurrent enrollments share one counter load and split n participants n/k apiece, give or take one."""
+    study_id = uuid.uuid4()
+    conditions = [uuid.uuid4() for _ in range(3)]
+    load_counts = AsyncMock(return_value=dict.fromkeys(conditions, 0))
+    allocator = ConditionAllocator(rng=random.Random(7))
+
+    assigned = await asyncio.gather(*(allocator.assign(study_id, load_counts) for _ in range(100)))
+
+    counts = Counter(assigned)
+    assert max(counts.values()) - min(counts.values()) <= 1
+    assert sum(counts.values()) == 100
+    load_counts.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_resync_and_invalidation_reload_counts() -> None:
+    """Counters are re-seeded after the resync interval and when a condition changes."""
+    now = [0.0]
+    study_id, condition_id = uuid.uuid4(), uuid.uuid4()
+    load_counts = AsyncMock(return_value={condition_id: 5})
+    allocator = ConditionAllocator(resync_seconds=60, clock=lambda: now[0])
+
+    await allocator.assign(study_id, load_counts)
+    await allocator.assign(study_id, load_counts)
+    assert allocator.counts(study_id) == {condition_id: 7}
+    assert load_counts.await_count == 1
+
+    now[0] = 61
+    await allocator.assign(study_id, load_counts)
+    assert load_counts.await_count == 2
+
+    allocator.invalidate_condition(condition_id)
+    assert allocator.counts(study_id) == {}
+
+
+@pytest.mark.asyncio
+async def test_study_without_conditions_raises_and_is_not_cached() -> None:
+    """A study with no enabled conditions is an error and leaves nothing behind."""
+    study_id = uuid.uuid4()
+    allocator = ConditionAllocator()
+
+    with pytest.raises(ValueError):
+        await allocator.assign(study_id, AsyncMock(return_value={}))
+    assert allocator.counts(study_id) == {}
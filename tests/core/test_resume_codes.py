@@ -0,0 +1,40 @@
+"""Tests for resume code allocation."""
+
+import pytest
+
+from rssa_api.core.resume_codes import CODE_ALPHABET, CodePermutation, ResumeCodeAllocator
+
+
+def test_permutation_is_a_bijection() -> None:
+    """Every index maps to a distinct value in the space, and decoding reverses encoding."""
+    permutation = CodePermutation(b'key', alphabet='ABC', length=4)
+
+    values = [permutation.permute(i) for i in range(permutation.size)]
+    assert sorted(values) == list(range(permutation.size))
+
+    codes = [permutation.encode(i) for i in range(permutation.size)]
+    assert len(set(codes)) == permutation.size
+    assert all(permutation.decode(code) == i for i, code in enumerate(codes))
+
+
+def test_allocator_skips_loaded_codes_and_never_repeats() -> None:
+    """Codes already stored are not handed out again, within or across study namespaces."""
+    allocator = ResumeCodeAllocator(key=b'key')
+    first = allocator.allocate('study-a')
+    assert len(first) == 5 and set(first) <= set(CODE_ALPHABET)
+
+    fresh = ResumeCodeAllocator(key=b'key')
+    fresh.load([first])
+    assert fresh.allocate('study-a') != first
+
+    codes = [allocator.allocate(namespace) for namespace in ('study-a', 'study-b') for _ in range(5000)]
+    assert len(set(codes)) == len(codes)
+
+
+def test_allocator_reports_exhausted_namespace() -> None:
+    """A namespace that ran out of codes raises instead of looping."""
+    allocator = ResumeCodeAllocator(key=b'key', alphabet='AB', length=2)
+
+    assert len({allocator.allocate('study') for _ in range(4)}) == 4
+    with pytest.raises(RuntimeError):
+        allocator.allocate('study')
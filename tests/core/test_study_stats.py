@@ -0,0 +1,52 @@
+"""Tests for the incrementally maintained study statistics."""
+
+import asyncio
+import uuid
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rssa_api.core.study_stats import ParticipantBucket, StudyStatsStore, participant_bucket
+
+
+def test_participant_bucket_applies_changes() -> None:
+    """A pending update is reflected in the bucket, and discarded participants are not counted."""
+    condition_id = uuid.uuid4()
+    participant = SimpleNamespace(
+        study_condition_id=condition_id,
+        current_status=None,
+        created_at=datetime(2026, 3, 1, 23, 30, tzinfo=UTC),
+        is_verified=None,
+        discarded=False,
+    )
+
+    assert participant_bucket(participant) == ParticipantBucket(condition_id, 'active', date(2026, 3, 1), False)
+    assert participant_bucket(participant, current_status='completed').status == 'completed'
+    assert participant_bucket(participant, discarded=True) is None
+
+
+@pytest.mark.asyncio
+async def test_records_move_participants_until_reconciled() -> None:
+    """Counters load once, follow recorded changes, and are reloaded after the reconcile interval."""
+    now = [0.0]
+    study_id = uuid.uuid4()
+    active = ParticipantBucket(uuid.uuid4(), 'active', date(2026, 3, 1), True)
+    completed = ParticipantBucket(active.condition_id, 'completed', active.enrolled_on, True)
+    load_buckets = AsyncMock(return_value=[(active, 4)])
+    store = StudyStatsStore(reconcile_seconds=60, clock=lambda: now[0])
+
+    store.record(study_id, None, active)  # not loaded yet, nothing to update
+    counts = await asyncio.gather(*(store.get(study_id, load_buckets) for _ in range(5)))
+    assert all(count == {active: 4} for count in counts)
+    load_buckets.assert_awaited_once()
+
+    store.record(study_id, None, active)
+    store.record(study_id, active, completed)
+    store.record(study_id, active, None)
+    assert await store.get(study_id, load_buckets) == {active: 3, completed: 1}
+
+    now[0] = 60
+    assert await store.get(study_id, load_buckets) == {active: 4}
+    assert load_buckets.await_count == 2
@@ -0,0 +1,64 @@
+"""Tests for the TTL cache."""
+
+from rssa_api.core.ttl_cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire() -> None:
+    """Entries are served until their TTL elapses, and None is a cacheable value."""
+    clock = FakeClock()
+    cache: TTLCache[str, str | None] = TTLCache(ttl_seconds=10, clock=clock)
+    cache.set('a', None)
+
+    assert cache.lookup('a') == (True, None)
+    clock.now = 10
+    assert cache.lookup('a') == (False, None)
+    assert len(cache) == 0
+
+
+def test_oldest_entries_are_evicted() -> None:
+    """The oldest entry is dropped once the cache is full; entries without a TTL never expire."""
+    clock = FakeClock()
+    cache: TTLCache[int, int] = TTLCache(ttl_seconds=None, maxsize=2, clock=clock)
+    for key in range(3):
+        cache.set(key, key)
+
+    clock.now = 1e9
+    assert cache.lookup(0) == (False, None)
+    assert cache.lookup(2) == (True, 2)
+
+
+def test_invalidate_where() -> None:
+    """Entries can be dropped by key predicate."""
+    cache: TTLCache[tuple[str, str], str] = TTLCache(ttl_seconds=60)
+    cache.set(('s1', 'u1'), 'owner')
+    cache.set(('s1', 'u2'), 'viewer')
+    cache.set(('s2', 'u1'), 'admin')
+
+    cache.invalidate_where(lambda key: key[0] == 's1')
+    cache.invalidate(('missing', 'key'))
+
+    assert len(cache) == 1
+    assert cache.lookup(('s2', 'u1')) == (True, 'admin')
+
+
+def test_lru_hits_refresh_an_entry() -> None:
+    """With `lru` set, a hit protects an entry from eviction; without it, entries leave in insertion order."""
+    for lru, survivor in ((True, 0), (False, 1)):
+        cache: TTLCache[int, int] = TTLCache(ttl_seconds=None, maxsize=2, lru=lru)
+        cache.set(0, 0)
+        cache.set(1, 1)
+        cache.lookup(0)
+        cache.set(2, 2)
+
+        assert cache.lookup(survivor) == (True, survivor)
+        assert len(cache) == 2
@@ -1,17 +1,30 @@
 """Tests for ParticipantResponseService."""
 
 import uuid
+from datetime import UTC, datetime
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from pydantic import ValidationError
+from rssa_storage.rssadb.models.participant_responses import (
+    ParticipantAttentionCheckResponse,
+    ParticipantFreeformResponse,
+    ParticipantRating,
+    ParticipantSurveyResponse,
+)
 from rssa_storage.rssadb.repositories.participant_responses import (
+    ParticipantAttentionCheckResponseRepository,
     ParticipantFreeformResponseRepository,
     ParticipantRatingRepository,
     ParticipantStudyInteractionResponseRepository,
     ParticipantSurveyResponseRepository,
 )
 from rssa_storage.rssadb.repositories.study_participants import StudyParticipantRepository
+from sqlalchemy.dialects import postgresql
 
+from rssa_api.data.repositories.survey_components import SurveyItemRepository
+from rssa_api.data.schemas.participant_response_schemas import ParticipantRatingBatch, SurveyPageResponsesCreate
 from rssa_api.data.services.response_service import ParticipantResponseService
 
 
@@ -24,6 +37,8 @@ def mock_repos() -> dict[str, AsyncMock]:
         'text': AsyncMock(spec=ParticipantFreeformResponseRepository),
         'rating': AsyncMock(spec=ParticipantRatingRepository),
         'interaction': AsyncMock(spec=ParticipantStudyInteractionResponseRepository),
+        'attention_check': AsyncMock(spec=ParticipantAttentionCheckResponseRepository),
+        'survey_item': AsyncMock(spec=SurveyItemRepository),
     }
 
 
@@ -31,11 +46,13 @@ def mock_repos() -> dict[str, AsyncMock]:
 def service(mock_repos: dict[str, AsyncMock]) -> ParticipantResponseService:
     """Fixture initializing the ParticipantResponseService with mocked repos."""
     return ParticipantResponseService(
-        particpant_repo=mock_repos['participant'],
+        participant_repo=mock_repos['participant'],
         item_response_repo=mock_repos['survey'],
         text_response_repo=mock_repos['text'],
         content_rating_repo=mock_repos['rating'],
         interact_response_repo=mock_repos['interaction'],
+        ac_response_repo=mock_repos['attention_check'],
+        survey_item_repo=mock_repos['survey_item'],
     )
 
 
@@ -109,3 +126,232 @@ async def test_update_response(service: ParticipantResponseService, mock_repos:
     await service.update_response('survey_item', uid, update_dict, client_version=1)
 
     mock_repos['survey'].update_response.assert_called_with(uid, update_dict, 1)
+
+
+def _created_row(**fields: object) -> MagicMock:
+    """Builds a mock ORM row as returned by INSERT ... RETURNING."""
+    row = MagicMock()
+    row.id = uuid.uuid4()
+    row.version = 1
+    row.created_at = datetime.now(UTC)
+    row.updated_at = datetime.now(UTC)
+    for key, value in fields.items():
+        setattr(row, key, value)
+    return row
+
+
+@pytest.mark.asyncio
+async def test_create_page_responses(service: ParticipantResponseService, mock_repos: dict[str, AsyncMock]) -> None:
+    """A page submission uses one lookup and one multi-row insert per response type."""
+    study_id = uuid.uuid4()
+    participant_id = uuid.uuid4()
+    step_id = uuid.uuid4()
+    page_id = uuid.uuid4()
+    scale_id = uuid.uuid4()
+    level_id = uuid.uuid4()
+    construct_id = uuid.uuid4()
+    survey_item_ids = [uuid.uuid4(), uuid.uuid4()]
+    attention_check_id = uuid.uuid4()
+    context = {'study_step_id': str(step_id), 'study_step_page_id': str(page_id), 'context_tag': 'page'}
+
+    payload = SurveyPageResponsesCreate.model_validate(
+        {
+            'survey_items': [
+                {
+                    **context,
+                    'item_id': str(item_id),
+                    'survey_scale_id': str(scale_id),
+                    'survey_scale_level_id': str(level_id),
+                }
+                for item_id in [*survey_item_ids, attention_check_id]
+            ],
+            'text_responses': [{**context, 'response_text': 'first'}, {**context, 'response_text': 'second'}],
+        }
+    )
+
+    mock_repos['survey_item'].get_construct_ids.return_value = dict.fromkeys(survey_item_ids, construct_id)
+
+    survey_rows = [
+        _created_row(
+            **context,
+            survey_construct_id=construct_id,
+            survey_item_id=item_id,
+            survey_scale_id=scale_id,
+            survey_scale_level_id=level_id,
+        )
+        for item_id in survey_item_ids
+    ]
+    ac_row = _created_row(
+        **context,
+        study_attention_check_id=attention_check_id,
+        survey_scale_id=scale_id,
+        responded_survey_scale_level_id=level_id,
+        text=None,
+        assigned_position=None,
+        study_step_page_content_id=None,
+        expected_survey_scale_level_id=None,
+    )
+    text_row = _created_row(**context, response_text='second', version=2)
+
+    returned_rows = {
+        ParticipantFreeformResponse: [text_row],
+        ParticipantSurveyResponse: survey_rows,
+        ParticipantAttentionCheckResponse: [ac_row],
+    }
+
+    def _returning(stmt: Any, **_: Any) -> MagicMock:
+        result = MagicMock()
+        result.all.return_value = returned_rows[stmt.entity_description['entity']]
+        return result
+
+    db = MagicMock()
+    db.scalars = AsyncMock(side_effect=_returning)
+    mock_repos['participant'].db = db
+
+    result = await service.create_page_responses(payload, study_id, participant_id)
+
+    mock_repos['survey_item'].get_construct_ids.assert_awaited_once_with({*survey_item_ids, attention_check_id})
+    assert db.scalars.await_count == 3
+    inserted = {call.args[0].entity_description['entity']: call.args[0] for call in db.scalars.await_args_list}
+    assert len(inserted[ParticipantSurveyResponse]._multi_values[0]) == 2
+    assert len(inserted[ParticipantFreeformResponse]._multi_values[0]) == 1
+    text_upsert = str(inserted[ParticipantFreeformResponse].compile(dialect=postgresql.dialect()))
+    stored_step = f'{ParticipantFreeformResponse.__tablename__}.study_step_id'
+    assert f'study_step_id = coalesce(excluded.study_step_id, {stored_step})' in text_upsert
+    assert [r.survey_item_id for r in result.survey_items] == survey_item_ids
+    assert result.attention_checks[0].study_attention_check_id == attention_check_id
+    assert result.text_responses[0].version == 2
+    assert result.ratings == []
+    mock_repos['rating'].create.assert_not_called()
+
+
+def _stored_rating(**fields: object) -> MagicMock:
+    """A row of the SELECT that resolves a rating batch to stored ratings."""
+    row = MagicMock()
+    for name, value in fields.items():
+        setattr(row, name, value)
+    return row
+
+
+def _inserted_rows(stmt: Any) -> list[dict[str, Any]]:
+    """The rows of a multi-row INSERT, by column name."""
+    return [{getattr(column, 'key', column): value for column, value in row.items()} for row in stmt._multi_values[0]]
+
+
+def _ratings_db(stored: list[MagicMock], rejected: set[uuid.UUID] = frozenset()) -> MagicMock:
+    """A session holding `stored` ratings, whose upsert rejects the rows in `rejected` on the version check."""
+    db = MagicMock()
+    selected = MagicMock()
+    selected.all.return_value = stored
+    db.execute = AsyncMock(return_value=selected)
+    stored_ids = {row.id for row in stored}
+
+    async def _returning(stmt: Any, **_: Any) -> MagicMock:
+        result = MagicMock()
+        result.all.return_value = [
+            _created_row(
+                id=row['id'],
+                study_step_id=row['study_step_id'],
+                study_step_page_id=None,
+                context_tag=row['context_tag'],
+                rated_item={'item_id': row['item_id'], 'rating': row['rating']},
+                version=row['version'] + (1 if row['id'] in stored_ids else 0),
+            )
+            for row in _inserted_rows(stmt)
+            if row['id'] not in rejected
+        ]
+        return result
+
+    db.scalars = AsyncMock(side_effect=_returning)
+    return db
+
+
+def _rating_batch(*rated_items: dict[str, Any]) -> ParticipantRatingBatch:
+    return ParticipantRatingBatch.model_validate(
+        {'study_step_id': str(uuid.uuid4()), 'context_tag': 'gallery', 'rated_items': list(rated_items)}
+    )
+
+
+@pytest.mark.asyncio
+async def test_upsert_ratings(service: ParticipantResponseService, mock_repos: dict[str, AsyncMock]) -> None:
+    """Ratings are upserted in one statement and stale versions come back as conflicts."""
+    new_item, updated_item, stale_item = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    updated_id, stale_id = uuid.uuid4(), uuid.uuid4()
+    batch = _rating_batch(
+        {'item_id': str(new_item), 'rating': 3},
+        {'item_id': str(updated_item), 'rating': 5, 'id': str(updated_id), 'version': 2},
+        {'item_id': str(stale_item), 'rating': 1, 'id': str(stale_id), 'version': 1},
+    )
+    db = _ratings_db(
+        [
+            _stored_rating(id=updated_id, item_id=updated_item, context_tag='gallery', version=2),
+            _stored_rating(id=stale_id, item_id=stale_item, context_tag='gallery', version=2),
+        ],
+        rejected={stale_id},
+    )
+    mock_repos['participant'].db = db
+
+    result = await service.upsert_ratings(batch, uuid.uuid4(), uuid.uuid4())
+
+    db.execute.assert_awaited_once()
+    db.scalars.assert_awaited_once()
+    stmt = db.scalars.await_args.args[0]
+    assert stmt.entity_description['entity'] is ParticipantRating
+    assert [row['version'] for row in _inserted_rows(stmt)] == [1, 2, 1]
+    assert result.conflicts == [stale_item]
+    assert {r.rated_item.item_id: r.version for r in result.ratings} == {new_item: 1, updated_item: 3}
+
+
+@pytest.mark.asyncio
+async def test_upsert_ratings_resent_without_id_updates_the_stored_row(
+    service: ParticipantResponseService, mock_repos: dict[str, AsyncMock]
+) -> None:
+    """A rating re-sent without its id updates the item's stored rating instead of adding a second one."""
+    item_id, stored_id = uuid.uuid4(), uuid.uuid4()
+    db = _ratings_db([_stored_rating(id=stored_id, item_id=item_id, context_tag='gallery', version=4)])
+    mock_repos['participant'].db = db
+
+    result = await service.upsert_ratings(
+        _rating_batch({'item_id': str(item_id), 'rating': 2}), uuid.uuid4(), uuid.uuid4()
+    )
+
+    (row,) = _inserted_rows(db.scalars.await_args.args[0])
+    assert (row['id'], row['version']) == (stored_id, 4)
+    assert result.conflicts == []
+    assert [r.version for r in result.ratings] == [5]
+
+
+@pytest.mark.asyncio
+async def test_upsert_ratings_unknown_id_creates_a_first_version(
+    service: ParticipantResponseService, mock_repos: dict[str, AsyncMock]
+) -> None:
+    """A client id that matches no stored rating does not become the row id, and the rating starts at version 1."""
+    item_id, unknown_id = uuid.uuid4(), uuid.uuid4()
+    db = _ratings_db([])
+    mock_repos['participant'].db = db
+
+    batch = _rating_batch({'item_id': str(item_id), 'rating': 4, 'id': str(unknown_id), 'version': 7})
+    result = await service.upsert_ratings(batch, uuid.uuid4(), uuid.uuid4())
+
+    (row,) = _inserted_rows(db.scalars.await_args.args[0])
+    assert row['id'] != unknown_id
+    assert row['version'] == 1
+    assert [r.version for r in result.ratings] == [1]
+
+
+@pytest.mark.parametrize(
+    'duplicate',
+    [
+        lambda item_id, rating_id: {'item_id': str(item_id), 'rating': 1},
+        lambda item_id, rating_id: {'item_id': str(uuid.uuid4()), 'rating': 1, 'id': str(rating_id), 'version': 1},
+    ],
+    ids=['same item', 'same rating id'],
+)
+def test_rating_batch_rejects_duplicates(duplicate: Any) -> None:
+    """A batch may rate an item, or update a rating, only once."""
+    item_id, rating_id = uuid.uuid4(), uuid.uuid4()
+    with pytest.raises(ValidationError):
+        _rating_batch(
+            {'item_id': str(item_id), 'rating': 5, 'id': str(rating_id), 'version': 1},
+            duplicate(item_id, rating_id),
+        )
@@ -1,22 +1,40 @@
 """Tests for StudyParticipant related services."""
 
 import uuid
+from datetime import UTC, date, datetime
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from rssa_storage.rssadb.models.participant_movie_sequence import StudyParticipantMovieSession
+from rssa_storage.rssadb.models.study_participants import ParticipantStudySession
 from rssa_storage.rssadb.repositories.study_components import StudyConditionRepository
 from rssa_storage.rssadb.repositories.study_participants import (
-    ParticipantDemographicRepository,
     ParticipantRecommendationContextRepository,
-    StudyParticipantRepository,
     StudyParticipantTypeRepository,
 )
 
-from rssa_api.data.services.study_components import StudyParticipantService
+from rssa_api.core.condition_allocator import condition_allocator
+from rssa_api.core.study_stats import study_stats
+from rssa_api.data.repositories.study_admin import PreShuffledMovieRepository
+from rssa_api.data.repositories.study_components import StudyRepository
+from rssa_api.data.repositories.study_participants import (
+    ParticipantDemographicRepository,
+    ParticipantStudySessionRepository,
+    StudyParticipantRepository,
+)
+from rssa_api.data.schemas.recommendations import ResponseWrapper
+from rssa_api.data.services.study_components import (
+    DEMOGRAPHIC_SUMMARY_FIELDS,
+    StudyParticipantService,
+    demographic_summary_cache,
+)
 from rssa_api.data.services.study_participants import (
+    DEFAULT_DATASET_SUBSET,
     EnrollmentService,
     FeedbackService,
+    ParticipantStudySessionService,
+    enrollment_context_cache,
 )
 
 # --- EnrollmentService Tests ---
@@ -29,16 +47,20 @@ def mock_enroll_repos() -> dict[str, AsyncMock]:
         'participant': AsyncMock(spec=StudyParticipantRepository),
         'type': AsyncMock(spec=StudyParticipantTypeRepository),
         'condition': AsyncMock(spec=StudyConditionRepository),
+        'study': AsyncMock(spec=StudyRepository),
+        'shuffled': AsyncMock(spec=PreShuffledMovieRepository),
     }
 
 
 @pytest.fixture
 def enrollment_service(mock_enroll_repos: dict[str, AsyncMock]) -> EnrollmentService:
     """Fixture for EnrollmentService."""
+    condition_allocator.clear()
     return EnrollmentService(
         participant_repo=mock_enroll_repos['participant'],
-        participant_type_repo=mock_enroll_repos['type'],
         study_condition_repo=mock_enroll_repos['condition'],
+        study_repo=mock_enroll_repos['study'],
+        shuffled_movie_repo=mock_enroll_repos['shuffled'],
     )
 
 
@@ -55,9 +77,9 @@ async def test_enroll_participant_success(
     mock_enroll_repos['participant'].find_one.return_value = None  # New participant
     mock_enroll_repos['type'].find_one.return_value = MagicMock(id=uuid.uuid4())
 
-    condition = MagicMock()
-    condition.id = uuid.uuid4()
-    mock_enroll_repos['condition'].find_many.return_value = [condition]
+    mock_enroll_repos['condition'].get_participant_count_by_condition.return_value = [
+        MagicMock(study_condition_id=uuid.uuid4(), participant_count=0)
+    ]
 
     mock_enroll_repos['participant'].create.return_value = MagicMock(id=uuid.uuid4())
 
@@ -67,6 +89,80 @@ async def test_enroll_participant_success(
     assert result is not None
 
 
+@pytest.mark.asyncio
+async def test_enroll_participants_balances_conditions_with_one_count_query(
+    enrollment_service: EnrollmentService, mock_enroll_repos: dict[str, AsyncMock]
+) -> None:
+    """Counts are loaded once per study, and the lagging condition catches up before the others are used again."""
+    study_id = uuid.uuid4()
+    ahead, behind = uuid.uuid4(), uuid.uuid4()
+    mock_enroll_repos['condition'].get_participant_count_by_condition.return_value = [
+        MagicMock(study_condition_id=ahead, participant_count=3),
+        MagicMock(study_condition_id=behind, participant_count=1),
+    ]
+
+    assigned = [await enrollment_service._pick_condition(study_id, None) for _ in range(6)]
+
+    assert assigned[:2] == [behind, behind]
+    assert (assigned.count(ahead), assigned.count(behind)) == (2, 4)
+    mock_enroll_repos['condition'].get_participant_count_by_condition.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_enroll_with_session_uses_cached_context_and_inserts_the_participant_first(
+    enrollment_service: EnrollmentService, mock_enroll_repos: dict[str, AsyncMock]
+) -> None:
+    """The enrollment context is loaded once per study; the participant is flushed before the rows referencing it."""
+    study_id = uuid.uuid4()
+    first_step, second_step, list_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    enrollment_context_cache.clear()
+
+    db = MagicMock()
+    writes: list[str] = []
+    stored_session = MagicMock()
+    session_result = MagicMock()
+    session_result.first.return_value = stored_session
+
+    async def _execute(stmt: Any, **_: Any) -> MagicMock:
+        writes.append(stmt.table.name)
+        return MagicMock()
+
+    async def _scalars(stmt: Any, **_: Any) -> Any:
+        writes.append(stmt.table.name)
+        return session_result
+
+    db.execute = AsyncMock(side_effect=_execute)
+    db.scalars = AsyncMock(side_effect=_scalars)
+    db.flush = AsyncMock(side_effect=lambda: writes.append('flush'))
+    mock_enroll_repos['participant'].db = db
+    mock_enroll_repos['study'].get_dataset_subset_and_step_ids.return_value = (None, [first_step, second_step])
+    mock_enroll_repos['shuffled'].get_list_ids.return_value = [list_id]
+    mock_enroll_repos['condition'].get_participant_count_by_condition.return_value = [
+        MagicMock(study_condition_id=uuid.uuid4(), participant_count=0)
+    ]
+
+    context = await enrollment_service.get_enrollment_context(study_id)
+    assert context is not None
+    assert context.next_step_ids == {first_step: second_step, second_step: None}
+    assert context.dataset_subset == DEFAULT_DATASET_SUBSET
+    assert context.shuffled_list_ids == (list_id,)
+    assert await enrollment_service.get_enrollment_context(study_id) is context
+    mock_enroll_repos['study'].get_dataset_subset_and_step_ids.assert_awaited_once_with(study_id)
+    mock_enroll_repos['shuffled'].get_list_ids.assert_awaited_once_with(DEFAULT_DATASET_SUBSET)
+
+    new_participant = MagicMock(source_meta=None, current_step_id=second_step, current_page_id=None)
+    participant, session = await enrollment_service.enroll_with_session(study_id, new_participant, context)
+
+    assert session is stored_session
+    db.add.assert_called_once_with(participant)
+    assert writes == [
+        'flush',
+        StudyParticipantMovieSession.__tablename__,
+        ParticipantStudySession.__tablename__,
+    ]
+    enrollment_context_cache.clear()
+
+
 # --- StudyParticipantService Tests ---
 
 
@@ -122,8 +218,7 @@ async def test_create_recommendation_context(
     context_data.step_id = uuid.uuid4()
     context_data.step_page_id = uuid.uuid4()
     context_data.context_tag = 'tag'
-    context_data.recommendations_json = MagicMock()
-    context_data.recommendations_json.model_dump.return_value = {}
+    context_data.recommendations_json = ResponseWrapper(response_type='standard', items=[1, 2])
 
     # Mock create to set ID on instance (simulating DB commit)
     def set_id(instance) -> Any:
@@ -137,6 +232,8 @@ async def test_create_recommendation_context(
 
     assert res is not None
     mock_sp_repos['context'].create.assert_called_once()
+    created = mock_sp_repos['context'].create.call_args.args[0]
+    assert created.recommendations_json == {'response_type': 'standard', 'items': [1, 2], 'fallback_reason': None}
 
 
 @pytest.mark.asyncio
@@ -172,6 +269,86 @@ async def test_create_demographic_info(
         assert call_arg.race == 'Asian;White'
 
 
+@pytest.mark.asyncio
+async def test_demographic_summary_is_one_query_and_follows_writes(
+    sp_service: StudyParticipantService, mock_sp_repos: dict[str, AsyncMock]
+) -> None:
+    """The summary is built from one grouped query, cached, and recomputed after a demographic write."""
+    study_id = uuid.uuid4()
+    demographic_summary_cache.clear()
+    mock_sp_repos['demo'].count_answers_by_field.return_value = [
+        ('age_range', '18-24', 3),
+        ('gender', 'Woman', 2),
+        ('gender', None, 1),
+        ('race', 'Asian', 3),
+        ('education', 'Bachelor', 3),
+    ]
+
+    summary = await sp_service.get_study_demographic_summary(study_id)
+    assert summary == {
+        'age_range': {'18-24': 3},
+        'gender': {'Woman': 2, 'Unknown': 1},
+        'race': {'Asian': 3},
+        'education': {'Bachelor': 3},
+    }
+    await sp_service.get_study_demographic_summary(study_id)
+    mock_sp_repos['demo'].count_answers_by_field.assert_awaited_once_with(study_id, DEMOGRAPHIC_SUMMARY_FIELDS)
+
+    existing = MagicMock(id=uuid.uuid4(), version=1, raw_json={}, age_range='18-24', race='Asian', education='Bachelor')
+    existing.gender = None
+    mock_sp_repos['demo'].find_one.return_value = existing
+    update = MagicMock()
+    update.model_dump.return_value = {'gender': 'Woman', 'race': ['Asian', 'White']}
+    with patch('rssa_api.data.services.study_components.DemographicsCreate'):
+        await sp_service.upsert_demographic_info(uuid.uuid4(), update, study_id=study_id)
+
+    # The write is not committed yet, so the cached counts are dropped rather than patched.
+    assert demographic_summary_cache.lookup(study_id) == (False, None)
+    await sp_service.get_study_demographic_summary(study_id)
+    assert mock_sp_repos['demo'].count_answers_by_field.await_count == 2
+    demographic_summary_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_study_stats_follow_participant_updates(
+    sp_service: StudyParticipantService, mock_sp_repos: dict[str, AsyncMock]
+) -> None:
+    """Stats are loaded with one grouped query and finalizing a participant moves them to completed."""
+    study_id, condition_id = uuid.uuid4(), uuid.uuid4()
+    study_stats.clear()
+    mock_sp_repos['participant'].count_by_stats_bucket.return_value = [
+        MagicMock(
+            study_condition_id=condition_id,
+            current_status='active',
+            enrolled_on=date(2026, 3, 1),
+            is_verified=True,
+            count=3,
+        )
+    ]
+    mock_sp_repos['participant'].find_one.return_value = MagicMock(
+        study_id=study_id,
+        study_condition_id=condition_id,
+        current_status='active',
+        created_at=datetime(2026, 3, 1, tzinfo=UTC),
+        is_verified=True,
+        discarded=False,
+    )
+
+    stats = await sp_service.get_study_stats(study_id)
+    assert (stats.total_participants, stats.completed_participants) == (3, 0)
+
+    await sp_service.update(uuid.uuid4(), {'current_status': 'completed'})
+
+    stats = await sp_service.get_study_stats(study_id)
+    assert (stats.total_participants, stats.verified_participants, stats.completed_participants) == (3, 3, 1)
+    assert stats.participants_by_status == {'active': 2, 'completed': 1}
+    assert stats.verified_participants_by_condition == {condition_id: 3}
+    assert stats.participants_by_day == {date(2026, 3, 1): 3}
+    mock_sp_repos['participant'].update.assert_awaited_once()
+    mock_sp_repos['participant'].count_by_stats_bucket.assert_awaited_once_with(study_id)
+    study_stats.clear()
+
+
 # --- FeedbackService Tests ---
 
 
@@ -208,3 +385,23 @@ async def test_create_feedback(feedback_service: FeedbackService, mock_feedback_
 
     assert res == 'fb'
     mock_feedback_repo.create.assert_called_once()
+
+
+# --- ParticipantStudySessionService Tests ---
+
+
+@pytest.mark.asyncio
+async def test_get_session_by_resume_code_is_one_statement() -> None:
+    """Resolving a code extends the session in a single statement without separate reads or updates."""
+    repo = AsyncMock(spec=ParticipantStudySessionRepository)
+    session = MagicMock(resume_code='ABCDE')
+    repo.extend_by_resume_code.return_value = session
+    service = ParticipantStudySessionService(repo)
+    study_id = uuid.uuid4()
+
+    assert await service.get_session_by_resume_code('ABCDE', study_id) is session
+
+    repo.extend_by_resume_code.assert_awaited_once()
+    assert repo.extend_by_resume_code.await_args.kwargs['study_id'] == study_id
+    repo.find_one.assert_not_called()
+    repo.update.assert_not_called()
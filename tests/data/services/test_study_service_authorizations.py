@@ -4,15 +4,23 @@ import uuid
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from rssa_storage.rssadb.models.study_components import Study, StudyAuthorization
+from rssa_storage.rssadb.models.study_components import StudyAuthorization, StudyStepPage
 
-from rssa_api.data.services.study_components import StudyService
+from rssa_api.data.repositories.study_components import StudyRepository
+from rssa_api.data.services.study_components import StudyService, component_study_cache, study_role_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_access_caches() -> None:
+    """Start every test with empty process-wide access caches."""
+    study_role_cache.clear()
+    component_study_cache.clear()
 
 
 @pytest.fixture
 def mock_study_repo() -> AsyncMock:
     """Mock study repository."""
-    return AsyncMock()
+    return AsyncMock(spec=StudyRepository)
 
 
 @pytest.fixture
@@ -35,14 +43,13 @@ async def test_check_study_access_owner(
     study_id = uuid.uuid4()
     user_id = uuid.uuid4()
 
-    mock_study = MagicMock(spec=Study)
-    mock_study.owner_id = user_id
-    mock_study_repo.find_one.return_value = mock_study
+    mock_study_repo.get_owner_and_role.return_value = (user_id, None)
 
     result = await study_service.check_study_access(study_id, user_id)
 
     assert result is True
-    # Should check owner first and return True without checking auth repo
+    # Owner and authorization are resolved by one joined query
+    mock_study_repo.get_owner_and_role.assert_awaited_once_with(study_id, user_id)
     mock_auth_repo.find_one.assert_not_called()
 
 
@@ -57,17 +64,12 @@ async def test_check_study_access_authorized_user(
     user_id = uuid.uuid4()
     owner_id = uuid.uuid4()
 
-    mock_study = MagicMock(spec=Study)
-    mock_study.owner_id = owner_id
-    mock_study_repo.find_one.return_value = mock_study
-
-    mock_auth_record = MagicMock(spec=StudyAuthorization)
-    mock_auth_repo.find_one.return_value = mock_auth_record
+    mock_study_repo.get_owner_and_role.return_value = (owner_id, 'viewer')
 
     result = await study_service.check_study_access(study_id, user_id)
 
     assert result is True
-    mock_auth_repo.find_one.assert_called_once()
+    mock_study_repo.get_owner_and_role.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -79,11 +81,7 @@ async def test_check_study_access_unauthorized(
     user_id = uuid.uuid4()
     owner_id = uuid.uuid4()
 
-    mock_study = MagicMock(spec=Study)
-    mock_study.owner_id = owner_id
-    mock_study_repo.find_one.return_value = mock_study
-
-    mock_auth_repo.find_one.return_value = None
+    mock_study_repo.get_owner_and_role.return_value = (owner_id, None)
 
     result = await study_service.check_study_access(study_id, user_id)
 
@@ -132,14 +130,8 @@ async def test_check_study_access_min_role_success(
     user_id = uuid.uuid4()
     owner_id = uuid.uuid4()
 
-    mock_study = MagicMock(spec=Study)
-    mock_study.owner_id = owner_id
-    mock_study_repo.find_one.return_value = mock_study
-
     # User is admin, min_role is editor. 2 >= 1 => True
-    mock_auth_record = MagicMock(spec=StudyAuthorization)
-    mock_auth_record.role = 'admin'
-    mock_auth_repo.find_one.return_value = mock_auth_record
+    mock_study_repo.get_owner_and_role.return_value = (owner_id, 'admin')
 
     result = await study_service.check_study_access(study_id, user_id, min_role='editor')
     assert result is True
@@ -154,14 +146,67 @@ async def test_check_study_access_min_role_failure(
     user_id = uuid.uuid4()
     owner_id = uuid.uuid4()
 
-    mock_study = MagicMock(spec=Study)
-    mock_study.owner_id = owner_id
-    mock_study_repo.find_one.return_value = mock_study
-
     # User is viewer, min_role is editor. 0 >= 1 => False
-    mock_auth_record = MagicMock(spec=StudyAuthorization)
-    mock_auth_record.role = 'viewer'
-    mock_auth_repo.find_one.return_value = mock_auth_record
+    mock_study_repo.get_owner_and_role.return_value = (owner_id, 'viewer')
 
     result = await study_service.check_study_access(study_id, user_id, min_role='editor')
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_check_study_access_missing_study(study_service: StudyService, mock_study_repo: AsyncMock) -> None:
+    """Test access denial when the study does not exist."""
+    mock_study_repo.get_owner_and_role.return_value = None
+
+    assert await study_service.check_study_access(uuid.uuid4(), uuid.uuid4()) is False
+
+
+@pytest.mark.asyncio
+async def test_study_role_is_cached_across_requests(mock_study_repo: AsyncMock, mock_auth_repo: AsyncMock) -> None:
+    """Test that the role is resolved once and reused by later requests until it is invalidated."""
+    study_id = uuid.uuid4()
+    user_id = uuid.uuid4()
+    mock_study_repo.get_owner_and_role.return_value = (uuid.uuid4(), 'viewer')
+
+    first_request = StudyService(mock_study_repo, mock_auth_repo)
+    assert await first_request.check_study_access(study_id, user_id, min_role='viewer') is True
+    assert await first_request.check_study_access(study_id, user_id, min_role='editor') is False
+
+    second_request = StudyService(mock_study_repo, mock_auth_repo)
+    assert await second_request.get_study_role(study_id, user_id) == 'viewer'
+    mock_study_repo.get_owner_and_role.assert_awaited_once()
+
+    mock_study_repo.get_owner_and_role.return_value = (uuid.uuid4(), 'editor')
+    await second_request.add_study_authorization(study_id, user_id, 'editor')
+
+    assert await second_request.check_study_access(study_id, user_id, min_role='editor') is True
+    assert mock_study_repo.get_owner_and_role.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_remove_study_authorization_invalidates_role(
+    study_service: StudyService, mock_study_repo: AsyncMock, mock_auth_repo: AsyncMock
+) -> None:
+    """Test that revoking access is visible immediately."""
+    study_id = uuid.uuid4()
+    user_id = uuid.uuid4()
+    mock_study_repo.get_owner_and_role.return_value = (uuid.uuid4(), 'admin')
+    assert await study_service.check_study_access(study_id, user_id, min_role='admin') is True
+
+    mock_auth_repo.find_one.return_value = MagicMock(spec=StudyAuthorization, id=uuid.uuid4())
+    mock_study_repo.get_owner_and_role.return_value = (uuid.uuid4(), None)
+    await study_service.remove_study_authorization(study_id, user_id)
+
+    assert await StudyService(mock_study_repo, mock_auth_repo).check_study_access(study_id, user_id) is False
+
+
+@pytest.mark.asyncio
+async def test_component_study_id_is_cached(study_service: StudyService, mock_study_repo: AsyncMock) -> None:
+    """Test that a component's study is looked up once."""
+    page_id = uuid.uuid4()
+    study_id = uuid.uuid4()
+    mock_study_repo.get_component_study_id.return_value = study_id
+
+    assert await study_service.get_component_study_id(StudyStepPage, page_id) == study_id
+    assert await study_service.get_component_study_id(StudyStepPage, page_id) == study_id
+    mock_study_repo.get_component_study_id.assert_awaited_once_with(StudyStepPage, page_id)
@@ -0,0 +1,172 @@
+"""Tests for the API's repository extensions."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from rssa_storage.rssadb.models.study_components import StudyAuthorization, StudyStepPage
+from sqlalchemy.dialects import postgresql
+
+from rssa_api.data.repositories.study_admin import PreShuffledMovieRepository
+from rssa_api.data.repositories.study_components import StudyRepository
+from rssa_api.data.repositories.study_participants import (
+    ParticipantDemographicRepository,
+    ParticipantStudySessionRepository,
+    StudyParticipantRepository,
+)
+from rssa_api.data.repositories.survey_components import SurveyItemRepository
+
+
+def _db_returning(result: MagicMock) -> MagicMock:
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def _sql(db: MagicMock) -> str:
+    """The SQL of the statement the repository executed."""
+    stmt = db.execute.await_args.args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_owner_and_role_are_fetched_with_one_outer_join() -> None:
+    """The owner comes back even when the user has no authorization on the study."""
+    owner_id = uuid.uuid4()
+    result = MagicMock()
+    result.first.return_value = (owner_id, None)
+    db = _db_returning(result)
+
+    assert await StudyRepository(db).get_owner_and_role(uuid.uuid4(), uuid.uuid4()) == (owner_id, None)
+    assert f'LEFT OUTER JOIN {StudyAuthorization.__tablename__}' in _sql(db)
+
+    result.first.return_value = None
+    assert await StudyRepository(db).get_owner_and_role(uuid.uuid4(), uuid.uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_component_study_id() -> None:
+    """A component's study is read from the component's own table."""
+    study_id = uuid.uuid4()
+    result = MagicMock()
+    result.scalar.return_value = study_id
+    db = _db_returning(result)
+
+    assert await StudyRepository(db).get_component_study_id(StudyStepPage, uuid.uuid4()) == study_id
+    assert f'FROM {StudyStepPage.__tablename__}' in _sql(db)
+
+
+@pytest.mark.asyncio
+async def test_dataset_subset_and_step_ids() -> None:
+    """Steps come back in order, and a missing study is told apart from one without steps."""
+    first_step, second_step = uuid.uuid4(), uuid.uuid4()
+    result = MagicMock()
+    result.first.return_value = MagicMock(dataset_subset='subset')
+    db = _db_returning(result)
+    db.scalars = AsyncMock(return_value=iter([first_step, second_step]))
+
+    repo = StudyRepository(db)
+    assert await repo.get_dataset_subset_and_step_ids(uuid.uuid4()) == ('subset', [first_step, second_step])
+    step_stmt = db.scalars.await_args.args[0]
+    assert 'ORDER BY' in str(step_stmt.compile(dialect=postgresql.dialect()))
+
+    result.first.return_value = None
+    db.scalars.reset_mock()
+    assert await repo.get_dataset_subset_and_step_ids(uuid.uuid4()) is None
+    db.scalars.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_pre_shuffled_list_ids() -> None:
+    """Only the list ids are selected, not the shuffled movie ids."""
+    list_id = uuid.uuid4()
+    db = MagicMock()
+    db.scalars = AsyncMock(return_value=iter([list_id]))
+
+    assert await PreShuffledMovieRepository(db).get_list_ids('subset') == [list_id]
+    stmt = db.scalars.await_args.args[0]
+    assert [column.name for column in stmt.selected_columns] == ['id']
+
+
+@pytest.mark.asyncio
+async def test_extend_by_resume_code_is_one_update_returning_the_session() -> None:
+    """The code is resolved and the session extended by one UPDATE, scoped to the study when one is given."""
+    session = MagicMock()
+    result = MagicMock()
+    result.first.return_value = session
+    db = MagicMock()
+    db.scalars = AsyncMock(return_value=result)
+    repo = ParticipantStudySessionRepository(db)
+
+    found = await repo.extend_by_resume_code(
+        'ABCDE', datetime.now(UTC), max_age=timedelta(hours=72), extension=timedelta(hours=24)
+    )
+    assert found is session
+    sql = str(db.scalars.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith('UPDATE') and 'RETURNING' in sql and 'IN (SELECT' not in sql
+
+    await repo.extend_by_resume_code(
+        'ABCDE', datetime.now(UTC), max_age=timedelta(hours=72), extension=timedelta(hours=24), study_id=uuid.uuid4()
+    )
+    assert 'IN (SELECT' in str(db.scalars.await_args.args[0].compile(dialect=postgresql.dialect()))
+
+
+class _GroupingRow(tuple):
+    """A result row of the GROUPING SETS answer count query."""
+
+    def __new__(cls, values: tuple, grouping_id: int, count: int) -> '_GroupingRow':
+        row = super().__new__(cls, values)
+        row.grouping_id = grouping_id
+        row.count = count
+        return row
+
+
+@pytest.mark.asyncio
+async def test_answer_counts_are_one_grouping_sets_query() -> None:
+    """Each row is attributed to the field its grouping set was built from."""
+    result = MagicMock()
+    result.all.return_value = [
+        _GroupingRow(('18-24', None, None), 0b011, 3),
+        _GroupingRow((None, 'Woman', None), 0b101, 2),
+        _GroupingRow((None, None, None), 0b101, 1),
+        _GroupingRow((None, None, 'Bachelor'), 0b110, 3),
+    ]
+    db = _db_returning(result)
+
+    counts = await ParticipantDemographicRepository(db).count_answers_by_field(
+        uuid.uuid4(), ('age_range', 'gender', 'education')
+    )
+
+    assert counts == [
+        ('age_range', '18-24', 3),
+        ('gender', 'Woman', 2),
+        ('gender', None, 1),
+        ('education', 'Bachelor', 3),
+    ]
+    assert 'GROUPING SETS' in _sql(db)
+
+
+@pytest.mark.asyncio
+async def test_participants_are_counted_by_stats_bucket() -> None:
+    """Discarded participants are left out and enrollment is bucketed by its UTC day."""
+    rows = [MagicMock()]
+    result = MagicMock()
+    result.all.return_value = rows
+    db = _db_returning(result)
+
+    assert await StudyParticipantRepository(db).count_by_stats_bucket(uuid.uuid4()) == rows
+    sql = _sql(db)
+    assert 'GROUP BY' in sql and 'discarded IS false' in sql and 'timezone(' in sql
+
+
+@pytest.mark.asyncio
+async def test_construct_ids_are_looked_up_with_one_in_query() -> None:
+    """Ids that are not survey items, like attention checks, are missing from the result."""
+    item_id, construct_id = uuid.uuid4(), uuid.uuid4()
+    result = MagicMock()
+    result.all.return_value = [(item_id, construct_id)]
+    db = _db_returning(result)
+
+    assert await SurveyItemRepository(db).get_construct_ids({item_id, uuid.uuid4()}) == {item_id: construct_id}
+    assert ' IN (' in _sql(db)
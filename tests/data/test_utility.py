@@ -0,0 +1,36 @@
+"""Tests for the data modeling helpers."""
+
+import json
+import uuid
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import numpy as np
+
+from rssa_api.data.schemas.recommendations import ResponseWrapper
+from rssa_api.data.utility import to_json_safe
+
+
+def test_to_json_safe_converts_nested_values() -> None:
+    """Nested UUIDs, dates, Decimals, NumPy values and models come out JSON-serializable."""
+    item_id = uuid.uuid4()
+    data = {
+        'id': item_id,
+        'at': datetime(2024, 5, 1, 12, 30, tzinfo=UTC),
+        'history': [{'day': date(2024, 5, 1), 'score': np.float32(0.5), 'rank': np.int64(3)}],
+        'scores': np.array([1.5, np.nan]),
+        'price': Decimal('1.10'),
+        'tags': ('a', 'b'),
+        item_id: True,
+        'response': ResponseWrapper(response_type='standard', items=[1, 2]),
+    }
+
+    safe = to_json_safe(data)
+
+    assert safe['id'] == str(item_id) and safe[str(item_id)] is True
+    assert safe['at'] == '2024-05-01T12:30:00+00:00'
+    assert safe['history'] == [{'day': '2024-05-01', 'score': 0.5, 'rank': 3}]
+    assert safe['scores'] == [1.5, None]
+    assert (safe['price'], safe['tags']) == ('1.10', ['a', 'b'])
+    assert safe['response'] == {'response_type': 'standard', 'items': [1, 2], 'fallback_reason': None}
+    assert json.loads(json.dumps(safe, allow_nan=False)) == safe
@@ -0,0 +1,52 @@
+"""Tests for the background DB writer tasks."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from rssa_api.data import workers
+
+
+def _payload(step_id: uuid.UUID) -> dict:
+    return {
+        'study_id': uuid.uuid4(),
+        'study_participant_id': uuid.uuid4(),
+        'context_data': {'step_id': step_id, 'emotion_input': [{'emotion': 'joy', 'weight': 'high'}]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_upsert_interaction_appends_in_one_statement(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An existing history is extended by a single UPDATE, without reading or rewriting it in Python."""
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(first=MagicMock(return_value=(uuid.uuid4(),)))
+    repo = MagicMock(return_value=AsyncMock())
+    monkeypatch.setattr(workers, 'ParticipantStudyInteractionResponseRepository', repo)
+
+    await workers.process_upsert_interaction(session, _payload(uuid.uuid4()))
+
+    session.execute.assert_awaited_once()
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith('UPDATE') and 'jsonb_set' in sql and '||' in sql
+    repo.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upsert_interaction_creates_the_first_event(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The first event of a step creates the row holding the history."""
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(first=MagicMock(return_value=None))
+    repo = AsyncMock()
+    monkeypatch.setattr(workers, 'ParticipantStudyInteractionResponseRepository', MagicMock(return_value=repo))
+    step_id = uuid.uuid4()
+
+    await workers.process_upsert_interaction(session, _payload(step_id))
+
+    created = repo.create.await_args.args[0]
+    assert created.study_step_id == step_id
+    assert created.context_tag == 'emotion_tuning'
+    assert [event['emotion_input'] for event in created.payload_json['extra']['history']] == [
+        [{'emotion': 'joy', 'weight': 'high'}]
+    ]
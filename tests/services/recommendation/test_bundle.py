@@ -0,0 +1,69 @@
+"""Tests for ModelBundle."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from rssa_api.services.recommendation.bundle import BUNDLE_FORMAT_VERSION, ModelBundle
+
+
+def _write_bundle(root: Path, version: str = 'abc123', format_version: int = BUNDLE_FORMAT_VERSION) -> Path:
+    arrays = {
+        'item_ids': np.array([3, 7, 11], dtype=np.int32),
+        'item_factors': np.arange(6, dtype=np.float32).reshape(3, 2),
+        'user_ids': np.array([1, 5], dtype=np.int32),
+        'history_indptr': np.array([0, 2, 3], dtype=np.int64),
+        'history_items': np.array([3, 11, 7], dtype=np.int32),
+        'history_ratings': np.array([4.0, 2.5, 5.0], dtype=np.float32),
+    }
+    version_dir = root / version
+    version_dir.mkdir(parents=True)
+    specs = {}
+    for name, values in arrays.items():
+        np.save(version_dir / f'{name}.npy', values)
+        specs[name] = {'file': f'{name}.npy', 'dtype': str(values.dtype), 'shape': list(values.shape)}
+    manifest = {'format_version': format_version, 'version': version, 'arrays': specs}
+    (version_dir / 'manifest.json').write_text(json.dumps(manifest))
+    (root / 'LATEST').write_text(version)
+    return version_dir
+
+
+def test_open_memory_maps_latest_version(tmp_path: Path) -> None:
+    """The bundle root resolves to the LATEST version, and arrays are read-only memory maps."""
+    version_dir = _write_bundle(tmp_path)
+
+    bundle = ModelBundle.open(tmp_path)
+
+    assert bundle.path == version_dir
+    assert bundle.version == 'abc123'
+    assert isinstance(bundle.item_factors, np.memmap)
+    assert not bundle.item_factors.flags.writeable
+    assert bundle.nbytes == sum(array.nbytes for array in bundle.arrays.values())
+    np.testing.assert_array_equal(bundle.item_positions([7, 4, 11, 99]), [1, -1, 2, -1])
+
+
+def test_user_history(tmp_path: Path) -> None:
+    """History rows are sliced out of the CSR arrays, and unknown users have no history."""
+    _write_bundle(tmp_path)
+    bundle = ModelBundle.open(tmp_path)
+
+    items, ratings = bundle.user_history(1)
+    np.testing.assert_array_equal(items, [3, 11])
+    np.testing.assert_array_equal(ratings, [4.0, 2.5])
+
+    items, ratings = bundle.user_history(2)
+    assert len(items) == 0 and len(ratings) == 0
+
+
+def test_open_rejects_mismatched_bundles(tmp_path: Path) -> None:
+    """Unknown formats and arrays that disagree with the manifest are refused."""
+    _write_bundle(tmp_path / 'old', format_version=BUNDLE_FORMAT_VERSION + 1)
+    with pytest.raises(ValueError, match='Unsupported bundle format'):
+        ModelBundle.open(tmp_path / 'old')
+
+    version_dir = _write_bundle(tmp_path / 'bad')
+    np.save(version_dir / 'item_ids.npy', np.array([3, 7], dtype=np.int32))
+    with pytest.raises(ValueError, match='item_ids'):
+        ModelBundle.open(version_dir)
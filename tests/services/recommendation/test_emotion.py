@@ -0,0 +1,86 @@
+"""Tests for the local emotion re-ranking of candidate pools."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
+from rssa_api.data.schemas.recommendations import ResponseWrapper
+from rssa_api.services.recommendation.emotion import (
+    EMOTION_TAGS,
+    EmotionPreferences,
+    EmotionRerankStrategy,
+    ItemEmotions,
+    rerank,
+)
+
+RATINGS = [MovieLensRating(item_id='1', rating=4)]
+
+
+@pytest.fixture
+def emotions() -> ItemEmotions:
+    """Items 10-14 with rising joy and constant other emotions; item 15 has no scores."""
+    frame = pd.DataFrame(0.5, index=pd.Index([14, 13, 12, 11, 10, 15], name='item'), columns=list(EMOTION_TAGS))
+    frame['joy'] = [0.9, 0.7, 0.5, 0.3, 0.1, np.nan]
+    return ItemEmotions.from_frame(frame)
+
+
+def test_item_emotions_load_the_train_mfs_lookup(tmp_path: Path) -> None:
+    """The lookup is read from parquet the way train_mfs writes it: item-indexed, one column per emotion."""
+    frame = pd.DataFrame(0.5, index=pd.Index([20, 10], name='item'), columns=list(EMOTION_TAGS))
+    frame['joy'] = [0.9, 0.1]
+    path = tmp_path / 'item_emotion_lookup.parquet'
+    frame.to_parquet(path, compression='snappy')
+
+    emotions = ItemEmotions.from_parquet(path)
+    known, vectors = emotions.lookup([10, 20, 30])
+
+    assert emotions.tags == EMOTION_TAGS
+    assert known.tolist() == [True, True, False]
+    assert vectors[:, EMOTION_TAGS.index('joy')].tolist() == pytest.approx([0.1, 0.9])
+
+
+def test_preferences_parse_discrete_and_continuous() -> None:
+    """Discrete sliders map to the low and high targets; continuous ones carry their own weight."""
+    tags = list(EMOTION_TAGS)
+    discrete = EmotionPreferences.parse(
+        [{'emotion': 'joy', 'weight': 'high'}, {'emotion': 'fear', 'weight': 'diverse'}], tags, 0.3, 0.8
+    )
+    continuous = EmotionPreferences.parse([{'emotion': 'anger', 'switch': 'specified', 'weight': 0.2}], tags, 0.3, 0.8)
+
+    assert discrete.targets[tags.index('joy')] == pytest.approx(0.8)
+    assert discrete.diverse[tags.index('fear')] and np.isnan(discrete.targets[tags.index('fear')])
+    assert continuous.targets[tags.index('anger')] == pytest.approx(0.2)
+
+
+def test_rerank_moves_towards_the_target_and_diversifies() -> None:
+    """A target reorders the pool; diversity trades score for items unlike those already picked."""
+    relevance = np.array([1.0, 0.9, 0.8], dtype=np.float32)
+    vectors = np.array([[0.1], [0.12], [0.9]], dtype=np.float32)
+    none = EmotionPreferences(targets=np.array([np.nan], dtype=np.float32), diverse=np.array([False]))
+    high = EmotionPreferences(targets=np.array([0.9], dtype=np.float32), diverse=np.array([False]))
+    varied = EmotionPreferences(targets=np.array([np.nan], dtype=np.float32), diverse=np.array([True]))
+
+    assert rerank(relevance, vectors, none, 3).tolist() == [0, 1, 2]
+    assert rerank(relevance, vectors, high, 1).tolist() == [2]
+    assert rerank(relevance, vectors, varied, 2).tolist() == [0, 2]
+
+
+@pytest.mark.asyncio
+async def test_tuning_requests_reuse_the_candidate_pool(emotions: ItemEmotions) -> None:
+    """Slider changes are re-ranked locally; the wrapped strategy is asked once, for the whole pool."""
+    inner = AsyncMock()
+    inner.recommend.return_value = ResponseWrapper(response_type='standard', items=[10, 11, 12, 13, 14, 15])
+    strategy = EmotionRerankStrategy(inner, emotions, pool_size=6)
+
+    plain = await strategy.recommend('u1', RATINGS, 2, {'context_tag': 'tuning'})
+    joyful = await strategy.recommend(
+        'u1', RATINGS, 2, {'context_tag': 'tuning', 'emotion_input': [{'emotion': 'joy', 'weight': 'high'}]}
+    )
+
+    assert plain.items == [10, 11]
+    assert joyful.items == [13, 12]  # closest to the joy target, traded off against rank
+    inner.recommend.assert_awaited_once_with('u1', RATINGS, 6, {'context_tag': 'tuning'})
@@ -0,0 +1,98 @@
+"""Tests for the batched fold-in scorer."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from rssa_api.services.recommendation.bundle import ModelBundle
+from rssa_api.services.recommendation.fold_in import FoldInBatcher, FoldInRequest, FoldInScorer
+
+ITEM_IDS = np.array([10, 20, 30, 40, 50, 60], dtype=np.int32)
+
+
+def _bundle(model_class: str, **params: float) -> ModelBundle:
+    rng = np.random.default_rng(7)
+    arrays = {
+        'item_ids': ITEM_IDS,
+        'item_factors': rng.normal(size=(len(ITEM_IDS), 3)).astype(np.float32),
+        'item_bias': rng.normal(size=len(ITEM_IDS)).astype(np.float32),
+    }
+    manifest = {'version': 'test', 'model_class': model_class, 'params': params, 'global_bias': 3.5}
+    return ModelBundle(path=Path('.'), manifest=manifest, arrays=arrays)
+
+
+def _reference_scores(scorer: FoldInScorer, item_ids: list[int], ratings: list[float]) -> np.ndarray:
+    """Folds in a single user the way the ALS row trainers do and scores every item."""
+    rows = scorer.bundle.item_positions(item_ids)
+    all_factors = scorer.item_factors.astype(np.float64)
+    factors = all_factors[rows]
+    ratings = np.asarray(ratings, dtype=np.float64)
+    identity = np.eye(scorer.n_features)
+    if scorer.implicit:
+        confidence = scorer.weight * ratings
+        lhs = all_factors.T @ all_factors + scorer.reg * identity + (factors.T * confidence) @ factors
+        return all_factors @ np.linalg.solve(lhs, factors.T @ (confidence + 1))
+    residuals = ratings - scorer.global_bias - scorer.item_bias[rows]
+    user_bias = residuals.sum() / (len(rows) + scorer.damping)
+    lhs = factors.T @ factors + scorer.reg * len(rows) * identity
+    user_factors = np.linalg.solve(lhs, factors.T @ (residuals - user_bias))
+    return all_factors @ user_factors + scorer.global_bias + user_bias + scorer.item_bias
+
+
+@pytest.mark.parametrize(
+    ('model_class', 'params'),
+    [('ImplicitMF', {'reg': 0.1, 'weight': 40.0}), ('BiasedMF', {'reg': 0.1, 'damping': 5.0})],
+)
+def test_batched_solve_matches_single_user_solves(model_class: str, params: dict) -> None:
+    """Padding users into one batch gives each of them the factors of their own solve."""
+    scorer = FoldInScorer(_bundle(model_class, **params))
+    users = [([10, 30], [4.0, 2.0]), ([20, 40, 50, 60], [5.0, 1.0, 3.0, 4.5]), ([60], [3.0])]
+    positions, ratings, mask = scorer._pad([FoldInRequest(items, values, 3) for items, values in users])
+
+    scores = scorer.score(positions, ratings, mask)
+
+    for row, (items, values) in enumerate(users):
+        np.testing.assert_allclose(scores[row], _reference_scores(scorer, items, values), rtol=1e-4, atol=1e-4)
+
+
+def test_recommend_excludes_rated_and_unknown_items() -> None:
+    """Rated items are never recommended, unknown items are ignored, and each request gets its own limit."""
+    scorer = FoldInScorer(_bundle('ImplicitMF'))
+
+    first, second = scorer.recommend(
+        [FoldInRequest([10, 20, 999], [5, 4, 3], limit=10), FoldInRequest([], [], limit=2)]
+    )
+
+    assert set(first.tolist()) == {30, 40, 50, 60}
+    assert len(second) == 2
+
+
+@pytest.mark.asyncio
+async def test_batcher_scores_concurrent_requests_together() -> None:
+    """Requests that arrive within the wait window share one scorer call."""
+    scorer = MagicMock(spec=FoldInScorer)
+    scorer.recommend.side_effect = lambda requests: [np.array(request.item_ids) for request in requests]
+    batcher = FoldInBatcher(scorer, max_batch_size=8, max_wait_seconds=0.01)
+
+    results = await asyncio.gather(*(batcher.recommend([i], [5], limit=1) for i in range(5)))
+
+    assert results == [[i] for i in range(5)]
+    scorer.recommend.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_batcher_flushes_full_batches_and_propagates_errors() -> None:
+    """A full batch is scored without waiting, and a failed batch fails every request in it."""
+    scorer = MagicMock(spec=FoldInScorer)
+    scorer.recommend.side_effect = RuntimeError('boom')
+    batcher = FoldInBatcher(scorer, max_batch_size=2, max_wait_seconds=60)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.recommend([1], [5], 1), batcher.recommend([2], [5], 1), return_exceptions=True),
+        timeout=1,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,108 @@
+"""Tests for the hot-reloadable model registry."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from rssa_api.services.recommendation import registry as registry_module
+from rssa_api.services.recommendation.registry import ModelRegistry
+from rssa_api.services.recommendation.strategies import LambdaStrategy, LocalStrategy
+
+DEFAULTS = {'implicit_recs_top_n': {'type': 'lambda', 'function_name': 'ImplicitFn', 'payload_template': {}}}
+
+
+def _write_bundle(root: Path, version: str, seed: int) -> None:
+    arrays = {
+        'item_ids': np.array([1, 2, 3, 4], dtype=np.int32),
+        'item_factors': np.random.default_rng(seed).normal(size=(4, 2)).astype(np.float32),
+    }
+    version_dir = root / version
+    version_dir.mkdir(parents=True)
+    specs = {}
+    for name, values in arrays.items():
+        np.save(version_dir / f'{name}.npy', values)
+        specs[name] = {'file': f'{name}.npy', 'dtype': str(values.dtype), 'shape': list(values.shape)}
+    manifest = {'format_version': 1, 'version': version, 'model_class': 'ImplicitMF', 'arrays': specs}
+    (version_dir / 'manifest.json').write_text(json.dumps(manifest))
+    (root / 'LATEST').write_text(version)
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> Path:
+    """A registry config adding a local model."""
+    _write_bundle(tmp_path / 'bundle', 'v1', seed=1)
+    config = tmp_path / 'registry.json'
+    config.write_text(json.dumps({'local_top_n': {'type': 'local', 'bundle': str(tmp_path / 'bundle')}}))
+    return config
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_new_versions_and_keeps_the_previous(config: Path) -> None:
+    """A new bundle version is loaded and swapped in, in-flight holders keep the old one, and rollback is instant."""
+    registry = ModelRegistry(DEFAULTS, config, poll_seconds=None)
+    assert isinstance(registry['implicit_recs_top_n'].inner, LambdaStrategy)
+    assert 'local_top_n' not in registry
+
+    assert await registry.reload() == ['local_top_n']
+    first = registry['local_top_n']
+    assert isinstance(first.inner, LocalStrategy)
+    assert await registry.reload() == []
+
+    _write_bundle(config.parent / 'bundle', 'v2', seed=2)
+    assert await registry.reload() == ['local_top_n']
+    current, previous = {c.key: (c, p) for c, p in registry.models()}['local_top_n']
+    assert (current.version, previous.version) == ('v2', 'v1')
+    assert current.nbytes > 0
+    assert (await first.recommend('u1', [], 2)).items  # an in-flight holder of v1 can still finish
+
+    assert registry.rollback('local_top_n').version == 'v1'
+    assert registry['local_top_n'] is first
+    assert await registry.reload() == []  # pinned until an explicit unpin
+    assert await registry.reload(unpin=True) == ['local_top_n']
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_serving_when_loading_fails(config: Path) -> None:
+    """A broken entry is logged and skipped, and removed entries leave the registry."""
+    registry = ModelRegistry(DEFAULTS, config, poll_seconds=None)
+    await registry.reload()
+    served = registry['local_top_n']
+
+    config.write_text(json.dumps({'local_top_n': {'type': 'local', 'bundle': '/missing'}, 'implicit_recs_top_n': None}))
+    assert await registry.reload() == ['implicit_recs_top_n']
+    assert registry['local_top_n'] is served
+    assert 'implicit_recs_top_n' not in registry
+
+    with pytest.raises(ValueError):
+        registry.rollback('local_top_n')
+
+
+@pytest.mark.asyncio
+async def test_start_polls_for_changes(config: Path) -> None:
+    """The background poller picks up new entries."""
+    config.write_text('{}')
+    registry = ModelRegistry(DEFAULTS, config, poll_seconds=0.01)
+    await registry.start()
+    config.write_text(json.dumps({'other': {'type': 'lambda', 'function_name': 'OtherFn'}}))
+    for _ in range(100):
+        if 'other' in registry:
+            break
+        await asyncio.sleep(0.01)
+    await registry.stop()
+
+    assert 'other' in registry
+
+
+def test_default_fallback_only_stands_in_for_item_lists(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The ranked CSV fallback is not used for advisor or comparison responses unless an entry asks for it."""
+    csv = tmp_path / 'averaged_item_score.csv'
+    csv.write_text('item,ave_score,ave_discounted_score\n1,3.0,0.1\n')
+    monkeypatch.setattr(registry_module, 'RECOMMENDATION_FALLBACK_CSV', str(csv))
+    advisors = registry_module.DEFAULT_ENTRIES['community_advisors']
+
+    assert registry_module.load_fallback(registry_module.DEFAULT_ENTRIES['implicit_recs_top_n']) is not None
+    assert registry_module.load_fallback(advisors) is None
+    assert registry_module.load_fallback({**advisors, 'fallback': {'csv': str(csv)}}) is not None
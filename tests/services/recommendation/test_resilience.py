@@ -0,0 +1,124 @@
+"""Tests for deadlines, hedging, circuit breaking and fallbacks around strategies."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
+from rssa_api.data.schemas.recommendations import ResponseWrapper
+from rssa_api.services.recommendation.resilience import (
+    CircuitBreaker,
+    RankedFallback,
+    RecommendationUnavailableError,
+    ResilientStrategy,
+)
+
+RATINGS = [MovieLensRating(item_id='2', rating=5)]
+ANSWER = ResponseWrapper(response_type='standard', items=[7])
+
+
+def _strategy(*delays: float) -> AsyncMock:
+    """A strategy whose n-th call answers after delays[n] seconds, or fails when the delay is negative."""
+    calls = iter(delays)
+
+    async def recommend(*args: object) -> ResponseWrapper:
+        delay = next(calls)
+        await asyncio.sleep(abs(delay))
+        if delay < 0:
+            raise RuntimeError('cold start failed')
+        return ANSWER
+
+    strategy = AsyncMock()
+    strategy.recommend.side_effect = recommend
+    return strategy
+
+
+def test_circuit_breaker_opens_and_trials() -> None:
+    """The breaker opens at the threshold, lets one trial through after the reset, and closes on success."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    now[0] = 10
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    now[0] = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+
+def test_fallback_from_csv_skips_rated_items(tmp_path: Path) -> None:
+    """The fallback ranks a score table and leaves out what the participant rated."""
+    path = tmp_path / 'averaged_item_score.csv'
+    path.write_text('item,ave_score,ave_discounted_score\n1,3.0,0.1\n2,4.0,0.9\n3,2.0,0.5\n')
+
+    fallback = RankedFallback.from_csv(path)
+
+    assert fallback.recommend(RATINGS, limit=5).items == [3, 1]
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_over_a_slow_one() -> None:
+    """A request still running after the hedge delay is duplicated and the faster answer is used."""
+    inner = _strategy(1.0, 0.01)
+    strategy = ResilientStrategy(inner, 'test', deadline_seconds=0.5, hedge_after_seconds=0.02)
+
+    assert await strategy.recommend('u1', RATINGS, 1) == ANSWER
+    assert inner.recommend.await_count == 2
+    assert strategy.hedged_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_fall_back_and_open_the_circuit() -> None:
+    """A failed retry and a missed deadline are served from the fallback and open the breaker."""
+    inner = _strategy(-0.01, -0.01, 1.0)
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    strategy = ResilientStrategy(
+        inner, 'test', deadline_seconds=0.05, fallback=RankedFallback([2, 9, 8]), breaker=breaker
+    )
+
+    first = await strategy.recommend('u1', RATINGS, 1)
+    second = await strategy.recommend('u1', RATINGS, 1)
+    third = await strategy.recommend('u1', RATINGS, 1)
+
+    assert (first.items, first.fallback_reason) == ([9], 'error')
+    assert second.fallback_reason == 'deadline'
+    assert third.fallback_reason == 'circuit_open'
+    assert inner.recommend.await_count == 3  # the failed first attempt was retried once, the open circuit skipped
+
+
+@pytest.mark.asyncio
+async def test_missed_deadline_without_fallback_raises() -> None:
+    """Without a fallback the participant gets an error instead of waiting past the deadline."""
+    strategy = ResilientStrategy(_strategy(1.0, 1.0), 'test', deadline_seconds=0.02)
+
+    with pytest.raises(RecommendationUnavailableError):
+        await asyncio.wait_for(strategy.recommend('u1', RATINGS, 1), timeout=0.5)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_releases_the_breaker() -> None:
+    """A trial request cancelled by its caller does not leave the breaker stuck half open."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 10
+    strategy = ResilientStrategy(_strategy(1.0), 'test', deadline_seconds=5, breaker=breaker)
+
+    trial = asyncio.create_task(strategy.recommend('u1', RATINGS, 1))
+    await asyncio.sleep(0.01)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert breaker.state == 'half_open'
+    assert breaker.allow()
@@ -1,12 +1,13 @@
 """Tests for LambdaStrategy."""
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from rssa_api.data.schemas.recommendations import ResponseWrapper
-from rssa_api.services.recommendation.strategies import LambdaStrategy
+from rssa_api.services.recommendation.strategies import LambdaStrategy, LocalStrategy
 
 
 @pytest.fixture
@@ -88,3 +89,54 @@ async def test_recommend_lambda_error(mock_session: AsyncMock) -> None:
 
     with pytest.raises(RuntimeError, match='Recommendation Engine Error: Something went wrong'):
         await strategy.recommend('u1', [], 10)
+
+
+@pytest.mark.asyncio
+async def test_recommend_batches_concurrent_requests(mock_session: AsyncMock) -> None:
+    """Concurrent requests share one invocation and each caller gets its own entry of the batched response."""
+    strategy = LambdaStrategy('ImplicitMF', {'path': 'top_n'}, batch_size=8, batch_window_seconds=0.01)
+
+    mock_client = AsyncMock()
+    mock_session.return_value.create_client.return_value.__aenter__.return_value = mock_client
+
+    async def invoke(**kwargs: str) -> dict:
+        batch = json.loads(kwargs['Payload'])['batch']
+        body = [
+            {'errorMessage': 'no ratings'} if not entry['ratings'] else {'response_type': 'standard', 'items': [1]}
+            for entry in batch
+        ]
+        stream = AsyncMock()
+        stream.read.return_value = json.dumps({'body': json.dumps(body)}).encode()
+        return {'Payload': stream}
+
+    mock_client.invoke.side_effect = invoke
+    from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
+
+    ratings = [MovieLensRating(item_id='1', rating=5)]
+    results = await asyncio.gather(
+        strategy.recommend('u1', ratings, 10),
+        strategy.recommend('u2', ratings, 10),
+        strategy.recommend('u3', [], 10),
+        return_exceptions=True,
+    )
+
+    assert results[:2] == [ResponseWrapper(response_type='standard', items=[1])] * 2
+    assert isinstance(results[2], RuntimeError)
+    mock_client.invoke.assert_called_once()
+    batch = json.loads(mock_client.invoke.call_args.kwargs['Payload'])['batch']
+    assert [entry['user_id'] for entry in batch] == ['u1', 'u2', 'u3']
+
+
+@pytest.mark.asyncio
+async def test_local_strategy_recommend() -> None:
+    """The local strategy hands the ratings to the fold-in batcher and wraps its ranking."""
+    from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
+
+    batcher = MagicMock()
+    batcher.recommend = AsyncMock(return_value=[30, 40])
+    strategy = LocalStrategy(batcher)
+
+    result = await strategy.recommend('u1', [MovieLensRating(item_id='10', rating=4)], limit=2)
+
+    assert result == ResponseWrapper(response_type='standard', items=[30, 40])
+    batcher.recommend.assert_awaited_once_with(item_ids=[10], ratings=[4], limit=2)
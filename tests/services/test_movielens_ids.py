@@ -0,0 +1,67 @@
+"""Tests for the MovieLens id map."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from rssa_storage.moviedb.repositories import MovieRepository
+
+from rssa_api.services.movielens_ids import MovieLensIdMap
+
+
+def _session_factory(rows: list[tuple[uuid.UUID, str]]) -> MagicMock:
+    """Builds a session factory whose sessions return the given (id, movielens_id) rows."""
+    result = MagicMock()
+    result.all.return_value = rows
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    return MagicMock(return_value=session)
+
+
+@pytest.mark.asyncio
+async def test_load_and_lookup() -> None:
+    """The map is loaded with one query and looked up in order."""
+    known, other, unknown = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    id_map = MovieLensIdMap(_session_factory([(known, '1'), (other, 2)]))
+
+    assert await id_map.load() == 2
+    assert id_map.loaded_at is not None
+    assert id_map.lookup([other, unknown, known]) == ['2', None, '1']
+
+
+@pytest.mark.asyncio
+async def test_translate_only_fetches_misses() -> None:
+    """Ids missing from the map are fetched once and remembered."""
+    known, added = uuid.uuid4(), uuid.uuid4()
+    id_map = MovieLensIdMap(_session_factory([(known, '1')]))
+    await id_map.load()
+
+    movie = MagicMock()
+    movie.id = added
+    movie.movielens_id = '99'
+    repo = AsyncMock(spec=MovieRepository)
+    repo.find_many.return_value = [movie]
+
+    assert await id_map.translate([known, added, added], repo) == ['1', '99', '99']
+    options = repo.find_many.call_args.args[0]
+    assert options.ids == [added]
+
+    assert await id_map.translate([added, known], repo) == ['99', '1']
+    repo.find_many.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_translate_without_misses_skips_movie_db() -> None:
+    """A fully loaded map answers without touching the movie repository."""
+    movie_id = uuid.uuid4()
+    id_map = MovieLensIdMap(_session_factory([]))
+    id_map.set(movie_id, 7)
+    repo = AsyncMock(spec=MovieRepository)
+
+    assert await id_map.translate([movie_id], repo) == ['7']
+    repo.find_many.assert_not_called()
+
+    id_map.discard(movie_id)
+    assert movie_id not in id_map
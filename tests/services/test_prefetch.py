@@ -0,0 +1,61 @@
+"""Tests for the speculative recommendation prefetcher."""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+from rssa_api.services.prefetch import RecommendationPrefetcher
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_debounced_and_flushed_on_step_entry() -> None:
+    """Repeated rating saves schedule a single prefetch, which a step change starts right away."""
+    service = AsyncMock()
+
+    @asynccontextmanager
+    async def service_factory():
+        yield service
+
+    prefetcher = RecommendationPrefetcher(delay_seconds=60, service_factory=service_factory)
+    participant_id = uuid.uuid4()
+
+    prefetcher.schedule(participant_id)
+    prefetcher.schedule(participant_id)
+    prefetcher.flush(participant_id)
+    prefetcher.flush(participant_id)
+    await asyncio.gather(*prefetcher._tasks)
+
+    service.prefetch_recommendations.assert_awaited_once_with(participant_id)
+
+    prefetcher.schedule(participant_id)
+    await prefetcher.stop()
+    assert service.prefetch_recommendations.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_runs_on_entering_the_step_after_the_rating_step() -> None:
+    """Only entering the step that follows the rating step starts the prefetch the ratings scheduled."""
+    service = AsyncMock()
+
+    @asynccontextmanager
+    async def service_factory():
+        yield service
+
+    prefetcher = RecommendationPrefetcher(delay_seconds=60, service_factory=service_factory)
+    participant_id = uuid.uuid4()
+    rating_step, recommendation_step, other_step = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    prefetcher.step_entered(participant_id, 'preference-elicitation', rating_step, recommendation_step)
+    assert not prefetcher._timers
+    prefetcher.schedule(participant_id)
+    prefetcher.step_entered(participant_id, 'survey', other_step, None)
+    assert not prefetcher._tasks
+
+    prefetcher.step_entered(participant_id, 'task', recommendation_step, other_step)
+    await asyncio.gather(*prefetcher._tasks)
+
+    service.prefetch_recommendations.assert_awaited_once_with(participant_id)
+    await prefetcher.stop()
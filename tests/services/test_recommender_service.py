@@ -1,5 +1,6 @@
 """Tests for the RecommenderService."""
 
+import asyncio
 import uuid
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
@@ -14,7 +15,9 @@ from rssa_storage.rssadb.repositories.participant_responses import (
 )
 from rssa_storage.rssadb.repositories.study_participants import StudyParticipantRepository
 
+from rssa_api.core.ttl_cache import TTLCache
 from rssa_api.data.schemas.movie_schemas import EmotionsSchema, MovieDetailSchema
+from rssa_api.data.schemas.participant_response_schemas import MovieLensRating
 from rssa_api.data.schemas.recommendations import (
     EnrichedResponseWrapper,
     ResponseWrapper,
@@ -231,7 +234,10 @@ async def test_get_recommendations_verifies_eager_load(
 
 @pytest.mark.asyncio
 async def test_get_recommendations_records_interaction(
-    recommender_service: RecommenderService, mock_repos: dict[str, AsyncMock], mock_registry: dict[str, Any]
+    recommender_service: RecommenderService,
+    mock_repos: dict[str, AsyncMock],
+    mock_registry: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Verifies that participant interactions are recorded during recommendation."""
     # Setup
@@ -258,8 +264,8 @@ async def test_get_recommendations_records_interaction(
     # Ensure no context cache
     mock_repos['context'].find_one.return_value = None
 
-    # Case 1: New Interaction (interaction not found)
-    mock_repos['interaction'].find_one.return_value = None
+    enqueue = MagicMock()
+    monkeypatch.setattr(recommender_service, '_enqueue_command', enqueue)
 
     context_data = {
         'emotion_input': [{'emotion': 'joy', 'weight': 'high'}],
@@ -272,67 +278,129 @@ async def test_get_recommendations_records_interaction(
         mock_participant.study_id, user_id, context_data
     )
 
-    # Assertions
-    # Should check find_one called
-    mock_repos['interaction'].find_one.assert_called_once()
-    # Should check create called
-    mock_repos['interaction'].create.assert_called_once()
-    create_arg = mock_repos['interaction'].create.call_args[0][0]
-    assert create_arg.context_tag == 'emotion_tuning'
-    assert create_arg.study_step_id == step_id
-    assert 'history' in create_arg.payload_json['extra']
-    assert len(create_arg.payload_json['extra']['history']) == 1
+    # Assertions: the interaction is handed to the background writer, which appends it to the history
+    task_names = [call.args[0] for call in enqueue.call_args_list]
+    assert task_names == ['upsert_interaction', 'save_rec_context']
+    interaction = enqueue.call_args_list[0].args[1]
+    assert interaction['study_participant_id'] == user_id
+    assert interaction['context_data'] == context_data
+    mock_repos['interaction'].find_one.assert_not_called()
+
+
+def test_invalidate_participant(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Only the prefetched recommendations of the given participant are dropped."""
+    participant_id = uuid.uuid4()
+    other_id = uuid.uuid4()
+    prefetched: TTLCache[uuid.UUID, Any] = TTLCache(ttl_seconds=None)
+    prefetched.set(participant_id, 'stale')
+    prefetched.set(other_id, 'fresh')
+    monkeypatch.setattr(RecommenderService, '_prefetched', prefetched)
+
+    RecommenderService.invalidate_participant(participant_id)
+
+    assert prefetched.lookup(participant_id) == (False, None)
+    assert prefetched.lookup(other_id) == (True, 'fresh')
 
 
 @pytest.mark.asyncio
-async def test_get_recommendations_updates_interaction(
-    recommender_service: RecommenderService, mock_repos: dict[str, AsyncMock], mock_registry: dict[str, Any]
+async def test_request_reuses_prefetched_recommendations(
+    recommender_service: RecommenderService, mock_registry: dict[str, Any], monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    """Verifies that existing participant interactions are updated."""
-    # Setup
-    user_id = uuid.uuid4()
-    algorithm_key = 'test_strategy_interact_update'
-    step_id = uuid.uuid4()
+    """A request with the prefetched inputs is answered without calling the strategy again."""
+    participant_id = uuid.uuid4()
+    ratings = [MovieLensRating(item_id='5', rating=4)]
+    monkeypatch.setattr(recommender_service, '_get_participant_algorithm_config', AsyncMock(return_value=('als', 2)))
+    monkeypatch.setattr(recommender_service, '_get_translated_participant_ratings', AsyncMock(return_value=ratings))
+    monkeypatch.setattr(recommender_service, '_process_recommendation_result', AsyncMock(side_effect=lambda r: r))
+    mock_strategy = AsyncMock(spec=LambdaStrategy)
+    mock_strategy.recommend.return_value = ResponseWrapper(response_type='standard', items=[101, 102])
+    mock_registry['als'] = mock_strategy
+    context_data = {'step_id': str(uuid.uuid4()), 'context_tag': 'top_n'}
 
-    # Mock Participant
-    mock_participant = MagicMock()
-    mock_participant.study_condition.recommender_key = algorithm_key
-    mock_participant.id = user_id
-    mock_participant.study_id = uuid.uuid4()
-    mock_repos['study_participant'].find_one.return_value = mock_participant
+    await recommender_service.prefetch_recommendations(participant_id)
+    result = await recommender_service._generate_and_background_save(
+        uuid.uuid4(), uuid.uuid4(), None, participant_id, 'top_n', context_data
+    )
+
+    assert result.items == [101, 102]
+    mock_strategy.recommend.assert_awaited_once()
+
+    # Changed ratings, or request inputs beyond the routing fields, go to the strategy.
+    ratings.append(MovieLensRating(item_id='6', rating=2))
+    await recommender_service._generate_and_background_save(
+        uuid.uuid4(), uuid.uuid4(), None, participant_id, 'top_n', context_data
+    )
+    RecommenderService.invalidate_participant(participant_id)
+    await recommender_service.prefetch_recommendations(participant_id)
+    await recommender_service._generate_and_background_save(
+        uuid.uuid4(), uuid.uuid4(), None, participant_id, 'emotion', {**context_data, 'emotion_input': {'joy': 1}}
+    )
+    assert mock_strategy.recommend.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_demo_requests_are_coalesced_and_cached(
+    recommender_service: RecommenderService,
+    mock_repos: dict[str, AsyncMock],
+    mock_registry: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Identical demo requests, concurrent or later and in any rating order, share one strategy call."""
+    monkeypatch.setattr('rssa_api.services.recommender_service.DEMO_RECOMMENDER_KEYS', {'demo_top_n', 'missing'})
+    release = asyncio.Event()
+
+    async def recommend(**kwargs: Any) -> ResponseWrapper:
+        await release.wait()
+        return ResponseWrapper(response_type='standard', items=[101])
 
-    # Mock Strategy
     mock_strategy = AsyncMock(spec=LambdaStrategy)
-    mock_strategy.recommend.return_value = ResponseWrapper(items=[], response_type='standard', total_count=0)
-    mock_registry[algorithm_key] = mock_strategy
+    mock_strategy.recommend.side_effect = recommend
+    mock_registry['demo_top_n'] = mock_strategy
+    mock_repos['movie'].find_many.return_value = [create_dummy_movie_detail('101')]
+    # A unique item keeps the request out of the process-wide demo cache filled by other tests.
+    ratings = [MovieLensRating(item_id=str(uuid.uuid4()), rating=5), MovieLensRating(item_id='7', rating=3)]
+    context_data = {'recommender_key': 'demo_top_n'}
 
-    # Mock Ratings (empty)
-    mock_repos['participant_rating'].find_many.return_value = []
+    first = asyncio.create_task(recommender_service.get_recommendations(ratings, 1, context_data))
+    second = asyncio.create_task(recommender_service.get_recommendations(ratings[::-1], 1, context_data))
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(first, second)
+    later = await recommender_service.get_recommendations(ratings, 1, context_data)
 
-    # Ensure no context cache
-    mock_repos['context'].find_one.return_value = None
+    assert [list(result.items) for result in [*results, later]] == [[101], [101], [101]]
+    mock_strategy.recommend.assert_awaited_once_with(user_id='demo', ratings=ratings, limit=1, run_config=None)
+    mock_repos['movie'].find_many.assert_awaited_once()
 
-    # Case 2: Existing Interaction (interaction found)
-    existing_mock = MagicMock()
-    existing_mock.id = uuid.uuid4()
-    existing_mock.payload_json = {'history': [{'timestamp': 'old', 'emotion_input': []}]}
-    mock_repos['interaction'].find_one.return_value = existing_mock
+    with pytest.raises(ValueError, match='No strategy found'):
+        await recommender_service.get_recommendations(ratings, 1, {'recommender_key': 'missing'})
 
-    context_data = {
-        'emotion_input': [{'emotion': 'sadness', 'weight': 'low'}],
-        'step_id': str(step_id),
-        'context_tag': 'emotion_tuning',
-    }
 
-    # Execution
-    await recommender_service.get_recommendations_for_study_participant(
-        mock_participant.study_id, user_id, context_data
+@pytest.mark.asyncio
+async def test_demo_requests_only_reach_allowed_recommenders_with_tuning_fields(
+    recommender_service: RecommenderService,
+    mock_repos: dict[str, AsyncMock],
+    mock_registry: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Demo requests may only name allow-listed recommenders, and only tuning fields are passed on."""
+    monkeypatch.setattr('rssa_api.services.recommender_service.DEMO_RECOMMENDER_KEYS', {'demo_top_n'})
+    mock_strategy = AsyncMock(spec=LambdaStrategy)
+    mock_strategy.recommend.return_value = ResponseWrapper(response_type='standard', items=[101])
+    mock_registry['demo_top_n'] = mock_strategy
+    mock_registry['study_only'] = mock_strategy
+    mock_repos['movie'].find_many.return_value = [create_dummy_movie_detail('101')]
+    ratings = [MovieLensRating(item_id=str(uuid.uuid4()), rating=4)]
+    emotion_input = [{'emotion': 'joy', 'weight': 'high'}]
+
+    with pytest.raises(ValueError, match='not available for demo requests'):
+        await recommender_service.get_recommendations(ratings, 1, {'recommender_key': 'study_only'})
+
+    for padding in ('a', 'b'):
+        await recommender_service.get_recommendations(
+            ratings, 1, {'recommender_key': 'demo_top_n', 'emotion_input': emotion_input, 'padding': padding}
+        )
+
+    mock_strategy.recommend.assert_awaited_once_with(
+        user_id='demo', ratings=ratings, limit=1, run_config={'emotion_input': emotion_input}
     )
-
-    # Assertions
-    mock_repos['interaction'].find_one.assert_called_once()
-    mock_repos['interaction'].update.assert_called_once()
-    update_id, update_payload = mock_repos['interaction'].update.call_args[0]
-    assert update_id == existing_mock.id
-    assert 'history' in update_payload['payload_json']
-    assert len(update_payload['payload_json']['history']) == 2